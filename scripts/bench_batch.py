@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""批量检查基准：逐篇调用 wordf cf（shell 循环）vs wordf batch 的常驻进程池。
+
+生成若干篇带格式偏差的合成论文（结构 JSON 预先放在输出目录，不涉及分类模型），分别逐篇启动
+`python -m wordformat cf` 和调用 run_batch，比较总耗时，并核对两种方式生成的标注版文档完全一致。
+逐篇调用每次都要付出解释器启动、导入和配置解析的开销。
+
+用法：python scripts/bench_batch.py [篇数] [进程数]
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+from loguru import logger
+
+from wordformat.pipeline.batch import run_batch
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+_DATE = re.compile(rb' w:date="[^"]*"')
+
+
+def _make_doc(path: Path, seed: int) -> list[dict]:
+    doc = Document()
+    items = []
+    for ch in range(1, 4):
+        rows = [("heading_level_1", f"第{ch}章 标题{ch}", "Heading 1")]
+        rows += [("body_text", f"第{ch}章正文{i}，包含English words。", None) for i in range(30)]
+        rows.append(("caption_figure", f"图{ch}.1 示意图", None))
+        for category, text, style in rows:
+            p = doc.add_paragraph(style=style)
+            r1, r2 = p.add_run(text[:4]), p.add_run(text[4:])
+            k = (len(items) + seed) % 7
+            if k == 0:
+                r1.bold = True
+            elif k == 1:
+                r2.font.size = Pt(15)
+            elif k == 2:
+                r1.font.color.rgb = RGBColor(255, 0, 0)
+            items.append({"category": category, "paragraph": text, "fingerprint": f"fp{len(items)}"})
+    doc.save(str(path))
+    return items
+
+
+def _parts(path) -> tuple[bytes, bytes]:
+    with zipfile.ZipFile(path) as z:
+        return _DATE.sub(b"", z.read("word/document.xml")), _DATE.sub(b"", z.read("word/comments.xml"))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp:
+        src, loop_out, batch_out = Path(tmp) / "in", Path(tmp) / "loop", Path(tmp) / "batch"
+        for d in (src, loop_out, batch_out):
+            d.mkdir()
+        for i in range(count):
+            data = json.dumps(_make_doc(src / f"thesis{i}.docx", i), ensure_ascii=False)
+            for out in (loop_out, batch_out):
+                (out / f"thesis{i}.json").write_text(data, encoding="utf-8")
+
+        t0 = time.perf_counter()
+        for i in range(count):
+            cmd = [sys.executable, "-m", "wordformat", "cf", "-d", str(src / f"thesis{i}.docx")]
+            cmd += ["-c", str(EXAMPLE), "-f", str(loop_out / f"thesis{i}.json"), "-o", str(loop_out)]
+            subprocess.run(cmd, check=True, capture_output=True)
+        loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        results = run_batch(src, "cf", str(EXAMPLE), out_dir=batch_out, workers=workers)
+        batch = time.perf_counter() - t0
+
+        same = all(r.status == "done" for r in results) and all(
+            _parts(r.output) == _parts(loop_out / Path(r.output).name) for r in results
+        )
+    print(f"{count} 篇（{workers} 进程）：逐篇调用 {loop * 1000:.0f} ms，批量 {batch * 1000:.0f} ms")
+    print(f"加速 {loop / batch:.1f}x")
+    print("结果一致" if same else "结果不一致！")
+
+
+if __name__ == "__main__":
+    main()
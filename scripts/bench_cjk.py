@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""CJK 文本统计的微基准：逐字符生成器 vs 预编译正则 / NumPy 码点数组。
+
+摘要字数统计、中英文字体检查都要对段落文本做 has/count/extract。改动前三者均逐字符调用
+is_chinese_char；现在短文本走字符类正则，长文本（≥128 字符）转 UTF-32 码点后向量化判定。
+
+用法：python scripts/bench_cjk.py [重复次数]
+"""
+
+import sys
+import time
+
+from wordformat.utils import count_chinese_chars, extract_chinese_chars, has_chinese, is_chinese_char
+
+_SAMPLE = "本文提出一种基于深度学习（Deep Learning）的论文格式检查方法，准确率达到 98.5%。"
+
+
+def _legacy_count(text):
+    return sum(1 for ch in text if is_chinese_char(ch))
+
+
+def _legacy_extract(text):
+    return "".join(ch for ch in text if is_chinese_char(ch))
+
+
+def _legacy_has(text):
+    return any(is_chinese_char(ch) for ch in text)
+
+
+def _time(func, texts, repeat):
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            result = [func(t) for t in texts]
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    # 正文段落、整章、标题（英文标题 has_chinese 需扫描全文）
+    cases = {
+        "段落": [_SAMPLE] * 50,
+        "整章": [_SAMPLE * 100] * 5,
+        "英文": ["Research on Format Checking of Theses " * 3] * 50,
+    }
+    funcs = [
+        ("count", _legacy_count, count_chinese_chars),
+        ("extract", _legacy_extract, extract_chinese_chars),
+        ("has", _legacy_has, has_chinese),
+    ]
+    same = True
+    legacy_total = fast_total = 0.0
+    for case, texts in cases.items():
+        for name, legacy, fast in funcs:
+            t_legacy, expected = _time(legacy, texts, repeat)
+            t_fast, actual = _time(fast, texts, repeat)
+            same &= actual == expected
+            legacy_total += t_legacy
+            fast_total += t_fast
+            print(
+                f"{case} {name:<8}逐字符 {t_legacy * 1000:7.1f} ms，"
+                f"新实现 {t_fast * 1000:6.1f} ms（{t_legacy / t_fast:.1f}x）"
+            )
+    print(f"加速 {legacy_total / fast_total:.1f}x")
+    print("结果一致" if same else "结果不一致！")
+
+
+if __name__ == "__main__":
+    main()
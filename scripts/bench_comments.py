@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""批注写入微基准：逐条 add_styled_comment vs 批量写入（style.comment_writer）。
+
+构造 N 个段落，每段一条两行批注（问题类型取自常见的字号 / 字体 / 对齐错误），
+分别逐条调用 add_styled_comment（每条重扫已有批注 ID）与登记后一次 flush，
+并核对 comments.xml 与正文（去掉 w:date）一致。
+
+用法：python scripts/bench_comments.py [批注数]
+"""
+
+import re
+import sys
+import time
+
+from docx import Document
+
+from wordformat.style.comment_writer import CommentWriter
+from wordformat.style.comments import add_styled_comment, split_comment_line
+
+LINES = [
+    "正文段落-字号错误：小四，规范：五号",
+    "正文段落-中文字体错误：黑体，规范：宋体",
+    "正文段落-对齐错误：居中，规范：两端对齐",
+    "正文段落-字体颜色错误：红色，规范：黑色",
+]
+_DATE = re.compile(r' w:date="[^"]*"')
+
+
+def _make_doc(n: int):
+    doc = Document()
+    for i in range(n):
+        doc.add_paragraph(f"第{i}段正文")
+    return doc
+
+
+def _lines(i: int) -> list[str]:
+    return [LINES[i % len(LINES)], LINES[(i + 1) % len(LINES)]]
+
+
+def _one_by_one(doc):
+    for i, p in enumerate(doc.paragraphs):
+        add_styled_comment(doc, p.runs, [split_comment_line(t) for t in _lines(i)])
+
+
+def _batched(doc):
+    writer = CommentWriter.for_document(doc)
+    for i, p in enumerate(doc.paragraphs):
+        writer.add(p.runs, _lines(i))
+    writer.flush()
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    results = {}
+    for name, fn in (("逐条写入", _one_by_one), ("批量写入", _batched)):
+        doc = _make_doc(n)
+        t0 = time.perf_counter()
+        fn(doc)
+        elapsed = time.perf_counter() - t0
+        xml = _DATE.sub("", doc.part._comments_part.element.xml) + doc.element.body.xml
+        results[name] = (elapsed, xml)
+        print(f"{name:<8}{elapsed * 1e3:>10.1f} ms  ({elapsed / n * 1e6:.1f} µs/条)")
+
+    (t_one, xml_one), (t_batch, xml_batch) = results.values()
+    print(f"加速 {t_one / t_batch:.1f}x，结果{'一致' if xml_one == xml_batch else '不一致！'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""配置热路径访问的微基准：DotDict / NodeConfigRoot 与只读视图对比。
+
+用法：python scripts/bench_config_access.py [配置文件] [重复次数]
+"""
+
+import sys
+import timeit
+
+from wordformat.config.compiled import CompiledConfig
+from wordformat.config.dotdict import DotDict, merge_node_config
+from wordformat.config.models import NodeConfigRoot
+from wordformat.rules import HeadingLevel1Node
+from wordformat.utils._yaml import parse_yaml
+
+DEFAULT_CONFIG = "example/undergrad_thesis.yaml"
+
+# 节点 / run 级别每次都会读到的访问路径
+CASES = {
+    "cfg.alignment": "cfg.alignment",
+    "cfg.font_size": "cfg.font_size",
+    "cfg.missing": "cfg.no_such_key",
+    "rules.<name>.enabled": "cfg.rules.numbering.enabled",
+    "root.headings.level_1.font_size": "root.headings.level_1.font_size",
+}
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    with open(path, encoding="utf-8") as f:
+        raw = parse_yaml(f.read()) or {}
+    raw.setdefault("headings", {}).setdefault("level_1", {}).setdefault(
+        "rules", {"numbering": {"enabled": True}}
+    )
+
+    compiled = CompiledConfig(raw)
+    frozen = compiled.config_for(HeadingLevel1Node)
+    variants = {
+        "DotDict": {
+            "cfg": DotDict(
+                merge_node_config(raw, HeadingLevel1Node.NODE_TYPE, HeadingLevel1Node.DEFAULTS)
+            ),
+            "root": NodeConfigRoot(**raw),
+        },
+        "Frozen": {"cfg": frozen, "root": compiled},
+    }
+    print(f"{'访问路径':<34}{'DotDict':>12}{'Frozen':>12}{'加速':>8}   (ns/次，{number} 次)")
+    for label, expr in CASES.items():
+        cost = {}
+        for name, env in variants.items():
+            t = min(timeit.repeat(expr, globals=env, number=number, repeat=3))
+            cost[name] = t / number * 1e9
+        speedup = cost["DotDict"] / cost["Frozen"] if cost["Frozen"] else float("inf")
+        print(f"{label:<34}{cost['DotDict']:>12.1f}{cost['Frozen']:>12.1f}{speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
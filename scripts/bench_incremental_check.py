@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""增量 check 基准：完整检查 vs 改动少数段落后复用检查缓存的重新检查（仅出报告，不含保存）。
+
+生成一篇多章、带格式偏差的合成论文并完整检查一次（写入内存中的检查缓存），随后改写其中几段正文，
+分别做完整检查和带缓存的重新检查，比较耗时并核对问题记录与统计完全一致。
+
+用法：python scripts/bench_incremental_check.py [章节数] [改动段落数]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+from loguru import logger
+
+from wordformat.pipeline.incremental import CheckCache
+from wordformat.pipeline.orchestrate import check_format_report
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+
+
+def _make_doc(path: Path, chapters: int, edited: int = 0) -> list[dict]:
+    """edited 为改写的正文段数（均匀分布在各章中）。"""
+    doc = Document()
+    items = []
+    bodies = chapters * 3 * 20
+    step = max(bodies // edited, 1) if edited else 0
+    body = 0
+    for ch in range(1, chapters + 1):
+        rows = [("heading_level_1", f"第{ch}章 标题{ch}", "Heading 1")]
+        for sec in range(1, 4):
+            rows.append(("heading_level_2", f"{ch}.{sec} 小节", "Heading 2"))
+            for i in range(20):
+                text = f"第{ch}章第{sec}节正文{i}，包含English words。"
+                if step and body % step == 0 and body // step < edited:
+                    text = f"第{ch}章第{sec}节正文{i}，修改后的内容。"
+                rows.append(("body_text", text, None))
+                body += 1
+            rows.append(("caption_figure", f"图{ch}.{sec} 示意图", None))
+        for category, text, style in rows:
+            p = doc.add_paragraph(style=style)
+            r1, r2 = p.add_run(text[:4]), p.add_run(text[4:])
+            k = len(items) % 7
+            if k == 0:
+                r1.bold = True
+            elif k == 1:
+                r2.font.size = Pt(15)
+            elif k == 2:
+                r1.font.color.rgb = RGBColor(255, 0, 0)
+            items.append({"category": category, "paragraph": text, "fingerprint": f"fp{len(items)}"})
+    doc.save(str(path))
+    return items
+
+
+def main() -> None:
+    chapters = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    edited = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp:
+        docx = Path(tmp) / "thesis.docx"
+        full = incremental = float("inf")
+        for _ in range(3):
+            # 每轮从改动前的缓存开始：先检查原稿，再改写几段
+            cache = CheckCache()
+            check_format_report(_make_doc(docx, chapters), str(docx), str(EXAMPLE), cache=cache)
+            items = _make_doc(docx, chapters, edited)
+            cache.hits = cache.misses = 0
+
+            t0 = time.perf_counter()
+            expected = check_format_report(items, str(docx), str(EXAMPLE), cache=False)
+            full = min(full, time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            actual = check_format_report(items, str(docx), str(EXAMPLE), cache=cache)
+            incremental = min(incremental, time.perf_counter() - t0)
+
+    print(
+        f"{len(items)} 段 / {chapters} 章，改动 {edited} 段：完整检查 {full * 1000:.0f} ms，"
+        f"增量检查 {incremental * 1000:.0f} ms（复用 {cache.hits} 段）"
+    )
+    print(f"加速 {full / incremental:.1f}x")
+    same = actual["issues"] == expected["issues"] and actual["summary"] == expected["summary"]
+    print("结果一致" if same else "结果不一致！")
+
+
+if __name__ == "__main__":
+    main()
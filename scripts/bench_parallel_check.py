@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""按章节分片的多进程 check 基准：串行检查 vs 进程池分片检查（仅出报告，不含保存）。
+
+生成一篇多章、带格式偏差的合成论文，分别以 1 个进程和 N 个进程运行 check_format_report，
+比较耗时并核对问题记录与统计完全一致。加速取决于可用核数（单核机器上只有额外开销）。
+
+用法：python scripts/bench_parallel_check.py [进程数] [章节数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+from loguru import logger
+
+from wordformat.pipeline.orchestrate import check_format_report
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+
+
+def _make_doc(path: Path, chapters: int) -> list[dict]:
+    doc = Document()
+    items = []
+    for ch in range(1, chapters + 1):
+        rows = [("heading_level_1", f"第{ch}章 标题{ch}", "Heading 1")]
+        for sec in range(1, 4):
+            rows.append(("heading_level_2", f"{ch}.{sec} 小节", "Heading 2"))
+            rows += [("body_text", f"第{ch}章第{sec}节正文{i}，包含English words。", None) for i in range(20)]
+            rows.append(("caption_figure", f"图{ch}.{sec} 示意图", None))
+        for category, text, style in rows:
+            p = doc.add_paragraph(style=style)
+            r1, r2 = p.add_run(text[:4]), p.add_run(text[4:])
+            k = len(items) % 7
+            if k == 0:
+                r1.bold = True
+            elif k == 1:
+                r2.font.size = Pt(15)
+            elif k == 2:
+                r1.font.color.rgb = RGBColor(255, 0, 0)
+            items.append({"category": category, "paragraph": text, "fingerprint": f"fp{len(items)}"})
+    doc.save(str(path))
+    return items
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(os.cpu_count() or 1, 2)
+    chapters = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp:
+        docx = Path(tmp) / "thesis.docx"
+        items = _make_doc(docx, chapters)
+
+        t0 = time.perf_counter()
+        expected = check_format_report(items, str(docx), str(EXAMPLE), workers=1, cache=False)
+        serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        actual = check_format_report(items, str(docx), str(EXAMPLE), workers=workers, cache=False)
+        sharded = time.perf_counter() - t0
+
+    print(
+        f"{len(items)} 段 / {chapters} 章（{os.cpu_count()} 核）：串行 {serial * 1000:.0f} ms，"
+        f"{workers} 进程分片 {sharded * 1000:.0f} ms"
+    )
+    print(f"加速 {serial / sharded:.1f}x")
+    same = actual["issues"] == expected["issues"] and actual["summary"] == expected["summary"]
+    print("结果一致" if same else "结果不一致！")
+
+
+if __name__ == "__main__":
+    main()
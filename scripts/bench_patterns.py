@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""文本模式微基准：逐个 re.match vs 合并后的预编译模式族（utils._patterns）。
+
+构造 N 条合成的标题 / 题注 / 参考文献文本（含不匹配的正文），
+分别按成员顺序逐个 re.match（旧写法）与一次 family.match，并核对命中的成员和匹配文本一致。
+
+用法：python scripts/bench_patterns.py [文本数]
+"""
+
+import random
+import re
+import sys
+import time
+
+from wordformat.utils._patterns import CAPTION, REFERENCE_NUMBER, heading_number_family
+
+SAMPLES = {
+    0: ["第{n}章 绪论", "第{c}章研究背景", "（{c}）实验设计", "{c}、总体框架", "IV. Results"],
+    1: ["{n}.{n} 研究现状", "{n}.{n}.{n}方法", "{c}.{n} 小结", "{c}、需求分析"],
+    2: ["{n}.{n}.{n} 数据集", "{n}、实验环境", "{n}. 参数设置"],
+    "caption": ["图{n}.{n} 系统架构", "表{n}-{n} 实验参数", "图{c}.{n} 流程", "续表{n}.{n} 对比结果"],
+    "reference": ["[{n}] 张三. 论文标题[J]. 期刊, 2024.", "{n}. Smith J. Title", "（{n}）李四. 书名"],
+}
+FILLER = ["本文研究了格式检查方法。", "2024. 年度报告", "图表说明见下文"]
+CHINESE = "一二三四五六七八九十"
+
+
+def _make_texts(n: int, seed: int = 0) -> list[tuple[object, str]]:
+    rnd = random.Random(seed)
+    keys = list(SAMPLES)
+    texts = []
+    for _ in range(n):
+        key = rnd.choice(keys)
+        pool = SAMPLES[key] + FILLER
+        tpl = rnd.choice(pool)
+        texts.append(
+            (key, tpl.format(n=rnd.randint(1, 12), c=rnd.choice(CHINESE)).removeprefix("续"))
+        )
+    return texts
+
+
+def _family(key):
+    if key == "caption":
+        return CAPTION
+    if key == "reference":
+        return REFERENCE_NUMBER
+    return heading_number_family(key)
+
+
+def _sequential(family, text):
+    for member, source in family.members:
+        m = re.match(source, text, family.flags)
+        if m:
+            return member, m.group()
+    return None
+
+
+def _combined(family, text):
+    m = family.match(text)
+    return (m.member, m.text) if m else None
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    texts = [(_family(key), text) for key, text in _make_texts(n)]
+
+    results = {}
+    for name, fn in (("逐个 re.match", _sequential), ("合并模式族", _combined)):
+        t0 = time.perf_counter()
+        out = [fn(family, text) for family, text in texts]
+        elapsed = time.perf_counter() - t0
+        results[name] = (elapsed, out)
+        print(f"{name:<14}{elapsed * 1e3:>10.1f} ms  ({elapsed / n * 1e6:.2f} µs/条)")
+
+    (t_seq, out_seq), (t_comb, out_comb) = results.values()
+    hits = sum(r is not None for r in out_comb)
+    print(
+        f"加速 {t_seq / t_comb:.1f}x，命中 {hits}/{n}，"
+        f"结果{'一致' if out_seq == out_comb else '不一致！'}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""规则调度的微基准：每个节点现算规则表 vs 绑定配置时按类取得的规则表。
+
+handler 替换为空操作，只计调度本身（合并规则字典、校验配置、getattr、enabled 读取）。
+
+用法：python scripts/bench_rule_dispatch.py [配置文件] [节点数]
+"""
+
+import sys
+import time
+
+from loguru import logger
+
+from wordformat.config.compiled import compile_config
+from wordformat.rules import BodyText, KeywordsCN
+
+
+def _noop(self, doc, rule_cfg, p=False):
+    return rule_cfg
+
+
+def _noop_class(cls):
+    """把 cls 的全部规则 handler 换成空操作的子类。"""
+    handlers = {**cls.DEFAULT_RULES, **cls.RULES}.values()
+    return type(f"Noop{cls.__name__}", (cls,), dict.fromkeys(handlers, _noop))
+
+
+NoopBody = _noop_class(BodyText)
+NoopKeywords = _noop_class(KeywordsCN)
+
+
+def _legacy_run_rules(node, doc, p):
+    """改动前的调度：每次按配置重算规则表，再按 handler 名 getattr。"""
+    cls = type(node)
+    names = {**cls.DEFAULT_RULES, **cls.RULES}
+    for step in cls.rule_plan(node.pydantic_config):
+        getattr(node, names[step.name])(doc, step.config, p)
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else "example/undergrad_thesis.yaml"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    logger.remove()
+    compiled = compile_config(path)
+    nodes = []
+    for i in range(count):
+        node = (NoopKeywords if i % 10 == 0 else NoopBody)(value={}, level=1)
+        node.load_config(compiled)
+        nodes.append(node)
+
+    t0 = time.perf_counter()
+    for node in nodes:
+        _legacy_run_rules(node, None, True)
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for node in nodes:
+        node._run_rules(None, True)
+    bound = time.perf_counter() - t0
+
+    same = all(
+        [s.name for s in type(n).rule_plan(n.pydantic_config)] == [s.name for s in n._rules]
+        for n in nodes[:20]
+    )
+    print(f"{count} 个节点：逐节点现算 {legacy * 1000:.1f} ms，绑定规则表 {bound * 1000:.1f} ms")
+    print(f"加速 {legacy / bound:.1f}x")
+    print("结果一致" if same else "结果不一致！")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""run 拆分微基准：逐个区间拆分 vs 一次批量拆分（utils.split_runs）。
+
+构造 N 个段落，每段一个长 run，含 K 个需要独占 run 的标点，
+分别逐个区间调用 split_runs（每次重扫整段）与一次传入全部区间，并核对结果一致。
+
+用法：python scripts/bench_split_runs.py [段落数] [每段标点数]
+"""
+
+import sys
+import time
+
+from docx import Document
+
+from wordformat.utils import split_runs
+
+
+def _make_doc(n: int, k: int):
+    doc = Document()
+    for _ in range(n):
+        doc.add_paragraph("中文," * k + "结尾")
+    return doc
+
+
+def _spans(k: int):
+    return [(3 * i + 2, 3 * i + 3) for i in range(k)]
+
+
+def _one_by_one(doc, k):
+    for p in doc.paragraphs:
+        for span in _spans(k):
+            split_runs(p, [span])
+
+
+def _batched(doc, k):
+    for p in doc.paragraphs:
+        split_runs(p, _spans(k))
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    results = {}
+    for name, fn in (("逐个拆分", _one_by_one), ("批量拆分", _batched)):
+        doc = _make_doc(n, k)
+        t0 = time.perf_counter()
+        fn(doc, k)
+        elapsed = time.perf_counter() - t0
+        results[name] = (elapsed, doc.element.body.xml)
+        print(f"{name:<8}{elapsed * 1e3:>10.1f} ms  ({elapsed / n * 1e6:.1f} µs/段)")
+
+    (t_one, xml_one), (t_batch, xml_batch) = results.values()
+    print(f"加速 {t_one / t_batch:.1f}x，结果{'一致' if xml_one == xml_batch else '不一致！'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""流水线树遍历的微基准：逐阶段各自遍历 vs TreeWalkStage 合并遍历。
+
+改动前一次 check 要遍历整棵树 7 次：段落对齐展平 1 次、子树提升 3 次、格式化 1 次、
+报告统计 1 次（外加重读全部段落算总字数），apply 模式另有超链接收集。现在合并为结构、格式两次遍历。
+格式化本身替换为空操作、段落快照预先建好，只计遍历和统计的开销。
+
+用法：python scripts/bench_tree_walk.py [章节数]
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+
+from docx import Document
+from loguru import logger
+
+from wordformat.pipeline.stages import (
+    ParagraphAlignmentStage,
+    SummaryGenerationStage,
+    TreeNormalizationStage,
+    TreeWalkStage,
+)
+from wordformat.rules import BodyText, HeadingLevel1Node, HeadingLevel2Node
+from wordformat.rules.abstract import AbstractTitleCN, AbstractTitleEN
+from wordformat.rules.node import FormatNode
+from wordformat.rules.references import ReferenceEntry, References
+from wordformat.structure.utils import promote_bodytext_in_subtrees_of_type
+from wordformat.tree import bfs_walk
+from wordformat.utils import paragraph_snapshot
+
+
+def _build(chapters: int) -> FormatNode:
+    root = FormatNode(value={"category": "top"}, level=0)
+    for cls in (AbstractTitleCN, AbstractTitleEN):
+        title = cls(value={}, level=1)
+        for _ in range(5):
+            title.add_child_node(BodyText(value={}, level=2))
+        root.add_child_node(title)
+    for _ in range(chapters):
+        h1 = HeadingLevel1Node(value={"category": "heading_level_1"}, level=1)
+        for _ in range(4):
+            h2 = HeadingLevel2Node(value={"category": "heading_level_2"}, level=2)
+            for _ in range(10):
+                h2.add_child_node(BodyText(value={"category": "body_text"}, level=3))
+            h1.add_child_node(h2)
+        root.add_child_node(h1)
+    refs = References(value={}, level=1)
+    for _ in range(60):
+        refs.add_child_node(BodyText(value={}, level=2))
+    root.add_child_node(refs)
+    return root
+
+
+def _legacy(root, document):
+    """改动前：各阶段各自遍历。"""
+    nodes = ParagraphAlignmentStage()._flatten_tree_nodes(root)
+    for node, para in zip(nodes, document.paragraphs, strict=False):
+        node.paragraph = para
+    for parent_cls, target_cls in TreeNormalizationStage.MAPPINGS:
+        promote_bodytext_in_subtrees_of_type(root, parent_cls, target_cls)
+
+    chapter = 0
+
+    def traverse(node):  # 格式化遍历（空操作，仅保留章节计数）
+        nonlocal chapter
+        if node.value.get("category") == "heading_level_1":
+            chapter += 1
+        for child in node.children:
+            traverse(child)
+
+    traverse(root)
+
+    summary = SummaryGenerationStage()
+    sections = {}
+
+    def collect(node, parent):
+        para = node.paragraph
+        text = paragraph_snapshot(para).text.strip() if para else ""
+        summary._count_section(node, parent, text, sections)
+        for child in node.children:
+            collect(child, node)
+
+    collect(root, None)
+    texts = (paragraph_snapshot(p).text for p in document.paragraphs)
+    total_chars = sum(len(t) for t in texts if t.strip())
+
+    refs = [n for n in bfs_walk(root) if isinstance(n, ReferenceEntry)]
+    return sections, total_chars, len(refs)
+
+
+class _NoopFormatting:
+    """格式化阶段的替身：只保留章节计数。"""
+
+    def register(self, visitor, ctx):
+        chapter = 0
+
+        def visit(node, parent):
+            nonlocal chapter
+            if node.value.get("category") == "heading_level_1":
+                chapter += 1
+
+        visitor.on(object, visit)
+
+
+class _CollectRefs:
+    """超链接后处理的节点收集部分。"""
+
+    def __init__(self):
+        self.refs = []
+
+    def register(self, visitor, ctx):
+        visitor.on(ReferenceEntry, lambda node, parent: self.refs.append(node))
+
+
+def _fused(root, document):
+    """现在：结构遍历 + 格式遍历。"""
+    ctx = SimpleNamespace(
+        document=document,
+        root_node=root,
+        check=True,
+        report_only=True,
+        docx_path="",
+        config_model=None,
+    )
+    TreeWalkStage(ParagraphAlignmentStage(), TreeNormalizationStage()).process(ctx)
+
+    result = {}
+    summary = SummaryGenerationStage()
+
+    def build_report(doc, config_model, sections, total_chars):
+        result.update(sections=sections, total_chars=total_chars)
+        return {}
+
+    summary._build_report = build_report
+    collect = _CollectRefs()
+    TreeWalkStage(_NoopFormatting(), summary, collect).process(ctx)
+    return result["sections"], result["total_chars"], len(collect.refs)
+
+
+def main() -> None:
+    chapters = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    logger.remove()
+    legacy_root, fused_root = _build(chapters), _build(chapters)
+    count = len(ParagraphAlignmentStage()._flatten_tree_nodes(legacy_root))
+    legacy_doc, fused_doc = Document(), Document()
+    warmed = []
+    for doc in (legacy_doc, fused_doc):
+        for i in range(count + 20):
+            doc.add_paragraph(f"第{i}段正文")
+        # 实际流水线中段落快照已在格式化时建好，这里预先建立（并持有段落元素，缓存才不丢），
+        # 只比较遍历开销
+        warmed.extend(doc.paragraphs)
+    for para in warmed:
+        paragraph_snapshot(para)
+
+    legacy = fused = float("inf")
+    for _ in range(5):  # 各阶段都可重复执行，取最好成绩
+        t0 = time.perf_counter()
+        expected = _legacy(legacy_root, legacy_doc)
+        legacy = min(legacy, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        actual = _fused(fused_root, fused_doc)
+        fused = min(fused, time.perf_counter() - t0)
+
+    flatten = ParagraphAlignmentStage()._flatten_tree_nodes
+    same = actual == expected and [type(n) for n in flatten(legacy_root)] == [
+        type(n) for n in flatten(fused_root)
+    ]
+    print(f"{count} 个节点：逐阶段遍历 {legacy * 1000:.1f} ms，合并遍历 {fused * 1000:.1f} ms")
+    print(f"加速 {legacy / fused:.1f}x")
+    print("结果一致" if same else "结果不一致！")
+
+
+if __name__ == "__main__":
+    main()
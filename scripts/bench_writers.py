@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""apply 写回微基准：逐属性写回 vs 印章写回（DiffMemo.stamp）。
+
+构造 N 个格式相同、与正文配置不符的段落（每段 3 个 run），分别用
+逐项 _write_paragraph / _write_run 与 fix_paragraph / fix_run 修正，并核对结果一致。
+
+用法：python scripts/bench_writers.py [段落数]
+"""
+
+import sys
+import time
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt, RGBColor
+
+from wordformat.config.loader import load_config
+from wordformat.rules import BodyText
+
+CONFIG = "example/undergrad_thesis.yaml"
+
+
+def _make_doc(n: int):
+    doc = Document()
+    for i in range(n):
+        p = doc.add_paragraph()
+        p.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p.paragraph_format.line_spacing = 2.0
+        for text in ("正文内容", "English text", f"第{i}段"):
+            r = p.add_run(text)
+            r.font.size = Pt(15)
+            r.font.color.rgb = RGBColor(255, 0, 0)
+            r.bold = True
+    return doc
+
+
+def _per_attribute(doc, ps, cs):
+    for p in doc.paragraphs:
+        ps._write_paragraph(p, ps.diff_from_paragraph(p))
+        for r in p.runs:
+            cs._write_run(r, cs.diff_from_run(r))
+
+
+def _stamped(doc, ps, cs):
+    for p in doc.paragraphs:
+        ps.fix_paragraph(p)
+        for r in p.runs:
+            cs.fix_run(r)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    config = load_config(CONFIG)
+    ps = config.paragraph_style_for(BodyText)
+    cs = config.character_style_for(BodyText)
+
+    results = {}
+    for name, fn in (("逐属性写回", _per_attribute), ("印章写回", _stamped)):
+        doc = _make_doc(n)
+        t0 = time.perf_counter()
+        fn(doc, ps, cs)
+        elapsed = time.perf_counter() - t0
+        results[name] = (elapsed, doc.element.body.xml)
+        print(f"{name:<8}{elapsed * 1e3:>10.1f} ms  ({elapsed / n * 1e6:.1f} µs/段)")
+
+    (t_attr, xml_attr), (t_stamp, xml_stamp) = results.values()
+    print(f"加速 {t_attr / t_stamp:.1f}x，结果{'一致' if xml_attr == xml_stamp else '不一致！'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,16 @@
 # @Time    : 2026/2/5 21:41
 # @Author  : afish
 # @File    : __init__.py
+import asyncio
+import contextvars
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 
-from fastapi import Body, FastAPI, File, HTTPException, UploadFile
+from fastapi import Body, FastAPI, File, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
@@ -15,10 +19,14 @@ from pydantic import BaseModel
 from starlette.responses import FileResponse
 
 from wordformat.classify.tag import set_tag_main
+from wordformat.config.compiled import invalidate_config
 
 # 复用原有项目的核心函数和校验工具
-from wordformat.pipeline.orchestrate import auto_format_thesis_document
-from wordformat.settings import BASE_DIR, SERVER_HOST, VERSION
+from wordformat.pipeline.orchestrate import (
+    auto_format_thesis_document,
+    check_format_report,
+)
+from wordformat.settings import API_WORKERS, BASE_DIR, SERVER_HOST, VERSION
 
 # ---------------------- 初始化FastAPI应用 ----------------------
 app = FastAPI(
@@ -43,6 +51,18 @@ TEMP_DIR = BASE_DIR / "temp"
 OUTPUT_DIR = BASE_DIR / "output"
 
 
+# 文档处理线程池：检查 / 格式化在工作线程中执行，不阻塞事件循环，多个请求可并发
+_executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="wordformat")
+
+
+async def run_in_worker(fn, /, **kwargs):
+    """在线程池中执行 fn；每个任务使用全新的 contextvars 上下文，请求间不共享配置等状态。"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, partial(contextvars.Context().run, fn, **kwargs)
+    )
+
+
 def _ensure_dirs() -> None:
     """按需创建临时/输出目录（避免 import 时产生副作用）。"""
     for d in (TEMP_DIR, OUTPUT_DIR):
@@ -146,10 +166,14 @@ async def api_check_format(
         None, description="格式配置YAML文件（可选）"
     ),
     json_data: str = Body(..., description="从/generate-json获取的文档结构JSON数据"),
+    report_only: bool = Query(
+        False, description="仅返回JSON检测报告，不生成标注版文档"
+    ),
 ):
     """
     对应原命令行check-format模式：仅执行格式校验，生成【原文件名+--标注版.docx】
     - 基于函数返回的真实路径拼接下载链接，保证路径100%匹配
+    - report_only=true 时不写批注、不保存文件，data 中直接返回检测报告
     """
     _ensure_dirs()
     try:
@@ -157,8 +181,19 @@ async def api_check_format(
         docx_path = save_upload_file(docx_file, TEMP_DIR)
         config_path = save_upload_file(config_file, TEMP_DIR) if config_file else None
 
+        if report_only:
+            report = await run_in_worker(
+                check_format_report,
+                jsonpath=json_data,
+                docxpath=docx_path,
+                configpath=config_path,
+            )
+            report["document"] = docx_file.filename
+            return OperationResult(code=200, msg="格式校验执行成功", data=report)
+
         # 2. 执行校验逻辑，获取【函数返回的实际保存文件路径】（核心！）
-        actual_save_path = auto_format_thesis_document(
+        actual_save_path = await run_in_worker(
+            auto_format_thesis_document,
             jsonpath=json_data,
             docxpath=docx_path,
             configpath=config_path,
@@ -212,7 +247,8 @@ async def api_apply_format(
         config_path = save_upload_file(config_file, TEMP_DIR) if config_file else None
 
         # 2. 执行格式化逻辑，获取【函数返回的实际保存文件路径】（核心！）
-        actual_save_path = auto_format_thesis_document(
+        actual_save_path = await run_in_worker(
+            auto_format_thesis_document,
             jsonpath=json_data,
             docxpath=docx_path,
             configpath=config_path,
@@ -323,6 +359,8 @@ def save_config(req: SaveConfigRequest):
     try:
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(req.content)
+        # 文件内容已变，丢弃该路径的编译配置
+        invalidate_config(file_path)
         return {"code": 200, "msg": f"配置已保存到 configs/{req.filename}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
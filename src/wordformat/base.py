@@ -11,6 +11,14 @@ from loguru import logger
 from wordformat.agent.onnx_infer import onnx_batch_infer, onnx_single_infer
 from wordformat.settings import BATCH_SIZE
 from wordformat.utils import get_paragraph_numbering_text, para_contains_image
+from wordformat.utils._patterns import ABSTRACT_START, ABSTRACT_TITLE, SECTION_TITLE
+
+_EN_KEYWORDS_LABEL = re.compile(r"Keywords?|KEY\s*WORDS", re.IGNORECASE)
+_KEYWORD_SEPARATOR = re.compile(r"[；;,]")
+_SECTION_TITLE_REASONS = {
+    "references_title": "序列修正：参考文献标题",
+    "acknowledgements_title": "序列修正：致谢标题",
+}
 
 
 class DocxBase:
@@ -31,7 +39,10 @@ class DocxBase:
         #     raise
 
     def parse(self) -> list[dict]:
-        # 收集所有段落（含空段），空段/图片段直接标记，不走 AI 推理
+        return classify_documents([self])[0]
+
+    def _prepare(self) -> list[str]:
+        """收集待推理文本（含空段的全部段落中的非空段）；空段/图片段直接标记，不走 AI 推理。"""
         all_paras = list(self.document.paragraphs)
         text_indices = []
         texts_for_ai = []
@@ -54,35 +65,30 @@ class DocxBase:
                     "comment": "图片段落" if has_image else "空段落",
                     "paragraph": "",
                 }
-
-        # 对非空段进行批量 AI 推理
-        for i in range(0, len(texts_for_ai), BATCH_SIZE):
-            batch_texts = texts_for_ai[i : i + BATCH_SIZE]
-            batch_indices = text_indices[i : i + BATCH_SIZE]
-
-            try:
-                batch_results = onnx_batch_infer(batch_texts)
-            except Exception as e:
-                logger.error(f"批量推理失败，降级到单条处理: {e}")
-                batch_results = [onnx_single_infer(t) for t in batch_texts]
-
-            for idx, text, pred in zip(
-                batch_indices, batch_texts, batch_results, strict=False
-            ):
-                tag = pred["label"]
-                score = pred["score"]
-                response = {
-                    "category": tag,
-                    "score": score,
-                    "comment": f"置信度：{score:.4f}",
-                    "paragraph": text,
-                }
-                if score < 0.6:
-                    response["category"] = "body_text"
-                    response["comment"] = (
-                        f"原预测标签为 '{tag}'，置信度 {score:.4f} < 0.6，已强制设为 'body_text'"
-                    )
-                result[idx] = response
+        self._result, self._text_indices = result, text_indices
+        return texts_for_ai
+
+    def _finish(self, texts: list[str], preds: list[dict]) -> list[dict]:
+        """把推理结果填回各段落，再按已知模式修正分类。"""
+        result = self._result
+        for idx, text, pred in zip(self._text_indices, texts, preds, strict=False):
+            if pred is None:
+                continue
+            tag = pred["label"]
+            score = pred["score"]
+            response = {
+                "category": tag,
+                "score": score,
+                "comment": f"置信度：{score:.4f}",
+                "paragraph": text,
+            }
+            if score < 0.6:
+                response["category"] = "body_text"
+                response["comment"] = (
+                    f"原预测标签为 '{tag}'，置信度 {score:.4f} < 0.6，已强制设为 'body_text'"
+                )
+            result[idx] = response
+        del self._result, self._text_indices
 
         assert all(r is not None for r in result), "存在未处理的段落"
         # 后处理：已知模式的段落强制修正分类
@@ -90,19 +96,43 @@ class DocxBase:
         return result
 
 
+def classify_documents(docs: list[DocxBase]) -> list[list[dict]]:
+    """对多篇文档做段落分类，返回与 docs 一一对应的结果（同 DocxBase.parse）。
+
+    各文档的非空段按顺序拼在一起、每 BATCH_SIZE 条推理一次（一批可以跨文档），
+    批量处理多篇短文档时不会因为每篇末尾的零头批次多跑推理。
+    """
+    texts_per_doc = [doc._prepare() for doc in docs]
+    texts = [text for doc_texts in texts_per_doc for text in doc_texts]
+
+    preds = []
+    for i in range(0, len(texts), BATCH_SIZE):
+        batch_texts = texts[i : i + BATCH_SIZE]
+        try:
+            batch_results = onnx_batch_infer(batch_texts)
+        except Exception as e:
+            logger.error(f"批量推理失败，降级到单条处理: {e}")
+            batch_results = [onnx_single_infer(t) for t in batch_texts]
+        # 推理结果条数不足时（如降级失败）补齐位置，由 _finish 按段落校验
+        preds.extend(batch_results[: len(batch_texts)])
+        preds.extend([None] * (len(batch_texts) - len(batch_results)))
+
+    results = []
+    start = 0
+    for doc, doc_texts in zip(docs, texts_per_doc, strict=True):
+        doc_preds = preds[start : start + len(doc_texts)]
+        start += len(doc_texts)
+        results.append(doc._finish(doc_texts, doc_preds))
+    return results
+
+
 def _fix_known_categories(result: list[dict]) -> None:
-    """用已知文本模式修正常见 AI 分类错误。"""
-    abstract_patterns = [
-        (r"^(摘要)\s*$", "abstract_chinese_title"),
-        (r"^(Abstract)\s*$", "abstract_english_title"),
-        (r"^摘要\s*[:：]", "abstract_chinese_title_content"),
-        (r"^Abstract\s*[:：]?", "abstract_english_title_content"),
-    ]
+    """用已知文本模式修正常见 AI 分类错误（模式族见 utils._patterns）。"""
     # 找到第一个摘要段落的位置，之前的内容全部标为 other（封面/声明）
     abstract_start = None
     for i, item in enumerate(result):
         text = (item.get("paragraph") or "").strip()
-        if re.match(r"^(摘要|Abstract)", text):
+        if ABSTRACT_START.match(text):
             abstract_start = i
             break
     if abstract_start is not None:
@@ -118,11 +148,10 @@ def _fix_known_categories(result: list[dict]) -> None:
             continue
         text = (item.get("paragraph") or "").strip()
         if item["category"] == "body_text":
-            for pat, cat in abstract_patterns:
-                if re.match(pat, text):
-                    item["category"] = cat
-                    item["comment"] = f"模式修正为 {cat}"
-                    break
+            m = ABSTRACT_TITLE.match(text)
+            if m:
+                item["category"] = m.member
+                item["comment"] = f"模式修正为 {m.member}"
     # 序列修正：用类别相邻关系纠正明显不合理分类
     _fix_sequence(result)
 
@@ -154,29 +183,23 @@ def _fix_sequence(result: list[dict]) -> None:  # noqa C901
         if "keywords_chinese" in _cat(i) and i + 1 < n:
             j = i + 1
             while j < n and _cat(j) in ("body_text",):
-                if re.search(r"Keywords?|KEY\s*WORDS", _text(j), re.IGNORECASE):
+                if _EN_KEYWORDS_LABEL.search(_text(j)):
                     _set(j, "keywords_english", "关键词序列修正：英文关键词")
                     break
                 j += 1
         i += 1
 
-    # 规则2：独立"参考文献"行 → references_title
-    for i in range(n):
-        t = _text(i)
-        if re.match(r"^参考文献\s*$", t) and _cat(i) != "references_title":
-            _set(i, "references_title", "序列修正：参考文献标题")
-
-    # 规则3：独立"致谢"行 → acknowledgements_title
+    # 规则2/3：独立"参考文献" / "致谢"行 → references_title / acknowledgements_title
     for i in range(n):
-        t = _text(i)
-        if re.match(r"^致\s*谢\s*$", t) and _cat(i) != "acknowledgements_title":
-            _set(i, "acknowledgements_title", "序列修正：致谢标题")
+        m = SECTION_TITLE.match(_text(i))
+        if m and _cat(i) != m.member:
+            _set(i, m.member, _SECTION_TITLE_REASONS[m.member])
 
     # 规则4：keywords + 后面紧跟 keyword-like 内容 → 标记为关键词
     for i in range(n):
         if "keywords" in _cat(i) and i + 1 < n and _cat(i + 1) == "body_text":
             t = _text(i + 1)
             # 含分号分隔的短词 → 关键词
-            if re.search(r"[；;,]", t) and len(t) < 200:
+            if _KEYWORD_SEPARATOR.search(t) and len(t) < 200:
                 if "keyword" not in _cat(i + 1):
                     _set(i + 1, _cat(i), "序列修正：关键词延续")
@@ -13,7 +13,11 @@ from loguru import logger
 from rich.console import Console
 
 from wordformat.classify.tag import set_tag_main
-from wordformat.pipeline.orchestrate import auto_format_thesis_document, md_to_docx
+from wordformat.pipeline.orchestrate import (
+    auto_format_thesis_document,
+    check_format_report,
+    md_to_docx,
+)
 from wordformat.settings import VERSION
 from wordformat.tree import print_tree
 
@@ -87,6 +91,8 @@ def main():
 【极简命令】
 wordf gj    生成文档JSON结构
 wordf cf    检查格式错误
+wordf watch  监视文档，保存后自动重新检查
+wordf batch  批量处理整个目录的论文
 wordf af    自动格式化论文
 wordf tree  查看文档结构树
 wordf config  查看所有可配置字段
@@ -96,6 +102,8 @@ wordf startapi    启动API服务
 【一键示例】
 wordf gj -d 论文.docx -c config.yaml -o output/
 wordf cf -d 论文.docx -c config.yaml -f output/xxx.json -o output/
+wordf watch -d 论文.docx -c config.yaml -f output/xxx.json
+wordf batch -i 论文目录/ -c config.yaml --mode cf -j 4 -o output/
 wordf af -d 论文.docx -c config.yaml -f output/xxx.json -o output/
 wordf tree -f output/xxx.json
 wordf md -d thesis.md -c config.yaml -o output/
@@ -156,6 +164,90 @@ wordf startapi -H 127.0.0.1 -p 8000
         help="JSON文件路径",
     )
     p_cf.add_argument("-o", default="output/", help="输出目录")
+    p_cf.add_argument(
+        "--report-only",
+        action="store_true",
+        help="仅输出 JSON 检测报告（不写批注、不保存标注版文档）",
+    )
+    p_cf.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="按章节分片并行检查的进程数（默认取 WORDFORMAT_CHECK_WORKERS，1 为串行）",
+    )
+    p_cf.add_argument(
+        "--cache",
+        action="store_true",
+        help="在文档旁保存检查缓存 .<文件名>.wfcheck，再次检查时未改动的段落复用上次结果",
+    )
+
+    # ------------------------------
+    # 2.1 watch = 监视文档，保存后增量重新检查
+    # ------------------------------
+    p_watch = subparsers.add_parser(
+        "watch", help="监视文档，保存后自动重新检查并显示问题变化"
+    )
+    p_watch.add_argument(
+        "-d",
+        required=True,
+        type=lambda x: validate_file(x, "文档", [".docx"]),
+        help="Word文档路径",
+    )
+    p_watch.add_argument(
+        "-c",
+        required=True,
+        type=lambda x: validate_file(x, "配置", [".yaml", ".yml"]),
+        help="YAML配置路径",
+    )
+    p_watch.add_argument(
+        "-f",
+        required=True,
+        type=lambda x: validate_file(x, "JSON文件", [".json"]),
+        help="JSON文件路径",
+    )
+    p_watch.add_argument(
+        "--interval", type=float, default=0.3, help="轮询间隔（秒，默认0.3）"
+    )
+
+    # ------------------------------
+    # 2.2 batch = 批量处理目录
+    # ------------------------------
+    p_batch = subparsers.add_parser(
+        "batch", help="用进程池批量处理整个目录的论文（gj/cf/af）"
+    )
+    p_batch.add_argument("-i", required=True, help="论文所在目录（处理其中的 .docx）")
+    p_batch.add_argument(
+        "-c",
+        default=None,
+        type=lambda x: validate_file(x, "配置", [".yaml", ".yml"]),
+        help="YAML配置路径（可选）",
+    )
+    p_batch.add_argument(
+        "--mode",
+        dest="batch_mode",
+        required=True,
+        choices=["gj", "cf", "af"],
+        help="对每篇执行的操作",
+    )
+    p_batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="工作进程数（默认为 CPU 核数）",
+    )
+    p_batch.add_argument("-o", default="output/", help="输出目录（默认output/）")
+    p_batch.add_argument(
+        "--summary",
+        default=None,
+        help="汇总文件路径，.json 或 .csv（默认 <输出目录>/batch_summary.csv）",
+    )
+    p_batch.add_argument(
+        "--force",
+        action="store_true",
+        help="重新处理输出目录中已有产物的文档（默认跳过以便续跑）",
+    )
 
     # ------------------------------
     # 3. af = 格式化
@@ -251,7 +343,7 @@ wordf startapi -H 127.0.0.1 -p 8000
     args = parser.parse_args()
 
     # 只在需要输出目录的命令中创建目录
-    if args.mode in ["gj", "cf", "af", "md"]:
+    if args.mode in ["gj", "cf", "af", "md", "batch"]:
         output_dir = Path(args.o)
         output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -278,6 +370,24 @@ wordf startapi -H 127.0.0.1 -p 8000
         logger.success(f"✅ JSON 已生成：{json_path.resolve()}")
         logger.info("💡 可复制此路径用于 cf/af 命令")
 
+    elif args.mode == "cf" and args.report_only:
+        logger.info("🔍 开始格式检查（仅报告）...")
+        report = check_format_report(
+            jsonpath=args.f,
+            docxpath=args.d,
+            configpath=args.c,
+            workers=args.jobs,
+            cache=True if args.cache else None,
+        )
+        report_path = output_dir / f"{Path(args.d).stem}--检测报告.json"
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        summary = report["summary"]
+        logger.success(
+            f"✅ 检查完成！错误 {summary['errors']}，提醒 {summary['notices']}，"
+            f"报告保存在：{report_path}"
+        )
+
     elif args.mode == "cf":
         logger.info("🔍 开始格式检查...")
         auto_format_thesis_document(
@@ -286,9 +396,69 @@ wordf startapi -H 127.0.0.1 -p 8000
             configpath=args.c,
             savepath=args.o,
             check=True,
+            workers=args.jobs,
+            cache=True if args.cache else None,
         )
         logger.success(f"✅ 检查完成！报告保存在：{args.o}")
 
+    elif args.mode == "watch":
+        from wordformat.pipeline.watch import DocumentWatcher, format_delta
+
+        # 每次检查的流水线日志会刷屏，监视期间控制台只显示警告
+        setup_logger(console_level="WARNING")
+        watcher = DocumentWatcher(
+            jsonpath=args.f, docxpath=args.d, configpath=args.c, interval=args.interval
+        )
+
+        def show(result):
+            stamp = time.strftime("%H:%M:%S")
+            if watcher.checks == 1:
+                summary = result.report["summary"]
+                console.print(
+                    f"[{stamp}] 首次检查：错误 {summary['errors']}，提醒 {summary['notices']}"
+                    f"（{result.elapsed * 1000:.0f} ms）",
+                    markup=False,
+                )
+                return
+            lines = format_delta(result)
+            console.print(f"[{stamp}] {lines[0]}", markup=False)
+            for line in lines[1:]:
+                console.print(line, markup=False)
+
+        console.print(
+            f"👀 监视中：{args.d}（保存后自动重新检查，Ctrl+C 退出）", markup=False
+        )
+        try:
+            watcher.run(show)
+        except KeyboardInterrupt:
+            console.print("已停止监视")
+
+    elif args.mode == "batch":
+        from wordformat.pipeline.batch import run_batch, write_summary
+
+        if not os.path.isdir(args.i):
+            parser.error(f"论文目录不存在: {os.path.abspath(args.i)}")
+        logger.info(f"📚 开始批量处理（{args.batch_mode}）...")
+        results = run_batch(
+            args.i,
+            args.batch_mode,
+            configpath=args.c,
+            out_dir=args.o,
+            workers=args.jobs or os.cpu_count() or 1,
+            resume=not args.force,
+        )
+        summary_path = write_summary(
+            results, args.summary or output_dir / "batch_summary.csv"
+        )
+        failed = [r for r in results if r.status == "failed"]
+        done = sum(r.status == "done" for r in results)
+        logger.success(
+            f"✅ 批量处理完成！完成 {done}，跳过 {len(results) - done - len(failed)}，"
+            f"失败 {len(failed)}，汇总保存在：{summary_path}"
+        )
+        for r in failed:
+            logger.error(f"❌ {r.document}: {r.error}")
+
     elif args.mode == "af":
         logger.info("✏️ 开始自动格式化...")
         auto_format_thesis_document(
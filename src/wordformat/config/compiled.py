@@ -0,0 +1,180 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 14:10
+# @Author  : afish
+# @File    : compiled.py
+"""编译配置：一份配置文件只解析、合并一次，跨文档、跨 API 请求复用。
+
+CompiledConfig 本身仍是 NodeConfigRoot（dict），原有按 key / 点号访问的代码不受影响，
+但整棵配置已冻结为只读视图（见 config.dotdict.FrozenConfigMixin）；额外按节点类缓存：
+
+    config_for(cls)           NODE_TYPE 子配置与 DEFAULTS 合并后的 DotDict
+    paragraph_style_for(cls)  预先构建的 ParagraphStyle（配置无 alignment 时为 None）
+    character_style_for(cls)  预先构建的 CharacterStyle（配置无 chinese_font_name 时为 None）
+    rules_for(cls)            启用的规则表（RuleStep 元组，handler 已解析）
+    derived(kind, build)      其它由本配置派生、跨文档复用的对象（如模板样式片段）
+
+节点 load_config 时直接引用这些对象，约定只读。编译结果按文件内容哈希放入 LRU，
+文件被改写（如 /configs/save）后调用 invalidate_config 丢弃旧结果。
+需要在代码中改动配置项时（如测试），先改 dict 再用 config_from_dict 编译，不经过缓存。
+进程内未命中时先读 YAML 旁的解析快照（见 utils._yaml），快照新鲜则不再解析 YAML。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from wordformat import settings
+from wordformat.config.dotdict import (
+    FrozenConfigMixin,
+    FrozenDotDict,
+    merge_node_config,
+)
+from wordformat.config.models import NodeConfigRoot
+from wordformat.utils._yaml import parse_yaml, read_snapshot, write_snapshot
+
+# 最多缓存的配置份数（按内容哈希）
+CACHE_SIZE = 8
+
+
+class CompiledConfig(FrozenConfigMixin, NodeConfigRoot):
+    """按节点类预先合并好配置、样式对象和规则表的配置根节点（只读）。"""
+
+    def __init__(self, raw: dict | None = None, digest: str = ""):
+        dict.__init__(self, raw or {})
+        self._freeze_items()
+        # 只读视图禁止 setattr，内部状态需绕开
+        object.__setattr__(self, "digest", digest)
+        object.__setattr__(self, "_per_class", {})
+        # 样式构建会嵌套调用 config_for，需可重入锁
+        object.__setattr__(self, "_lock", threading.RLock())
+
+    def __reduce__(self):
+        # 锁与按类缓存不参与序列化（多进程传递配置时在子进程重新编译）
+        return (self.__class__, (dict(self), self.digest))
+
+    def _get(self, kind: str, cls, build):
+        key = (kind, cls)
+        try:
+            return self._per_class[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._per_class:
+                self._per_class[key] = build(cls)
+            return self._per_class[key]
+
+    def config_for(self, cls) -> FrozenDotDict:
+        """cls.NODE_TYPE 子配置与 cls.DEFAULTS 合并后的只读配置。"""
+        return self._get(
+            "config",
+            cls,
+            lambda c: FrozenDotDict(
+                merge_node_config(self, c.NODE_TYPE, getattr(c, "DEFAULTS", {}))
+            ),
+        )
+
+    def paragraph_style_for(self, cls):
+        """cls 的期待段落样式；配置不含段落格式时为 None。"""
+
+        def build(c):
+            from wordformat.style.diff import ParagraphStyle
+
+            cfg = self.config_for(c)
+            return None if cfg.alignment is None else ParagraphStyle.from_config(cfg)
+
+        return self._get("paragraph_style", cls, build)
+
+    def character_style_for(self, cls):
+        """cls 的期待字符样式；配置不含字体格式时为 None。"""
+
+        def build(c):
+            from wordformat.style.diff import CharacterStyle
+
+            cfg = self.config_for(c)
+            return (
+                None
+                if cfg.chinese_font_name is None
+                else CharacterStyle.from_config(cfg)
+            )
+
+        return self._get("character_style", cls, build)
+
+    def rules_for(self, cls) -> tuple:
+        """cls 启用的规则表（见 FormatNode.rule_plan）。"""
+        return self._get("rules", cls, lambda c: c.rule_plan(self.config_for(c)))
+
+    def derived(self, kind: str, build):
+        """按 kind 缓存由本配置派生的对象，build() 只调用一次。"""
+        return self._get(kind, None, lambda _: build())
+
+
+_cache: OrderedDict[str, CompiledConfig] = OrderedDict()
+# 路径 → 最近一次编译的内容哈希，用于按路径失效
+_path_digest: dict[str, str] = {}
+_cache_lock = threading.Lock()
+
+
+def _norm(path) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def _parse_config(path, data: bytes, mtime_ns: int, digest: str) -> dict:
+    """解析配置内容；快照新鲜时直接取快照，否则解析 YAML 并刷新快照。"""
+    if settings.YAML_SNAPSHOT:
+        raw = read_snapshot(path, mtime_ns, digest)
+        if raw is not None:
+            return raw
+    raw = parse_yaml(data.decode("utf-8")) or {}
+    if settings.YAML_SNAPSHOT and isinstance(raw, dict):
+        write_snapshot(path, mtime_ns, digest, raw)
+    return raw
+
+
+def compile_config(path) -> CompiledConfig:
+    """读取配置文件并返回编译配置；内容哈希相同则直接复用缓存。"""
+    with open(path, "rb") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    with _cache_lock:
+        compiled = _cache.get(digest)
+        if compiled is not None:
+            _cache.move_to_end(digest)
+            _path_digest[_norm(path)] = digest
+            return compiled
+    compiled = CompiledConfig(_parse_config(path, data, mtime_ns, digest), digest)
+    with _cache_lock:
+        compiled = _cache.setdefault(digest, compiled)
+        _cache.move_to_end(digest)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+        _path_digest[_norm(path)] = digest
+    return compiled
+
+
+def config_from_dict(raw: dict) -> CompiledConfig:
+    """由内存中的配置 dict 构建编译配置（不进入缓存），哈希按内容计算。"""
+    data = json.dumps(raw, ensure_ascii=False, sort_keys=True, default=str)
+    return CompiledConfig(raw, hashlib.sha256(data.encode("utf-8")).hexdigest())
+
+
+def invalidate_config(path=None) -> None:
+    """丢弃 path 对应的编译配置；path 为 None 时清空全部缓存。"""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+            _path_digest.clear()
+            return
+        digest = _path_digest.pop(_norm(path), None)
+        if digest is not None:
+            _cache.pop(digest, None)
+
+
+def cache_info() -> dict:
+    """缓存状态，便于日志与测试。"""
+    with _cache_lock:
+        return {"size": len(_cache), "max_size": CACHE_SIZE, "paths": len(_path_digest)}
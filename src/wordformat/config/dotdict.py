@@ -1,5 +1,7 @@
 """轻量级点号访问字典，替代 Pydantic 模型做配置容器。"""
 
+from functools import lru_cache
+
 
 class DotDict(dict):
     """支持点号访问的字典，递归转换嵌套 dict。
@@ -34,6 +36,67 @@ class DotDict(dict):
             raise AttributeError(key) from e
 
 
+# 点号访问找不到 key 时依次回落查找的子字典
+_FALLBACK_SUBS = ("paragraph", "font")
+
+
+@lru_cache(maxsize=None)
+def _class_attr_names(cls) -> frozenset:
+    """类上已有的属性名（dict 方法等），同名配置 key 不写成实例属性以免遮蔽。"""
+    return frozenset(dir(cls))
+
+
+class FrozenConfigMixin:
+    """只读配置视图：构造时一次性把点号访问结果写进实例属性。
+
+    属性读取即普通实例属性命中，不再经过 __getattr__、不再为嵌套 dict 分配包装对象；
+    语义与 DotDict 相同：本层 key 优先，其次 paragraph、font 子字典，都没有返回 None。
+    与 dict 方法同名的 key（items、get 等）仍只能用下标访问，与 DotDict 一致。
+    嵌套 dict 递归冻结，写操作一律抛 TypeError。
+    """
+
+    def _freeze_items(self) -> None:
+        for k, v in dict.items(self):
+            if isinstance(v, dict) and not isinstance(v, FrozenConfigMixin):
+                dict.__setitem__(self, k, FrozenDotDict(v))
+        attrs = {}
+        # 回落顺序的逆序写入，后写覆盖先写：font < paragraph < 本层
+        for sub in reversed(_FALLBACK_SUBS):
+            sub_dict = dict.get(self, sub)
+            if isinstance(sub_dict, dict):
+                attrs.update(dict.items(sub_dict))
+        attrs.update(dict.items(self))
+        cls_attrs = _class_attr_names(type(self))
+        vars(self).update(
+            (k, v)
+            for k, v in attrs.items()
+            if isinstance(k, str) and k not in cls_attrs and not k.startswith("__")
+        )
+
+    def __getattr__(self, key: str):
+        # 只有不存在的 key 会走到这里（存在的都已是实例属性）
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return None
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} 为只读配置视图")
+
+    __setitem__ = __delitem__ = __setattr__ = __delattr__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+class FrozenDotDict(FrozenConfigMixin, DotDict):
+    """DotDict 的只读视图（编译配置按类合并后的节点配置）。"""
+
+    def __init__(self, data=()):
+        dict.__init__(self, data)
+        self._freeze_items()
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
 # 全局格式默认值，所有节点以此为底
 BASE_FORMAT: dict[str, object] = {
     "paragraph": {
@@ -68,3 +131,20 @@ def deep_merge(base: dict, override: dict) -> dict:
         else:
             result[k] = v
     return result
+
+
+def merge_node_config(full_config: dict, node_type: str, defaults: dict) -> dict:
+    """沿 NODE_TYPE 路径（如 "headings.level_1"）取 YAML 子配置，以 defaults 为底合并。"""
+    yaml_node: dict = {}
+    current = full_config
+    try:
+        for part in node_type.split("."):
+            if not isinstance(current, dict):
+                raise KeyError
+            current = current[part]
+        yaml_node = current if isinstance(current, dict) else {}
+    except (KeyError, TypeError):
+        yaml_node = {}
+
+    # 合并：DEFAULTS 为底，YAML 覆盖
+    return deep_merge(defaults, yaml_node) if defaults else yaml_node
@@ -1,25 +1,42 @@
 #! /usr/bin/env python
-"""配置加载器。"""
+"""配置加载器。
+
+当前配置保存在上下文变量中：每个线程（及 contextvars.Context().run 隔离的任务）
+各自持有一份，同一进程内并发处理多篇文档时互不影响。
+"""
 
 from __future__ import annotations
 
-from wordformat.config.models import NodeConfigRoot
-from wordformat.utils import load_yaml_with_merge
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from wordformat.config.compiled import CompiledConfig, compile_config
+
+if TYPE_CHECKING:
+    from wordformat.config.models import NodeConfigRoot
+
+_config: ContextVar[NodeConfigRoot | None] = ContextVar(
+    "wordformat_config", default=None
+)
+
 
-_config: NodeConfigRoot | None = None
+def load_config(path: str) -> CompiledConfig:
+    """加载配置；同内容的配置文件只解析一次（见 config.compiled）。"""
+    config = compile_config(path)
+    _config.set(config)
+    return config
 
 
-def load_config(path: str) -> NodeConfigRoot:
-    global _config
-    raw = load_yaml_with_merge(path)
-    _config = NodeConfigRoot(**raw)
-    return _config
+def use_config(config: NodeConfigRoot | None) -> None:
+    """把已加载的配置设为当前配置（如分片检查的子进程使用父进程传来的配置）。"""
+    _config.set(config)
 
 
 def get_config() -> NodeConfigRoot:
-    if _config is None:
+    config = _config.get()
+    if config is None:
         raise RuntimeError("config not loaded, call load_config first")
-    return _config
+    return config
 
 
 def init_config(path: str):
@@ -29,8 +46,7 @@ def init_config(path: str):
 
 def clear_config():
     """向后兼容别名。"""
-    global _config
-    _config = None
+    _config.set(None)
 
 
 class ConfigNotLoadedError(RuntimeError):
@@ -8,6 +8,8 @@ Pydantic 配置模型已被 DEFAULTS + DotDict 替代。
 NodeConfigRoot 保留为 dict 子类，提供向后兼容的点号访问和 collect_style_configs()。
 """
 
+from wordformat.config.dotdict import FrozenConfigMixin
+
 
 class NodeConfigRoot(dict):
     """配置根节点 —— dict 子类，支持点号访问和 collect_style_configs()。
@@ -95,7 +97,8 @@ def _walk_config_for_styles(obj, style_map: dict[str, object]) -> None:
         return
     eng_name = _resolve_builtin_style_name(obj)
     if eng_name and isinstance(eng_name, str):
-        style_map[eng_name] = obj
+        # 编译配置的只读视图换回普通 dict，StyleDefinitionFixStage 按原始 YAML 结构处理
+        style_map[eng_name] = dict(obj) if isinstance(obj, FrozenConfigMixin) else obj
     for _key, val in obj.items():
         if isinstance(val, dict):
             _walk_config_for_styles(val, style_map)
@@ -8,8 +8,9 @@
      点击可跳转到对应的参考文献条目
 """
 
+from __future__ import annotations
+
 import re
-from copy import deepcopy
 
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
@@ -17,26 +18,65 @@ from loguru import logger
 
 from wordformat.rules.body import _CITATION_PATTERN
 from wordformat.tree import bfs_walk
+from wordformat.utils._runs import split_runs
+from wordformat.utils._snapshot import invalidate_snapshot, paragraph_snapshot
+
+# 引用标记内部：编号分隔符、编号范围
+_REF_SEPARATOR = re.compile(r"[,，、]\s*")
+_REF_RANGE = re.compile(r"(\d+)\s*-\s*(\d+)")
 
 
 def create_citation_hyperlinks(root_node, document):
-    """为参考文献创建书签，并将正文中的引用标记替换为可点击的超链接。
+    """单遍处理正文引用：为参考文献建书签索引，逐段拆分引用 run、设上标并包裹超链接。
 
-    调用时机：格式化 + 编号完成后。
+    调用时机：格式化 + 编号完成后。第一章正文的引用上标也在这里统一设置
+    （BodyText.apply_format 只做标记），每段文本只扫描、拆分一次。
 
     Args:
         root_node: 文档树根节点
         document: docx Document 对象
     """
+    from wordformat.rules.body import BodyText
     from wordformat.rules.references import ReferenceEntry
 
-    # 1. 按文档顺序收集所有 ReferenceEntry 节点
+    # 一次遍历，按文档顺序收集参考文献条目和正文节点
     ref_entries = []
-    _collect_nodes_of_type(root_node, ReferenceEntry, ref_entries)
-    if not ref_entries:
-        return
+    body_nodes = []
+    for node in bfs_walk(root_node):
+        if isinstance(node, ReferenceEntry):
+            ref_entries.append(node)
+        elif isinstance(node, BodyText):
+            body_nodes.append(node)
+    link_citations(ref_entries, body_nodes, document)
+
+
+def link_citations(ref_entries, body_nodes, document) -> None:
+    """按已收集的参考文献条目与正文节点处理引用（节点可由流水线的单次树遍历收集）。"""
+    # 1. 为每个参考文献条目创建书签：引用编号 i → bookmark_names[i - 1]
+    bookmark_names = _build_reference_index(ref_entries, document)
+
+    # 2. 逐段处理正文引用（无参考文献时只处理需要上标的段落）
+    processed = 0
+    for node in body_nodes:
+        para = getattr(node, "paragraph", None)
+        if para is None:
+            continue
+        superscript = node.superscript_citations
+        if not ref_entries and not superscript:
+            continue
+        _wrap_citations_in_hyperlinks(para, bookmark_names, superscript=superscript)
+        processed += 1
+
+    if ref_entries:
+        logger.info(
+            f"引用超链接创建完成：{len(ref_entries)} 条参考文献，"
+            f"{processed} 个正文段落已处理"
+        )
 
-    # 2. 为每个参考文献条目创建书签
+
+def _build_reference_index(ref_entries, document) -> list[str | None]:
+    """为参考文献条目插入书签，返回按引用编号排列的书签名（无段落的条目为 None）。"""
+    ids = BookmarkIds.for_document(document)
     bookmark_names = []
     for i, entry in enumerate(ref_entries, start=1):
         para = getattr(entry, "paragraph", None)
@@ -45,49 +85,67 @@ def create_citation_hyperlinks(root_node, document):
             logger.warning(f"参考文献条目 #{i} 未匹配到段落，跳过书签创建")
             continue
         bm_name = f"_Ref{i}"
-        bm_id = _next_bookmark_id()
-        _insert_bookmark(para, bm_name, bm_id)
+        _insert_bookmark(para, bm_name, ids.allocate())
         bookmark_names.append(bm_name)
+    return bookmark_names
 
-    # 3. 遍历正文段落，将引用标记包裹为超链接
-    body_nodes = []
-    _collect_nodes_of_type(root_node, None, body_nodes, collect_body=True)
-    for node in body_nodes:
-        para = getattr(node, "paragraph", None)
-        if para is None:
-            continue
-        _wrap_citations_in_hyperlinks(para, bookmark_names)
 
-    logger.info(
-        f"引用超链接创建完成：{len(ref_entries)} 条参考文献，"
-        f"{len(body_nodes)} 个正文段落已处理"
-    )
+# ---------------------------------------------------------------------------
+# 书签
+# ---------------------------------------------------------------------------
 
+# 书签 ID 起点（与文档已有书签 ID 取较大者）
+_BOOKMARK_ID_BASE = 1000
 
-def _collect_nodes_of_type(root_node, node_type, result, collect_body=False):
-    """遍历树，收集指定类型的节点（按文档顺序）。"""
-    from wordformat.rules.body import BodyText
 
-    for node in bfs_walk(root_node):
-        if node_type is not None:
-            if isinstance(node, node_type):
-                result.append(node)
-        elif collect_body and isinstance(node, BodyText):
-            result.append(node)
+class BookmarkIds:
+    """文档内的书签 ID 分配器，挂在 DocumentPart 上，每个文档独立计数。
 
+    w:id 只需在单个文档内唯一；从文档已有书签的最大 ID 之后递增，
+    长驻进程（API）处理再多文档也不会让 ID 无限增长。
+    """
 
-# ---------------------------------------------------------------------------
-# 书签
-# ---------------------------------------------------------------------------
+    __slots__ = ("_last",)
+
+    def __init__(self, last: int = _BOOKMARK_ID_BASE):
+        self._last = last
 
-# 全局书签 ID 计数器（每个文档内唯一）
-_bookmark_id_counter = 1000
+    @classmethod
+    def for_document(cls, document) -> BookmarkIds:
+        """取（或创建）document 的分配器；part 不可写时返回不缓存的新分配器。"""
+        part = getattr(document, "part", None)
+        cached = getattr(part, "_wf_bookmark_ids", None)
+        if isinstance(cached, BookmarkIds):
+            return cached
+        cached = cls(max(_BOOKMARK_ID_BASE, _max_bookmark_id(part)))
+        try:
+            part._wf_bookmark_ids = cached
+        except Exception:
+            pass
+        return cached
+
+    def allocate(self) -> int:
+        self._last += 1
+        return self._last
+
+
+def _max_bookmark_id(part) -> int:
+    """文档正文中已有书签的最大 w:id（无书签或取不到正文时为 -1）。"""
+    element = getattr(part, "element", None)
+    if element is None or not hasattr(element, "iter"):
+        return -1
+    largest = -1
+    for start in element.iter(qn("w:bookmarkStart")):
+        try:
+            largest = max(largest, int(start.get(qn("w:id"))))
+        except (TypeError, ValueError):
+            continue
+    return largest
 
 
-def _next_bookmark_id():
-    global _bookmark_id_counter
-    _bookmark_id_counter += 1
-    return _bookmark_id_counter
+def _next_bookmark_id(document) -> int:
+    """为 document 分配下一个书签 ID。"""
+    return BookmarkIds.for_document(document).allocate()
 
 
 def _insert_bookmark(paragraph, bookmark_name: str, bookmark_id: int):
@@ -119,130 +177,84 @@ def _insert_bookmark(paragraph, bookmark_name: str, bookmark_id: int):
 # ---------------------------------------------------------------------------
 
 
-def _wrap_citations_in_hyperlinks(paragraph, bookmark_names: list):  # noqa: C901
-    """将段落中匹配引用标记的 run 包裹为超链接。
+def _wrap_citations_in_hyperlinks(
+    paragraph, bookmark_names: list, superscript: bool = False
+):
+    """处理段落中的引用标记：拆分 run、（可选）设上标，并包裹为超链接。
 
-    分两步：
-      1. 先扫描所有 run，将含有引用标记的混合 run 拆分为独立 run
-         （作为 _apply_citation_superscript 未覆盖到的兜底处理）
-      2. 再遍历拆分后的 run，将独立的引用标记包裹为超链接
+    一次扫描段落文本、一次 split_runs 让每个引用标记独占 run；
+    superscript 为 True 时引用所在的全部 run 设为上标，
+    再把独占单个 run 的引用包裹为超链接，跨多个 run 的引用不加链接（不设上标时也不拆分）。
 
     Args:
         paragraph: docx Paragraph 对象
         bookmark_names: 与引用编号对应的书签名列表（1-indexed）
+        superscript: 是否同时把引用设为上标（第一章正文）
     """
-    para_elem = paragraph._element
-
-    # ---- 第 1 步：拆分包含引用标记的混合 run ----
-    r_elems = list(para_elem.findall(qn("w:r")))
-    for r_elem in r_elems:
-        t_elem = r_elem.find(qn("w:t"))
-        if t_elem is None or t_elem.text is None:
-            continue
-        text = t_elem.text
-
-        # 查找所有引用标记位置
-        citation_spans = [
-            (m.start(), m.end()) for m in _CITATION_PATTERN.finditer(text)
+    snap = paragraph_snapshot(paragraph)
+    para_text = snap.text
+    spans = [m.span() for m in _CITATION_PATTERN.finditer(para_text)]
+    if not superscript:
+        # 跨 run 的引用不加链接，不设上标时也无需拆分，保持原 run 不动
+        spans = [
+            (start, end)
+            for start, end in spans
+            if snap.run_index_at(start) == snap.run_index_at(end - 1) != -1
         ]
-        if not citation_spans:
-            continue
-
-        # 如果整个 run 就是引用标记，无需拆分
-        if len(citation_spans) == 1 and citation_spans[0] == (0, len(text)):
-            continue
-
-        # 按引用边界切分
-        rPr = deepcopy(r_elem.find(qn("w:rPr")))
-        split_points = set()
-        for c_start, c_end in citation_spans:
-            if c_start > 0:
-                split_points.add(c_start)
-            if c_end < len(text):
-                split_points.add(c_end)
-
-        segments = []
-        last = 0
-        for pos in sorted(split_points):
-            segments.append((last, pos))
-            last = pos
-        segments.append((last, len(text)))
-
-        # 更新当前 run 为第一段
-        t_elem.text = text[segments[0][0] : segments[0][1]]
-
-        # 为后续段创建新 run
-        ref = r_elem
-        for seg_start, seg_end in segments[1:]:
-            seg_text = text[seg_start:seg_end]
-            if not seg_text:
-                continue
-            new_r = OxmlElement("w:r")
-            if rPr is not None:
-                new_r.append(deepcopy(rPr))
-            new_t = OxmlElement("w:t")
-            new_t.text = seg_text
-            new_r.append(new_t)
-            ref.addnext(new_r)
-            ref = new_r
-
-    # ---- 第 2 步：将独立的引用 run 包裹为超链接 ----
-    r_elems = list(para_elem.findall(qn("w:r")))
+    if not spans:
+        return
     skipped_count = 0
-
-    for r_elem in r_elems:
-        t_elem = r_elem.find(qn("w:t"))
-        if t_elem is None or t_elem.text is None:
-            continue
-
-        text = t_elem.text
-        m = _CITATION_PATTERN.fullmatch(text)
-        if not m:
-            continue
-
-        # 提取引用编号
-        ref_nums = _parse_ref_numbers(text)
-        if not ref_nums:
-            skipped_count += 1
-            continue
-
-        if ref_nums[0] > len(bookmark_names):
-            logger.debug(
-                f"引用 {text} 编号超出参考文献总数 ({len(bookmark_names)})，跳过"
-            )
-            skipped_count += 1
+    for (start, end), runs in zip(spans, split_runs(paragraph, spans), strict=True):
+        if superscript:
+            for run in runs:
+                # CT_R.get_or_add_rPr() → CT_RPr.superscript 官方封装
+                run._r.get_or_add_rPr().superscript = True
+        if len(runs) != 1 or not bookmark_names:
             continue
-
-        # 链接到第一个引用编号对应的参考文献
-        anchor = bookmark_names[ref_nums[0] - 1]
-        if anchor is None:
-            logger.debug(
-                f"引用 {text} 对应的参考文献条目 #{ref_nums[0]} 缺少书签，跳过"
-            )
+        if not _link_citation_run(runs[0]._r, para_text[start:end], bookmark_names):
             skipped_count += 1
-            continue
-
-        # 在 rPr 中添加 Hyperlink 字符样式（保留已有格式如上标）
-        rPr = r_elem.find(qn("w:rPr"))
-        if rPr is None:
-            rPr = OxmlElement("w:rPr")
-            r_elem.insert(0, rPr)
-        if rPr.find(qn("w:rStyle")) is None:
-            rStyle = OxmlElement("w:rStyle")
-            rStyle.set(qn("w:val"), "Hyperlink")
-            rPr.insert(0, rStyle)
-
-        # 创建 <w:hyperlink> 包裹 run（w:hyperlink → CT_Hyperlink，用其类型化属性）
-        hyperlink = OxmlElement("w:hyperlink")
-        hyperlink.anchor = anchor
-        hyperlink.history = True
-        r_elem.addprevious(hyperlink)
-        hyperlink.append(r_elem)
 
+    invalidate_snapshot(paragraph)
     if skipped_count > 0:
         logger.debug(f"段落中有 {skipped_count} 个引用标记未创建超链接")
 
 
+def _link_citation_run(r_elem, text: str, bookmark_names: list) -> bool:
+    """把独占 run 的引用标记包裹为指向第一个引用编号的超链接；无法链接时返回 False。"""
+    # 提取引用编号
+    ref_nums = _parse_ref_numbers(text)
+    if not ref_nums:
+        return False
+
+    if ref_nums[0] > len(bookmark_names):
+        logger.debug(f"引用 {text} 编号超出参考文献总数 ({len(bookmark_names)})，跳过")
+        return False
+
+    # 链接到第一个引用编号对应的参考文献
+    anchor = bookmark_names[ref_nums[0] - 1]
+    if anchor is None:
+        logger.debug(f"引用 {text} 对应的参考文献条目 #{ref_nums[0]} 缺少书签，跳过")
+        return False
+
+    # 在 rPr 中添加 Hyperlink 字符样式（保留已有格式如上标）
+    rPr = r_elem.find(qn("w:rPr"))
+    if rPr is None:
+        rPr = OxmlElement("w:rPr")
+        r_elem.insert(0, rPr)
+    if rPr.find(qn("w:rStyle")) is None:
+        rStyle = OxmlElement("w:rStyle")
+        rStyle.set(qn("w:val"), "Hyperlink")
+        rPr.insert(0, rStyle)
+
+    # 创建 <w:hyperlink> 包裹 run（w:hyperlink → CT_Hyperlink，用其类型化属性）
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.anchor = anchor
+    hyperlink.history = True
+    r_elem.addprevious(hyperlink)
+    hyperlink.append(r_elem)
+    return True
+
+
 def _parse_ref_numbers(text: str) -> list[int]:
     """从引用标记文本中提取参考编号列表。
 
@@ -253,9 +265,9 @@ def _parse_ref_numbers(text: str) -> list[int]:
     """
     inner = text.strip("[]")
     numbers = []
-    for part in re.split(r"[,，、]\s*", inner):
+    for part in _REF_SEPARATOR.split(inner):
         part = part.strip()
-        m = re.match(r"(\d+)\s*-\s*(\d+)", part)
+        m = _REF_RANGE.match(part)
         if m:
             start, end = int(m.group(1)), int(m.group(2))
             numbers.extend(range(start, end + 1))
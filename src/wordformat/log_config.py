@@ -8,11 +8,12 @@ from pathlib import Path
 from loguru import logger
 
 
-def setup_logger(log_dir: str | None = None):
+def setup_logger(log_dir: str | None = None, console_level: str = "INFO"):
     """配置日志。
 
     Args:
         log_dir: 日志文件目录。为 None 时仅输出到控制台（测试/开发模式）。
+        console_level: 控制台输出的最低级别（如监视模式只显示 WARNING 及以上）。
     """
     logger.remove()
 
@@ -30,12 +31,12 @@ def setup_logger(log_dir: str | None = None):
             diagnose=True,
         )
 
-    # 控制台输出：仅 INFO 及以上（DEBUG 不刷屏）
+    # 控制台输出：默认仅 INFO 及以上（DEBUG 不刷屏）
     if not sys.stdout.closed:
         logger.add(
             sys.stdout,
             colorize=True,
-            level="INFO",
+            level=console_level,
             format=(
                 "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
                 "<level>{level: <8}</level> | "
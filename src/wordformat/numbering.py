@@ -9,17 +9,22 @@
 4. 应用参考文献条目的自动编号
 
 流程：
-  格式化完成后 → 对 heading / ReferenceEntry 节点 → 清除手动编号 → 应用自动编号
+  格式化完成后 → 按文档顺序一次规划全部 heading / ReferenceEntry 节点（NumberingPlan）
+  → 批量清除手动编号 → 批量写入 numPr
 """
 
-import re
+import copy
 
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.shared import Cm, Inches, Mm, Pt
 from loguru import logger
 
+from wordformat.rules.references import ReferenceEntry
 from wordformat.style.units import extract_unit_from_string
+from wordformat.utils._patterns import REFERENCE_NUMBER, heading_number_family
+from wordformat.utils._runs import set_run_text
+from wordformat.utils._snapshot import invalidate_snapshot, paragraph_snapshot
 
 # EMU 到 twips 的换算系数
 _EMU_PER_TWIP = 635
@@ -28,7 +33,7 @@ _EMU_PER_TWIP = 635
 def _auto_strip_numbering(paragraph, ilvl: int) -> bool:
     """自动检测并清除段落开头的手动编号文本。
 
-    根据标题级别 'ilvl' 构建匹配列表，按优先级依次尝试。
+    按标题级别 'ilvl' 取预编译的编号模式族（utils._patterns），一次匹配。
     无需用户编写正则表达式。
 
     支持：
@@ -37,65 +42,19 @@ def _auto_strip_numbering(paragraph, ilvl: int) -> bool:
     - 括号编号：（一）、(1)、（1）、1)
     - 带空格或标点后缀：1.1   、 一、
     """
-    if not paragraph.runs:
+    snap = paragraph_snapshot(paragraph)
+    if not snap.runs:
         return False
 
-    text = paragraph.text.lstrip("\u3000 ")  # 全角/半角空格
+    text = snap.text.lstrip("\u3000 ")  # 全角/半角空格
     if not text:
         return False
 
-    # ---------- 公共原子 ----------
-    _CH = "[一二三四五六七八九十百千零壹贰叁肆伍陆柒捌玖拾佰仟]"
-    _CHN = (
-        "(?:一|二|三|四|五|六|七|八|九|十|百|千|零|壹|贰|叁|肆|伍|陆|柒|捌|玖|拾|佰|仟)"
-    )
-    _NUM = r"\d+"
-    _ROMAN = "[IVXLCDM]+"
-
-    # 中文数字/阿拉伯数字 混合组
-    _CHD = f"(?:{_CHN}|[0-9])"
-    _CHDM = f"(?:{_CHN}|[0-9])+"
-
-    # 按 ilvl 构建模式列表（优先级从高到低）
-    patterns: list[str] = []
-
-    if ilvl == 0:  # 一级标题
-        patterns = [
-            rf"^第{_CHDM}章\s*",  # 第一章、第1章
-            rf"^第{_CHDM}节\s*",  # 第一节
-            rf"^第{_CHDM}部分\s*",  # 第一部分
-            rf"^（{_CHDM}）\s*",  # （一）、（1）
-            rf"^\({_CHDM}\)\s*",  # (一)、(1)
-            rf"^{_CHDM}\)\s*",  # 一)、1)
-            rf"^{_ROMAN}\.\s+",  # I.  / V.
-            rf"^{_CH}\s*[、，,\.]?\s*",  # 一、 / 一 / 一.
-        ]
-    elif ilvl == 1:  # 二级标题
-        patterns = [
-            rf"^{_NUM}\.{_NUM}\.{_NUM}\s*",  # 1.1.1 (先匹配更长的)
-            rf"^{_NUM}\.{_NUM}\s+",  # 1.1   (带空格)
-            rf"^{_NUM}\.{_NUM}\s*",  # 1.1
-            rf"^{_CH}\.{_NUM}\s*",  # 一.1
-            rf"^{_CH}\s*[、，,\.]?\s*",  # 一、/ 一.
-        ]
-    else:  # 三级及以上
-        patterns = [
-            rf"^{_NUM}\.{_NUM}\.{_NUM}\s*",  # 1.1.1
-            rf"^{_NUM}\.{_NUM}\.{_NUM}\s+",  # 1.1.1
-            rf"^{_NUM}\.{_NUM}\s*",  # 1.1
-            rf"^{_NUM}\s*[、，,\.]?\s*",  # 1. / 1、
-        ]
-
-    # 去除所有尾部空格和零宽断言
-    for pattern in patterns:
-        match = re.match(pattern, text)
-        if not match:
-            continue
-        stripped_len = len(match.group())
-        _remove_chars(paragraph, stripped_len)
-        return True
-
-    return False
+    match = heading_number_family(ilvl).match(text)
+    if not match:
+        return False
+    _remove_chars(paragraph, len(match.text))
+    return True
 
 
 def _strip_reference_numbering(paragraph) -> bool:
@@ -105,50 +64,43 @@ def _strip_reference_numbering(paragraph) -> bool:
       [1]  [1]  1.  1)  (1)  [1]  ［1］  ①
     返回 True 表示已清除编号。
     """
-    if not paragraph.runs:
+    snap = paragraph_snapshot(paragraph)
+    if not snap.runs:
         return False
 
-    text = paragraph.text.lstrip("　 ")
+    text = snap.text.lstrip("　 ")
     if not text:
         return False
 
-    patterns = [
-        r"^\[\d+\][\s　]*",  # [1]  [1]
-        r"^［\d+］[\s　]*",  # ［1］（全角方括号）
-        r"^\(\d+\)[\s　]*",  # (1)
-        r"^（\d+）[\s　]*",  # （1）（全角括号）
-        r"^\d+\.[\s　]+",  # 1.  (必须有空格，避免匹配年份如 2024.)
-        r"^\d+\)[\s　]*",  # 1)
-        r"^[①②③④⑤⑥⑦⑧⑨⑩][\s　]*",  # ①（带圈数字）
-    ]
-
-    for pattern in patterns:
-        match = re.match(pattern, text)
-        if match:
-            _remove_chars(paragraph, len(match.group()))
-            return True
-
-    return False
+    match = REFERENCE_NUMBER.match(text)
+    if not match:
+        return False
+    _remove_chars(paragraph, len(match.text))
+    return True
 
 
 def _remove_chars(paragraph, count: int) -> None:
-    """从段落开头删除指定数量的字符，跨 run 操作。"""
+    """从段落开头删除指定数量的字符，跨 run 操作（按快照中的 run 文本定位）。"""
+    snap = paragraph_snapshot(paragraph)
+    texts = list(snap.run_texts)
     remaining = count
-    for run in paragraph.runs:
+    for i, run in enumerate(snap.runs):
         if remaining <= 0:
             break
-        rt = run.text
+        rt = texts[i]
         if len(rt) <= remaining:
             remaining -= len(rt)
-            run.text = ""
+            texts[i] = ""
         else:
-            run.text = rt[remaining:]
+            texts[i] = rt[remaining:]
             remaining = 0
+        set_run_text(run._r, texts[i])
     # 清除第一个非空 run 开头的空白
-    for run in paragraph.runs:
-        if run.text:
-            run.text = run.text.lstrip("\u3000 ")
+    for run, rt in zip(snap.runs, texts, strict=True):
+        if rt:
+            set_run_text(run._r, rt.lstrip("\u3000 "))
             break
+    invalidate_snapshot(paragraph)
 
 
 def _convert_to_twips(value_str: str) -> int:
@@ -273,77 +225,151 @@ def _build_numbering_rPr(headings_config, level_key: str):
     return rPr
 
 
-def _traverse_numbering(
-    node, heading_map, heading_num_map, config, ref_enabled, reference_num_id, counters
-):
-    """递归遍历节点树，应用标题和参考文献编号。"""
-    from wordformat.rules.references import ReferenceEntry
-
-    category = node.value.get("category", "") if isinstance(node.value, dict) else ""
-    paragraph = getattr(node, "paragraph", None)
-
-    if paragraph:
-        # 处理标题节点
-        for level_key, (ilvl_str, config_key) in heading_map.items():
-            if category == f"heading_{level_key}":
-                level_config = getattr(config, config_key, None)
-                if level_config and level_config.enabled:
-                    _auto_strip_numbering(paragraph, int(ilvl_str))
-                    num_id = heading_num_map.get(config_key)
-                    if num_id:
-                        apply_auto_numbering(paragraph, num_id, ilvl_str)
-                    counters["heading"] += 1
-                break
-
-        # 处理参考文献条目节点
-        if ref_enabled and isinstance(node, ReferenceEntry):
+# 标题类别 → (ilvl, 编号配置键)
+_HEADING_LEVELS = {
+    "heading_level_1": (0, "level_1"),
+    "heading_level_2": (1, "level_2"),
+    "heading_level_3": (2, "level_3"),
+}
+
+
+class NumberingPlan:
+    """标题与参考文献编号的执行计划。
+
+    add 按文档顺序逐节点登记需要编号的段落（启用的级别在构造时一次确定），
+    apply 建立编号定义后批量清除手动编号、批量写入 numPr。
+    可由 process_heading_numbering 单独遍历，也可挂在流水线的格式遍历上。
+    """
+
+    __slots__ = ("config", "_levels", "_ref_enabled", "headings", "references")
+
+    def __init__(self, config):
+        self.config = config
+        # 启用的标题类别 → (ilvl, 配置键)
+        self._levels: dict[str, tuple[int, str]] = {}
+        for category, (ilvl, key) in _HEADING_LEVELS.items():
+            level_config = getattr(config, key, None)
+            if level_config and level_config.enabled:
+                self._levels[category] = (ilvl, key)
+        ref_config = getattr(config, "references", None)
+        self._ref_enabled = isinstance(ref_config, dict) and ref_config.get(
+            "enabled", False
+        )
+        self.headings: list[tuple[object, int, str]] = []  # (段落, ilvl, 配置键)
+        self.references: list = []  # 参考文献条目段落
+
+    def add(self, node) -> None:
+        """登记单个节点（按文档顺序调用）。"""
+        paragraph = getattr(node, "paragraph", None)
+        if not paragraph:
+            return
+        value = node.value
+        category = value.get("category", "") if isinstance(value, dict) else ""
+        level = self._levels.get(category)
+        if level is not None:
+            self.headings.append((paragraph, *level))
+        if self._ref_enabled and isinstance(node, ReferenceEntry):
+            self.references.append(paragraph)
+
+    def add_tree(self, root_node) -> None:
+        """按文档顺序（DFS 前序，含根节点）登记整棵树。"""
+        stack = [root_node]
+        while stack:
+            node = stack.pop()
+            self.add(node)
+            stack.extend(reversed(node.children))
+
+    def apply(self, document, headings_config=None, parts=None) -> dict:
+        """建立编号定义，清除手动编号并写入 numPr，返回编号定义（同 create_numbering_definition）。
+
+        parts 为模板片段缓存（style.template_parts.TemplateParts），
+        提供时 w:lvl 片段按模板只构建一次，否则现场构建。
+        """
+        config = self.config
+        levels = None
+        if parts is not None:
+            levels = parts.numbering_levels(
+                lambda: build_numbering_levels(config, headings_config)
+            )
+        definitions = create_numbering_definition(
+            document, config, headings_config, levels
+        )
+        heading_num_map = definitions.get("headings", {})
+        reference_num_id = definitions.get("references")
+
+        # 同一 (numId, ilvl) 的 numPr 只构建一次，写入时复制
+        prototypes: dict[tuple[str, str], object] = {}
+        writes = []
+        for paragraph, ilvl, key in self.headings:
+            _auto_strip_numbering(paragraph, ilvl)
+            num_id = heading_num_map.get(key)
+            if num_id:
+                writes.append(
+                    (paragraph, _num_pr_prototype(prototypes, num_id, str(ilvl)))
+                )
+        for paragraph in self.references:
             _strip_reference_numbering(paragraph)
             if reference_num_id:
-                apply_auto_numbering(paragraph, reference_num_id, "0")
-            counters["ref"] += 1
-
-    for child in node.children:
-        _traverse_numbering(
-            child,
-            heading_map,
-            heading_num_map,
-            config,
-            ref_enabled,
-            reference_num_id,
-            counters,
+                writes.append(
+                    (paragraph, _num_pr_prototype(prototypes, reference_num_id, "0"))
+                )
+        for paragraph, numPr in writes:
+            _set_num_pr(paragraph._element, copy.deepcopy(numPr))
+
+        logger.info(
+            f"编号处理完成：标题 {len(self.headings)} 个，"
+            f"参考文献条目 {len(self.references)} 个"
         )
+        return definitions
 
 
-def process_heading_numbering(root_node, document, config, headings_config=None):
-    """处理所有标题和参考文献条目的自动编号。"""
+def process_heading_numbering(
+    root_node, document, config, headings_config=None, parts=None
+):
+    """处理所有标题和参考文献条目的自动编号（见 NumberingPlan）。
+
+    parts 为模板片段缓存（style.template_parts.TemplateParts），
+    提供时 w:lvl 片段按模板只构建一次，否则现场构建。
+    """
     if not config.enabled:
         return
 
-    definitions = create_numbering_definition(document, config, headings_config)
+    plan = NumberingPlan(config)
+    plan.add_tree(root_node)
+    plan.apply(document, headings_config, parts)
 
-    heading_map = {
-        "level_1": ("0", "level_1"),
-        "level_2": ("1", "level_2"),
-        "level_3": ("2", "level_3"),
-    }
 
-    ref_config = getattr(config, "references", None)
-    ref_enabled = isinstance(ref_config, dict) and ref_config.get("enabled", False)
-
-    counters = {"heading": 0, "ref": 0}
-    _traverse_numbering(
-        root_node,
-        heading_map,
-        definitions.get("headings", {}),
-        config,
-        ref_enabled,
-        definitions.get("references"),
-        counters,
-    )
-    logger.info(
-        f"编号处理完成：标题 {counters['heading']} 个，"
-        f"参考文献条目 {counters['ref']} 个"
-    )
+def _num_pr(num_id: str, ilvl: str):
+    """构建 <w:numPr><w:ilvl/><w:numId/></w:numPr>。"""
+    numPr = OxmlElement("w:numPr")
+    ilvl_elem = OxmlElement("w:ilvl")
+    ilvl_elem.set(qn("w:val"), ilvl)
+    numId_elem = OxmlElement("w:numId")
+    numId_elem.set(qn("w:val"), num_id)
+    numPr.append(ilvl_elem)
+    numPr.append(numId_elem)
+    return numPr
+
+
+def _num_pr_prototype(prototypes: dict, num_id: str, ilvl: str):
+    numPr = prototypes.get((num_id, ilvl))
+    if numPr is None:
+        numPr = prototypes[num_id, ilvl] = _num_pr(num_id, ilvl)
+    return numPr
+
+
+def _set_num_pr(p_element, numPr) -> None:
+    """把 numPr 写入段落 pPr（替换已有的 numPr）。"""
+    pPr = p_element.find(qn("w:pPr"))
+    if pPr is None:
+        pPr = OxmlElement("w:pPr")
+        p_element.insert(0, pPr)
+
+    # 移除已有的 numPr（避免重复）
+    existing_numPr = pPr.find(qn("w:numPr"))
+    if existing_numPr is not None:
+        pPr.remove(existing_numPr)
+    pPr.append(numPr)
 
 
 def apply_auto_numbering(paragraph, num_id: str, ilvl: str = "0"):
@@ -358,34 +384,109 @@ def apply_auto_numbering(paragraph, num_id: str, ilvl: str = "0"):
         num_id: 编号定义 ID（对应 numbering.xml 中的 w:numId）
         ilvl: 编号级别（默认 "0"）
     """
-    pPr = paragraph._element.find(qn("w:pPr"))
-    if pPr is None:
-        pPr = OxmlElement("w:pPr")
-        paragraph._element.insert(0, pPr)
+    _set_num_pr(paragraph._element, _num_pr(num_id, ilvl))
+    logger.debug(f"已应用自动编号: numId={num_id}, ilvl={ilvl}")
 
-    # 移除已有的 numPr（避免重复）
-    existing_numPr = pPr.find(qn("w:numPr"))
-    if existing_numPr is not None:
-        pPr.remove(existing_numPr)
 
-    # 创建新的 numPr
-    numPr = OxmlElement("w:numPr")
-    ilvl_elem = OxmlElement("w:ilvl")
-    ilvl_elem.set(qn("w:val"), ilvl)
-    numId_elem = OxmlElement("w:numId")
-    numId_elem.set(qn("w:val"), num_id)
-    numPr.append(ilvl_elem)
-    numPr.append(numId_elem)
-    pPr.append(numPr)
+def build_numbering_levels(config, headings_config=None) -> dict:
+    """按配置构建编号定义的 w:lvl 片段，与具体文档无关，可按模板缓存复用。
+
+    返回:
+      {
+        "headings": [(level_key, w:lvl), ...],   # 启用且有 template 的标题级别
+        "references": w:lvl or None,
+      }
+    """
+    level_configs = [
+        ("level_1", config.level_1, 0),
+        ("level_2", config.level_2, 1),
+        ("level_3", config.level_3, 2),
+    ]
+    headings = [
+        (key, _build_numbering_level(key, lcfg, ilvl, headings_config))
+        for key, lcfg, ilvl in level_configs
+        if lcfg.enabled and lcfg.template
+    ]
+
+    reference = None
+    ref_config = getattr(config, "references", None)
+    if (
+        isinstance(ref_config, dict)
+        and ref_config.get("enabled", False)
+        and ref_config.get("template")
+    ):
+        # 参考文献只有一级（ilvl=0），numFmt 始终为 decimal
+        reference = _build_numbering_level(None, ref_config, 0, None)
+
+    return {"headings": headings, "references": reference}
 
-    logger.debug(f"已应用自动编号: numId={num_id}, ilvl={ilvl}")
 
+def _append_num_definition(
+    numbering_elm, abstract_num_id: int, num_id: int, lvls
+) -> None:
+    """在 numbering 中追加一对 abstractNum / num 定义，lvls 复制后接入。"""
+    abstract_num = OxmlElement("w:abstractNum")
+    abstract_num.set(qn("w:abstractNumId"), str(abstract_num_id))
+    for lvl in lvls:
+        abstract_num.append(copy.deepcopy(lvl))
+    numbering_elm.append(abstract_num)
 
-def create_numbering_definition(document, config, headings_config=None) -> dict:
+    num = OxmlElement("w:num")
+    num.set(qn("w:numId"), str(num_id))
+    abstract_num_id_ref = OxmlElement("w:abstractNumId")
+    abstract_num_id_ref.set(qn("w:val"), str(abstract_num_id))
+    num.append(abstract_num_id_ref)
+    numbering_elm.append(num)
+
+
+class _NumberingIndex:
+    """numbering.xml 中已用的最大 abstractNumId / numId。
+
+    挂在 numbering part 上，只在 numbering 根元素的子元素数变化（被其它代码改过）时重新扫描；
+    create_numbering_definition 追加定义后用 update 增量更新。
+    """
+
+    __slots__ = ("size", "max_abstract_num_id", "max_num_id")
+
+    def __init__(self, numbering_elm):
+        self.size = 0
+        self.max_abstract_num_id = -1
+        self.max_num_id = 0
+        self.update(numbering_elm, start=0)
+
+    @classmethod
+    def for_part(cls, numbering_part) -> "_NumberingIndex":
+        numbering_elm = numbering_part._element
+        index = getattr(numbering_part, "_wf_numbering_index", None)
+        if not isinstance(index, cls) or index.size != len(numbering_elm):
+            index = cls(numbering_elm)
+            numbering_part._wf_numbering_index = index
+        return index
+
+    def update(self, numbering_elm, start: int | None = None) -> None:
+        """扫描 numbering 根元素 start 之后（默认为上次扫描之后）新增的子元素。"""
+        abstract_tag, num_tag = qn("w:abstractNum"), qn("w:num")
+        for elem in numbering_elm[self.size if start is None else start :]:
+            if elem.tag == abstract_tag:
+                abstract_num_id = int(elem.get(qn("w:abstractNumId"), "0"))
+                self.max_abstract_num_id = max(
+                    self.max_abstract_num_id, abstract_num_id
+                )
+            elif elem.tag == num_tag:
+                self.max_num_id = max(
+                    self.max_num_id, int(elem.get(qn("w:numId"), "0"))
+                )
+        self.size = len(numbering_elm)
+
+
+def create_numbering_definition(
+    document, config, headings_config=None, levels=None
+) -> dict:
     """
     在文档中创建自动编号定义（如果不存在）。
 
-    根据配置中的 template 生成 abstractNum 和 num 定义。
+    根据配置中的 template 生成 abstractNum 和 num 定义；levels 为预先构建的
+    w:lvl 片段（见 build_numbering_levels），None 时现场构建。
 
     返回:
       {
@@ -400,6 +501,9 @@ def create_numbering_definition(document, config, headings_config=None) -> dict:
     if not config.enabled:
         return {"headings": {}, "references": None}
 
+    if levels is None:
+        levels = build_numbering_levels(config, headings_config)
+
     # 获取或创建 numbering part
     try:
         numbering_part = document.part.numbering_part
@@ -419,93 +523,42 @@ def create_numbering_definition(document, config, headings_config=None) -> dict:
 
     numbering_elm = numbering_part._element
 
-    # 查找已有的最大 abstractNumId 和 numId
-    max_abstract_num_id = -1
-    max_num_id = 0
-    for elem in numbering_elm.findall(qn("w:abstractNum")):
-        num_id = int(elem.get(qn("w:abstractNumId"), "0"))
-        max_abstract_num_id = max(max_abstract_num_id, num_id)
-    for elem in numbering_elm.findall(qn("w:num")):
-        num_id = int(elem.get(qn("w:numId"), "0"))
-        max_num_id = max(max_num_id, num_id)
+    # 已有的最大 abstractNumId 和 numId
+    index = _NumberingIndex.for_part(numbering_part)
+    max_abstract_num_id = index.max_abstract_num_id
+    max_num_id = index.max_num_id
 
     heading_num_map = {}
     reference_num_id = None
 
-    # ========================
     # 1. 标题编号定义
-    # ========================
-    level_configs = [
-        ("level_1", config.level_1, 0),
-        ("level_2", config.level_2, 1),
-        ("level_3", config.level_3, 2),
-    ]
-    enabled_heading_levels = [
-        (key, lcfg, ilvl)
-        for key, lcfg, ilvl in level_configs
-        if lcfg.enabled and lcfg.template
-    ]
-
-    if enabled_heading_levels:
-        abstract_num_id = max_abstract_num_id + 1
-        num_id = max_num_id + 1
+    if levels["headings"]:
         max_abstract_num_id += 1
         max_num_id += 1
-
-        abstract_num = OxmlElement("w:abstractNum")
-        abstract_num.set(qn("w:abstractNumId"), str(abstract_num_id))
-
-        for level_key, level_config, ilvl in enabled_heading_levels:
-            lvl = _build_numbering_level(level_key, level_config, ilvl, headings_config)
-            abstract_num.append(lvl)
-
-        numbering_elm.append(abstract_num)
-
-        num = OxmlElement("w:num")
-        num.set(qn("w:numId"), str(num_id))
-        abstract_num_id_ref = OxmlElement("w:abstractNumId")
-        abstract_num_id_ref.set(qn("w:val"), str(abstract_num_id))
-        num.append(abstract_num_id_ref)
-        numbering_elm.append(num)
-
+        _append_num_definition(
+            numbering_elm,
+            max_abstract_num_id,
+            max_num_id,
+            [lvl for _, lvl in levels["headings"]],
+        )
         logger.debug(
-            f"创建标题编号定义: abstractNumId={abstract_num_id}, numId={num_id}"
+            f"创建标题编号定义: abstractNumId={max_abstract_num_id}, numId={max_num_id}"
         )
-        heading_num_map = {key: str(num_id) for key, _, _ in enabled_heading_levels}
+        heading_num_map = {key: str(max_num_id) for key, _ in levels["headings"]}
 
-    # ========================
     # 2. 参考文献条目编号定义
-    # ========================
-    ref_config = getattr(config, "references", None)
-    if (
-        isinstance(ref_config, dict)
-        and ref_config.get("enabled", False)
-        and ref_config.get("template")
-    ):
+    if levels["references"] is not None:
         ref_abstract_num_id = max_abstract_num_id + 1
         ref_num_id = max_num_id + 1
-
-        ref_abstract_num = OxmlElement("w:abstractNum")
-        ref_abstract_num.set(qn("w:abstractNumId"), str(ref_abstract_num_id))
-
-        # 参考文献只有一级（ilvl=0），numFmt 始终为 decimal
-        ref_lvl = _build_numbering_level(None, ref_config, 0, None)
-        ref_abstract_num.append(ref_lvl)
-
-        numbering_elm.append(ref_abstract_num)
-
-        ref_num = OxmlElement("w:num")
-        ref_num.set(qn("w:numId"), str(ref_num_id))
-        ref_abstract_num_id_ref = OxmlElement("w:abstractNumId")
-        ref_abstract_num_id_ref.set(qn("w:val"), str(ref_abstract_num_id))
-        ref_num.append(ref_abstract_num_id_ref)
-        numbering_elm.append(ref_num)
-
+        _append_num_definition(
+            numbering_elm, ref_abstract_num_id, ref_num_id, [levels["references"]]
+        )
         reference_num_id = str(ref_num_id)
         logger.debug(
             f"创建参考文献编号定义: abstractNumId={ref_abstract_num_id}, numId={ref_num_id}"
         )
 
+    index.update(numbering_elm)
     return {"headings": heading_num_map, "references": reference_num_id}
 
 
@@ -2,9 +2,10 @@
 # @Time    : 2026/7/7 12:24
 # @Author  : afish
 # @File    : __init__.py.py
-from .context import FormatContext, PipelineStage
+from .context import FormatContext, PipelineStage, VisitorStage
 
 __all__ = [
     "FormatContext",
     "PipelineStage",
+    "VisitorStage",
 ]
@@ -0,0 +1,317 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/20 00:30
+# @Author  : afish
+# @File    : batch.py
+"""批量处理：用一个常驻进程池处理整个目录的论文（gj / cf / af）。
+
+逐篇调用 wordf 时，每篇都要付出解释器启动、模型加载和配置解析的开销。这里改为固定的 N 个工作进程，
+每个进程在初始化时加载一次分类模型和编译配置，之后依次处理分到的文档：
+
+    - 文档按 chunk_size 篇一组提交。同组中需要生成结构 JSON 的文档合并推理（见 base.classify_documents），
+      一个推理批次可以跨文档
+    - cf / af 先取输出目录中已有的 <文件名>.json，没有时先分类生成
+    - 某篇失败只记入汇总，不影响其余文档；工作进程崩溃时该组文档记为失败
+
+输出目录中已有对应产物（gj 为 <文件名>.json，cf / af 为标注版 / 修改版文档）的文档默认跳过，
+中断后重新运行即可续跑。每篇的耗时、错误数和失败原因写入汇总文件（CSV 或 JSON）。
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+from wordformat.log_config import logger
+from wordformat.style.issues import IssueCollector
+from wordformat.utils import ensure_directory_exists, get_file_name
+
+from .context import FormatContext
+from .orchestrate import run_thesis_pipeline
+
+MODES = ("gj", "cf", "af")
+# 每组提交的文档数：同组文档合并推理，组越大推理批次越满，失败重试的粒度也越粗
+CHUNK_SIZE = 4
+
+
+class DocumentResult(NamedTuple):
+    """一篇文档的处理结果（汇总文件的一行）。"""
+
+    document: str
+    status: str  # done / skipped / failed
+    output: str = ""
+    paragraphs: int = 0
+    errors: int = 0
+    notices: int = 0
+    classify_ms: float = 0.0  # 合并推理时按段落数分摊
+    format_ms: float = 0.0
+    total_ms: float = 0.0
+    error: str = ""
+
+
+def find_documents(input_dir) -> list[Path]:
+    """目录下待处理的 .docx（按文件名排序），跳过 Word 临时文件和本工具的输出。"""
+    return sorted(
+        path
+        for path in Path(input_dir).glob("*.docx")
+        if not path.name.startswith("~$")
+        and not path.stem.endswith(("--标注版", "--修改版"))
+    )
+
+
+def json_path_for(docx: Path, out_dir) -> Path:
+    return Path(out_dir) / f"{get_file_name(str(docx))}.json"
+
+
+def output_path_for(docx: Path, mode: str, out_dir) -> Path:
+    """该模式下文档的最终产物路径（与 DocumentSavingStage 的命名一致）。"""
+    if mode == "gj":
+        return json_path_for(docx, out_dir)
+    suffix = "--标注版.docx" if mode == "cf" else "--修改版.docx"
+    return Path(out_dir) / f"{get_file_name(str(docx))}{suffix}"
+
+
+# 工作进程状态：配置路径（编译配置已在初始化时放入进程内缓存）
+_worker_config = None
+
+
+def _init_worker(configpath: str | None, need_model: bool) -> None:
+    """进程池初始化：加载编译配置和（需要分类时）分类模型，之后处理的每篇文档都复用。"""
+    global _worker_config
+    from wordformat.config.compiled import compile_config
+
+    _worker_config = configpath
+    if configpath:
+        compile_config(configpath)
+    if not need_model:
+        return
+    try:
+        from wordformat.agent.onnx_infer import _load_model
+
+        _load_model()
+    except Exception as e:
+        # 真正分类时由对应文档报错并记入汇总
+        logger.warning(f"分类模型加载失败: {e}")
+
+
+def _classify(docs: list[Path], out_dir) -> dict[Path, tuple[float, str]]:
+    """为 docs 合并推理并写出结构 JSON，返回每篇的 (分摊耗时 ms, 错误信息)。"""
+    from wordformat.base import DocxBase, classify_documents
+
+    outcome: dict[Path, tuple[float, str]] = {}
+    bases = {}
+    for path in docs:
+        try:
+            bases[path] = DocxBase(str(path), _worker_config)
+        except Exception as e:
+            outcome[path] = (0.0, f"读取失败: {type(e).__name__}: {e}")
+    if not bases:
+        return outcome
+
+    t0 = time.perf_counter()
+    try:
+        results = classify_documents(list(bases.values()))
+    except Exception as e:
+        # 合并推理失败时逐篇重试，只让出错的那篇失败
+        logger.warning(f"合并推理失败，逐篇重试: {e}")
+        groups = _classify_each(bases, outcome)
+    else:
+        groups = [(list(bases), results, (time.perf_counter() - t0) * 1000)]
+
+    for paths, results, elapsed in groups:
+        # 合并推理的耗时按段落数分摊到各篇
+        total = sum(len(data) for data in results) or 1
+        for path, data in zip(paths, results, strict=True):
+            try:
+                with open(json_path_for(path, out_dir), "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=4)
+            except OSError as e:
+                outcome[path] = (0.0, f"写入结构 JSON 失败: {e}")
+                continue
+            outcome[path] = (elapsed * len(data) / total, "")
+    return outcome
+
+
+def _classify_each(bases: dict, outcome: dict) -> list[tuple[list[Path], list, float]]:
+    """逐篇推理，返回成功的 [([path], 结果, 耗时 ms)]；失败的文档记入 outcome。"""
+    from wordformat.base import classify_documents
+
+    groups = []
+    for path, base in bases.items():
+        t0 = time.perf_counter()
+        try:
+            results = classify_documents([base])
+        except Exception as e:
+            elapsed = (time.perf_counter() - t0) * 1000
+            outcome[path] = (elapsed, f"分类失败: {type(e).__name__}: {e}")
+        else:
+            groups.append(([path], results, (time.perf_counter() - t0) * 1000))
+    return groups
+
+
+def _process_chunk(docs: list[Path], mode: str, out_dir: str) -> list[DocumentResult]:
+    """在工作进程中处理一组文档。"""
+    t_start = time.perf_counter()
+    pending = [
+        path
+        for path in docs
+        if mode == "gj" or not json_path_for(path, out_dir).exists()
+    ]
+    classified = _classify(pending, out_dir)
+
+    results = []
+    for path in docs:
+        t0 = time.perf_counter()
+        classify_ms, error = classified.get(path, (0.0, ""))
+        row = DocumentResult(
+            str(path), "failed", classify_ms=round(classify_ms, 1), error=error
+        )
+        if not error:
+            json_path = json_path_for(path, out_dir)
+            try:
+                paragraphs = len(json.loads(json_path.read_text(encoding="utf-8")))
+                row = row._replace(
+                    status="done", output=str(json_path), paragraphs=paragraphs
+                )
+                if mode != "gj":
+                    ctx = FormatContext(
+                        docx_path=str(path),
+                        json_path=str(json_path),
+                        config_path=_worker_config,
+                        save_dir=out_dir,
+                        check=mode == "cf",
+                        check_cache=False,
+                    )
+                    ctx = run_thesis_pipeline(ctx, workers=1)
+                    stats = IssueCollector.for_document(ctx.document).stats
+                    row = row._replace(
+                        output=ctx.output_path,
+                        errors=stats.get("错误", 0),
+                        notices=stats.get("提醒", 0),
+                        format_ms=round((time.perf_counter() - t0) * 1000, 1),
+                    )
+            except Exception as e:
+                row = row._replace(
+                    status="failed", output="", error=f"{type(e).__name__}: {e}"
+                )
+        results.append(row)
+
+    # 总耗时：分摊的推理时间 + 本篇的检查 / 格式化时间 + 组内其余开销（读取文档等）的均摊
+    overhead = (time.perf_counter() - t_start) * 1000 - sum(
+        r.classify_ms + r.format_ms for r in results
+    )
+    share = max(overhead, 0.0) / len(results)
+    return [
+        r._replace(total_ms=round(r.classify_ms + r.format_ms + share, 1))
+        for r in results
+    ]
+
+
+def run_batch(
+    input_dir,
+    mode: str,
+    configpath: str | None = None,
+    out_dir="output/",
+    workers: int = 1,
+    resume: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[DocumentResult]:
+    """批量处理 input_dir 下的 .docx，按文档顺序返回每篇的结果。
+
+    Args:
+        input_dir: 论文所在目录（不递归）。
+        mode: gj / cf / af。
+        configpath: 格式配置路径，为 None 时使用内置默认配置。
+        out_dir: 输出目录（结构 JSON 与标注版 / 修改版文档）。
+        workers: 工作进程数；1 时在当前进程中依次处理。
+        resume: 为 True 时跳过输出目录中已有产物的文档。
+        chunk_size: 每组提交给工作进程的文档数。
+    """
+    if mode not in MODES:
+        raise ValueError(f"不支持的批量模式: {mode}（可选 {', '.join(MODES)}）")
+    out_dir = str(out_dir)
+    ensure_directory_exists(out_dir)
+    docs = find_documents(input_dir)
+    results: dict[Path, DocumentResult] = {}
+    todo = []
+    for path in docs:
+        output = output_path_for(path, mode, out_dir)
+        if resume and output.exists():
+            results[path] = DocumentResult(str(path), "skipped", output=str(output))
+        else:
+            todo.append(path)
+    logger.info(
+        f"批量 {mode}：共 {len(docs)} 篇，跳过已有输出 {len(docs) - len(todo)} 篇"
+    )
+
+    chunk_size = max(chunk_size, 1)
+    chunks = [todo[i : i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    need_model = mode == "gj" or any(
+        not json_path_for(path, out_dir).exists() for path in todo
+    )
+    done = 0
+
+    def collect(chunk, rows):
+        nonlocal done
+        results.update(zip(chunk, rows, strict=True))
+        done += len(chunk)
+        failed = sum(row.status == "failed" for row in rows)
+        logger.info(
+            f"已处理 {done}/{len(todo)} 篇"
+            + (f"，本组失败 {failed} 篇" if failed else "")
+        )
+
+    if workers <= 1 or len(chunks) <= 1:
+        _init_worker(configpath, need_model)
+        for chunk in chunks:
+            collect(chunk, _process_chunk(chunk, mode, out_dir))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(configpath, need_model),
+        ) as pool:
+            futures = {
+                pool.submit(_process_chunk, chunk, mode, out_dir): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    # 工作进程崩溃等：整组记为失败，续跑时重试
+                    rows = [
+                        DocumentResult(
+                            str(path), "failed", error=f"{type(e).__name__}: {e}"
+                        )
+                        for path in chunk
+                    ]
+                collect(chunk, rows)
+    return [results[path] for path in docs]
+
+
+def write_summary(results: list[DocumentResult], path) -> str:
+    """写出汇总文件：.json 为 {"summary", "documents"}，其余按 CSV 写出（每篇一行）。"""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        summary = {
+            status: sum(r.status == status for r in results)
+            for status in ("done", "skipped", "failed")
+        }
+        summary["errors"] = sum(r.errors for r in results)
+        summary["notices"] = sum(r.notices for r in results)
+        data = {"summary": summary, "documents": [r._asdict() for r in results]}
+        path.write_text(
+            json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
+        )
+    else:
+        # utf-8-sig：Excel 直接打开不乱码
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(DocumentResult._fields)
+            writer.writerows(results)
+    return str(path)
@@ -28,9 +28,21 @@ class FormatContext:
     root_node: FormatNode = None
     config_model: dict = field(default_factory=dict)
     output_path: Path | str = ""
+    # 仅出报告：check 模式下不写批注、不保存文档，结果放在 report
+    report_only: bool = False
+    report: dict | None = None
+    # check 模式的检查缓存（见 pipeline.incremental）：None 按 settings.CHECK_CACHE（默认关闭）决定是否
+    # 使用源文档旁的落盘缓存，True / False 强制启用 / 关闭，也可传入 CheckCache 实例（如内存缓存）
+    check_cache: object = None
 
 
 class PipelineStage(Protocol):
     """pipeline stage"""
 
     def process(self, ctx: FormatContext) -> FormatContext: ...
+
+
+class VisitorStage(PipelineStage, Protocol):
+    """可并入 TreeWalkStage 单次遍历的 stage：在 register 中向 TreeVisitor 注册钩子"""
+
+    def register(self, visitor, ctx: FormatContext) -> None: ...
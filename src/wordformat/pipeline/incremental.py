@@ -0,0 +1,273 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 23:05
+# @Author  : afish
+# @File    : incremental.py
+"""check 模式的增量检查：按段落指纹复用上次的检查结果。
+
+check 不依赖其他段落：一个节点的结果只由以下输入决定，它们合起来就是段落指纹（TreeNode.fingerprint）：
+
+    - 段落的 XML 序列化（内容替换之后）
+    - 节点类、层级和 value（含类别、JSON 指纹，以及遍历注入的章节号 / 题注顺序号）
+    - 文档级定义：样式、编号、主题（样式修正阶段之后）
+    - 配置内容哈希、是否写批注、程序版本
+
+检查前先做一次预遍历（章节号、题注编号、内容替换照常执行），逐节点算指纹：命中缓存的节点直接重放
+上次的问题和批注（见 parallel.apply_result），未命中的节点串行检查，或在多进程时按章节分片检查
+（见 pipeline.parallel）。合并始终按文档顺序进行，结果与完整检查逐字节一致。
+重新检查一篇略有改动的论文时，耗时随改动规模而不是全文规模增长。
+
+缓存默认不启用。显式开启（cf --cache、WORDFORMAT_CHECK_CACHE=1）时落盘为源文档旁的隐藏文件
+.<文件名>.wfcheck（marshal），只保留最近一次检查用到的条目；也可以只放在内存中跨多次检查复用（如监视模式）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+from itertools import groupby
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from lxml import etree
+
+from wordformat._version import __version__
+from wordformat.config.compiled import CompiledConfig
+from wordformat.log_config import logger
+from wordformat.settings import CHECK_CACHE
+from wordformat.style.issues import Issue, IssueCollector
+from wordformat.style.table import FormatTable
+from wordformat.utils._fs import write_bytes_atomic
+
+from .parallel import NodeResult, apply_result, check_node, check_shards
+from .visitor import TreeVisitor
+
+# 缓存格式版本：指纹构成或 NodeResult 结构变化时递增，旧缓存自动失效
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".wfcheck"
+
+# 参与指纹的文档级定义
+_DOCUMENT_PARTS = (RT.STYLES, RT.NUMBERING, RT.THEME)
+
+
+def check_cache(ctx) -> CheckCache | None:
+    """本次 check 使用的检查缓存（按 ctx.check_cache 解析一次并写回 ctx）；不使用时为 None。"""
+    cache = ctx.check_cache
+    if cache is None or cache is True:
+        enabled = CHECK_CACHE if cache is None else True
+        # 落盘缓存需要磁盘上的源文档；从流加载的文档不使用
+        if enabled and is_source_file(ctx.docx_path):
+            cache = CheckCache.for_source(ctx.docx_path)
+        else:
+            cache = False
+        ctx.check_cache = cache
+    return cache if isinstance(cache, CheckCache) else None
+
+
+def cache_path(docx_path) -> str:
+    """检查缓存路径：与源文档同目录的隐藏文件 .<文件名>.wfcheck。"""
+    head, name = os.path.split(os.path.abspath(os.fspath(docx_path)))
+    return os.path.join(head, f".{name}{CACHE_SUFFIX}")
+
+
+def is_source_file(docx_path) -> bool:
+    """docx_path 是否为磁盘上的文件（可供缓存落盘、子进程加载）。"""
+    return isinstance(docx_path, (str, os.PathLike)) and os.path.isfile(docx_path)
+
+
+def _config_digest(config) -> str:
+    if isinstance(config, CompiledConfig):
+        return config.digest
+    text = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def document_scope(document, config, write_comments: bool) -> bytes:
+    """整篇文档共用的指纹前缀：程序版本、配置、是否写批注、样式 / 编号 / 主题定义。"""
+    h = hashlib.sha256(f"{CACHE_VERSION}|{__version__}|{write_comments}|".encode())
+    h.update(_config_digest(config).encode())
+    for reltype in _DOCUMENT_PARTS:
+        try:
+            h.update(document.part.part_related_by(reltype).blob)
+        except KeyError:
+            h.update(b"-")
+    return h.digest()
+
+
+def node_fingerprint(node, scope: bytes) -> str:
+    """节点段落的内容指纹（见模块说明）。"""
+    h = hashlib.sha256(scope)
+    cls = type(node)
+    value = json.dumps(node.value, sort_keys=True, ensure_ascii=False, default=str)
+    h.update(f"{cls.__module__}.{cls.__qualname__}|{node.level}|{value}|".encode())
+    h.update(etree.tostring(node.paragraph._p))
+    return h.hexdigest()
+
+
+def _encode(result: NodeResult) -> tuple:
+    """NodeResult → marshal 可写的基本类型。"""
+    issues = result.issues
+    return (
+        tuple(tuple(issue.to_dict().values()) for issue in issues.issues),
+        dict(issues.stats),
+        result.comments,
+        result.changed,
+    )
+
+
+def _decode(data: tuple) -> NodeResult:
+    issue_rows, stats, comments, changed = data
+    issues = IssueCollector()
+    issues.issues = [Issue(*row) for row in issue_rows]
+    issues.stats = dict(stats)
+    return NodeResult(issues, tuple(comments), changed)
+
+
+class CheckCache:
+    """段落指纹 → NodeResult 的检查缓存。
+
+    path 为 None 时只在内存中保存。每次检查结束调用 commit：只保留本次检查用到（命中或新算出）的条目，
+    缓存大小跟随文档而不会无限增长；有 path 时同时写盘。
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._entries: dict[str, NodeResult] = {}
+        self._current: dict[str, NodeResult] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_source(cls, docx_path) -> CheckCache:
+        """源文档旁的落盘缓存（已有缓存文件时载入）。"""
+        cache = cls(cache_path(docx_path))
+        cache.load()
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> NodeResult | None:
+        result = self._entries.get(fingerprint)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._current[fingerprint] = result
+        return result
+
+    def put(self, fingerprint: str, result: NodeResult) -> None:
+        self._current[fingerprint] = result
+
+    def commit(self) -> None:
+        """结束一次检查：本次用到的条目成为缓存内容，有 path 时写盘。"""
+        self._entries, self._current = self._current, {}
+        if self.path is not None:
+            self.save()
+
+    def load(self) -> None:
+        """从 path 载入；不存在、版本不符或损坏时为空缓存。"""
+        try:
+            with open(self.path, "rb") as f:
+                version, entries = marshal.load(f)
+            if version != CACHE_VERSION:
+                return
+            self._entries = {fp: _decode(data) for fp, data in entries.items()}
+        except (OSError, EOFError, ValueError, TypeError):
+            self._entries = {}
+
+    def save(self) -> None:
+        """写盘；目录不可写时静默跳过。"""
+        payload = marshal.dumps(
+            (
+                CACHE_VERSION,
+                {fp: _encode(result) for fp, result in self._entries.items()},
+            )
+        )
+        try:
+            write_bytes_atomic(self.path, payload)
+        except OSError as e:
+            logger.debug(f"检查缓存写入失败，跳过: {self.path} ({e})")
+
+
+def run_deferred_check(stage, ctx, cache: CheckCache | None = None) -> bool:
+    """在格式遍历之前完成全部 check（stage 为 FormattingExecutionStage）。
+
+    预遍历后按文档顺序处理节点：命中 cache 的重放，其余在多进程时按章节分片检查、否则串行检查。
+    既没有缓存、又不能分片（单进程或没有可供子进程加载的源文件）时什么也不做并返回 False，
+    由调用方照常在遍历中逐节点检查；否则返回 True。
+    """
+    shardable = stage.workers > 1 and is_source_file(ctx.docx_path)
+    if cache is None and not shardable:
+        return False
+
+    document, config = ctx.document, ctx.config_model
+    # 预遍历：章节号、题注编号、内容替换照常执行，check_format 推迟到下面
+    deferred: list[tuple[int, object]] = []
+    visitor = TreeVisitor()
+    stage.register_nodes(visitor, document, config, True, deferred=deferred)
+    visitor.walk(ctx.root_node)
+
+    results = _cached_results(deferred, document, config, cache)
+    hits = len(results)
+    if shardable:
+        results.update(_check_sharded(deferred, results, ctx, stage.workers))
+
+    # 本进程内检查的节点：格式表只为它们建（命中缓存的节点不必抽取）
+    local = [node for _, node in deferred if id(node) not in results]
+    if local and FormatTable.for_obj(document) is None:
+        table = FormatTable()
+        for node in local:
+            table.add_node(node)
+        table.finalize().attach(document)
+
+    _merge_results(deferred, results, document, cache)
+    if cache is not None:
+        logger.info(f"检查缓存：{len(deferred)} 个节点中 {hits} 个复用上次结果")
+        cache.commit()
+    return True
+
+
+def _cached_results(deferred, document, config, cache) -> dict[int, NodeResult]:
+    """为各节点算指纹（记在 node.fingerprint），返回命中缓存的结果 {id(node): NodeResult}。"""
+    results: dict[int, NodeResult] = {}
+    if cache is None:
+        return results
+    write_comments = IssueCollector.for_document(document).write_comments
+    scope = document_scope(document, config, write_comments)
+    for _, node in deferred:
+        node.fingerprint = node_fingerprint(node, scope)
+        hit = cache.get(node.fingerprint)
+        if hit is not None:
+            results[id(node)] = hit
+    return results
+
+
+def _check_sharded(deferred, results, ctx, workers: int) -> dict[int, NodeResult]:
+    """未命中缓存的节点按章节分片、在子进程中检查；不足两片或分片失败的节点不在结果中。"""
+    misses = [(chapter, node) for chapter, node in deferred if id(node) not in results]
+    shards = [
+        [node for _, node in group] for _, group in groupby(misses, key=lambda x: x[0])
+    ]
+    checked: dict[int, NodeResult] = {}
+    if len(shards) < 2:
+        return checked
+    outcomes = check_shards(
+        ctx.document, shards, ctx.config_model, ctx.docx_path, workers
+    )
+    for nodes, shard in zip(shards, outcomes, strict=True):
+        if shard is not None:
+            checked.update(zip(map(id, nodes), shard, strict=True))
+    return checked
+
+
+def _merge_results(deferred, results, document, cache) -> None:
+    """按文档顺序合并，保证批注与问题记录的顺序和串行一致；没有结果的节点在本进程检查。"""
+    for _, node in deferred:
+        result = results.get(id(node))
+        if result is None:
+            result = check_node(node, document)
+        else:
+            apply_result(document, node, result)
+        if cache is not None and result is not None:
+            cache.put(node.fingerprint, result)
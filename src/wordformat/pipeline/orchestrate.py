@@ -8,11 +8,13 @@ from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from wordformat.pipeline import PipelineStage
+    from wordformat.pipeline.incremental import CheckCache
 
 from wordformat.log_config import logger
 from wordformat.pipeline.context import FormatContext
 from wordformat.pipeline.stages import (
     DocumentSavingStage,
+    FormatTableStage,
     FormattingExecutionStage,
     LoadConfigStage,
     LoadDocxStage,
@@ -22,6 +24,7 @@ from wordformat.pipeline.stages import (
     SummaryGenerationStage,
     TreeBuildingStage,
     TreeNormalizationStage,
+    TreeWalkStage,
 )
 from wordformat.pipeline.stages_md import (
     DocumentCreationStage,
@@ -36,6 +39,8 @@ def auto_format_thesis_document(
     configpath: Optional[str] = None,
     savepath: str = "output/",
     check=True,
+    workers: int | None = None,
+    cache: CheckCache | bool | None = None,
 ):
     """自动对学位论文文档进行格式校验与批注。
 
@@ -57,6 +62,12 @@ def auto_format_thesis_document(
         savepath (str): 处理完成后带批注的文档保存路径。
         configpath (Optional[str]): 格式规范配置文件（YAML）路径，支持继承与合并。
                                  为 None 时使用内置默认配置。
+        workers (Optional[int]): check 模式按章节分片并行检查的进程数，
+                                 为 None 时取 WORDFORMAT_CHECK_WORKERS（默认 1，串行）。
+        cache (CheckCache | bool | None): check 模式的检查缓存，未改动段落复用上次结果。
+                                 为 None 时按 WORDFORMAT_CHECK_CACHE（默认关闭）决定是否使用
+                                 源文档旁的 .wfcheck 文件，True / False 强制启用 / 关闭，
+                                 也可传入 CheckCache 实例（如内存缓存）。
 
     Side Effects:
         - 读取 jsonpath、docxpath 和 configpath 指定的文件；
@@ -79,23 +90,80 @@ def auto_format_thesis_document(
         config_path=configpath,
         save_dir=savepath,
         check=check,
+        check_cache=cache,
     )
-    # 2. 组装流水线
+    return run_thesis_pipeline(ctx, workers).output_path
+
+
+def run_thesis_pipeline(
+    ctx: FormatContext, workers: int | None = None
+) -> FormatContext:
+    """对已准备好的上下文执行完整的论文检查 / 格式化流水线（含保存），返回处理后的上下文。
+
+    供需要处理结果（文档对象、问题收集器等）而不只是输出路径的调用方使用，如批量处理。
+    """
     pipeline: list[PipelineStage] = [
         LoadConfigStage(),
         LoadDocxStage(),
         TreeBuildingStage(),
-        ParagraphAlignmentStage(),
-        TreeNormalizationStage(),
+        # 结构遍历：段落对齐 + 子树提升 +（check 模式）格式表抽取
+        TreeWalkStage(
+            ParagraphAlignmentStage(), TreeNormalizationStage(), FormatTableStage()
+        ),
         StyleDefinitionFixStage(),
-        FormattingExecutionStage(),
-        SummaryGenerationStage(),
-        PostProcessingStage(),
+        # 格式遍历：检查/应用格式，同时累加报告统计、收集后处理节点
+        TreeWalkStage(
+            FormattingExecutionStage(workers=workers),
+            SummaryGenerationStage(),
+            PostProcessingStage(),
+        ),
         DocumentSavingStage(),
     ]
     for stage in pipeline:
         ctx = stage.process(ctx)
-    return ctx.output_path
+    return ctx
+
+
+def check_format_report(
+    jsonpath: str | list,
+    docxpath: str,
+    configpath: Optional[str] = None,
+    workers: int | None = None,
+    cache: CheckCache | bool | None = None,
+) -> dict:
+    """仅检查格式并返回结构化报告，不写批注、不保存文档。
+
+    流程与 check 模式的 auto_format_thesis_document 相同，但节点产出的问题只进入
+    每文档的 IssueCollector，不生成批注；跳过后处理和保存阶段。
+    workers、cache 同 auto_format_thesis_document。
+
+    Returns:
+        dict: {"document", "template", "summary", "issues"}，
+        summary 含 total/errors/notices/error_rate/sections，issues 为 Issue.to_dict() 列表。
+    """
+    ctx = FormatContext(
+        docx_path=docxpath,
+        json_path=jsonpath,
+        config_path=configpath,
+        check=True,
+        report_only=True,
+        check_cache=cache,
+    )
+    pipeline: list[PipelineStage] = [
+        LoadConfigStage(),
+        LoadDocxStage(),
+        TreeBuildingStage(),
+        TreeWalkStage(
+            ParagraphAlignmentStage(), TreeNormalizationStage(), FormatTableStage()
+        ),
+        StyleDefinitionFixStage(),
+        TreeWalkStage(
+            FormattingExecutionStage(workers=workers), SummaryGenerationStage()
+        ),
+    ]
+    for stage in pipeline:
+        ctx = stage.process(ctx)
+    return ctx.report
 
 
 def md_to_docx(
@@ -141,8 +209,7 @@ def md_to_docx(
         TreeBuildingStage(),
         DocumentCreationStage(),
         StyleDefinitionFixStage(),
-        FormattingExecutionStage(),
-        PostProcessingStage(),
+        TreeWalkStage(FormattingExecutionStage(), PostProcessingStage()),
     ]
 
     for stage in pipeline:
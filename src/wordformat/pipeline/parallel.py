@@ -0,0 +1,248 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 21:40
+# @Author  : afish
+# @File    : parallel.py
+"""check 模式按章节分片的多进程检查，以及与文档解耦的单节点检查结果。
+
+一级标题下的各章基本互不依赖。父进程先做一次预遍历（见 pipeline.incremental）：注入章节号 /
+题注顺序号、执行内容替换，并按文档顺序收集待检查节点，章节号和题注编号因此与串行完全相同。
+每章节点连同段落 XML 发给进程池；子进程在自己的文档副本上执行 check_format，不触碰父进程的文档，
+逐节点回传 NodeResult：
+
+    - 问题记录与错误统计（IssueCollector）
+    - 批注记录，锚点换成「段内第几个 w:r」
+    - 检查过程中被改动的段落 XML（如摘要节点清理换行），未改动为 None
+
+父进程按文档顺序用 apply_result 合并：先写回改动的段落，再接入问题、统计和批注记录。批注顺序、
+题注编号和错误统计与串行检查一致。子进程的文档副本由原 docx 加载，再换上父进程当前的样式 /
+编号定义；某一章在子进程中失败时，该章由调用方回退到父进程串行检查（报错行为与串行相同）。
+NodeResult 同时是检查缓存（见 pipeline.incremental）的存储单位。
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+from docx.oxml.parser import parse_xml
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from wordformat.config.loader import get_config, use_config
+from wordformat.log_config import logger
+from wordformat.style.comment_writer import CommentRecord, CommentWriter
+from wordformat.style.issues import IssueCollector
+from wordformat.style.table import FormatTable
+from wordformat.utils import invalidate_snapshot
+
+# 子进程需要与父进程保持一致的文档级定义（样式修正阶段可能已改动）
+_SHARED_PARTS = (RT.STYLES, RT.NUMBERING)
+
+
+class NodeResult(NamedTuple):
+    """一个节点的 check 结果，与所在文档解耦：可跨进程传递，也可存入检查缓存后重放。"""
+
+    issues: IssueCollector  # 该节点登记的问题与按批注计的统计
+    comments: tuple  # (首 w:r 序号, 末 w:r 序号, 各行文本, 严重度, 作者, 缩写)
+    changed: bytes | None  # 检查改动过段落时为检查后的段落 XML
+
+
+def check_node(node, document) -> NodeResult | None:
+    """执行节点的 check_format，并把本节点的产出整理为 NodeResult。
+
+    产出照常进入文档的收集器 / 写入器，段落改动照常留在文档中；批注锚点不在本段落内时
+    结果无法脱离文档重放，返回 None。
+    """
+    p = node.paragraph._p
+    collector = IssueCollector.for_document(document)
+    writer = CommentWriter.for_document(document)
+    before = etree.tostring(p)
+    n_issues, stats, n_records = (
+        len(collector.issues),
+        dict(collector.stats),
+        writer.pending,
+    )
+    node.check_format(document)
+
+    issues = IssueCollector(collector.write_comments)
+    issues.issues = collector.issues[n_issues:]
+    issues.stats = {
+        key: count - stats.get(key, 0) for key, count in collector.stats.items()
+    }
+    positions = {r: i for i, r in enumerate(p.iter(qn("w:r")))}
+    comments = []
+    for record in writer.since(n_records):
+        first, last = positions.get(record.first), positions.get(record.last)
+        if first is None or last is None:
+            return None
+        comments.append((first, last, *record[2:]))
+    after = etree.tostring(p)
+    return NodeResult(issues, tuple(comments), None if after == before else after)
+
+
+def _replace_paragraph(p, xml: bytes) -> None:
+    """用检查后的内容原地替换段落（保留元素本身，节点引用和缓存位置不变）。"""
+    new = parse_xml(xml)
+    p.attrib.clear()
+    p.attrib.update(new.attrib)
+    p[:] = list(new)
+    invalidate_snapshot(p)
+
+
+def apply_result(document, node, result: NodeResult) -> None:
+    """把不在本文档上产生的检查结果并入：写回改动的段落，接入问题、统计和批注。"""
+    p = node.paragraph._p
+    if result.changed is not None:
+        _replace_paragraph(p, result.changed)
+    collector = IssueCollector.for_document(document)
+    collector.merge(result.issues)
+    if not result.comments or not collector.write_comments:
+        return
+    runs = list(p.iter(qn("w:r")))
+    CommentWriter.for_document(document).extend(
+        CommentRecord(runs[first], runs[last], *rest)
+        for first, last, *rest in result.comments
+    )
+
+
+class ShardJob(NamedTuple):
+    """一个待检查节点：节点类、value、层级、期待规则和段落 XML。"""
+
+    cls: type
+    value: object
+    level: int | float
+    expected_rule: object
+    xml: bytes
+
+
+# 子进程状态：文档副本（body 只保留 sectPr）与节点使用的配置
+_worker_document = None
+_worker_config = None
+
+
+def _init_worker(docx_path: str, parts: dict[str, bytes], current, config) -> None:
+    """进程池初始化：加载文档副本，换上父进程的样式 / 编号定义，设置当前配置。
+
+    current 为父进程的当前配置（警告开关等由此读取），config 为节点 load_config 使用的配置。
+    """
+    global _worker_document, _worker_config
+    document = Document(docx_path)
+    for reltype, xml in parts.items():
+        try:
+            document.part.part_related_by(reltype)._element = parse_xml(xml)
+        except KeyError:
+            continue
+    body = document.element.body
+    for child in list(body):
+        if child.tag != qn("w:sectPr"):
+            body.remove(child)
+    use_config(current)
+    _worker_document, _worker_config = document, config
+
+
+def _check_shard(jobs: list[ShardJob], write_comments: bool) -> list[NodeResult]:
+    """在文档副本上检查一章的节点，按顺序返回各节点的 NodeResult。"""
+    document, config = _worker_document, _worker_config
+    part = document.part
+    body = document.element.body
+    anchor = body[-1] if len(body) and body[-1].tag == qn("w:sectPr") else None
+    part._wf_issues = IssueCollector(write_comments)
+    part._wf_comment_writer = CommentWriter(part)
+
+    elements, nodes = [], []
+    for job in jobs:
+        p = parse_xml(job.xml)
+        if anchor is not None:
+            anchor.addprevious(p)
+        else:
+            body.append(p)
+        node = job.cls(
+            value=job.value,
+            level=job.level,
+            paragraph=Paragraph(p, document._body),
+            expected_rule=job.expected_rule,
+        )
+        node.load_config(config)
+        elements.append(p)
+        nodes.append(node)
+    try:
+        # 与父进程相同：check 模式先向量化比对，逐节点只对不一致的行做 diff
+        table = FormatTable()
+        for node in nodes:
+            table.add_node(node)
+        table.finalize().attach(document)
+        results = []
+        for node in nodes:
+            result = check_node(node, document)
+            if result is None:
+                raise RuntimeError(f"{node} 的批注锚点不在本段落内")
+            results.append(result)
+        if len(body) != len(elements) + (anchor is not None):
+            raise RuntimeError("检查改动了分片段落之外的文档内容")
+        return results
+    finally:
+        FormatTable.detach(document)
+        del part._wf_issues, part._wf_comment_writer
+        for p in elements:
+            body.remove(p)
+
+
+def _shared_parts(document) -> dict[str, bytes]:
+    parts = {}
+    for reltype in _SHARED_PARTS:
+        try:
+            parts[reltype] = etree.tostring(
+                document.part.part_related_by(reltype).element
+            )
+        except KeyError:
+            continue
+    return parts
+
+
+def check_shards(
+    document, shards: list[list], config, docx_path: str, workers: int
+) -> list[list[NodeResult] | None]:
+    """用 workers 个进程检查各分片（每片为一章按文档顺序的节点），结果与 shards 一一对应。
+
+    只计算、不合并，由调用方按文档顺序 apply_result；某片在子进程中失败时对应位置为 None。
+    """
+    try:
+        current = get_config()
+    except RuntimeError:
+        current = None
+    write_comments = IssueCollector.for_document(document).write_comments
+    workers = min(workers, len(shards))
+    logger.info(f"按章节分片并行检查：{len(shards)} 个分片，{workers} 个进程")
+    results: list[list[NodeResult] | None] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(str(docx_path), _shared_parts(document), current, config),
+    ) as pool:
+        futures = [
+            pool.submit(
+                _check_shard,
+                [
+                    ShardJob(
+                        type(node),
+                        node.value,
+                        node.level,
+                        node.expected_rule,
+                        etree.tostring(node.paragraph._p),
+                    )
+                    for node in nodes
+                ],
+                write_comments,
+            )
+            for nodes in shards
+        ]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning(f"分片检查失败，该章回退为串行检查: {e}")
+                results.append(None)
+    return results
@@ -7,10 +7,13 @@ from pathlib import Path
 
 from docx import Document
 from docx.document import Document as DocumentObject
+from docx.oxml.ns import qn
 from docx.shared import Pt, RGBColor
+from docx.styles import BabelFish
+from docx.text.paragraph import Paragraph
 
 from wordformat.config.loader import load_config
-from wordformat.hyperlinks import create_citation_hyperlinks
+from wordformat.hyperlinks import link_citations
 from wordformat.log_config import logger
 from wordformat.rules.abstract import (
     AbstractContentCN,
@@ -18,13 +21,14 @@ from wordformat.rules.abstract import (
     AbstractTitleCN,
     AbstractTitleEN,
 )
+from wordformat.rules.body import BodyText
 from wordformat.rules.caption import CaptionFigure, CaptionTable
 from wordformat.rules.keywords import KeywordsCN, KeywordsEN
 from wordformat.rules.node import FormatNode
 from wordformat.rules.references import ReferenceEntry, References
-from wordformat.settings import VOIDNODELIST
+from wordformat.settings import CHECK_WORKERS, VOIDNODELIST
 from wordformat.structure.document_builder import DocumentBuilder
-from wordformat.structure.utils import promote_bodytext_in_subtrees_of_type
+from wordformat.style.comment_writer import flush_comments
 from wordformat.style.defs import (
     Alignment,
     FirstLineIndent,
@@ -38,6 +42,11 @@ from wordformat.style.defs import (
     SpaceBefore,
     ensure_style_exists,
 )
+from wordformat.style.inheritance import StyleResolver
+from wordformat.style.issues import IssueCollector
+from wordformat.style.memo import DiffMemo
+from wordformat.style.table import FormatTable
+from wordformat.style.template_parts import TemplateParts, style_index
 from wordformat.style.writer import (
     SetFirstLineIndent,
     SetIndent,
@@ -51,10 +60,13 @@ from wordformat.utils import (
     ensure_directory_exists,
     get_file_name,
     has_chinese,
+    paragraph_snapshot,
     parse_caption_text,
 )
 
-from .context import FormatContext
+from .context import FormatContext, VisitorStage
+from .incremental import check_cache, run_deferred_check
+from .visitor import TreeVisitor
 
 
 class LoadConfigStage:
@@ -94,42 +106,102 @@ class TreeBuildingStage:
         return ctx
 
 
-class ParagraphAlignmentStage:
-    """展平树并对齐段落 pipline"""
+class TreeWalkStage:
+    """把若干阶段的逐节点工作合并为一次树遍历（见 pipeline.visitor）。
+
+    各阶段在 register 中按节点类型注册钩子和收尾工作，这里只遍历一次整棵树。
+    """
+
+    def __init__(self, *stages: VisitorStage):
+        self.stages = stages
 
     def process(self, ctx: FormatContext) -> FormatContext:
-        nodes = self._flatten_tree_nodes(ctx.root_node)
-        for node, para in zip(nodes, ctx.document.paragraphs, strict=False):
-            node.paragraph = para
+        visitor = TreeVisitor()
+        for stage in self.stages:
+            stage.register(visitor, ctx)
+        visitor.walk(ctx.root_node)
         return ctx
 
-    def _flatten_tree_nodes(self, root_node):
-        """DFS 前序遍历展平树中所有节点（排除虚拟根节点），顺序与文档段落一致。"""
-        result = []
 
-        def dfs(node):
-            for child in node.children:
-                result.append(child)
-                dfs(child)
+class ParagraphAlignmentStage:
+    """展平树并对齐段落 pipline"""
+
+    def register(self, visitor: TreeVisitor, ctx: FormatContext) -> None:
+        # 遍历顺序（DFS 前序，不含根节点）与文档段落顺序一致，依次取下一个段落
+        paragraphs = iter(ctx.document.paragraphs)
 
-        dfs(root_node)
-        return result
+        def align(node, parent):
+            if parent is None:
+                return
+            para = next(paragraphs, None)
+            if para is not None:
+                node.paragraph = para
+
+        visitor.on(object, align)
+
+    def process(self, ctx: FormatContext) -> FormatContext:
+        return TreeWalkStage(self).process(ctx)
 
 
 class TreeNormalizationStage:
     """提升子树（摘要、参考文献）"""
 
+    # (父节点类型, 提升目标类型)：父节点子树中的 BodyText 提升为目标类型，按顺序优先
+    MAPPINGS = (
+        (AbstractTitleCN, AbstractContentCN),
+        (AbstractTitleEN, AbstractContentEN),
+        (References, ReferenceEntry),
+    )
+
+    def register(self, visitor: TreeVisitor, ctx: FormatContext) -> None:
+        """遍历中按祖先类型提升节点，结果与逐类型调用 promote_bodytext_in_subtrees_of_type 相同。"""
+        mappings = self.MAPPINGS
+        parent_types = tuple(parent_cls for parent_cls, _ in mappings)
+        # 有子节点的节点 id → 它及其祖先命中的映射序号（升序）
+        scopes: dict[int, tuple[int, ...]] = {}
+
+        def promote(node, parent):
+            hits = scopes.get(id(parent), ())
+            if hits and isinstance(node, BodyText):
+                for i in hits:
+                    if isinstance(node, BodyText):
+                        node.__class__ = mappings[i][1]
+            if isinstance(node, parent_types):
+                own = tuple(
+                    i
+                    for i, parent_cls in enumerate(parent_types)
+                    if i not in hits and isinstance(node, parent_cls)
+                )
+                hits = tuple(sorted(hits + own))
+            if hits and node.children:
+                scopes[id(node)] = hits
+
+        visitor.on(object, promote)
+        visitor.on_finish(scopes.clear)
+
     def process(self, ctx: FormatContext) -> FormatContext:
-        mappings = {
-            AbstractTitleCN: AbstractContentCN,
-            AbstractTitleEN: AbstractContentEN,
-            References: ReferenceEntry,
-        }
-        for parent_cls, target_cls in mappings.items():
-            promote_bodytext_in_subtrees_of_type(
-                ctx.root_node, parent_type=parent_cls, target_type=target_cls
-            )
-        return ctx
+        return TreeWalkStage(self).process(ctx)
+
+
+class FormatTableStage:
+    """check 模式：遍历中逐节点抽取格式表行，结束时向量化比对并挂到文档上（见 style.table）"""
+
+    def register(self, visitor: TreeVisitor, ctx: FormatContext) -> None:
+        # 启用检查缓存时只为未命中缓存的节点建表（见 pipeline.incremental），不在这里整篇抽取
+        if not ctx.check or check_cache(ctx) is not None:
+            return
+        table = FormatTable()
+        visitor.on(object, lambda node, parent: table.add_node(node))
+
+        def finish():
+            table.finalize()
+            table.attach(ctx.document)
+            logger.info(table.summary())
+
+        visitor.on_finish(finish)
+
+    def process(self, ctx: FormatContext) -> FormatContext:
+        return TreeWalkStage(self).process(ctx)
 
 
 class StyleDefinitionFixStage:
@@ -279,41 +351,59 @@ class StyleDefinitionFixStage:
         1. 字符格式：中英文字体、字号、颜色（清除主题色）、加粗、斜体、下划线
         2. 段落格式：对齐方式
         3. 确保样式定义存在（不存在则创建）
+
+        修正结果按模板缓存（见 style.template_parts），同一原定义只逐项修正一次。
         """
 
-        style_configs = config_model.collect_style_configs()
+        parts = TemplateParts.for_config(config_model)
+        index = style_index(document)
 
-        for eng_style_name, cfg in style_configs.items():
-            ensure_style_exists(document, eng_style_name)
+        for eng_style_name, cfg in parts.style_configs().items():
 
-            try:
-                style = document.styles[eng_style_name]
-            except KeyError:
-                logger.warning(f"样式 '{eng_style_name}' 创建失败，跳过修正")
-                continue
+            def fix(style, cfg=cfg, name=eng_style_name):
+                self._fix_style_run_properties(style, cfg, name)
+                self._fix_style_paragraph_properties(style, cfg, name)
+
+            elem = index.get(BabelFish.ui2internal(eng_style_name))
+            if elem is None:
+                ensure_style_exists(document, eng_style_name)
+                try:
+                    elem = document.styles[eng_style_name].element
+                except KeyError:
+                    logger.warning(f"样式 '{eng_style_name}' 创建失败，跳过修正")
+                    continue
 
-            self._fix_style_run_properties(style, cfg, eng_style_name)
-            self._fix_style_paragraph_properties(style, cfg, eng_style_name)
+            # 同模板、同原定义的修正结果直接整体替换，不再逐项修正
+            parts.graft_style(elem, eng_style_name, fix)
 
             logger.debug(f"已修正样式定义: {eng_style_name}")
 
     def process(self, ctx: FormatContext) -> FormatContext:
         if not ctx.check:
             self._fix_all_style_definitions(ctx.document, ctx.config_model)
+            # 样式定义已变，丢弃修正前可能缓存的继承链与 diff 结果
+            StyleResolver.invalidate(ctx.document)
+            DiffMemo.invalidate(ctx.document)
         return ctx
 
 
+# 子节点不参与格式化的类别（目录、附录、封面/声明）
+SKIP_CHILDREN_CATEGORIES = {"heading_mulu", "heading_fulu", "other"}
+
+
 class FormattingExecutionStage:
     """执行格式化/检查（核心遍历）"""
 
-    def __init__(self, skip_comments: bool = False):
+    def __init__(self, skip_comments: bool = False, workers: int | None = None):
         self.skip_comments = skip_comments
+        # check 模式按章节分片并行检查的进程数（见 pipeline.parallel）；1 为串行
+        self.workers = CHECK_WORKERS if workers is None else max(workers, 1)
 
     def apply_format_check_to_all_nodes(
         self, root_node: FormatNode, document, config, check=True
     ):
         """
-        递归遍历文档树中的所有节点，
+        遍历文档树中的所有节点，
         对每个具有 check_format 方法的节点执行该方法。
 
         :param root_node: 树的根节点（FormatNode 或其子类实例）
@@ -321,168 +411,220 @@ class FormattingExecutionStage:
         :param config: 配置文件
         :param check: 用来控制是仅检查还是仅修改
         """
-
+        visitor = TreeVisitor()
+        self.register_nodes(visitor, document, config, check)
+        visitor.walk(root_node)
+
+    def register_nodes(
+        self,
+        visitor: TreeVisitor,
+        document,
+        config,
+        check=True,
+        *,
+        deferred: list | None = None,
+    ) -> None:
+        """注册逐节点格式化钩子（章节号、题注编号、检查 / 应用格式）。
+
+        check 模式下给出 deferred 时不在遍历中执行 check_format，而是把 (章号, 节点)
+        按文档顺序追加到 deferred，交给分片并行检查（见 pipeline.parallel）。
+        """
         chapter_index: int = 0
         figure_counter: dict[int, int] = {}
         table_counter: dict[int, int] = {}
+        # 有子节点的节点 id → (类别, 所在章号, 是否在跳过的子树内)
+        frames: dict[int, tuple[str, int, bool]] = {}
 
-        def traverse(node, parent_category="", current_chapter: int = 0):
+        def visit(node, parent):
             nonlocal chapter_index
 
+            if parent is None:
+                parent_category, current_chapter, skipped = "", 0, False
+            else:
+                parent_category, current_chapter, skipped = frames[id(parent)]
+                # 目录、附录、封面/声明的子节点跳过格式化
+                skipped = skipped or parent_category in SKIP_CHILDREN_CATEGORIES
+
             category = (
                 node.value.get("category", "") if isinstance(node.value, dict) else ""
             )
 
             # 遇到一级标题时递增章节号
-            if category == "heading_level_1":
+            if category == "heading_level_1" and not skipped:
                 chapter_index += 1
                 current_chapter = chapter_index
+            if node.children:
+                frames[id(node)] = (category, current_chapter, skipped)
+            if skipped or not hasattr(node, "check_format"):
+                return
 
-            if hasattr(node, "check_format"):
-                try:
-                    # top 节点直接关联的 body_text 不参与格式化（如封面页、原创性声明等）
-                    # 但间接关联的 body_text（作为 heading 子节点）正常格式化
-                    is_top_direct_body_text = (
-                        parent_category == "top" and category == "body_text"
-                    )
-                    if category not in VOIDNODELIST and not is_top_direct_body_text:
-                        node.load_config(config)
-
-                        # 对题注节点注入章节号和顺序号
-                        if isinstance(node, (CaptionFigure, CaptionTable)):
-                            # 检查是否为续表/续图：保留原标题注编号，不递增计数器
-                            text = node.paragraph.text.strip() if node.paragraph else ""
-                            parsed = parse_caption_text(text)
-                            if (
-                                parsed
-                                and parsed.get("is_continued")
-                                and parsed.get("chapter_num") is not None
-                                and parsed.get("number_num") is not None
-                            ):
-                                chapter = parsed["chapter_num"]
-                                seq = parsed["number_num"]
-                            else:
-                                chapter = current_chapter if current_chapter > 0 else 0
-                                if isinstance(node, CaptionFigure):
-                                    counter = figure_counter
-                                else:
-                                    counter = table_counter
-                                counter[chapter] = counter.get(chapter, 0) + 1
-                                seq = counter[chapter]
-                            node.value["chapter_number"] = chapter
-                            node.value["sequence_number"] = seq
-
-                        # 给所有节点注入章节号（BodyText 引用上标需要）
-                        if isinstance(node.value, dict):
-                            node.value.setdefault("chapter_number", current_chapter)
-
-                        if node.paragraph:
-                            # 先执行内容替换（check/format 两种模式均执行）
-                            node.apply_replace(document)
-                            if check:
-                                node.check_format(document)
-                            elif self.skip_comments:
-                                node.apply_style(document)
+            try:
+                # top 节点直接关联的 body_text 不参与格式化（如封面页、原创性声明等）
+                # 但间接关联的 body_text（作为 heading 子节点）正常格式化
+                is_top_direct_body_text = (
+                    parent_category == "top" and category == "body_text"
+                )
+                if category not in VOIDNODELIST and not is_top_direct_body_text:
+                    node.load_config(config)
+
+                    # 对题注节点注入章节号和顺序号
+                    if isinstance(node, (CaptionFigure, CaptionTable)):
+                        # 检查是否为续表/续图：保留原标题注编号，不递增计数器
+                        text = node.paragraph.text.strip() if node.paragraph else ""
+                        parsed = parse_caption_text(text)
+                        if (
+                            parsed
+                            and parsed.get("is_continued")
+                            and parsed.get("chapter_num") is not None
+                            and parsed.get("number_num") is not None
+                        ):
+                            chapter = parsed["chapter_num"]
+                            seq = parsed["number_num"]
+                        else:
+                            chapter = current_chapter if current_chapter > 0 else 0
+                            if isinstance(node, CaptionFigure):
+                                counter = figure_counter
                             else:
-                                node.apply_format(document)
-                except Exception as e:
-                    logger.warning(f"Node {node} not format, because: {str(e)}")
-                    raise e
-
-            # 目录、附录、封面/声明的子节点跳过格式化
-            SKIP_CHILDREN_CATEGORIES = {"heading_mulu", "heading_fulu", "other"}
-            if category not in SKIP_CHILDREN_CATEGORIES:
-                for child in node.children:
-                    traverse(
-                        child, parent_category=category, current_chapter=current_chapter
-                    )
+                                counter = table_counter
+                            counter[chapter] = counter.get(chapter, 0) + 1
+                            seq = counter[chapter]
+                        node.value["chapter_number"] = chapter
+                        node.value["sequence_number"] = seq
+
+                    # 给所有节点注入章节号（BodyText 引用上标需要）
+                    if isinstance(node.value, dict):
+                        node.value.setdefault("chapter_number", current_chapter)
+
+                    if node.paragraph:
+                        # 先执行内容替换（check/format 两种模式均执行）
+                        node.apply_replace(document)
+                        if check and deferred is not None:
+                            deferred.append((current_chapter, node))
+                        elif check:
+                            node.check_format(document)
+                        elif self.skip_comments:
+                            node.apply_style(document)
+                        else:
+                            node.apply_format(document)
+            except Exception as e:
+                logger.warning(f"Node {node} not format, because: {str(e)}")
+                raise e
 
-        traverse(root_node)
+        visitor.on(object, visit)
+        visitor.on_finish(frames.clear)
 
-    def process(self, ctx: FormatContext) -> FormatContext:
+    def register(self, visitor: TreeVisitor, ctx: FormatContext) -> None:
+        document = ctx.document
+        cache = check_cache(ctx) if ctx.check else None
         if ctx.check:
-            FormatNode.reset_stats()
-        self.apply_format_check_to_all_nodes(
-            ctx.root_node, ctx.document, ctx.config_model, ctx.check
-        )
-        return ctx
+            collector = IssueCollector.for_document(document)
+            collector.write_comments = not ctx.report_only
+            # check 模式：整篇格式表先向量化比对，遍历时只对不一致的行做 diff。
+            # 通常已由 FormatTableStage 在结构遍历中构建，单独使用本阶段时在这里构建；
+            # 启用检查缓存时由 run_deferred_check 只为未命中的节点建表
+            if cache is None and FormatTable.for_obj(document) is None:
+                table = FormatTable.build(ctx.root_node)
+                table.attach(document)
+                logger.info(table.summary())
+            visitor.on_cleanup(lambda: FormatTable.detach(document))
+        # 检查缓存 / 多进程分片时 check 在遍历前完成（见 pipeline.incremental），本次遍历不再逐节点检查；
+        # 二者都不可用时照常在遍历中检查
+        deferred = ctx.check and run_deferred_check(self, ctx, cache)
+        if not deferred:
+            self.register_nodes(visitor, document, ctx.config_model, ctx.check)
+        if not ctx.check or not ctx.report_only:
+            # 节点批注在遍历中只登记，这里一次写入 comments.xml
+            visitor.on_finish(lambda: flush_comments(document))
+
+    def process(self, ctx: FormatContext) -> FormatContext:
+        return TreeWalkStage(self).process(ctx)
 
 
 class SummaryGenerationStage:
     """生成检测报告摘要（仅 check 模式）"""
 
-    def _build_check_summary(self, root_node, document, config_model) -> str:
-        """遍历树和错误统计，生成检测报告摘要文本。"""
-        stats = FormatNode._error_stats
-        total = stats["total"]
-
-        # 遍历树，收集文档级统计
-
-        def _collect_section(node, sections):
-            cls_name = type(node).__name__
-            para = node.paragraph
-            if para and para.text.strip():
-                text = para.text.strip()
-                if cls_name == "AbstractContentCN":
-                    cn_chars = count_chinese_chars(text)
-                    if cn_chars:
-                        sections["abstract_cn_chars"] = (
-                            sections.get("abstract_cn_chars", 0) + cn_chars
-                        )
-                elif cls_name == "AbstractContentEN":
-                    sections["abstract_en_words"] = sections.get(
-                        "abstract_en_words", 0
-                    ) + len(text.split())
-                elif cls_name == "KeywordsCN":
-                    kws = KeywordsCN.extract_keywords(text)
-                    if kws:
-                        sections["keyword_cn_count"] = len(kws)
-                elif cls_name == "KeywordsEN":
-                    kws = KeywordsEN.extract_keywords(text)
-                    if kws:
-                        sections["keyword_en_count"] = len(kws)
-                elif cls_name == "ReferenceEntry":
-                    if has_chinese(text):
-                        sections["ref_cn"] = sections.get("ref_cn", 0) + 1
-                    else:
-                        sections["ref_en"] = sections.get("ref_en", 0) + 1
-            # 处理混合节点：AbstractTitleContentCN/EN 的子 BodyText 是摘要正文
-            if cls_name == "AbstractTitleContentCN":
-                for child in node.children:
-                    cp = child.paragraph
-                    if cp and cp.text.strip():
-                        cnt = count_chinese_chars(cp.text.strip())
-                        sections["abstract_cn_chars"] = (
-                            sections.get("abstract_cn_chars", 0) + cnt
-                        )
-            elif cls_name == "AbstractTitleContentEN":
-                for child in node.children:
-                    cp = child.paragraph
-                    if cp and cp.text.strip():
-                        cnt = len(cp.text.strip().split())
-                        sections["abstract_en_words"] = (
-                            sections.get("abstract_en_words", 0) + cnt
-                        )
-            for child in node.children:
-                _collect_section(child, sections)
+    def _count_section(self, node, parent, text: str, sections: dict) -> None:
+        """按节点段落文本 text（已去首尾空白）累加文档级统计（摘要字数、关键词数、参考文献条数）。"""
+        if not text:
+            return
+        # 处理混合节点：AbstractTitleContentCN/EN 的子节点是摘要正文
+        parent_name = type(parent).__name__ if parent is not None else ""
+        if parent_name == "AbstractTitleContentCN":
+            sections["abstract_cn_chars"] = sections.get(
+                "abstract_cn_chars", 0
+            ) + count_chinese_chars(text)
+        elif parent_name == "AbstractTitleContentEN":
+            sections["abstract_en_words"] = sections.get("abstract_en_words", 0) + len(
+                text.split()
+            )
 
-        sections: dict = {}
-        _collect_section(root_node, sections)
+        cls_name = type(node).__name__
+        if cls_name == "AbstractContentCN":
+            cn_chars = count_chinese_chars(text)
+            if cn_chars:
+                sections["abstract_cn_chars"] = (
+                    sections.get("abstract_cn_chars", 0) + cn_chars
+                )
+        elif cls_name == "AbstractContentEN":
+            sections["abstract_en_words"] = sections.get("abstract_en_words", 0) + len(
+                text.split()
+            )
+        elif cls_name == "KeywordsCN":
+            kws = KeywordsCN.extract_keywords(text)
+            if kws:
+                sections["keyword_cn_count"] = len(kws)
+        elif cls_name == "KeywordsEN":
+            kws = KeywordsEN.extract_keywords(text)
+            if kws:
+                sections["keyword_en_count"] = len(kws)
+        elif cls_name == "ReferenceEntry":
+            if has_chinese(text):
+                sections["ref_cn"] = sections.get("ref_cn", 0) + 1
+            else:
+                sections["ref_en"] = sections.get("ref_en", 0) + 1
+
+    def _build_report(
+        self, document, config_model, sections: dict, total_chars: int
+    ) -> dict:
+        """由问题收集器和遍历中累加的统计生成检测报告（摘要统计 + 全部问题）。
+
+        total_chars 为正文段落（非空白段）的总字符数，用于计算万字差错率。
+        """
+        collector = IssueCollector.for_document(document)
+        stats = collector.stats
+        total = stats["total"]
 
         # 计算万字差错率
-        total_chars = sum(
-            len(p.text) for p in document.paragraphs if p.text and p.text.strip()
-        )
         error_rate = (total / max(total_chars, 1)) * 10000 if total else 0
 
         # 模板名（从 config 读取）
         template_name = getattr(config_model, "template_name", None) or "未知模板"
 
+        return {
+            "template": template_name,
+            "summary": {
+                "total": total,
+                "errors": stats.get("错误", 0),
+                "notices": stats.get("提醒", 0),
+                "error_rate": round(error_rate, 1),
+                "sections": sections,
+            },
+            "issues": collector.to_list(),
+        }
+
+    def _build_check_summary(
+        self, document, config_model, sections: dict, total_chars: int
+    ) -> str:
+        """生成检测报告摘要文本（批注形式）。"""
+        report = self._build_report(document, config_model, sections, total_chars)
+        summary = report["summary"]
+        sections = summary["sections"]
+
         lines = [
             "检测结果：",
-            f"检测模板：《{template_name}》",
-            f"检测错误数：{total}，万字差错率：{error_rate:.1f}",
-            f"错误：{stats.get('错误', 0)}，提醒：{stats.get('提醒', 0)}",
+            f"检测模板：《{report['template']}》",
+            f"检测错误数：{summary['total']}，万字差错率：{summary['error_rate']:.1f}",
+            f"错误：{summary['errors']}，提醒：{summary['notices']}",
         ]
 
         # 字数问题
@@ -531,39 +673,96 @@ class SummaryGenerationStage:
             runs=para.runs, text=summary, author="Wordformat", initials="afish"
         )
 
-    def process(self, ctx: FormatContext) -> FormatContext:
-        if ctx.check:
+    def register(self, visitor: TreeVisitor, ctx: FormatContext) -> None:
+        if not ctx.check:
+            return
+        # 文档级统计在格式化遍历中逐节点累加（节点此时已完成内容替换）
+        document = ctx.document
+        sections: dict = {}
+        counted = set()  # 已计入 total_chars 的段落元素
+        total_chars = 0
+
+        def count(node, parent):
+            nonlocal total_chars
+            para = node.paragraph
+            if not para:
+                return
+            text = paragraph_snapshot(para).text
+            stripped = text.strip()
+            self._count_section(node, parent, stripped, sections)
+            if stripped and isinstance(para, Paragraph) and para._p not in counted:
+                counted.add(para._p)
+                total_chars += len(text)
+
+        def finish():
+            nonlocal total_chars
+            # 没有对应节点的正文段落（结构 JSON 未覆盖的部分）补计字符数
+            for p in document.element.body.iterchildren(qn("w:p")):
+                if p not in counted:
+                    text = paragraph_snapshot(Paragraph(p, document._body)).text
+                    if text.strip():
+                        total_chars += len(text)
+            counted.clear()
+
+            memo = getattr(document.part, "_wf_diff_memo", None)
+            if isinstance(memo, DiffMemo):
+                logger.info(memo.summary())
+            if ctx.report_only:
+                report = self._build_report(
+                    document, ctx.config_model, sections, total_chars
+                )
+                ctx.report = {"document": str(ctx.docx_path), **report}
+                return
             summary = self._build_check_summary(
-                ctx.root_node, ctx.document, ctx.config_model
+                document, ctx.config_model, sections, total_chars
             )
             if summary:
-                self._add_summary_comment(ctx.document, summary)
-        return ctx
+                self._add_summary_comment(document, summary)
+
+        visitor.on(object, count)
+        visitor.on_finish(finish)
+
+    def process(self, ctx: FormatContext) -> FormatContext:
+        return TreeWalkStage(self).process(ctx)
 
 
 class PostProcessingStage:
     """后处理（编号 + 超链接，仅 apply 模式）"""
 
-    def process(self, ctx: FormatContext) -> FormatContext:
+    def register(self, visitor: TreeVisitor, ctx: FormatContext) -> None:
         if ctx.check:
-            return ctx
+            return
         config_model = ctx.config_model
-        # 标题编号
+        # 标题编号：遍历中按文档顺序登记标题 / 参考文献段落，结束时批量清除手动编号、写入 numPr
         numbering = config_model.numbering
+        plan = None
         if numbering and getattr(numbering, "enabled", False):
-            from wordformat.numbering import process_heading_numbering
+            from wordformat.numbering import NumberingPlan
 
-            process_heading_numbering(
-                ctx.root_node,
-                ctx.document,
-                numbering,
-                config_model.headings,
-            )
+            plan = NumberingPlan(numbering)
+            visitor.on(object, lambda node, parent: plan.add(node))
 
-        # 引用超链接
-        create_citation_hyperlinks(ctx.root_node, ctx.document)
+        # 按文档顺序收集参考文献条目和正文节点，遍历结束后统一建超链接
+        ref_entries = []
+        body_nodes = []
+        visitor.on(ReferenceEntry, lambda node, parent: ref_entries.append(node))
+        visitor.on(BodyText, lambda node, parent: body_nodes.append(node))
 
-        return ctx
+        def finish():
+            if plan is not None:
+                plan.apply(
+                    ctx.document,
+                    config_model.headings,
+                    TemplateParts.for_config(config_model),
+                )
+
+            # 引用超链接
+            link_citations(ref_entries, body_nodes, ctx.document)
+
+        visitor.on_finish(finish)
+
+    def process(self, ctx: FormatContext) -> FormatContext:
+        return TreeWalkStage(self).process(ctx)
 
 
 class DocumentSavingStage:
@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 20:10
+# @Author  : afish
+# @File    : visitor.py
+"""单次有序遍历的树访问器。
+
+各阶段按节点类型注册钩子 hook(node, parent)，TreeVisitor.walk 以 DFS 前序（即文档顺序）
+遍历整棵树一次，对每个节点按注册顺序调用匹配的钩子；遍历结束后依次调用 on_finish 钩子。
+这样多个阶段的逐节点工作合并在同一次遍历中完成，而不是每个阶段各自递归一遍。
+
+钩子按节点类缓存分派表；钩子改写了节点类型（如子树提升）时，其余钩子按新类型重新分派。
+节点的子节点在该节点全部钩子执行完后才展开，钩子可以调整 children。
+on_cleanup 钩子无论遍历是否出错都会执行，用于撤下遍历期间挂在文档上的临时状态。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from itertools import repeat
+
+Hook = Callable[[object, object], None]
+
+
+class TreeVisitor:
+    """按节点类型分派钩子的 DFS 前序遍历器。"""
+
+    __slots__ = ("_hooks", "_plans", "_finish", "_cleanup")
+
+    def __init__(self):
+        self._hooks: list[tuple[type | tuple[type, ...], Hook]] = []
+        self._plans: dict[type, tuple[tuple[int, Hook], ...]] = {}
+        self._finish: list[Callable[[], None]] = []
+        self._cleanup: list[Callable[[], None]] = []
+
+    def on(self, node_type: type | tuple[type, ...], hook: Hook) -> None:
+        """注册钩子：遍历到 node_type 的实例时调用 hook(node, parent)（根节点的 parent 为 None）。"""
+        self._hooks.append((node_type, hook))
+        self._plans.clear()
+
+    def on_finish(self, hook: Callable[[], None]) -> None:
+        """注册遍历结束后调用的钩子（按注册顺序）。"""
+        self._finish.append(hook)
+
+    def on_cleanup(self, hook: Callable[[], None]) -> None:
+        """注册遍历结束（含出错）时必定调用的清理钩子。"""
+        self._cleanup.append(hook)
+
+    def _plan(self, cls: type) -> tuple[tuple[int, Hook], ...]:
+        plan = self._plans.get(cls)
+        if plan is None:
+            plan = self._plans[cls] = tuple(
+                (i, hook)
+                for i, (types, hook) in enumerate(self._hooks)
+                if issubclass(cls, types)
+            )
+        return plan
+
+    def _redispatch(self, node, parent, index: int) -> None:
+        """钩子改写了节点类型：序号大于 index 的其余钩子按新类型重新分派。"""
+        while True:
+            cls = type(node)
+            for step, hook in self._plan(cls):
+                if step <= index:
+                    continue
+                hook(node, parent)
+                if type(node) is not cls:
+                    # 类型再次改变：从这一步之后按新类型继续
+                    index = step
+                    break
+            else:
+                return
+
+    def walk(self, root) -> None:
+        """从 root（含）开始遍历整棵树，结束后调用 on_finish 钩子，最后调用 on_cleanup 钩子。"""
+        try:
+            if self._hooks:
+                plans = self._plans
+                stack = [(root, None)]
+                while stack:
+                    node, parent = stack.pop()
+                    cls = type(node)
+                    plan = plans.get(cls)
+                    if plan is None:
+                        plan = self._plan(cls)
+                    for index, hook in plan:
+                        hook(node, parent)
+                        if type(node) is not cls:
+                            self._redispatch(node, parent, index)
+                            break
+                    children = getattr(node, "children", None)
+                    if children:
+                        stack.extend(zip(reversed(children), repeat(node)))
+            for hook in self._finish:
+                hook()
+        finally:
+            for hook in self._cleanup:
+                hook()
@@ -0,0 +1,159 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 23:50
+# @Author  : afish
+# @File    : watch.py
+"""监视模式：文档保存后自动重新检查，输出与上一次相比新增 / 已解决的问题。
+
+只靠轮询文件的 (mtime_ns, size)，不依赖任何平台的文件事件接口。Word 保存时会分几次写入，
+检测到变化后要等到连续两次轮询结果相同（文件已稳定）才开始检查。
+
+监视期间进程常驻：编译后的配置按内容哈希留在进程内缓存中，检查缓存（CheckCache）只放在内存里，
+每次只重新检查改动过的段落（见 pipeline.incremental），典型的少量改动可以在一秒内给出结果。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from typing import Callable, NamedTuple
+
+from wordformat.log_config import logger
+from wordformat.style.issues import Issue
+
+from .incremental import CheckCache
+from .orchestrate import check_format_report
+
+
+class IssueDelta(NamedTuple):
+    """两次检查之间的问题变化（同一问题出现多次时按次数计）。"""
+
+    added: list[Issue]
+    resolved: list[Issue]
+
+
+def diff_issues(before: list[Issue], after: list[Issue]) -> IssueDelta:
+    """比较两次检查的问题列表，各自保持原有顺序。"""
+    added, resolved = Counter(after), Counter(before)
+    added.subtract(before)
+    resolved.subtract(after)
+
+    def pick(issues, counts):
+        result = []
+        for issue in issues:
+            if counts[issue] > 0:
+                counts[issue] -= 1
+                result.append(issue)
+        return result
+
+    return IssueDelta(pick(after, added), pick(before, resolved))
+
+
+def file_stamp(path) -> tuple[int, int] | None:
+    """文件的 (mtime_ns, size)；文件不存在（如保存过程中被临时替换）时为 None。"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class CheckResult(NamedTuple):
+    """一次检查的结果。"""
+
+    report: dict
+    issues: list[Issue]
+    delta: IssueDelta
+    elapsed: float  # 秒
+
+
+class DocumentWatcher:
+    """轮询文档（以及结构 JSON、配置文件），有改动时重新检查。
+
+    Args:
+        jsonpath: 文档结构 JSON 路径。
+        docxpath: 被监视的 Word 文档路径。
+        configpath: 格式配置路径，为 None 时使用内置默认配置。
+        interval: 轮询间隔（秒）。
+    """
+
+    def __init__(
+        self,
+        jsonpath: str,
+        docxpath: str,
+        configpath: str | None = None,
+        interval: float = 0.3,
+    ):
+        self.jsonpath = jsonpath
+        self.docxpath = docxpath
+        self.configpath = configpath
+        self.interval = interval
+        self.cache = CheckCache()
+        self.issues: list[Issue] = []
+        self.checks = 0
+        self._seen = None  # 最近一次轮询看到的文件状态
+        self._checked = None  # 最近一次检查时的文件状态
+
+    def _stamps(self) -> tuple:
+        paths = (self.docxpath, self.jsonpath, self.configpath)
+        return tuple(file_stamp(path) for path in paths if path is not None)
+
+    def poll(self) -> bool:
+        """轮询一次：文件有改动且已稳定（与上次轮询相同）、尚未检查过时返回 True。"""
+        stamps = self._stamps()
+        settled = stamps == self._seen
+        self._seen = stamps
+        return settled and stamps != self._checked and None not in stamps
+
+    def check(self) -> CheckResult:
+        """立即检查一次，与上一次成功检查的问题比较。"""
+        self._checked = self._seen = self._stamps()
+        t0 = time.perf_counter()
+        report = check_format_report(
+            self.jsonpath, self.docxpath, self.configpath, cache=self.cache
+        )
+        elapsed = time.perf_counter() - t0
+        issues = [Issue(**issue) for issue in report["issues"]]
+        delta = diff_issues(self.issues, issues)
+        self.issues = issues
+        self.checks += 1
+        return CheckResult(report, issues, delta, elapsed)
+
+    def run(
+        self, on_result: Callable[[CheckResult], None], max_checks: int | None = None
+    ) -> None:
+        """先检查一次，之后每次改动后重新检查，把结果交给 on_result；Ctrl+C 结束。
+
+        检查失败（如文档正在写入、JSON 与文档不匹配）时记录警告，等下次改动后再试。
+        max_checks 为成功检查的次数上限（主要供测试使用）。
+        """
+        first = True
+        while max_checks is None or self.checks < max_checks:
+            if first or self.poll():
+                first = False
+                try:
+                    result = self.check()
+                except Exception as e:
+                    logger.warning(f"检查失败，等待下次保存后重试: {e}")
+                else:
+                    on_result(result)
+                    continue
+            time.sleep(self.interval)
+
+
+def format_delta(result: CheckResult, limit: int = 10) -> list[str]:
+    """把一次检查结果整理成简短的输出行：统计、新增问题、已解决问题（各最多 limit 条）。"""
+    summary = result.report["summary"]
+    delta = result.delta
+    lines = [
+        f"错误 {summary['errors']}，提醒 {summary['notices']}；"
+        f"新增 {len(delta.added)} 条，已解决 {len(delta.resolved)} 条"
+        f"（{result.elapsed * 1000:.0f} ms）"
+    ]
+    for mark, issues in (("+", delta.added), ("-", delta.resolved)):
+        lines += [
+            f"  {mark} [{issue.severity}] {issue.text}" for issue in issues[:limit]
+        ]
+        if len(issues) > limit:
+            lines.append(f"  {mark} ……另有 {len(issues) - limit} 条")
+    return lines
@@ -8,6 +8,7 @@ from wordformat.config.dotdict import BASE_FORMAT, deep_merge
 from wordformat.rules.node import FormatNode
 from wordformat.structure.registry import register
 from wordformat.style.diff import CharacterStyle, ParagraphStyle
+from wordformat.utils._snapshot import invalidate_snapshot
 
 
 @register("abstract_chinese_title", level=1)
@@ -98,6 +99,7 @@ class AbstractTitleContentCN(FormatNode):
                 runs=run,
                 text=CharacterStyle.to_string(diff_result, target=self.NODE_LABEL),
             )
+        invalidate_snapshot(self.paragraph)
         self.add_comment(
             doc=doc,
             runs=self.paragraph.runs,
@@ -261,6 +263,7 @@ class AbstractTitleContentEN(FormatNode):
                 text=CharacterStyle.to_string(diff_result, target=self.NODE_LABEL),
             )
             cum += len(text_clean)
+        invalidate_snapshot(self.paragraph)
         self.add_comment(
             doc=doc,
             runs=self.paragraph.runs,
@@ -7,7 +7,7 @@
 from wordformat.config.dotdict import BASE_FORMAT, deep_merge
 from wordformat.rules.node import FormatNode
 from wordformat.structure.registry import register
-from wordformat.utils import parse_caption_text
+from wordformat.utils import invalidate_snapshot, parse_caption_text
 
 
 def _get_cfg(cfg, key, default=None):
@@ -25,6 +25,7 @@ def _replace_paragraph_text(paragraph, new_text: str) -> None:
     runs[0].text = new_text
     for run in runs[1:]:
         run.text = ""
+    invalidate_snapshot(paragraph)
 
 
 def _check_caption_numbering(
@@ -48,24 +49,19 @@ def _check_caption_numbering(
         return
 
     parsed = parse_caption_text(text)
-    from wordformat.style.comments import format_comment
+    from wordformat.style.issues import Issue, join_issues
 
     target = getattr(node, "NODE_LABEL", "题注")
 
     if parsed is None:
-        node.add_comment(
-            document,
-            paragraph.runs,
-            format_comment(
-                target, "格式错误", f"无法识别'{text[:50]}'", "正确题注格式"
-            ),
-        )
+        issue = Issue(target, "格式错误", f"无法识别'{text[:50]}'", "正确题注格式")
+        node.add_comment(document, paragraph.runs, issue.text, [issue])
         return
 
     issues = []
     if parsed["label"] != expected_label:
         issues.append(
-            format_comment(
+            Issue(
                 target,
                 "标签错误",
                 f"当前为'{parsed['label']}'",
@@ -78,11 +74,11 @@ def _check_caption_numbering(
     label_space = _get_cfg(numbering_cfg, "label_number_space", False)
     if label_with_space != label_space:
         want = "有空格" if label_space else "无空格"
-        issues.append(format_comment(target, "间距错误", "当前不符合", f"应为{want}"))
+        issues.append(Issue(target, "间距错误", "当前不符合", f"应为{want}"))
     ch = parsed.get("chapter_num")
     if ch is not None and ch != chapter:
         issues.append(
-            format_comment(
+            Issue(
                 target,
                 "章节号错误",
                 f"当前为{ch}",
@@ -91,7 +87,7 @@ def _check_caption_numbering(
         )
     if parsed["separator"] != separator:
         issues.append(
-            format_comment(
+            Issue(
                 target,
                 "分隔符错误",
                 f"当前为'{parsed['separator']}'",
@@ -101,7 +97,7 @@ def _check_caption_numbering(
     num = parsed.get("number_num")
     if num is not None and num != seq:
         issues.append(
-            format_comment(
+            Issue(
                 target,
                 "编号错误",
                 f"当前为{num}",
@@ -110,7 +106,7 @@ def _check_caption_numbering(
         )
 
     if issues:
-        node.add_comment(document, paragraph.runs, "\n".join(issues))
+        node.add_comment(document, paragraph.runs, join_issues(issues), issues)
 
 
 def _apply_caption_numbering(
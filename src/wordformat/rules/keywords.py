@@ -1,12 +1,10 @@
 import re
-from copy import deepcopy
-
-from docx.oxml.ns import qn
 
 from wordformat.config.dotdict import BASE_FORMAT, deep_merge
 from wordformat.rules.node import FormatNode
 from wordformat.structure.registry import register
 from wordformat.style.diff import CharacterStyle, ParagraphStyle
+from wordformat.utils._runs import split_runs
 
 
 # 第一步：提取关键词基类，复用通用逻辑
@@ -31,46 +29,24 @@ class BaseKeywordsNode(FormatNode):
         拆分为 "关键词：" 和 "校园二手交易；Django" 两个 run，
         以便分别应用不同的字符样式。
 
-        拆分后第二个 run 会继承第一个 run 的所有格式（rPr），
+        拆分后第二个 run 会复制第一个 run 的格式（rPr），
         后续样式检查会覆盖需要修改的属性。
         """
         label_pattern = self._get_label_split_pattern()
         if not label_pattern:
             return
 
-        runs_to_split = []
-
-        for run in self.paragraph.runs:
-            text = run.text
+        # 标签后面还有内容的 run：把内容部分切成独立 run
+        snap = self.snapshot
+        spans = []
+        for offset, text in zip(snap.offsets, snap.run_texts, strict=True):
             if not text.strip():
                 continue
             match = re.search(label_pattern, text)
             if match and match.end() < len(text):
-                # 标签后面还有内容，需要拆分
-                split_pos = match.end()
-                runs_to_split.append((run, split_pos))
-
-        for run, split_pos in runs_to_split:
-            r_elem = run._element
-            t_elem = r_elem.find(qn("w:t"))
-            if t_elem is None:
-                continue
-
-            full_text = t_elem.text or ""
-            label_text = full_text[:split_pos]
-            content_text = full_text[split_pos:]
-
-            # 修改原 run 为标签部分
-            t_elem.text = label_text
-
-            # 创建新 run（深拷贝原 run 的 XML，保留所有格式）
-            new_r_elem = deepcopy(r_elem)
-            new_t_elem = new_r_elem.find(qn("w:t"))
-            if new_t_elem is not None:
-                new_t_elem.text = content_text
-
-            # 在原 run 后面插入新 run
-            r_elem.addnext(new_r_elem)
+                spans.append((offset + match.end(), offset + len(text)))
+        if spans:
+            split_runs(self.paragraph, spans)
 
     def _get_label_split_pattern(self) -> re.Pattern | None:
         """返回用于拆分标签的正则表达式，由子类重写。"""
@@ -108,6 +84,9 @@ class KeywordsEN(BaseKeywordsNode):
 
     _LABEL_RE = re.compile(r"Keywords?:?\s*", re.IGNORECASE)
     _SEPARATOR_RE = re.compile(r"[,;]")
+    _RUN_LABEL_RE = re.compile(r"Keywords?|KEY\s*WORDS", re.IGNORECASE)
+    _FULL_LABEL_RE = re.compile(r"Keywords?\s*[:：]?\s*|KEY\s*WORDS\s*", re.IGNORECASE)
+    _SPLIT_RE = re.compile(r"Keywords?\s*[:：]?\s*", re.IGNORECASE)
 
     @staticmethod
     def extract_keywords(text: str) -> list[str]:
@@ -120,9 +99,9 @@ class KeywordsEN(BaseKeywordsNode):
         if not run.text.strip():
             return False
         if self.paragraph is None:
-            return bool(re.search(r"Keywords?|KEY\s*WORDS", run.text, re.IGNORECASE))
+            return bool(KeywordsEN._RUN_LABEL_RE.search(run.text))
         full = "".join(r.text for r in self.paragraph.runs)
-        m = re.match(r"Keywords?\s*[:：]?\s*|KEY\s*WORDS\s*", full, re.IGNORECASE)
+        m = KeywordsEN._FULL_LABEL_RE.match(full)
         if not m:
             return False
         label_end = m.end()
@@ -137,7 +116,7 @@ class KeywordsEN(BaseKeywordsNode):
 
     def _get_label_split_pattern(self) -> re.Pattern | None:
         """英文标签拆分模式：匹配 'Keywords:' 或 'Keywords ' 及其变体"""
-        return re.compile(r"Keywords?\s*[:：]?\s*", re.IGNORECASE)
+        return KeywordsEN._SPLIT_RE
 
     def _check_keyword_count(self, doc, rule_cfg, p: bool = False):
         """校验英文关键词数量"""
@@ -244,6 +223,12 @@ class KeywordsCN(BaseKeywordsNode):
 
     _LABEL_RE = re.compile(r"关键词[:：]?\s*")
     _SEPARATOR_RE = re.compile(r"[；;]")
+    _RUN_LABEL_RE = re.compile(
+        r"关[^a-zA-Z0-9\u4e00-\u9fff]*键[^a-zA-Z0-9\u4e00-\u9fff]*词"
+    )
+    _SPLIT_RE = re.compile(
+        r"关[^a-zA-Z0-9\u4e00-\u9fff]*键[^a-zA-Z0-9\u4e00-\u9fff]*词\s*[:：]?\s*"
+    )
 
     @staticmethod
     def extract_keywords(text: str) -> list[str]:
@@ -256,13 +241,9 @@ class KeywordsCN(BaseKeywordsNode):
         if not run.text.strip():
             return False
         if self.paragraph is None:
-            p = r"关[^a-zA-Z0-9\u4e00-\u9fff]*键[^a-zA-Z0-9\u4e00-\u9fff]*词"
-            return bool(re.search(p, run.text))
+            return bool(KeywordsCN._RUN_LABEL_RE.search(run.text))
         full = "".join(r.text for r in self.paragraph.runs)
-        m = re.search(
-            r"关[^a-zA-Z0-9\u4e00-\u9fff]*键[^a-zA-Z0-9\u4e00-\u9fff]*词\s*[:：]?\s*",
-            full,
-        )
+        m = KeywordsCN._SPLIT_RE.search(full)
         if not m:
             return False
         label_end = m.end()
@@ -276,9 +257,7 @@ class KeywordsCN(BaseKeywordsNode):
 
     def _get_label_split_pattern(self) -> re.Pattern | None:
         """中文标签拆分模式：匹配 '关键词：' 或 '关键词:' 及其变体"""
-        return re.compile(
-            r"关[^a-zA-Z0-9\u4e00-\u9fff]*键[^a-zA-Z0-9\u4e00-\u9fff]*词\s*[:：]?\s*"
-        )
+        return KeywordsCN._SPLIT_RE
 
     def _check_keyword_count(self, doc, rule_cfg, p: bool = False):
         """校验中文关键词数量"""
@@ -2,15 +2,22 @@
 # @Time    : 2026/1/10 14:07
 # @Author  : afish
 # @File    : node.py
-from collections.abc import Sequence
-from typing import Any
+from collections.abc import Callable, Sequence
+from typing import Any, NamedTuple
 
 from docx.document import Document
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from loguru import logger
 
-from wordformat.config.dotdict import DotDict, deep_merge
+from wordformat.config.compiled import CompiledConfig
+from wordformat.config.dotdict import DotDict, merge_node_config
+from wordformat.style.issues import Issue, IssueCollector, join_issues
+from wordformat.utils._snapshot import (
+    ParagraphSnapshot,
+    invalidate_snapshot,
+    paragraph_snapshot,
+)
 
 
 class TreeNode:
@@ -18,6 +25,9 @@ class TreeNode:
 
     NODE_TYPE = "node"
 
+    # load_config 绑定的编译配置；未绑定（普通 dict 配置）时为 None
+    _compiled: "CompiledConfig | None" = None
+
     def __init__(self, value: Any):
         self.value = value
         self._config = DotDict()
@@ -29,24 +39,17 @@ class TreeNode:
         return self._config
 
     def load_config(self, full_config: dict) -> None:
-        """根据 NODE_TYPE 从 full_config 中提取子配置，与 DEFAULTS 合并。"""
-        # 沿 NODE_TYPE 路径逐级查找 YAML 配置
-        path_parts = self.NODE_TYPE.split(".")
-        yaml_node: dict = {}
-        current = full_config
-        try:
-            for part in path_parts:
-                if not isinstance(current, dict):
-                    raise KeyError
-                current = current[part]
-            yaml_node = current if isinstance(current, dict) else {}
-        except (KeyError, TypeError):
-            yaml_node = {}
-
-        # 合并：DEFAULTS 为底，YAML 覆盖
+        """根据 NODE_TYPE 从 full_config 中提取子配置，与 DEFAULTS 合并。
+
+        full_config 为 CompiledConfig 时直接引用其按类预先合并好的配置（只读共享）。
+        """
+        if isinstance(full_config, CompiledConfig):
+            self._compiled = full_config
+            self._config = full_config.config_for(type(self))
+            return
+        self._compiled = None
         defaults = getattr(type(self), "DEFAULTS", {})
-        merged = deep_merge(defaults, yaml_node) if defaults else yaml_node
-        self._config = DotDict(merged)
+        self._config = DotDict(merge_node_config(full_config, self.NODE_TYPE, defaults))
 
     def add_child(self, child_value: Any) -> "TreeNode":
         """添加一个子节点，并返回该子节点（便于链式调用）"""
@@ -62,15 +65,23 @@ class TreeNode:
         return f"TreeNode({self.value})"
 
 
+class RuleStep(NamedTuple):
+    """规则表中的一项：规则名、handler 函数（未绑定，调用时传入节点）、规则配置。"""
+
+    name: str
+    handler: Callable
+    config: Any
+
+
 class FormatNode(TreeNode):
     """所有格式检查节点的基类"""
 
+    # load_config 绑定编译配置时取得的规则表（按节点类与配置共享）；未绑定时为 None
+    _rules: "tuple[RuleStep, ...] | None" = None
+
     # 子类定义的默认值，load_config 时与 YAML 合并
     DEFAULTS: dict = {}
 
-    # 全局错误统计（类变量，一次 check 周期内累加）
-    _error_stats: dict[str, int] = {"total": 0, "错误": 0, "提醒": 0}
-
     # 中文标签，用作批注的 [位置] 部分
     NODE_LABEL: str = ""
 
@@ -96,6 +107,11 @@ class FormatNode(TreeNode):
         self.expected_rule = expected_rule
         self._comment_texts: list[tuple] = []
 
+    def load_config(self, full_config: dict) -> None:
+        super().load_config(full_config)
+        compiled = self._compiled
+        self._rules = compiled.rules_for(type(self)) if compiled is not None else None
+
     @property
     def pydantic_config(self) -> "DotDict":
         """返回当前节点的合并配置（DotDict）。"""
@@ -104,6 +120,13 @@ class FormatNode(TreeNode):
     def update_paragraph(self, paragraph: Paragraph | dict):
         self.paragraph = paragraph
 
+    @property
+    def snapshot(self) -> ParagraphSnapshot | None:
+        """当前段落的文本 / run 快照（见 utils._snapshot）；无段落时为 None。"""
+        if self.paragraph is None:
+            return None
+        return paragraph_snapshot(self.paragraph)
+
     def _base(self, doc, p: bool, r: bool):
         """子类可覆写以添加自定义逻辑（如拆分混合 run）。标准节点无需覆写。"""
 
@@ -113,22 +136,36 @@ class FormatNode(TreeNode):
         p=True 表示检查模式，p=False 表示应用模式。handler 签名为
         (doc, rule_cfg, p)，p 默认 False 以兼容不需要区分模式的 handler。
 
-        DEFAULT_RULES 总是执行，RULES 仅当配置 enabled=true 时执行。提供双向验证：
+        绑定了编译配置时，启用规则表按（节点类, 配置）只计算一次，在 load_config 时取得
+        （见 CompiledConfig.rules_for），这里只按表依次调用 handler。
+        """
+        plan = self._rules
+        if plan is None:
+            plan = self.rule_plan(self.pydantic_config)
+        for step in plan:
+            step.handler(self, doc, step.config, p)
+
+    @classmethod
+    def rule_plan(cls, cfg) -> tuple[RuleStep, ...]:
+        """按配置计算启用的规则表（RuleStep 元组，handler 已解析为 cls 上的函数）。
+
+        DEFAULT_RULES 总是执行（规则配置为 None），RULES 仅当配置 enabled=true 时执行。
+        配置校验在这里完成，绑定编译配置时每个模板只做一次。提供双向验证：
         - 配置有规则但无 handler → warning
         - RULES 声明了但配置无对应项 → warning
         """
-        all_rules = {**self.DEFAULT_RULES, **self.RULES}
+        all_rules = {**cls.DEFAULT_RULES, **cls.RULES}
         if not all_rules:
-            return
+            return ()
 
-        rules_config = getattr(self.pydantic_config, "rules", None)
+        rules_config = getattr(cfg, "rules", None)
 
         # 双向验证（仅检查自定义 RULES）
-        if self.RULES:
+        if cls.RULES:
             if rules_config is None:
-                logger.debug(f"[{self.NODE_TYPE}] RULES 已声明但配置无 rules 节点")
+                logger.debug(f"[{cls.NODE_TYPE}] RULES 已声明但配置无 rules 节点")
             else:
-                declared_rules = set(self.RULES.keys())
+                declared_rules = set(cls.RULES.keys())
                 config_rules = (
                     set(rules_config.keys())
                     if isinstance(rules_config, dict)
@@ -138,18 +175,18 @@ class FormatNode(TreeNode):
                 orphan_configs = config_rules - declared_rules
                 if orphan_handlers:
                     logger.debug(
-                        f"[{self.NODE_TYPE}] RULES 声明了 {orphan_handlers} 但配置无对应项"
+                        f"[{cls.NODE_TYPE}] RULES 声明了 {orphan_handlers} 但配置无对应项"
                     )
                 if orphan_configs:
                     logger.debug(
-                        f"[{self.NODE_TYPE}] 配置有 {orphan_configs} 但无对应 handler"
+                        f"[{cls.NODE_TYPE}] 配置有 {orphan_configs} 但无对应 handler"
                     )
 
+        plan = []
         for rule_name, handler_name in all_rules.items():
             # 默认规则无配置，总是执行
-            if rule_name in self.DEFAULT_RULES:
-                handler = getattr(self, handler_name)
-                handler(doc, None, p)
+            if rule_name in cls.DEFAULT_RULES:
+                plan.append(RuleStep(rule_name, getattr(cls, handler_name), None))
                 continue
 
             # 自定义规则：读配置，检查 enabled
@@ -158,8 +195,8 @@ class FormatNode(TreeNode):
             rule_cfg = getattr(rules_config, rule_name, None)
             if rule_cfg is None or not rule_cfg.enabled:
                 continue
-            handler = getattr(self, handler_name)
-            handler(doc, rule_cfg, p)
+            plan.append(RuleStep(rule_name, getattr(cls, handler_name), rule_cfg))
+        return tuple(plan)
 
     # ------------------------------------------------------------------
     # 默认规则 handler：段落样式 + 字符样式
@@ -167,93 +204,102 @@ class FormatNode(TreeNode):
 
     def _handle_paragraph_style(self, doc, rule_cfg, p: bool):
         """默认段落样式检查/应用。配置需包含 alignment 等格式字段。"""
-        if self.paragraph is None or not self.paragraph.runs:
+        snap = self.snapshot
+        if snap is None or not snap.runs:
             return
         from wordformat.style.diff import ParagraphStyle
+        from wordformat.style.table import FormatTable
 
-        cfg = self.pydantic_config
-        if cfg.alignment is None:
+        if self._compiled is not None:
+            ps = self._compiled.paragraph_style_for(type(self))
+        else:
+            cfg = self.pydantic_config
+            ps = None if cfg.alignment is None else ParagraphStyle.from_config(cfg)
+        if ps is None:
             return
-        ps = ParagraphStyle.from_config(cfg)
         if p:
-            issues = ps.diff_from_paragraph(self.paragraph)
-            if issues:
-                self.add_comment(
-                    doc=doc,
-                    runs=self.paragraph.runs,
-                    text=ParagraphStyle.to_string(issues, target=self.NODE_LABEL),
-                )
+            # 整篇格式表已证明一致的段落无需逐项 diff
+            table = FormatTable.for_obj(self.paragraph)
+            if table is not None and table.para_clean(self.paragraph, ps.signature()):
+                return
+            diffs = ps.diff_from_paragraph(self.paragraph)
+            if diffs:
+                self._comment_diffs(doc, snap.runs, ParagraphStyle, diffs)
         else:
-            ps.apply_to_paragraph(self.paragraph)
-            # apply 后再次 diff，只报告修正失败的残留差异
-            remaining = ps.diff_from_paragraph(self.paragraph)
+            # 只报告修正失败的残留差异（继承链仅解析一次）
+            remaining = ps.fix_paragraph(self.paragraph)
             if remaining:
-                self.add_comment(
-                    doc=doc,
-                    runs=self.paragraph.runs,
-                    text=ParagraphStyle.to_string(remaining, target=self.NODE_LABEL),
-                )
+                self._comment_diffs(doc, snap.runs, ParagraphStyle, remaining)
 
     def _handle_character_style(self, doc, rule_cfg, p: bool):
         """默认字符样式检查/应用。配置需包含 chinese_font_name 等格式字段。"""
-        if not self.paragraph.runs:
+        snap = self.snapshot
+        if not snap.runs:
             return
         from wordformat.style.diff import CharacterStyle
+        from wordformat.style.table import FormatTable
+        from wordformat.utils import has_chinese
 
-        cfg = self.pydantic_config
-        if cfg.chinese_font_name is None:
+        if self._compiled is not None:
+            cstyle = self._compiled.character_style_for(type(self))
+        else:
+            cfg = self.pydantic_config
+            cstyle = (
+                None
+                if cfg.chinese_font_name is None
+                else CharacterStyle.from_config(cfg)
+            )
+        if cstyle is None:
             return
-        cstyle = CharacterStyle(
-            font_name_cn=cfg.chinese_font_name,
-            font_name_en=cfg.english_font_name,
-            font_size=cfg.font_size,
-            font_color=cfg.font_color,
-            bold=cfg.bold,
-            italic=cfg.italic,
-            underline=cfg.underline,
-        )
-        for run in self.paragraph.runs:
-            if not run.text.strip():
+        table = FormatTable.for_obj(self.paragraph) if p else None
+        signature = cstyle.signature() if table is not None else None
+        for run, text in zip(snap.runs, snap.run_texts, strict=True):
+            if not text.strip():
                 continue
             if p:
+                # 整篇格式表已证明一致的 run 无需逐项 diff
+                if table is not None and table.run_clean(
+                    run, signature, has_chinese(text)
+                ):
+                    continue
                 diff = cstyle.diff_from_run(run)
                 if diff:
-                    self.add_comment(
-                        doc=doc,
-                        runs=run,
-                        text=CharacterStyle.to_string(diff, target=self.NODE_LABEL),
-                    )
+                    self._comment_diffs(doc, run, CharacterStyle, diff)
             else:
-                cstyle.apply_to_run(run)
-                # apply 后再次 diff，只报告修正失败的残留差异
-                remaining = cstyle.diff_from_run(run)
+                # 只报告修正失败的残留差异（继承链仅解析一次）
+                remaining = cstyle.fix_run(run)
                 if remaining:
-                    self.add_comment(
-                        doc=doc,
-                        runs=run,
-                        text=CharacterStyle.to_string(
-                            remaining, target=self.NODE_LABEL
-                        ),
-                    )
+                    self._comment_diffs(doc, run, CharacterStyle, remaining)
+
+    def _comment_diffs(self, doc, runs, style_cls, diffs) -> None:
+        """把样式 diff 转为 Issue 并追加批注（全部被 warnings 关闭时不加）。"""
+        issues = style_cls.to_issues(diffs, target=self.NODE_LABEL)
+        if issues:
+            self.add_comment(
+                doc=doc, runs=runs, text=join_issues(issues), issues=issues
+            )
 
-    def _collect_comment(self, runs, text: str) -> None:
-        """将批注文本加入缓冲区，(runs, text) 成对存储。"""
-        if text.strip():
-            self._comment_texts.append((runs, text.strip()))
+    def _collect_comment(
+        self, runs, text: str, issues: list[Issue] | None = None
+    ) -> None:
+        """将批注文本及其问题记录加入缓冲区，(runs, text, issues) 成组存储。"""
+        text = text.strip()
+        if text:
+            self._comment_texts.append((runs, text, issues or Issue.parse(text)))
 
     def _flush_comments(self, doc: Document) -> None:
-        """将缓冲的批注按锚点分组写入。段落级合并为一条，run 级按 run 分开。"""
-        if not self._comment_texts or not self.paragraph.runs:
+        """将缓冲的批注按锚点分组提交给批注写入器。段落级合并为一条，run 级按 run 分开。"""
+        if not self._comment_texts or not self.snapshot.runs:
             self._comment_texts.clear()
             return
         groups = self._group_comments()
         self._write_comment_groups(doc, groups)
         self._comment_texts.clear()
 
-    def _group_comments(self) -> dict[tuple, tuple[tuple, list[str]]]:
-        """按 runs 分组批注文本。段落级用 ('__para__',)，run 级用索引 i。"""
-        para_runs = list(self.paragraph.runs)
-        groups: dict[tuple, tuple[tuple, list[str]]] = {}
+    def _group_comments(self) -> dict[tuple, tuple[tuple, list[str], list[Issue]]]:
+        """按 runs 分组批注文本和问题。段落级用 ('__para__',)，run 级用索引 i。"""
+        para_runs = self.snapshot.runs
+        groups: dict[tuple, tuple[tuple, list[str], list[Issue]]] = {}
 
         def _key(runs):
             if isinstance(runs, Sequence) and len(runs) == len(para_runs):
@@ -264,42 +310,33 @@ class FormatNode(TreeNode):
                     return (i,)
             return (id(runs),)
 
-        for runs, text in self._comment_texts:
+        for runs, text, issues in self._comment_texts:
             k = _key(runs)
             if k not in groups:
-                groups[k] = (runs, [])
+                groups[k] = (runs, [], [])
             groups[k][1].append(text)
+            groups[k][2].extend(issues)
         return groups
 
     def _write_comment_groups(self, doc, groups) -> None:
-        """将分组后的批注写入文档并更新统计。
+        """将分组后的问题登记到文档的问题收集器，并把批注交给批注写入器。
 
-        每条批注按行拆分，`位置-问题类型：` 按严重度上色，正文保持黑色。
+        每组一条批注、每条问题一行；写入器在格式化结束后统一写入 comments.xml，
+        `位置-问题类型：` 按严重度上色，正文保持黑色。仅出报告时不写批注。
         """
-        from wordformat.style.comments import (
-            SEVERITY_ORDER,
-            add_styled_comment,
-            get_severity,
-            split_comment_line,
-        )
+        from wordformat.style.comment_writer import CommentWriter
 
-        for runs, texts in groups.values():
-            paragraphs = [split_comment_line(t) for t in texts]
-            add_styled_comment(doc, runs, paragraphs)
-            max_sev = "提醒"
-            for t in texts:
-                sev = get_severity(t)
-                if SEVERITY_ORDER.get(sev, 3) < SEVERITY_ORDER.get(max_sev, 3):
-                    max_sev = sev
-            FormatNode._error_stats["total"] += 1
-            FormatNode._error_stats[max_sev] = (
-                FormatNode._error_stats.get(max_sev, 0) + 1
+        collector = IssueCollector.for_document(doc)
+        writer = CommentWriter.for_document(doc) if collector.write_comments else None
+        fingerprint = (
+            self.value.get("fingerprint", "") if isinstance(self.value, dict) else ""
+        )
+        for runs, texts, issues in groups.values():
+            severity = collector.record(
+                [issue.bind(self.NODE_TYPE, fingerprint) for issue in issues]
             )
-
-    @classmethod
-    def reset_stats(cls) -> None:
-        """重置全局错误统计。"""
-        cls._error_stats = {"total": 0, "错误": 0, "提醒": 0}
+            if writer is not None:
+                writer.add(runs, texts, severity=severity)
 
     def check_format(self, doc: Document):
         """格式检查：先执行样式检查，再自动调度业务规则"""
@@ -343,7 +380,8 @@ class FormatNode(TreeNode):
         if self.paragraph is None:
             return False
 
-        runs = self.paragraph.runs
+        snap = self.snapshot
+        runs = snap.runs
         if not runs:
             return False
 
@@ -351,13 +389,14 @@ class FormatNode(TreeNode):
             runs[0].text = replace_text
         else:
             pos = 0
-            for i, run in enumerate(runs):
+            for i, (run, text) in enumerate(zip(runs, snap.run_texts, strict=True)):
                 if i == len(runs) - 1:
                     run.text = replace_text[pos:]
                 else:
-                    n = min(len(run.text), len(replace_text) - pos)
+                    n = min(len(text), len(replace_text) - pos)
                     run.text = replace_text[pos : pos + n] if n > 0 else ""
                     pos += n
+        invalidate_snapshot(self.paragraph)
 
         logger.debug(f"已替换段落文本 → {replace_text[:50]}...")
         return True
@@ -366,9 +405,13 @@ class FormatNode(TreeNode):
         """移除段落内所有手动换行符 <w:br/>（Shift+Enter）。"""
         from docx.oxml.ns import qn
 
+        removed = False
         for r_elem in self.paragraph._element.findall(qn("w:r")):
             for br in r_elem.findall(qn("w:br")):
                 r_elem.remove(br)
+                removed = True
+        if removed:
+            invalidate_snapshot(self.paragraph)
 
     def _clean_paragraph_edge_spaces(self) -> None:
         """清理段落首尾 run 中的多余空格。
@@ -379,29 +422,46 @@ class FormatNode(TreeNode):
         """
         if self.paragraph is None:
             return
-        runs = self.paragraph.runs
-        if not runs:
+        if not self.snapshot.runs:
             return
 
         # 移除段落内的手动换行符（Shift+Enter → <w:br/>）
         self._remove_manual_line_breaks()
 
+        snap = self.snapshot
+        changed = False
         # 清理第一个非空 run 的开头空格
-        for run in runs:
-            if run.text:
-                stripped = run.text.lstrip(" \u00a0")  # 普通空格 + 不间断空格
-                if stripped != run.text:
+        for run, text in zip(snap.runs, snap.run_texts, strict=True):
+            if text:
+                stripped = text.lstrip(" \u00a0")  # 普通空格 + 不间断空格
+                if stripped != text:
                     run.text = stripped
+                    changed = True
                 break
 
-        # 清理最后一个非空 run 的结尾空格
-        for run in reversed(runs):
-            if run.text:
-                stripped = run.text.rstrip(" \u00a0")
-                if stripped != run.text:
+        # 清理最后一个非空 run 的结尾空格（与首个为同一 run 时读其当前文本）
+        for run, text in zip(
+            reversed(snap.runs), reversed(snap.run_texts), strict=True
+        ):
+            if text:
+                text = run.text if changed else text
+                stripped = text.rstrip(" \u00a0")
+                if stripped != text:
                     run.text = stripped
+                    changed = True
                 break
+        if changed:
+            invalidate_snapshot(self.paragraph)
 
-    def add_comment(self, doc: Document, runs: Run | Sequence[Run], text: str):
-        """追加批注到缓冲区，按锚点 run 分组，flush 时同组合并为一条。"""
-        self._collect_comment(runs, text)
+    def add_comment(
+        self,
+        doc: Document,
+        runs: Run | Sequence[Run],
+        text: str,
+        issues: list[Issue] | None = None,
+    ):
+        """追加批注到缓冲区，按锚点 run 分组，flush 时同组合并为一条。
+
+        issues 为该批注对应的结构化问题；省略时由 text 按行解析。
+        """
+        self._collect_comment(runs, text, issues)
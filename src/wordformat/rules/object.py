@@ -6,7 +6,8 @@ from docx.shared import Inches
 
 from wordformat.rules.node import FormatNode
 from wordformat.structure.registry import register
-from wordformat.style.comments import format_comment
+from wordformat.style.issues import Issue
+from wordformat.utils._snapshot import invalidate_snapshot
 
 
 @register("figure_image")
@@ -33,29 +34,27 @@ class FigureImage(FormatNode):
         expected_align = Alignment(str(cfg.alignment or "居中对齐"))
         actual_align = expected_align.get_from_paragraph(self.paragraph)
         if expected_align != actual_align:
+            issue = Issue(
+                self.NODE_LABEL,
+                "对齐错误",
+                _format_para_value("alignment", actual_align),
+                _format_para_value("alignment", expected_align),
+            )
             self.add_comment(
-                doc=doc,
-                runs=self.paragraph.runs,
-                text=format_comment(
-                    self.NODE_LABEL,
-                    "对齐错误",
-                    _format_para_value("alignment", actual_align),
-                    _format_para_value("alignment", expected_align),
-                ),
+                doc=doc, runs=self.paragraph.runs, text=issue.text, issues=[issue]
             )
 
         expected_indent = FirstLineIndent(str(cfg.first_line_indent or "0字符"))
         actual_indent = expected_indent.get_from_paragraph(self.paragraph)
         if expected_indent != actual_indent:
+            issue = Issue(
+                self.NODE_LABEL,
+                "首行缩进错误",
+                _format_para_value("first_line_indent", actual_indent),
+                _format_para_value("first_line_indent", expected_indent),
+            )
             self.add_comment(
-                doc=doc,
-                runs=self.paragraph.runs,
-                text=format_comment(
-                    self.NODE_LABEL,
-                    "首行缩进错误",
-                    _format_para_value("first_line_indent", actual_indent),
-                    _format_para_value("first_line_indent", expected_indent),
-                ),
+                doc=doc, runs=self.paragraph.runs, text=issue.text, issues=[issue]
             )
 
     def _try_insert_image(self) -> None:
@@ -86,6 +85,7 @@ class FigureImage(FormatNode):
                 run.add_picture(str(img_path), width=Inches(5.5))
         except Exception:
             pass  # 图片格式不支持等，保留占位文本
+        invalidate_snapshot(self.paragraph)
 
 
 @register("table_object")
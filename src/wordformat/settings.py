@@ -38,6 +38,17 @@ MODEL = os.getenv("WORDFORMAT_MODEL", "")
 MODEL_URL = os.getenv("WORDFORMAT_MODEL_URL", "")
 
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "64"))
+# 配置文件旁是否读写解析快照（.<文件名>.wfcache），设为 0 关闭
+YAML_SNAPSHOT = os.getenv("WORDFORMAT_YAML_SNAPSHOT", "1") != "0"
+# 批注预算：单段 / 全文批注条数上限，超出的提醒合并为汇总批注；0 表示不限
+COMMENT_BUDGET_PARAGRAPH = int(os.getenv("WORDFORMAT_COMMENT_BUDGET_PARAGRAPH", "0"))
+COMMENT_BUDGET_DOCUMENT = int(os.getenv("WORDFORMAT_COMMENT_BUDGET_DOCUMENT", "0"))
+# API 格式检查 / 格式化任务的工作线程数（多个请求的文档处理可并发进行）
+API_WORKERS = max(int(os.getenv("WORDFORMAT_API_WORKERS", "4")), 1)
+# check 模式是否在源文档旁读写检查缓存（.<文件名>.wfcheck），默认关闭（见 pipeline.incremental）
+CHECK_CACHE = os.getenv("WORDFORMAT_CHECK_CACHE", "0") == "1"
+# check 模式按章节分片并行检查的进程数；1 为串行（见 pipeline.parallel）
+CHECK_WORKERS = max(int(os.getenv("WORDFORMAT_CHECK_WORKERS", "1")), 1)
 ONNX_VERSION = "20260204"
 
 VOIDNODELIST = [
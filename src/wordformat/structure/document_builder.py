@@ -31,7 +31,6 @@ class DocumentBuilder:
     def build_from_json(cls, json_path: str | list, config) -> FormatNode:
         paragraphs = cls.load_paragraphs(json_path)
         logger.debug(f"共有 {len(paragraphs)} 条语料")
-        DocumentTreeBuilder.CONFIG = config
         builder = DocumentTreeBuilder()
         builder._config = config
         return builder.build_tree(paragraphs)
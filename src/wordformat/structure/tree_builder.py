@@ -19,7 +19,6 @@ class DocumentTreeBuilder:
     """负责将扁平列表构建成层级树结构"""
 
     HEADING_CATEGORIES = _HEADING_CATEGORIES
-    CONFIG = {}
 
     def __init__(self):
         self.stack = Stack()
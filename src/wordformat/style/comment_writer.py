@@ -0,0 +1,274 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 16:40
+# @Author  : afish
+# @File    : comment_writer.py
+"""批注批量写入器（每文档一份）。
+
+节点 flush 时不再逐条调用 doc.add_comment，而是把批注登记为记录缓冲起来，
+格式化遍历结束后一次性写入 comments.xml 并插入正文中的批注范围标记：
+
+- 批注 ID 由写入器统一分配：每次写入只扫描一次已有 ID，
+  不再像 python-docx 那样每加一条都重新求 max（条数多时是平方级）；
+- 每行批注文本的样式段落（严重度着色的 run）按行文本缓存为模板，重复的行直接复制；
+- 可选批注预算：单段 / 全文批注条数超出时，把低严重度（提醒）的批注合并为汇总批注。
+  预算只影响写入形态，错误统计仍按原始批注计数。
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections import Counter
+from copy import deepcopy
+from functools import lru_cache
+from typing import NamedTuple
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+from loguru import logger
+
+from wordformat import settings
+from wordformat.style.comments import (
+    SEVERITY_ORDER,
+    apply_run_style,
+    get_severity,
+    split_comment_line,
+)
+
+# 合并后的汇总批注使用的问题类型（严重度为提醒，见 SEVERITY_MAP）
+MERGED_ISSUE_TYPE = "提醒汇总"
+_LOW_SEVERITY = "提醒"
+
+
+class CommentRecord(NamedTuple):
+    """一条待写入的批注：锚点首尾 run（CT_R）、各行文本、最高严重度。"""
+
+    first: object
+    last: object
+    lines: tuple[str, ...]
+    severity: str
+    author: str = "Wordformat"
+    initials: str = "afish"
+
+
+class CommentBudget(NamedTuple):
+    """批注条数预算，0 表示不限。"""
+
+    paragraph: int = 0
+    document: int = 0
+
+    @classmethod
+    def from_settings(cls) -> CommentBudget:
+        return cls(settings.COMMENT_BUDGET_PARAGRAPH, settings.COMMENT_BUDGET_DOCUMENT)
+
+
+@lru_cache(maxsize=4096)
+def _line_template(line: str) -> tuple[object, str]:
+    """一行批注文本 → (批注段落 w:p 模板, 严重度)。模板只读，使用时需复制。"""
+    p = OxmlElement("w:p")
+    p.get_or_add_pPr().style = "CommentText"
+    para = Paragraph(p, None)
+    for text, style in split_comment_line(line):
+        apply_run_style(para.add_run(text), style)
+    return p, get_severity(line)
+
+
+def _max_severity(severities) -> str:
+    """多行中最严重的等级（默认提醒）。"""
+    result = _LOW_SEVERITY
+    for sev in severities:
+        if SEVERITY_ORDER.get(sev, 3) < SEVERITY_ORDER.get(result, 3):
+            result = sev
+    return result
+
+
+def _issue_type(line: str) -> str:
+    """批注行中的问题类型（位置-问题类型：… 的中间段）。"""
+    prefix = line.partition("：")[0]
+    return prefix.rsplit("-", 1)[-1]
+
+
+class CommentWriter:
+    """缓冲批注记录，flush 时批量写入所属文档。"""
+
+    __slots__ = ("_part", "_records", "budget")
+
+    def __init__(self, part, budget: CommentBudget | None = None):
+        self._part = part
+        self._records: list[CommentRecord] = []
+        self.budget = budget if budget is not None else CommentBudget.from_settings()
+
+    @classmethod
+    def for_document(cls, document) -> CommentWriter:
+        """取（或创建）挂在 DocumentPart 上的写入器。"""
+        part = document.part
+        cached = getattr(part, "_wf_comment_writer", None)
+        if not isinstance(cached, CommentWriter):
+            cached = cls(part)
+            part._wf_comment_writer = cached
+        return cached
+
+    @property
+    def pending(self) -> int:
+        return len(self._records)
+
+    def add(
+        self,
+        runs,
+        lines: list[str],
+        *,
+        author: str = "Wordformat",
+        initials: str = "afish",
+        severity: str | None = None,
+    ) -> CommentRecord:
+        """登记一条批注（锚定在 runs 的首尾 run 上），返回记录。
+
+        severity 为空时按各行文本推断最高严重度。
+        """
+        runs = [runs] if isinstance(runs, Run) else runs
+        lines = tuple(lines)
+        if severity is None:
+            severity = _max_severity(_line_template(line)[1] for line in lines)
+        record = CommentRecord(
+            runs[0]._r,
+            runs[-1]._r,
+            lines,
+            severity,
+            author,
+            initials,
+        )
+        self._records.append(record)
+        return record
+
+    def since(self, start: int) -> list[CommentRecord]:
+        """第 start 条起登记、尚未写入的批注记录（按登记顺序）。"""
+        return self._records[start:]
+
+    def extend(self, records) -> None:
+        """按顺序接入已构造好的批注记录（如分片检查在子进程中登记、父进程重新锚定的批注）。"""
+        self._records.extend(records)
+
+    # ------------------------------------------------------------------
+    # 预算
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge(
+        records: list[CommentRecord], limit: int, summarize
+    ) -> list[CommentRecord]:
+        """超出 limit 时保留全部错误和靠前的提醒，其余提醒交给 summarize 合并为一条。"""
+        if not limit or len(records) <= limit:
+            return records
+        errors = sum(r.severity != _LOW_SEVERITY for r in records)
+        low_left = max(limit - 1 - errors, 0)  # 为汇总批注留一个位置
+        result: list[CommentRecord] = []
+        merged: list[CommentRecord] = []
+        slot = 0
+        for record in records:
+            if record.severity != _LOW_SEVERITY:
+                result.append(record)
+            elif low_left:
+                low_left -= 1
+                result.append(record)
+            else:
+                if not merged:
+                    slot = len(result)  # 汇总批注放在第一条被合并批注的位置
+                merged.append(record)
+        if len(merged) < 2:
+            return records
+        result.insert(slot, summarize(merged))
+        return result
+
+    @staticmethod
+    def _paragraph_summary(merged: list[CommentRecord]) -> CommentRecord:
+        """单段汇总：锚定整段，逐行保留被合并的提醒。"""
+        p = merged[0].first.getparent()
+        run_elems = list(p.iterchildren(qn("w:r"))) or [merged[0].first]
+        target = merged[0].lines[0].split("-", 1)[0]
+        lines = [
+            f"{target}-{MERGED_ISSUE_TYPE}：本段另有 {len(merged)} 条提醒，合并如下"
+        ]
+        lines.extend(line for r in merged for line in r.lines)
+        return merged[0]._replace(
+            first=run_elems[0],
+            last=run_elems[-1],
+            lines=tuple(lines),
+            severity=_LOW_SEVERITY,
+        )
+
+    @staticmethod
+    def _document_summary(merged: list[CommentRecord]) -> CommentRecord:
+        """全文汇总：锚定第一条被合并的批注，按问题类型计数。"""
+        counts = Counter(_issue_type(line) for r in merged for line in r.lines)
+        lines = [
+            f"全文-{MERGED_ISSUE_TYPE}：超出批注上限，另有 {len(merged)} 条提醒未单独标注"
+        ]
+        lines.extend(f"{issue}：{n} 处" for issue, n in counts.most_common())
+        return merged[0]._replace(lines=tuple(lines), severity=_LOW_SEVERITY)
+
+    def _apply_budget(self, records: list[CommentRecord]) -> list[CommentRecord]:
+        budget = self.budget
+        if budget.paragraph:
+            by_para: dict[object, list[CommentRecord]] = {}
+            for record in records:
+                by_para.setdefault(record.first.getparent(), []).append(record)
+            records = [
+                r
+                for group in by_para.values()
+                for r in self._merge(group, budget.paragraph, self._paragraph_summary)
+            ]
+        if budget.document:
+            records = self._merge(records, budget.document, self._document_summary)
+        return records
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """把缓冲的批注写入 comments.xml 并插入范围标记，返回写入条数。"""
+        if not self._records:
+            return 0
+        raw = len(self._records)
+        records = self._apply_budget(self._records)
+        self._records = []
+
+        comments = self._part._comments_part.element
+        # 每次写入只扫描一次已有 ID（可能有外部直接添加的批注）
+        next_id = (
+            max((int(x) for x in comments.xpath("./w:comment/@w:id")), default=-1) + 1
+        )
+        stamp = OxmlElement("w:comment")
+        stamp.date = dt.datetime.now(dt.timezone.utc)
+        date = stamp.get(qn("w:date"))
+
+        for record in records:
+            comment_id = str(next_id)
+            comment = comments.makeelement(
+                qn("w:comment"),
+                {
+                    qn("w:id"): comment_id,
+                    qn("w:author"): record.author,
+                    qn("w:initials"): record.initials,
+                    qn("w:date"): date,
+                },
+            )
+            for line in record.lines:
+                comment.append(deepcopy(_line_template(line)[0]))
+            comments.append(comment)
+            record.first.insert_comment_range_start_above(next_id)
+            record.last.insert_comment_range_end_and_reference_below(next_id)
+            next_id += 1
+
+        if len(records) != raw:
+            logger.info(f"批注预算：{raw} 条批注合并为 {len(records)} 条写入")
+        return len(records)
+
+
+def flush_comments(document) -> int:
+    """写入 document 中缓冲的批注；没有写入器时什么也不做。"""
+    writer = getattr(document.part, "_wf_comment_writer", None)
+    if not isinstance(writer, CommentWriter):
+        return 0
+    return writer.flush()
@@ -56,6 +56,7 @@ SEVERITY_MAP: dict[str, str] = {
     "英文字体错误": "提醒",
     "标点问题": "提醒",
     "标点错误": "提醒",
+    "提醒汇总": "提醒",
 }
 
 _DEFAULT_SEVERITY = "错误"
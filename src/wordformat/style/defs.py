@@ -5,6 +5,7 @@
 import re
 from abc import abstractmethod
 from enum import Enum
+from functools import lru_cache
 from typing import Callable, Optional, Tuple
 
 import webcolors
@@ -14,6 +15,8 @@ from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from loguru import logger
 
+from wordformat.style.inheritance import StyleResolver
+from wordformat.style.memo import DiffMemo
 from wordformat.style.reader import (
     GetIndent,
     paragraph_get_alignment,
@@ -63,11 +66,36 @@ class UnitEnumMeta(type):
 
         return enum_cls
 
+    def __call__(cls, value):
+        """按 (类, 原始值) 驻留实例：常用取值只解析一次，之后构造即一次缓存查找。"""
+        try:
+            hash(value)
+        except TypeError:  # 不可哈希的取值不驻留
+            return cls._new_frozen(value)
+        return _interned(cls, value)
+
+    def _new_frozen(cls, value):
+        obj = super().__call__(value)
+        object.__setattr__(obj, "_frozen", True)
+        return obj
+
+
+# UnitLabelEnum 驻留表：(类, 取值类型, 取值) → 不可变实例。标签取值有限，
+# 数值取值（如任意磅值）不设上限会随长期运行的 API 进程无限增长，按 LRU 淘汰
+INTERN_SIZE = 4096
+
+
+@lru_cache(maxsize=INTERN_SIZE, typed=True)
+def _interned(cls, value) -> "UnitLabelEnum":
+    return cls._new_frozen(value)
+
 
 class UnitLabelEnum(metaclass=UnitEnumMeta):
     """
     带有单位的枚举类
     可以实现自动处理单位问题
+
+    实例不可变且按取值驻留（见 UnitEnumMeta.__call__），可在各样式对象间安全共享。
     """
 
     _LABEL_MAP = {}
@@ -81,6 +109,18 @@ class UnitLabelEnum(metaclass=UnitEnumMeta):
         member.__init__(value)
         return member
 
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(
+                f"{self.__class__.__name__} 实例不可变，不能设置 {name}"
+            )
+        object.__setattr__(self, name, value)
+
+    def _cache_rel_value(self, value):
+        """惰性计算的真实值写回（绕过不可变检查，取值本身不变）。"""
+        object.__setattr__(self, "_rel_value", value)
+        return value
+
     def __init__(self, value):
         self.value = value
         self.original_unit = None
@@ -118,15 +158,9 @@ class UnitLabelEnum(metaclass=UnitEnumMeta):
         if hasattr(self.__class__, "_LABEL_MAP"):
             label_map = self.__class__._LABEL_MAP
             if self.value in label_map:
-                self._rel_value = label_map[self.value]
-                return self._rel_value
+                return self._cache_rel_value(label_map[self.value])
         # 如果没有找到映射，返回原始值
-        self._rel_value = self.value
-        return self._rel_value
-
-    @rel_value.setter
-    def rel_value(self, value):
-        self._rel_value = value
+        return self._cache_rel_value(self.value)
 
     @property
     def rel_unit(self):
@@ -162,10 +196,10 @@ class UnitLabelEnum(metaclass=UnitEnumMeta):
             return fun(run=docx_obj, value=self.rel_value, **kwargs)
 
     @abstractmethod
-    def get_from_paragraph(self, paragraph: Paragraph):
+    def get_from_paragraph(self, paragraph: Paragraph, props=None):
         """
         从段落对象中提取当前实际值（与 self.rel_unit 单位一致）
-        子类必须实现
+        子类必须实现；props 为预先批量解析的 EffectiveParaProps，给出时优先使用
         """
         raise NotImplementedError
 
@@ -259,19 +293,15 @@ class FontSize(UnitLabelEnum):
         if self._rel_value is not None:
             return self._rel_value
         if self.value in self._LABEL_MAP:
-            return self._LABEL_MAP[self.value]
+            return self._cache_rel_value(self._LABEL_MAP[self.value])
         result = extract_unit_from_string(str(self.value))
         if result.is_valid and result.value is not None:
-            return result.value
+            return self._cache_rel_value(result.value)
         try:
-            return float(self.value)
+            return self._cache_rel_value(float(self.value))
         except (ValueError, TypeError):
             raise ValueError(f"无效的字号: '{self.value}'") from None
 
-    @rel_value.setter
-    def rel_value(self, value):
-        self._rel_value = value
-
     def base_set(self, docx_obj: Run, **kwargs):
         docx_obj.font.size = Pt(self.rel_value)
 
@@ -308,7 +338,9 @@ class FontColor(UnitLabelEnum):
 
     @property
     def rel_value(self):
-        return self._parse_color(self.value)
+        if self._rel_value is None:
+            self._cache_rel_value(self._parse_color(self.value))
+        return self._rel_value
 
     @staticmethod
     def _is_hex(color_spec: str) -> bool:
@@ -425,8 +457,11 @@ class Alignment(UnitLabelEnum):
         else:
             raise ValueError(f"无效的对齐方式: '{self.value}'")
 
-    def get_from_paragraph(self, paragraph: Paragraph):
-        alignment = paragraph_get_alignment(paragraph)
+    def get_from_paragraph(self, paragraph: Paragraph, props=None):
+        if props is not None:
+            alignment = props.alignment
+        else:
+            alignment = paragraph_get_alignment(paragraph)
         return alignment if alignment else WD_ALIGN_PARAGRAPH.LEFT
 
 
@@ -450,16 +485,18 @@ class Spacing(UnitLabelEnum):
         cm = SetSpacing.set_cm
         inch = SetSpacing.set_inch
 
-    def get_from_paragraph(self, paragraph: Paragraph) -> float | None:
+    def get_from_paragraph(self, paragraph: Paragraph, props=None) -> float | None:
         # 注意：需要区分 space_before / space_after！
         # 所以这个方法需要知道是 before 还是 after
         raise NotImplementedError("Spacing 需要知道是 before 还是 after")
 
 
 class SpaceBefore(Spacing):
-    def get_from_paragraph(self, paragraph: Paragraph) -> float | None:
+    def get_from_paragraph(self, paragraph: Paragraph, props=None) -> float | None:
         unit = self.rel_unit
         if unit == "hang":
+            if props is not None:
+                return props.space_before
             return paragraph_get_space_before(paragraph)
         elif unit in ("pt", "mm", "cm", "inch"):
             indent = paragraph.paragraph_format.space_before
@@ -469,9 +506,11 @@ class SpaceBefore(Spacing):
 
 
 class SpaceAfter(Spacing):
-    def get_from_paragraph(self, paragraph: Paragraph) -> float | None:
+    def get_from_paragraph(self, paragraph: Paragraph, props=None) -> float | None:
         unit = self.rel_unit
         if unit == "hang":
+            if props is not None:
+                return props.space_after
             return paragraph_get_space_after(paragraph)
         elif unit in ("pt", "mm", "cm", "inch"):
             indent = paragraph.paragraph_format.space_after
@@ -513,7 +552,9 @@ class LineSpacingRule(UnitLabelEnum):
         else:
             raise ValueError(f"无效的行距选项: '{self.value}'")
 
-    def get_from_paragraph(self, paragraph: Paragraph):
+    def get_from_paragraph(self, paragraph: Paragraph, props=None):
+        if props is not None:
+            return props.line_spacing_rule
         return paragraph_get_line_spacing_rule(paragraph)
 
 
@@ -549,7 +590,9 @@ class LineSpacing(UnitLabelEnum):
         else:
             raise ValueError(f"无效的行距: '{self.value}'")
 
-    def get_from_paragraph(self, paragraph: Paragraph):
+    def get_from_paragraph(self, paragraph: Paragraph, props=None):
+        if props is not None:
+            return props.line_spacing
         return paragraph_get_line_spacing(paragraph)
 
 
@@ -567,9 +610,11 @@ class Indent(UnitLabelEnum):
 
 
 class LeftIndent(Indent):
-    def get_from_paragraph(self, paragraph: Paragraph) -> float | None:
+    def get_from_paragraph(self, paragraph: Paragraph, props=None) -> float | None:
         unit = self.rel_unit
         if unit == "char":
+            if props is not None:
+                return props.left_indent
             return GetIndent.left_indent(paragraph)
         elif unit in ("pt", "mm", "cm", "inch"):
             indent = paragraph.paragraph_format.left_indent
@@ -579,9 +624,11 @@ class LeftIndent(Indent):
 
 
 class RightIndent(Indent):
-    def get_from_paragraph(self, paragraph: Paragraph) -> float | None:
+    def get_from_paragraph(self, paragraph: Paragraph, props=None) -> float | None:
         unit = self.rel_unit
         if unit == "char":
+            if props is not None:
+                return props.right_indent
             return GetIndent.right_indent(paragraph)
         elif unit in ("pt", "mm", "cm", "inch"):
             indent = paragraph.paragraph_format.right_indent
@@ -602,9 +649,11 @@ class FirstLineIndent(UnitLabelEnum):
         cm = SetFirstLineIndent.set_cm
         inch = SetFirstLineIndent.set_inch
 
-    def get_from_paragraph(self, paragraph: Paragraph) -> float | None:
+    def get_from_paragraph(self, paragraph: Paragraph, props=None) -> float | None:
         unit = self.rel_unit
         if unit == "char":
+            if props is not None:
+                return props.first_line_indent
             return paragraph_get_first_line_indent(paragraph)
         elif unit in ("pt", "mm", "cm", "inch"):
             indent = paragraph.paragraph_format.first_line_indent
@@ -655,7 +704,9 @@ class BuiltInStyle(UnitLabelEnum):
             ensure_style_exists(doc, style_name)
             docx_obj.style = style_name
 
-    def get_from_paragraph(self, paragraph: Paragraph):
+    def get_from_paragraph(self, paragraph: Paragraph, props=None):
+        if props is not None:
+            return props.builtin_style_name
         return paragraph_get_builtin_style_name(paragraph)
 
 
@@ -701,6 +752,8 @@ def ensure_style_exists(doc, style_name: str):
         else:
             base_style = None
         new_style = doc.styles.add_style(style_name, 1)  # WD_STYLE_TYPE.PARAGRAPH = 1
+        StyleResolver.invalidate(doc)
+        DiffMemo.invalidate(doc)
         if base_style:
             new_style.base_style = base_style
 
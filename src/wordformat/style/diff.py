@@ -10,15 +10,12 @@ from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from loguru import logger
 
+from wordformat.config.compiled import CompiledConfig
 from wordformat.config.loader import get_config
 from wordformat.style.reader import (
-    run_get_font_bold,
-    run_get_font_color,
-    run_get_font_italic,
-    run_get_font_name,
-    run_get_font_name_en,
-    run_get_font_size_pt,
-    run_get_font_underline,
+    _real_elem,
+    paragraph_get_effective_props,
+    run_get_effective_props,
 )
 from wordformat.utils import has_chinese
 
@@ -37,6 +34,8 @@ from .defs import (
     SpaceAfter,
     SpaceBefore,
 )
+from .issues import Issue, join_issues
+from .memo import DiffMemo
 
 
 @dataclass
@@ -62,6 +61,7 @@ class WarningConfig:
     builtin_style_name: bool = True
 
 
+# 显式覆盖（测试用）；正常流程按当前配置派生，不写此变量
 _warnings: WarningConfig | None = None
 
 
@@ -72,20 +72,30 @@ _WARNING_KEY_MAP = {
 }
 
 
+def _build_warnings(config) -> WarningConfig:
+    # 复制一份：配置对象可能被多个请求共享，不能原地改写
+    cfg = dict(config.get("style_checks_warning", {}) or {}) if config else {}
+    # 兼容旧 key 名
+    for old, new in _WARNING_KEY_MAP.items():
+        if old in cfg and new not in cfg:
+            cfg[new] = cfg.pop(old)
+    return WarningConfig(**{**dataclasses.asdict(WarningConfig()), **cfg})
+
+
+_DEFAULT_WARNINGS = WarningConfig()
+
+
 def _load_warnings() -> WarningConfig:
-    global _warnings
+    """当前配置（见 config.loader）的警告开关；编译配置上按配置缓存，不跨请求残留。"""
     if _warnings is not None:
         return _warnings
     try:
-        cfg = get_config().get("style_checks_warning", {})
+        config = get_config()
     except RuntimeError:
-        cfg = {}
-    # 兼容旧 key 名
-    for old, new in _WARNING_KEY_MAP.items():
-        if old in cfg and new not in cfg:
-            cfg[new] = cfg.pop(old)
-    _warnings = WarningConfig(**{**dataclasses.asdict(WarningConfig()), **cfg})
-    return _warnings
+        return _DEFAULT_WARNINGS
+    if isinstance(config, CompiledConfig):
+        return config.derived("style_checks_warning", lambda: _build_warnings(config))
+    return _build_warnings(config)
 
 
 def _pt_to_label(pt: float) -> str:
@@ -191,15 +201,66 @@ class CharacterStyle:
         self.italic: bool = italic
         self.underline: bool = underline
 
-    def diff_from_run(self, run: Run) -> list[DIFFResult]:  # noqa c901
+    @classmethod
+    def from_config(cls, config: Any) -> "CharacterStyle":
+        """从节点配置（chinese_font_name、font_size 等字段）构建 CharacterStyle。"""
+        return cls(
+            font_name_cn=config.chinese_font_name,
+            font_name_en=config.english_font_name,
+            font_size=config.font_size,
+            font_color=config.font_color,
+            bold=config.bold,
+            italic=config.italic,
+            underline=config.underline,
+        )
+
+    def signature(self) -> tuple:
+        """期待样式的取值签名，作为 diff 缓存键的一部分。"""
+        return (
+            self.font_name_cn.value,
+            self.font_name_en.value,
+            self.font_size.value,
+            self.font_color.value,
+            self.bold,
+            self.italic,
+            self.underline,
+        )
+
+    def diff_from_run(self, run: Run) -> list[DIFFResult]:
         """
         检查段落样式和指定样式是否一致
-        """
 
+        相同签名（直接 rPr、段落样式、期待样式、是否含中文）的 run 复用缓存结果。
+        """
+        has_cjk = has_chinese(run.text)
+        memo = DiffMemo.for_obj(run) if _real_elem(run) else None
+        if memo is None:
+            return self._diff_from_run(run, has_cjk)
+        return self._memo_diff_run(memo, run, has_cjk)
+
+    def _memo_diff_run(
+        self, memo: DiffMemo, run: Run, has_cjk: bool, key: tuple | None = None
+    ) -> list[DIFFResult]:
+        if key is None:
+            key = memo.run_key(run, self.signature(), has_cjk)
+        diffs = memo.get(memo.runs, key)
+        if diffs is None:
+            diffs = self._diff_from_run(run, has_cjk, memo.run_inherited)
+            memo.put(memo.runs, key, diffs)
+        return diffs
+
+    def _diff_from_run(
+        self, run: Run, has_cjk: bool, inherited_cache: dict | None = None
+    ) -> list[DIFFResult]:
+        # 一次遍历继承链取齐全部字符属性（直接→字符样式→段落样式→docDefaults）
+        return self._compare_run(run_get_effective_props(run, inherited_cache), has_cjk)
+
+    def _compare_run(self, props, has_cjk: bool) -> list[DIFFResult]:  # noqa c901
+        """有效字符属性快照与期待样式逐项比对。"""
         diffs = []
 
-        # 1. 加粗（沿继承链：直接→字符样式→段落样式→docDefaults）
-        bold = run_get_font_bold(run)
+        # 1. 加粗
+        bold = props.bold
         if bold != self.bold:
             diffs.append(
                 DIFFResult(
@@ -210,8 +271,8 @@ class CharacterStyle:
                     1,
                 )
             )
-        # 2. 斜体（沿继承链解析）
-        italic = run_get_font_italic(run)
+        # 2. 斜体
+        italic = props.italic
         if italic != self.italic:
             diffs.append(
                 DIFFResult(
@@ -223,8 +284,8 @@ class CharacterStyle:
                 )
             )
 
-        # 3. 下划线（沿继承链解析）
-        underline = run_get_font_underline(run)
+        # 3. 下划线
+        underline = props.underline
         if underline != self.underline:
             diffs.append(
                 DIFFResult(
@@ -237,7 +298,7 @@ class CharacterStyle:
             )
 
         # 4. 字号
-        current_size = run_get_font_size_pt(run)
+        current_size = props.size_pt
         if current_size != self.font_size:
             diffs.append(
                 DIFFResult(
@@ -250,7 +311,7 @@ class CharacterStyle:
             )
 
         # 5. 字体颜色
-        current_color = run_get_font_color(run)
+        current_color = props.color
         if self.font_color != current_color:
             # current_color 为 None 表示使用了主题色（themeColor），rgb 只是猜测值
             color_display = (
@@ -267,8 +328,7 @@ class CharacterStyle:
             )
 
         # 6. 东亚字体（仅当 run 含中文字符时才检查）
-        font_name = run_get_font_name(run) or ""
-        has_cjk = has_chinese(run.text)
+        font_name = props.font_name or ""
         if has_cjk and str(font_name).lower() != str(self.font_name_cn).lower():
             diffs.append(
                 DIFFResult(
@@ -280,7 +340,7 @@ class CharacterStyle:
                 )
             )
         # 7. 非东亚字体（沿继承链，含主题字体；未设置视为空）
-        ascii_font = run_get_font_name_en(run) or ""
+        ascii_font = props.font_name_en or ""
         if str(ascii_font).lower() != str(self.font_name_en).lower():
             diffs.append(
                 DIFFResult(
@@ -296,7 +356,37 @@ class CharacterStyle:
 
     def apply_to_run(self, run: Run):
         """将字符样式应用到 docx.Run 对象"""
-        diffs = self.diff_from_run(run)
+        return self._write_run(run, self.diff_from_run(run))
+
+    def fix_run(self, run: Run) -> list[DIFFResult]:
+        """应用字符样式，返回修正后仍残留的差异（等价于 apply_to_run 后再 diff_from_run）。
+
+        写回的都是直接 rPr，继承值不变：修正前后两次比对共用按样式缓存的继承值，
+        确认修正结果只需重读直接 rPr，不再重走继承链。同签名的 run 第二次起
+        直接盖上首次写回得到的 rPr（见 DiffMemo.stamp）。
+        """
+        has_cjk = has_chinese(run.text)
+        memo = DiffMemo.for_obj(run) if _real_elem(run) else None
+        if memo is None:
+            diffs = self._diff_from_run(run, has_cjk)
+            if not diffs:
+                return []
+            self._write_run(run, diffs)
+            return self._diff_from_run(run, has_cjk)
+        key = memo.run_key(run, self.signature(), has_cjk)
+        residual = memo.stamp(memo.run_stamps, key, run._element)
+        if residual is not None:
+            return residual
+        diffs = self._memo_diff_run(memo, run, has_cjk, key)
+        if not diffs:
+            return []
+        self._write_run(run, diffs)
+        residual = self._memo_diff_run(memo, run, has_cjk)
+        memo.put_stamp(memo.run_stamps, key, run._element, residual)
+        return residual
+
+    def _write_run(self, run: Run, diffs: list[DIFFResult]) -> list[DIFFResult]:
+        """按差异项写回 run 直接格式，差异项 comment 改为修正日志。"""
         result = []
         for diff in diffs:
             tmp_str = ""
@@ -337,20 +427,29 @@ class CharacterStyle:
     def to_string(
         value: list[DIFFResult], target: str = "", warnings: WarningConfig | None = None
     ) -> str:
-        if warnings is None:
-            warnings = _load_warnings()
         """将 DIFFResult 列表转为标准格式批注文本。"""
-        from .comments import format_comment
+        return join_issues(CharacterStyle.to_issues(value, target, warnings))
 
-        t = []
+    @staticmethod
+    def to_issues(
+        value: list[DIFFResult], target: str = "", warnings: WarningConfig | None = None
+    ) -> list[Issue]:
+        """将 DIFFResult 列表转为 Issue 记录（按 warnings 开关过滤）。"""
+        if warnings is None:
+            warnings = _load_warnings()
+        issues = []
         for diff in value:
             if not getattr(warnings, diff.diff_type, True):
                 continue
-            prop = CHAR_DIFF_LABELS.get(diff.diff_type, diff.diff_type)
-            actual = _format_char_value(diff.diff_type, diff.current_value)
-            standard = _format_char_value(diff.diff_type, diff.expected_value)
-            t.append(format_comment(target, prop, actual, standard))
-        return "\n".join(t)
+            issues.append(
+                Issue(
+                    target,
+                    CHAR_DIFF_LABELS.get(diff.diff_type, diff.diff_type),
+                    _format_char_value(diff.diff_type, diff.current_value),
+                    _format_char_value(diff.diff_type, diff.expected_value),
+                )
+            )
+        return issues
 
 
 class ParagraphStyle:
@@ -397,10 +496,59 @@ class ParagraphStyle:
         self.right_indent: RightIndent = RightIndent(right_indent)
         self.builtin_style_name: BuiltInStyle = BuiltInStyle(builtin_style_name)
 
-    def apply_to_paragraph(self, paragraph: Paragraph) -> list[DIFFResult]:  # noqa C901
+    def signature(self) -> tuple:
+        """期待样式的取值签名，作为 diff 缓存键的一部分。"""
+        return (
+            self.alignment.value,
+            self.space_before.value,
+            self.space_after.value,
+            self.line_spacing.value,
+            self.line_spacingrule.value,
+            self.first_line_indent.value,
+            self.left_indent.value,
+            self.right_indent.value,
+            self.builtin_style_name.value,
+        )
+
+    def apply_to_paragraph(self, paragraph: Paragraph) -> list[DIFFResult]:
         """将段落样式应用到 docx.Paragraph 对象，返回样式修正结果"""
         # 先检测当前段落与目标样式的差异
-        diffs = self.diff_from_paragraph(paragraph)
+        return self._write_paragraph(paragraph, self.diff_from_paragraph(paragraph))
+
+    def fix_paragraph(self, paragraph: Paragraph) -> list[DIFFResult]:
+        """应用段落样式，返回修正后仍残留的差异（等价于 apply_to_paragraph 后再 diff）。
+
+        修正前后两次比对共用按段落样式缓存的继承值，确认结果只需重读直接 pPr；
+        改写了段落样式时按新样式取（或解析一次）继承值。同签名的段落第二次起
+        直接盖上首次写回得到的 pPr（见 DiffMemo.stamp）。
+        """
+        if not paragraph:
+            return []
+        memo = DiffMemo.for_obj(paragraph) if _real_elem(paragraph) else None
+        if memo is None:
+            diffs = self._diff_from_paragraph(paragraph)
+            if not diffs:
+                return []
+            self._write_paragraph(paragraph, diffs)
+            return self._diff_from_paragraph(paragraph)
+        key = memo.para_key(paragraph, self.signature())
+        residual = memo.stamp(memo.para_stamps, key, paragraph._element)
+        if residual is not None:
+            return residual
+        diffs = self._memo_diff_paragraph(memo, paragraph, key)
+        if not diffs:
+            return []
+        self._write_paragraph(paragraph, diffs)
+        # 改写样式时可能新建了样式定义，旧 memo 已失效，重新取
+        memo = DiffMemo.for_obj(paragraph)
+        residual = self._memo_diff_paragraph(memo, paragraph)
+        memo.put_stamp(memo.para_stamps, key, paragraph._element, residual)
+        return residual
+
+    def _write_paragraph(  # noqa C901
+        self, paragraph: Paragraph, diffs: list[DIFFResult]
+    ) -> list[DIFFResult]:
+        """按差异项写回段落直接格式，返回样式修正结果。"""
         result = []
 
         # 第一步：先应用 builtin_style_name（样式赋值会重置对齐、缩进等，
@@ -458,13 +606,38 @@ class ParagraphStyle:
         # 返回所有修正结果，便于外部查看/记录
         return result
 
-    def diff_from_paragraph(self, paragraph: Paragraph) -> list[DIFFResult]:  # noqa C901
-        """检查当前段落样式与给定段落样式的差异"""
+    def diff_from_paragraph(self, paragraph: Paragraph) -> list[DIFFResult]:
+        """检查当前段落样式与给定段落样式的差异；相同 pPr + 期待样式复用缓存结果。"""
         if not paragraph:
             return []
+        memo = DiffMemo.for_obj(paragraph) if _real_elem(paragraph) else None
+        if memo is None:
+            return self._diff_from_paragraph(paragraph)
+        return self._memo_diff_paragraph(memo, paragraph)
+
+    def _memo_diff_paragraph(
+        self, memo: DiffMemo, paragraph: Paragraph, key: tuple | None = None
+    ) -> list[DIFFResult]:
+        if key is None:
+            key = memo.para_key(paragraph, self.signature())
+        diffs = memo.get(memo.paras, key)
+        if diffs is None:
+            diffs = self._diff_from_paragraph(paragraph, memo.para_inherited)
+            memo.put(memo.paras, key, diffs)
+        return diffs
+
+    def _diff_from_paragraph(
+        self, paragraph: Paragraph, inherited_cache: dict | None = None
+    ) -> list[DIFFResult]:
+        # 一次遍历继承链取齐全部段落属性，各 get_from_paragraph 直接取用
+        props = paragraph_get_effective_props(paragraph, inherited_cache)
+        return self._compare_paragraph(paragraph, props)
+
+    def _compare_paragraph(self, paragraph: Paragraph, props) -> list[DIFFResult]:  # noqa C901
+        """有效段落属性快照与期待样式逐项比对（物理单位项直接读段落直接格式）。"""
         diffs = []
         # 对齐方式
-        alignment = self.alignment.get_from_paragraph(paragraph)
+        alignment = self.alignment.get_from_paragraph(paragraph, props)
         if self.alignment != alignment:
             diffs.append(
                 DIFFResult(
@@ -476,7 +649,7 @@ class ParagraphStyle:
                 )
             )
         # 段前间距
-        space_before = self.space_before.get_from_paragraph(paragraph)
+        space_before = self.space_before.get_from_paragraph(paragraph, props)
         if self.space_before != space_before:
             diffs.append(
                 DIFFResult(
@@ -488,7 +661,7 @@ class ParagraphStyle:
                 )
             )
         # 段后间距
-        space_after = self.space_after.get_from_paragraph(paragraph)
+        space_after = self.space_after.get_from_paragraph(paragraph, props)
         if self.space_after != space_after:
             diffs.append(
                 DIFFResult(
@@ -500,7 +673,7 @@ class ParagraphStyle:
                 )
             )
         # 行距选项
-        linespacingrule = self.line_spacingrule.get_from_paragraph(paragraph)
+        linespacingrule = self.line_spacingrule.get_from_paragraph(paragraph, props)
         if self.line_spacingrule != linespacingrule:
             diffs.append(
                 DIFFResult(
@@ -512,7 +685,7 @@ class ParagraphStyle:
                 )
             )
         # 行距
-        line_spacing = self.line_spacing.get_from_paragraph(paragraph)
+        line_spacing = self.line_spacing.get_from_paragraph(paragraph, props)
         if self.line_spacing != line_spacing:
             diffs.append(
                 DIFFResult(
@@ -524,7 +697,7 @@ class ParagraphStyle:
                 )
             )
         # 首行缩进
-        first_line_indent = self.first_line_indent.get_from_paragraph(paragraph)
+        first_line_indent = self.first_line_indent.get_from_paragraph(paragraph, props)
         if self.first_line_indent != first_line_indent:
             diffs.append(
                 DIFFResult(
@@ -536,7 +709,7 @@ class ParagraphStyle:
                 )
             )
         # 缩进：文本之前（None = 未设置，视为0）
-        left_indent = self.left_indent.get_from_paragraph(paragraph) or 0
+        left_indent = self.left_indent.get_from_paragraph(paragraph, props) or 0
         if self.left_indent != left_indent:
             diffs.append(
                 DIFFResult(
@@ -548,7 +721,7 @@ class ParagraphStyle:
                 )
             )
         # 文本之后缩进（None = 未设置，视为0）
-        right_indent = self.right_indent.get_from_paragraph(paragraph) or 0
+        right_indent = self.right_indent.get_from_paragraph(paragraph, props) or 0
         if self.right_indent != right_indent:
             diffs.append(
                 DIFFResult(
@@ -560,7 +733,9 @@ class ParagraphStyle:
                 )
             )
         # 样式
-        builtin_style_name = self.builtin_style_name.get_from_paragraph(paragraph)
+        builtin_style_name = self.builtin_style_name.get_from_paragraph(
+            paragraph, props
+        )
         if self.builtin_style_name != builtin_style_name:
             diffs.append(
                 DIFFResult(
@@ -577,20 +752,29 @@ class ParagraphStyle:
     def to_string(
         value: list[DIFFResult], target: str = "", warnings: WarningConfig | None = None
     ) -> str:
-        if warnings is None:
-            warnings = _load_warnings()
         """将 DIFFResult 列表转为标准格式批注文本。"""
-        from .comments import format_comment
+        return join_issues(ParagraphStyle.to_issues(value, target, warnings))
 
-        t = []
+    @staticmethod
+    def to_issues(
+        value: list[DIFFResult], target: str = "", warnings: WarningConfig | None = None
+    ) -> list[Issue]:
+        """将 DIFFResult 列表转为 Issue 记录（按 warnings 开关过滤）。"""
+        if warnings is None:
+            warnings = _load_warnings()
+        issues = []
         for diff in value:
             if not getattr(warnings, diff.diff_type, True):
                 continue
-            prop = PARA_DIFF_LABELS.get(diff.diff_type, diff.diff_type)
-            actual = _format_para_value(diff.diff_type, diff.current_value)
-            standard = _format_para_value(diff.diff_type, diff.expected_value)
-            t.append(format_comment(target, prop, actual, standard))
-        return "\n".join(t)
+            issues.append(
+                Issue(
+                    target,
+                    PARA_DIFF_LABELS.get(diff.diff_type, diff.diff_type),
+                    _format_para_value(diff.diff_type, diff.current_value),
+                    _format_para_value(diff.diff_type, diff.expected_value),
+                )
+            )
+        return issues
 
     @classmethod
     def from_config(cls, config: Any) -> "ParagraphStyle":
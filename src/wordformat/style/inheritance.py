@@ -12,6 +12,7 @@
 
 扩展方式：新增一个属性 = 写一个 `extractor(elem) -> value | _MISS` 函数即可，
 无需再关心继承链遍历——遍历由 StyleResolver 统一负责，杜绝「查样式漏继承」。
+需要同时取多个属性时用 `resolve_run_many` / `resolve_para_many`，整条链只走一遍。
 """
 
 from __future__ import annotations
@@ -308,19 +309,28 @@ class StyleResolver:
 
     @classmethod
     def _get_cached(cls, obj) -> StyleResolver:
+        # 缓存挂在 DocumentPart 上：part.document 每次访问都新建代理对象，挂不住
         try:
-            document = obj.part.document
+            part = obj.part
+            document = part.document
         except Exception:
             return cls(None)  # 拿不到文档（如 Mock）→ 仅直接格式
-        cached = getattr(document, "_wf_style_resolver", None)
+        cached = getattr(part, "_wf_style_resolver", None)
         if not isinstance(cached, StyleResolver):
             cached = cls(document)
             try:
-                document._wf_style_resolver = cached
+                part._wf_style_resolver = cached
             except Exception:
                 pass
         return cached
 
+    @classmethod
+    def invalidate(cls, obj) -> None:
+        """丢弃 obj 所属文档的缓存 resolver（新增/修改样式定义后调用）。"""
+        part = getattr(obj, "part", None)
+        if part is not None and hasattr(part, "_wf_style_resolver"):
+            del part._wf_style_resolver
+
     @classmethod
     def for_run(cls, run) -> StyleResolver:
         return cls._get_cached(run)
@@ -348,15 +358,35 @@ class StyleResolver:
         pStyle = self._child(pPr, "w:pStyle")
         return pStyle.get(qn("w:val")) if pStyle is not None else None
 
+    def para_style_name(self, paragraph) -> str | None:
+        """段落样式名（同 paragraph.style.name，已小写）；无法判定返回 None。
+
+        直接查已建好的 styleId 索引，避免 python-docx 每次线性扫描全部样式找默认样式。
+        """
+        pPr = paragraph._element.find(qn("w:pPr"))
+        style = self._by_id.get(self._para_style_id(pPr) if pPr is not None else None)
+        if style is None or style.get(qn("w:type")) != "paragraph":
+            style = self._by_id.get(self._default_para_style_id)
+        if style is None:
+            return None
+        name = style.find(qn("w:name"))
+        if name is None or not name.get(qn("w:val")):
+            return None
+        return name.get(qn("w:val")).lower()
+
     # -- 源链 --
     def run_rpr_sources(self, run):
         """生成 run 字符属性继承链源：直接 rPr -> rStyle 链 -> 段落样式链 -> docDefaults。"""
         rPr = run._element.find(qn("w:rPr"))
         if rPr is not None:
             yield rPr
-            if rPr.style is not None:  # CT_RPr.style → rStyle/@val
-                for st in self._style_chain(rPr.style):
-                    yield self._child(st, "w:rPr")
+        yield from self.run_inherited_sources(run, rPr)
+
+    def run_inherited_sources(self, run, rPr):
+        """直接 rPr 之下的继承链源：rStyle 链 -> 段落样式链 -> docDefaults。"""
+        if rPr is not None and rPr.style is not None:  # CT_RPr.style → rStyle/@val
+            for st in self._style_chain(rPr.style):
+                yield self._child(st, "w:rPr")
         # 段落样式链
         pPr = getattr(run._parent, "_p", None)
         pPr = pPr.find(qn("w:pPr")) if pPr is not None else None
@@ -371,6 +401,10 @@ class StyleResolver:
         """生成段落属性继承链源：直接 pPr -> 段落样式链 -> docDefaults。"""
         pPr = paragraph._element.find(qn("w:pPr"))
         yield pPr
+        yield from self.para_inherited_sources(pPr)
+
+    def para_inherited_sources(self, pPr):
+        """直接 pPr 之下的继承链源：段落样式链 -> docDefaults。"""
         pid = self._para_style_id(pPr) if pPr is not None else None
         if pid is None:
             pid = self._default_para_style_id
@@ -402,8 +436,59 @@ class StyleResolver:
     def resolve_font(self, run, extractor) -> str | None:
         """字体名解析：把 ThemeRef 兑现为具体字体名；未设置 → None。"""
         val = self._resolve(self.run_rpr_sources(run), extractor)
+        return self._theme_font(val)
+
+    def _theme_font(self, val) -> str | None:
+        """把字体提取结果兑现为字体名：ThemeRef 查主题表，_MISS → None。"""
         if val is _MISS:
             return None
         if isinstance(val, ThemeRef):
             return self.theme.resolve(val.token)
         return val
+
+    # -- 批量解析（一次遍历继承链取多个属性）--
+    @staticmethod
+    def _resolve_many(sources, extractors: dict) -> dict:
+        """单次遍历源链，对每个源只跑尚未命中的提取器；未命中的键值为 _MISS。"""
+        result = dict.fromkeys(extractors, _MISS)
+        pending = dict(extractors)
+        for src in sources:
+            if src is None:
+                continue
+            for name, extractor in tuple(pending.items()):
+                val = extractor(src)
+                if val is not _MISS:
+                    result[name] = val
+                    del pending[name]
+            if not pending:
+                break
+        return result
+
+    def resolve_run_many(self, run, extractors: dict) -> dict:
+        """一次遍历 run 继承链，返回 {名称: 值 | _MISS}。"""
+        return self._resolve_many(self.run_rpr_sources(run), extractors)
+
+    def resolve_para_many(self, paragraph, extractors: dict) -> dict:
+        """一次遍历段落继承链，返回 {名称: 值 | _MISS}。"""
+        return self._resolve_many(self.para_ppr_sources(paragraph), extractors)
+
+    # -- 分层解析：继承值只取决于样式，可按样式缓存；直接层每次重读 --
+    @staticmethod
+    def direct_many(elem, extractors: dict) -> dict:
+        """只读直接 rPr / pPr 一层，返回 {名称: 值 | _MISS}。"""
+        if elem is None:
+            return dict.fromkeys(extractors, _MISS)
+        return {name: extractor(elem) for name, extractor in extractors.items()}
+
+    @staticmethod
+    def overlay(direct: dict, inherited: dict) -> dict:
+        """直接层覆盖继承层，得到与 _resolve_many 相同的结果。"""
+        return {k: inherited[k] if v is _MISS else v for k, v in direct.items()}
+
+    def resolve_run_inherited(self, run, rPr, extractors: dict) -> dict:
+        """一次遍历直接 rPr 之下的继承链（rStyle -> 段落样式 -> docDefaults）。"""
+        return self._resolve_many(self.run_inherited_sources(run, rPr), extractors)
+
+    def resolve_para_inherited(self, pPr, extractors: dict) -> dict:
+        """一次遍历直接 pPr 之下的继承链（段落样式 -> docDefaults）。"""
+        return self._resolve_many(self.para_inherited_sources(pPr), extractors)
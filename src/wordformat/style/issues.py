@@ -0,0 +1,133 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 18:10
+# @Author  : afish
+# @File    : issues.py
+"""结构化的检查问题记录与每文档的问题收集器。
+
+规则产出的每个问题是一条 Issue（位置、问题类型、现状、规范、严重等级），
+批注文本由 Issue 生成（见 comments.format_comment），而不是反过来从批注字符串解析。
+仍以自由文本调用 add_comment 的规则由 Issue.parse 兜底拆成记录。
+
+IssueCollector 挂在 DocumentPart 上，收集整篇文档的问题和按批注计的错误统计，
+供检测报告摘要和 --report-only 的 JSON 输出使用。
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+
+from wordformat.style.comments import (
+    _DEFAULT_SEVERITY,
+    SEVERITY_MAP,
+    SEVERITY_ORDER,
+    format_comment,
+    get_severity,
+)
+
+_LOW_SEVERITY = "提醒"
+
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    """一条检查问题。"""
+
+    location: str  # 位置（节点中文标签，如"正文段落"）
+    property: str  # 问题类型（如"字号错误"）
+    actual: str  # 现状
+    expected: str  # 规范
+    severity: str = ""  # 严重等级，留空时按问题类型查 SEVERITY_MAP
+    node_type: str = ""  # 所属节点类型（NODE_TYPE）
+    fingerprint: str = ""  # 所属段落指纹（JSON 中的 fingerprint）
+
+    def __post_init__(self):
+        if not self.severity:
+            object.__setattr__(
+                self, "severity", SEVERITY_MAP.get(self.property, _DEFAULT_SEVERITY)
+            )
+
+    @property
+    def text(self) -> str:
+        """标准批注文本：位置-问题类型：现状，规范：标准。"""
+        return format_comment(self.location, self.property, self.actual, self.expected)
+
+    @classmethod
+    def parse(cls, text: str) -> list[Issue]:
+        """把自由文本批注按行拆成 Issue（无法解析的部分整行记为现状）。"""
+        issues = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            prefix, sep, tail = line.partition("：")
+            location, dash, prop = prefix.partition("-")
+            if not (sep and dash):
+                issues.append(cls("", "", line, "", get_severity(line)))
+                continue
+            if "-" in prop:
+                prop = prop.rsplit("-", 1)[-1]
+            actual, _, expected = tail.partition("，规范：")
+            issues.append(cls(location, prop, actual, expected, get_severity(line)))
+        return issues
+
+    def bind(self, node_type: str, fingerprint: str) -> Issue:
+        """补上所属节点信息。"""
+        return replace(self, node_type=node_type, fingerprint=fingerprint)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def join_issues(issues: list[Issue]) -> str:
+    """多条问题合成一条批注文本（每条一行）。"""
+    return "\n".join(issue.text for issue in issues)
+
+
+def max_severity(issues) -> str:
+    """一组问题中最严重的等级（无问题时为提醒）。"""
+    result = _LOW_SEVERITY
+    for issue in issues:
+        if SEVERITY_ORDER.get(issue.severity, 3) < SEVERITY_ORDER.get(result, 3):
+            result = issue.severity
+    return result
+
+
+class IssueCollector:
+    """每文档一份的问题收集器。
+
+    issues 按产出顺序保存全部问题；stats 按批注计数（一条批注记一次，等级取其中最严重的），
+    与检测报告中的"检测错误数"口径一致。write_comments 为 False 时节点不写批注（仅出报告）。
+    """
+
+    __slots__ = ("issues", "stats", "write_comments")
+
+    def __init__(self, write_comments: bool = True):
+        self.issues: list[Issue] = []
+        self.stats: dict[str, int] = {"total": 0, "错误": 0, "提醒": 0}
+        self.write_comments = write_comments
+
+    @classmethod
+    def for_document(cls, document) -> IssueCollector:
+        """取（或创建）挂在 DocumentPart 上的收集器。"""
+        part = document.part
+        cached = getattr(part, "_wf_issues", None)
+        if not isinstance(cached, IssueCollector):
+            cached = cls()
+            part._wf_issues = cached
+        return cached
+
+    def record(self, issues: list[Issue]) -> str:
+        """登记一条批注包含的问题，返回该批注的严重等级。"""
+        severity = max_severity(issues)
+        self.issues.extend(issues)
+        self.stats["total"] += 1
+        self.stats[severity] = self.stats.get(severity, 0) + 1
+        return severity
+
+    def merge(self, other: IssueCollector) -> None:
+        """把另一个收集器（如分片检查的子进程结果）的问题和统计接在本收集器之后。"""
+        self.issues.extend(other.issues)
+        for key, count in other.stats.items():
+            self.stats[key] = self.stats.get(key, 0) + count
+
+    def to_list(self) -> list[dict]:
+        return [issue.to_dict() for issue in self.issues]
@@ -0,0 +1,182 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 10:20
+# @Author  : afish
+# @File    : memo.py
+"""按「格式签名」缓存 run / 段落的 diff 结果（每文档一份）。
+
+论文正文里成千上万个 run 共享相同的直接 rPr、段落样式和期待样式，
+diff 结果完全一致。这里把决定 diff 结果的全部输入压成一个签名：
+
+    run  : 直接 rPr 的 XML、所在段落的 pStyle、期待 CharacterStyle 的取值、是否含中文
+    段落 : 直接 pPr 的 XML（含 pStyle）、期待 ParagraphStyle 的取值
+
+签名相同即直接复用上次的结果（返回副本，调用方可放心修改 comment）。
+继承链上的样式定义由 StyleResolver 每文档缓存一次，memo 与其同挂在 DocumentPart 上；
+签名未命中时，直接格式之下的继承值也按样式组合缓存，只需重读直接 rPr / pPr。
+
+apply 模式的写回同理：修正前签名相同，逐项写回后的 rPr / pPr 也相同。首次写回后
+把结果元素存为「印章」，之后同签名的 run / 段落直接整体替换为印章副本，
+不再逐属性清理冲突属性、创建子元素。印章由原 rPr / pPr 整体推得，numPr、rStyle
+等无关子元素原样保留。印章中的样式 ID 只对本文档有效，故同样每文档一份。
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+
+from docx.oxml.ns import qn
+from lxml import etree
+
+_R = qn("w:r")
+_RPR = qn("w:rPr")
+_PPR = qn("w:pPr")
+_PSTYLE = qn("w:pStyle")
+_VAL = qn("w:val")
+
+
+def _xml_key(elem) -> bytes:
+    """元素序列化为 bytes 作为签名的一部分；None → b""。"""
+    return b"" if elem is None else etree.tostring(elem)
+
+
+class DiffMemo:
+    """run / 段落 diff 结果缓存，附带命中统计。"""
+
+    def __init__(self):
+        self.runs: dict[tuple, tuple] = {}
+        self.paras: dict[tuple, tuple] = {}
+        # 直接 rPr / pPr 之下的继承值，只取决于样式：run 按 (rStyle, 段落样式)，段落按段落样式
+        self.run_inherited: dict[tuple, dict] = {}
+        self.para_inherited: dict[str | None, dict] = {}
+        # 修正前签名 → (写回后的 rPr / pPr 元素, 写回后残留的 diff)
+        self.run_stamps: dict[tuple, tuple] = {}
+        self.para_stamps: dict[tuple, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stamped = 0
+
+    @classmethod
+    def for_part(cls, part) -> DiffMemo | None:
+        """取（或创建）挂在 DocumentPart 上的 memo；part 不可写时返回 None。
+
+        挂在 part 而非 document 上：part.document 每次访问都新建代理对象。
+        """
+        if part is None:
+            return None
+        cached = getattr(part, "_wf_diff_memo", None)
+        if not isinstance(cached, DiffMemo):
+            cached = cls()
+            try:
+                part._wf_diff_memo = cached
+            except Exception:
+                return None
+        return cached
+
+    @classmethod
+    def for_document(cls, document) -> DiffMemo | None:
+        """document 对应的 memo；document 为 None 返回 None。"""
+        return cls.for_part(getattr(document, "part", None))
+
+    @classmethod
+    def for_obj(cls, obj) -> DiffMemo | None:
+        """由 run / 段落找到所属文档的 memo；拿不到文档（如 Mock）返回 None。"""
+        try:
+            part = obj.part
+        except Exception:
+            return None
+        return cls.for_part(part)
+
+    @staticmethod
+    def invalidate(obj) -> None:
+        """丢弃 obj 所属文档的 memo（样式定义变化后，旧结果不再可信）。"""
+        part = getattr(obj, "part", None)
+        if part is not None and hasattr(part, "_wf_diff_memo"):
+            del part._wf_diff_memo
+
+    # -- 签名 --
+    @staticmethod
+    def run_format_key(run) -> tuple:
+        """决定 run 有效字符属性的输入：直接 rPr + 所在段落 pStyle。"""
+        p = getattr(run._parent, "_p", None)
+        pPr = p.find(_PPR) if p is not None else None
+        pStyle = pPr.find(_PSTYLE) if pPr is not None else None
+        style_id = pStyle.get(_VAL) if pStyle is not None else None
+        return (_xml_key(run._element.find(_RPR)), style_id)
+
+    @classmethod
+    def run_key(cls, run, style_sig: tuple, has_cjk: bool) -> tuple:
+        """run 签名：直接 rPr + 段落 pStyle + 期待样式 + 是否含中文。"""
+        return (*cls.run_format_key(run), style_sig, has_cjk)
+
+    @staticmethod
+    def para_format_key(paragraph) -> bytes:
+        """决定段落有效段落属性的输入：直接 pPr（含 pStyle）。"""
+        return _xml_key(paragraph._element.find(_PPR))
+
+    @classmethod
+    def para_key(cls, paragraph, style_sig: tuple) -> tuple:
+        """段落签名：直接 pPr（含 pStyle）+ 期待样式。"""
+        return (cls.para_format_key(paragraph), style_sig)
+
+    # -- 读写 --
+    def get(self, table: dict, key: tuple):
+        """命中返回 diff 列表副本，否则 None；同时计数。"""
+        cached = table.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [dataclasses.replace(d) for d in cached]
+
+    @staticmethod
+    def put(table: dict, key: tuple, diffs: list) -> None:
+        """存入结果副本，避免调用方后续修改污染缓存。"""
+        table[key] = tuple(dataclasses.replace(d) for d in diffs)
+
+    # -- 印章 --
+    def stamp(self, table: dict, key: tuple, parent) -> list | None:
+        """key 有印章时把 parent（w:r / w:p）的属性元素整体替换为印章副本，返回残留 diff 副本。
+
+        无印章返回 None，调用方走逐项写回后用 put_stamp 记录结果。
+        """
+        cached = table.get(key)
+        if cached is None:
+            return None
+        fragment, residual = cached
+        tag = _RPR if parent.tag == _R else _PPR
+        old = parent.find(tag)
+        if fragment is None:
+            if old is not None:
+                parent.remove(old)
+        elif old is not None:
+            parent.replace(old, copy.deepcopy(fragment))
+        else:
+            # rPr / pPr 均须为首个子元素
+            parent.insert(0, copy.deepcopy(fragment))
+        self.stamped += 1
+        return [dataclasses.replace(d) for d in residual]
+
+    @staticmethod
+    def put_stamp(table: dict, key: tuple, parent, residual: list) -> None:
+        """记录 parent 逐项写回后的属性元素与残留 diff，作为 key 的印章。"""
+        tag = _RPR if parent.tag == _R else _PPR
+        elem = parent.find(tag)
+        table[key] = (
+            None if elem is None else copy.deepcopy(elem),
+            tuple(dataclasses.replace(d) for d in residual),
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        """命中统计文本，用于检测摘要日志。"""
+        return (
+            f"diff 缓存：命中 {self.hits} / {self.hits + self.misses} 次"
+            f"（{self.hit_rate:.1%}），run 签名 {len(self.runs)} 种，"
+            f"段落签名 {len(self.paras)} 种"
+            + (f"，印章写回 {self.stamped} 次" if self.stamped else "")
+        )
@@ -10,12 +10,14 @@
 """
 
 from docx.enum.text import WD_LINE_SPACING
+from docx.oxml.ns import qn
 from docx.oxml.xmlchemy import BaseOxmlElement
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from loguru import logger
 
 from wordformat.style.inheritance import (
+    _MISS,
     StyleResolver,
     x_alignment,
     x_bold,
@@ -90,9 +92,8 @@ def paragraph_get_space_after(paragraph) -> float | None:
     return _para(paragraph, x_space_after, None)
 
 
-def paragraph_get_line_spacing(paragraph) -> float | None:
-    """行距倍数；固定值/最小值返回 None。"""
-    res = _para(paragraph, x_line_spacing, None)
+def _line_spacing_factor(res) -> float | None:
+    """x_line_spacing 结果 → 行距倍数；固定值/最小值/未设置返回 None。"""
     if not res:
         return None
     try:
@@ -102,9 +103,8 @@ def paragraph_get_line_spacing(paragraph) -> float | None:
     return factor if rule == WD_LINE_SPACING.MULTIPLE else None
 
 
-def paragraph_get_line_spacing_rule(paragraph):
-    """行距类型（WD_LINE_SPACING）。倍数 1.0/1.5/2.0 归一为单倍/1.5/2 倍。"""
-    res = _para(paragraph, x_line_spacing, None)
+def _line_spacing_rule(res):
+    """x_line_spacing 结果 → 行距类型，倍数 1.0/1.5/2.0 归一为单倍/1.5/2 倍。"""
     if not res:
         return WD_LINE_SPACING.MULTIPLE
     try:
@@ -120,6 +120,16 @@ def paragraph_get_line_spacing_rule(paragraph):
     return rule
 
 
+def paragraph_get_line_spacing(paragraph) -> float | None:
+    """行距倍数；固定值/最小值返回 None。"""
+    return _line_spacing_factor(_para(paragraph, x_line_spacing, None))
+
+
+def paragraph_get_line_spacing_rule(paragraph):
+    """行距类型（WD_LINE_SPACING）。倍数 1.0/1.5/2.0 归一为单倍/1.5/2 倍。"""
+    return _line_spacing_rule(_para(paragraph, x_line_spacing, None))
+
+
 def paragraph_get_first_line_indent(paragraph: Paragraph) -> float | None:
     """首行缩进（字符）；首行=正值，悬挂=负值，无则 None。"""
     return _para(paragraph, x_first_line_indent, None)
@@ -127,6 +137,14 @@ def paragraph_get_first_line_indent(paragraph: Paragraph) -> float | None:
 
 def paragraph_get_builtin_style_name(paragraph: Paragraph) -> str:
     """段落样式名（全小写）。"""
+    if _real_elem(paragraph):
+        try:
+            name = StyleResolver.for_paragraph(paragraph).para_style_name(paragraph)
+        except Exception as e:
+            logger.debug(f"段落样式名解析失败：{e}")
+            name = None
+        if name is not None:
+            return name
     style = paragraph.style
     if style is None:
         return ""
@@ -169,6 +187,13 @@ def run_get_font_underline(run: Run) -> bool:
     return bool(_run(run, x_underline, False))
 
 
+def _clamp_indent(val) -> float | None:
+    """左右缩进不取负值；未设置返回 None。"""
+    if val is None:
+        return None
+    return max(0.0, val)
+
+
 class GetIndent:
     """段落左/右缩进（单位：字符），沿继承链解析。"""
 
@@ -178,10 +203,7 @@ class GetIndent:
             logger.error("indent_type 必须是 'left' 或 'right'")
             raise ValueError("indent_type 必须是 'left' 或 'right'")
         extractor = x_left_indent if indent_type == "left" else x_right_indent
-        val = _para(paragraph, extractor, None)
-        if val is None:
-            return None
-        return max(0.0, val)
+        return _clamp_indent(_para(paragraph, extractor, None))
 
     @staticmethod
     def left_indent(paragraph: Paragraph) -> float | None:
@@ -190,3 +212,186 @@ class GetIndent:
     @staticmethod
     def right_indent(paragraph: Paragraph) -> float | None:
         return GetIndent.line_indent(paragraph, "right")
+
+
+# ── 批量读取：一次遍历继承链取齐全部属性 ──────────────────────────
+class EffectiveRunProps:
+    """run 的有效字符属性快照，取值语义与对应的 run_get_* 一致。"""
+
+    __slots__ = (
+        "bold",
+        "italic",
+        "underline",
+        "size_pt",
+        "color",
+        "font_name",
+        "font_name_en",
+    )
+
+    def __init__(
+        self,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+        size_pt: float = 12.0,
+        color: tuple[int, int, int] | None = (0, 0, 0),
+        font_name: str | None = None,
+        font_name_en: str | None = None,
+    ):
+        self.bold = bold
+        self.italic = italic
+        self.underline = underline
+        self.size_pt = size_pt
+        self.color = color
+        self.font_name = font_name
+        self.font_name_en = font_name_en
+
+
+class EffectiveParaProps:
+    """段落的有效段落属性快照，取值语义与对应的 paragraph_get_* 一致。"""
+
+    __slots__ = (
+        "alignment",
+        "space_before",
+        "space_after",
+        "line_spacing",
+        "line_spacing_rule",
+        "first_line_indent",
+        "left_indent",
+        "right_indent",
+        "builtin_style_name",
+    )
+
+    def __init__(
+        self,
+        alignment=None,
+        space_before: float | None = None,
+        space_after: float | None = None,
+        line_spacing: float | None = None,
+        line_spacing_rule=WD_LINE_SPACING.MULTIPLE,
+        first_line_indent: float | None = None,
+        left_indent: float | None = None,
+        right_indent: float | None = None,
+        builtin_style_name: str = "",
+    ):
+        self.alignment = alignment
+        self.space_before = space_before
+        self.space_after = space_after
+        self.line_spacing = line_spacing
+        self.line_spacing_rule = line_spacing_rule
+        self.first_line_indent = first_line_indent
+        self.left_indent = left_indent
+        self.right_indent = right_indent
+        self.builtin_style_name = builtin_style_name
+
+
+_RUN_EXTRACTORS = {
+    "bold": x_bold,
+    "italic": x_italic,
+    "underline": x_underline,
+    "size_pt": x_size_pt,
+    "color": x_color_rgb,
+    "font_name": x_font_ea,
+    "font_name_en": x_font_ascii,
+}
+
+_PARA_EXTRACTORS = {
+    "alignment": x_alignment,
+    "space_before": x_space_before,
+    "space_after": x_space_after,
+    "line_spacing": x_line_spacing,
+    "first_line_indent": x_first_line_indent,
+    "left_indent": x_left_indent,
+    "right_indent": x_right_indent,
+}
+
+
+def _or(val, default):
+    return default if val is _MISS else val
+
+
+def _run_props(resolver: StyleResolver, v: dict) -> EffectiveRunProps:
+    """把 {名称: 值 | _MISS} 整理为 EffectiveRunProps（补默认值、兑现主题字体）。"""
+    return EffectiveRunProps(
+        bold=bool(_or(v["bold"], False)),
+        italic=bool(_or(v["italic"], False)),
+        underline=bool(_or(v["underline"], False)),
+        size_pt=_or(v["size_pt"], 12.0),
+        color=_or(v["color"], (0, 0, 0)),
+        font_name=resolver._theme_font(v["font_name"]),
+        font_name_en=resolver._theme_font(v["font_name_en"]),
+    )
+
+
+def _para_props(paragraph, v: dict) -> EffectiveParaProps:
+    """把 {名称: 值 | _MISS} 整理为 EffectiveParaProps。"""
+    line = _or(v["line_spacing"], None)
+    return EffectiveParaProps(
+        alignment=_or(v["alignment"], None),
+        space_before=_or(v["space_before"], None),
+        space_after=_or(v["space_after"], None),
+        line_spacing=_line_spacing_factor(line),
+        line_spacing_rule=_line_spacing_rule(line),
+        first_line_indent=_or(v["first_line_indent"], None),
+        left_indent=_clamp_indent(_or(v["left_indent"], None)),
+        right_indent=_clamp_indent(_or(v["right_indent"], None)),
+        builtin_style_name=paragraph_get_builtin_style_name(paragraph),
+    )
+
+
+def run_get_effective_props(
+    run: Run, inherited_cache: dict | None = None
+) -> EffectiveRunProps:
+    """解析 run 全部字符属性；无效 run/Mock 或异常返回默认值。
+
+    给出 inherited_cache 时按 (rStyle, 段落样式) 缓存直接 rPr 之下的继承值，
+    同样式组合的 run 只需读取各自的直接 rPr。
+    """
+    if not _real_elem(run):
+        return EffectiveRunProps()
+    try:
+        resolver = StyleResolver.for_run(run)
+        if inherited_cache is None:
+            return _run_props(resolver, resolver.resolve_run_many(run, _RUN_EXTRACTORS))
+        rPr = run._element.find(qn("w:rPr"))
+        p = getattr(run._parent, "_p", None)
+        pPr = p.find(qn("w:pPr")) if p is not None else None
+        key = (rPr.style if rPr is not None else None, resolver._para_style_id(pPr))
+        inherited = inherited_cache.get(key)
+        if inherited is None:
+            inherited = resolver.resolve_run_inherited(run, rPr, _RUN_EXTRACTORS)
+            inherited_cache[key] = inherited
+        direct = resolver.direct_many(rPr, _RUN_EXTRACTORS)
+        return _run_props(resolver, resolver.overlay(direct, inherited))
+    except Exception as e:
+        logger.debug(f"run 属性批量解析失败：{e}")
+        return EffectiveRunProps()
+
+
+def paragraph_get_effective_props(
+    paragraph: Paragraph, inherited_cache: dict | None = None
+) -> EffectiveParaProps:
+    """解析段落全部段落属性；无效段落/Mock 或异常返回默认值。
+
+    给出 inherited_cache 时按段落样式缓存直接 pPr 之下的继承值。
+    """
+    if not _real_elem(paragraph):
+        return EffectiveParaProps(
+            builtin_style_name=paragraph_get_builtin_style_name(paragraph)
+        )
+    try:
+        resolver = StyleResolver.for_paragraph(paragraph)
+        if inherited_cache is None:
+            v = resolver.resolve_para_many(paragraph, _PARA_EXTRACTORS)
+        else:
+            pPr = paragraph._element.find(qn("w:pPr"))
+            key = resolver._para_style_id(pPr)
+            inherited = inherited_cache.get(key)
+            if inherited is None:
+                inherited = resolver.resolve_para_inherited(pPr, _PARA_EXTRACTORS)
+                inherited_cache[key] = inherited
+            v = resolver.overlay(resolver.direct_many(pPr, _PARA_EXTRACTORS), inherited)
+    except Exception as e:
+        logger.debug(f"段落属性批量解析失败：{e}")
+        v = dict.fromkeys(_PARA_EXTRACTORS, _MISS)
+    return _para_props(paragraph, v)
@@ -0,0 +1,407 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 14:05
+# @Author  : afish
+# @File    : table.py
+"""整篇文档的列式格式表（NumPy 结构化数组），用于 check 模式批量比对。
+
+一次遍历文档树，把所有参与默认样式规则的段落 / run 的有效属性抽成两张结构化数组：
+
+    run 表  : 字号、加粗、斜体、下划线、颜色、中/英文字体 id、是否含中文
+    段落表  : 对齐、段前/段后、行距、行距类型、首行/左/右缩进、样式名 id
+
+每行带节点类别（NODE_TYPE）和期待样式编号。期待值按样式编号展开成同形数组后，
+用向量运算一次算出「哪些行与规范不一致」。默认的段落/字符样式 handler 先查表：
+表能证明一致的行直接跳过，只有不一致（或表无法判断）的行才走 Python diff 生成批注。
+
+比较语义与 CharacterStyle.diff_from_run / ParagraphStyle.diff_from_paragraph 逐项一致；
+期待值无法向量化比较时（物理单位、无法解析的标签等）该样式整体标记为「需回退」，
+对应行照常走 diff，结果不变。格式表只在 check 模式使用：check 不写格式，抽取结果不会过期。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from loguru import logger
+
+from wordformat.style.diff import CharacterStyle, ParagraphStyle
+from wordformat.style.memo import DiffMemo
+from wordformat.style.reader import (
+    paragraph_get_effective_props,
+    run_get_effective_props,
+)
+from wordformat.utils import has_chinese
+
+RUN_DTYPE = np.dtype(
+    [
+        ("category", "i4"),
+        ("style", "i4"),
+        ("size", "f8"),
+        ("bold", "?"),
+        ("italic", "?"),
+        ("underline", "?"),
+        ("color", "i2", (3,)),
+        ("font_cn", "i4"),
+        ("font_en", "i4"),
+        ("has_cjk", "?"),
+    ]
+)
+
+PARA_DTYPE = np.dtype(
+    [
+        ("category", "i4"),
+        ("style", "i4"),
+        ("alignment", "i4"),
+        ("space_before", "f8"),
+        ("space_after", "f8"),
+        ("line_spacing", "f8"),
+        ("line_spacing_rule", "i4"),
+        ("first_line_indent", "f8"),
+        ("left_indent", "f8"),
+        ("right_indent", "f8"),
+        ("style_name", "i4"),
+    ]
+)
+
+# 期待值表：在数据列之外多一列 ok，False 表示该样式无法向量化，对应行一律回退 diff
+_EXP_RUN_DTYPE = np.dtype([("ok", "?")] + RUN_DTYPE.descr[2:-1])
+_EXP_PARA_DTYPE = np.dtype([("ok", "?")] + PARA_DTYPE.descr[2:])
+
+_NO_COLOR = (-1, -1, -1)  # 主题色（不确定）
+_ABSENT = object()
+
+# 构建期待样式时读取的配置字段（与 _handle_*_style 一致）
+_STYLE_FIELDS = {
+    "run": (
+        "chinese_font_name",
+        "english_font_name",
+        "font_size",
+        "font_color",
+        "bold",
+        "italic",
+        "underline",
+    ),
+    "para": (
+        "alignment",
+        "space_before",
+        "space_after",
+        "line_spacing",
+        "line_spacingrule",
+        "first_line_indent",
+        "left_indent",
+        "right_indent",
+        "builtin_style_name",
+    ),
+}
+
+
+class _Unsupported(Exception):
+    """期待值无法向量化比较。"""
+
+
+def _num(value) -> float:
+    """数值期待值；非数字（如未解析的标签）无法向量化。"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _Unsupported(value)
+    return float(value)
+
+
+def _flag(value) -> bool:
+    if not isinstance(value, bool):
+        raise _Unsupported(value)
+    return value
+
+
+def _or_zero(value) -> float:
+    """UnitLabelEnum 把 None 视为 0，左右缩进 diff 也把 None 视为 0。"""
+    return 0.0 if value is None else float(value)
+
+
+class FormatTable:
+    """check 模式下整篇文档的列式格式表。"""
+
+    def __init__(self):
+        self.categories: list[str] = []
+        self.runs = np.zeros(0, dtype=RUN_DTYPE)
+        self.paras = np.zeros(0, dtype=PARA_DTYPE)
+        self.run_mismatch = np.zeros(0, dtype=bool)
+        self.para_mismatch = np.zeros(0, dtype=bool)
+        self._run_rows: dict = {}  # w:r 元素 → 行号
+        self._para_rows: dict = {}  # w:p 元素 → 行号
+        self._run_sigs: list[tuple] = []
+        self._para_sigs: list[tuple] = []
+        self._names: dict[str, int] = {}
+        self._run_formats: dict[tuple, tuple] = {}
+        self._para_formats: dict[bytes, tuple] = {}
+        self._style_ids: dict[tuple, int] = {}  # 原始配置取值 → 期待样式编号
+        self._sig_ids: dict[tuple, int] = {}  # 样式签名 → 期待样式编号
+        # 逐节点抽取阶段的暂存（finalize 后清空）
+        self._category_ids: dict[str, int] = {}
+        self._pending_runs: list[tuple] = []
+        self._pending_paras: list[tuple] = []
+
+    # -- 挂载 --
+    def attach(self, document) -> None:
+        """挂到 DocumentPart 上（part.document 每次访问都新建代理对象）。"""
+        document.part._wf_format_table = self
+
+    @staticmethod
+    def detach(document) -> None:
+        part = getattr(document, "part", None)
+        if part is not None and hasattr(part, "_wf_format_table"):
+            del part._wf_format_table
+
+    @staticmethod
+    def for_obj(obj) -> FormatTable | None:
+        """run / 段落所属文档上挂着的格式表；未挂载或拿不到文档返回 None。"""
+        try:
+            table = getattr(obj.part, "_wf_format_table", None)
+        except Exception:
+            return None
+        return table if isinstance(table, FormatTable) else None
+
+    # -- 构建 --
+    @classmethod
+    def build(cls, root_node) -> FormatTable:
+        """遍历文档树抽取属性并完成向量化比对。"""
+        table = cls()
+        stack = [root_node]
+        while stack:
+            node = stack.pop()
+            stack.extend(reversed(getattr(node, "children", [])))
+            table.add_node(node)
+        return table.finalize()
+
+    def add_node(self, node) -> None:
+        """抽取一个节点段落的 run / 段落行；按文档顺序逐个调用，最后 finalize。
+
+        供单次树遍历（见 pipeline.visitor）在遍历中调用，不必再单独遍历一遍。
+        """
+        paragraph = getattr(node, "paragraph", None)
+        if paragraph is None or not paragraph.runs:
+            return
+        cfg = getattr(node, "pydantic_config", None)
+        if cfg is None:
+            return
+        cat = self._category_ids.setdefault(node.NODE_TYPE, len(self._category_ids))
+        if _uses_default(node, "paragraph_style") and cfg.alignment is not None:
+            self._add_para(paragraph, cfg, cat, self._pending_paras)
+        if _uses_default(node, "character_style") and cfg.chinese_font_name is not None:
+            self._add_runs(paragraph, cfg, cat, self._pending_runs)
+
+    def finalize(self) -> FormatTable:
+        """把已抽取的行组装为列式数组并完成向量化比对。"""
+        self.categories = list(self._category_ids)
+        self.runs = np.array(self._pending_runs, dtype=RUN_DTYPE)
+        self.paras = np.array(self._pending_paras, dtype=PARA_DTYPE)
+        self._pending_runs, self._pending_paras = [], []
+        self._compare()
+        return self
+
+    def _name_id(self, name) -> int:
+        key = str(name).lower()
+        return self._names.setdefault(key, len(self._names))
+
+    def _style_index(self, kind: str, cfg, factory, sigs: list) -> int | None:
+        """配置 → 期待样式编号；同一组配置取值只构建一次样式对象。"""
+        fields = _STYLE_FIELDS[kind]
+        raw = (kind, *(getattr(cfg, f, _ABSENT) for f in fields))
+        try:
+            return self._style_ids[raw]
+        except KeyError:
+            pass
+        except TypeError:  # 配置值不可哈希：不缓存
+            raw = None
+        try:
+            style = factory(cfg)
+        except Exception as e:  # 配置非法：交给 handler 照常报错
+            logger.debug(f"格式表跳过{kind}样式：{e}")
+            return None
+        sig = style.signature()
+        index = self._sig_ids.get((kind, sig))
+        if index is None:
+            index = self._sig_ids[(kind, sig)] = len(sigs)
+            sigs.append((sig, style))
+        if raw is not None:
+            self._style_ids[raw] = index
+        return index
+
+    def _add_runs(self, paragraph, cfg, cat, rows) -> None:
+        style = self._style_index("run", cfg, _character_style, self._run_sigs)
+        if style is None:
+            return
+        for run in paragraph.runs:
+            text = run.text  # run.text 每次都走 xpath，只取一次
+            if not text.strip():
+                continue
+            # 有效属性只取决于直接 rPr + 段落样式，同签名的 run 共用一次解析
+            key = DiffMemo.run_format_key(run)
+            fmt = self._run_formats.get(key)
+            if fmt is None:
+                fmt = self._run_formats[key] = self._run_format(run)
+            self._run_rows[run._element] = len(rows)
+            rows.append((cat, style, *fmt, has_chinese(text)))
+
+    def _run_format(self, run) -> tuple:
+        props = run_get_effective_props(run)
+        color = props.color if props.color is not None else _NO_COLOR
+        return (
+            props.size_pt,
+            props.bold,
+            props.italic,
+            props.underline,
+            tuple(int(c) for c in color),
+            self._name_id(props.font_name or ""),
+            self._name_id(props.font_name_en or ""),
+        )
+
+    def _add_para(self, paragraph, cfg, cat, rows) -> None:
+        style = self._style_index(
+            "para", cfg, ParagraphStyle.from_config, self._para_sigs
+        )
+        if style is None:
+            return
+        self._para_rows[paragraph._element] = len(rows)
+        # 有效段落属性只取决于直接 pPr（含 pStyle），同签名的段落共用一次解析
+        key = DiffMemo.para_format_key(paragraph)
+        fmt = self._para_formats.get(key)
+        if fmt is None:
+            fmt = self._para_formats[key] = self._para_format(paragraph)
+        rows.append((cat, style, *fmt))
+
+    def _para_format(self, paragraph) -> tuple:
+        props = paragraph_get_effective_props(paragraph)
+        alignment = props.alignment
+        return (
+            -1 if alignment is None else int(alignment),
+            _or_zero(props.space_before),
+            _or_zero(props.space_after),
+            _or_zero(props.line_spacing),
+            int(props.line_spacing_rule),
+            _or_zero(props.first_line_indent),
+            _or_zero(props.left_indent),
+            _or_zero(props.right_indent),
+            self._name_id(props.builtin_style_name),
+        )
+
+    # -- 期待值 --
+    def _expected_run(self, cs: CharacterStyle) -> tuple:
+        try:
+            return (
+                True,
+                _num(cs.font_size.rel_value),
+                _flag(cs.bold),
+                _flag(cs.italic),
+                _flag(cs.underline),
+                cs.font_color.rel_value,
+                self._name_id(cs.font_name_cn),
+                self._name_id(cs.font_name_en),
+            )
+        except Exception:
+            return (False, 0.0, False, False, False, _NO_COLOR, -1, -1)
+
+    def _expected_para(self, ps: ParagraphStyle) -> tuple:
+        try:
+            for unit_value, unit in (
+                (ps.space_before, "hang"),
+                (ps.space_after, "hang"),
+                (ps.first_line_indent, "char"),
+                (ps.left_indent, "char"),
+                (ps.right_indent, "char"),
+            ):
+                if unit_value.rel_unit != unit:
+                    raise _Unsupported(unit_value.value)
+            alignment = ps.alignment.rel_value
+            rule = ps.line_spacingrule.rel_value
+            style_name = ps.builtin_style_name.rel_value
+            if isinstance(alignment, str) or isinstance(rule, str):
+                raise _Unsupported((alignment, rule))
+            if not isinstance(style_name, str):
+                raise _Unsupported(style_name)
+            return (
+                True,
+                int(alignment),
+                _num(ps.space_before.rel_value),
+                _num(ps.space_after.rel_value),
+                _num(ps.line_spacing.rel_value),
+                int(rule),
+                _num(ps.first_line_indent.rel_value),
+                _num(ps.left_indent.rel_value),
+                _num(ps.right_indent.rel_value),
+                self._name_id(style_name),
+            )
+        except Exception:
+            return (False, -1, 0.0, 0.0, 0.0, -1, 0.0, 0.0, 0.0, -1)
+
+    # -- 向量化比对 --
+    def _compare(self) -> None:
+        exp_r = np.array(
+            [self._expected_run(cs) for _, cs in self._run_sigs], dtype=_EXP_RUN_DTYPE
+        )
+        exp_p = np.array(
+            [self._expected_para(ps) for _, ps in self._para_sigs],
+            dtype=_EXP_PARA_DTYPE,
+        )
+        r = self.runs
+        if len(r):
+            e = exp_r[r["style"]]
+            self.run_mismatch = (
+                ~e["ok"]
+                | (r["bold"] != e["bold"])
+                | (r["italic"] != e["italic"])
+                | (r["underline"] != e["underline"])
+                | (r["size"] != e["size"])
+                | (r["color"] != e["color"]).any(axis=1)
+                | (r["has_cjk"] & (r["font_cn"] != e["font_cn"]))
+                | (r["font_en"] != e["font_en"])
+            )
+        p = self.paras
+        if len(p):
+            e = exp_p[p["style"]]
+            # 对齐未设置时 Alignment.get_from_paragraph 回退为左对齐
+            left = int(WD_ALIGN_PARAGRAPH.LEFT)
+            alignment = np.where(p["alignment"] < 0, left, p["alignment"])
+            mismatch = ~e["ok"] | (alignment != e["alignment"])
+            for col in PARA_DTYPE.names[3:]:
+                mismatch |= p[col] != e[col]
+            self.para_mismatch = mismatch
+
+    # -- 查询 --
+    def run_clean(self, run, style_sig: tuple, has_cjk: bool) -> bool:
+        """表能证明该 run 与期待样式一致时返回 True；否则（含未收录）False。"""
+        row = self._run_rows.get(run._element)
+        if row is None or self.run_mismatch[row]:
+            return False
+        rec = self.runs[row]
+        return bool(rec["has_cjk"]) == has_cjk and (
+            self._run_sigs[rec["style"]][0] == style_sig
+        )
+
+    def para_clean(self, paragraph, style_sig: tuple) -> bool:
+        """表能证明该段落与期待样式一致时返回 True；否则（含未收录）False。"""
+        row = self._para_rows.get(paragraph._element)
+        if row is None or self.para_mismatch[row]:
+            return False
+        return self._para_sigs[self.paras[row]["style"]][0] == style_sig
+
+    def summary(self) -> str:
+        return (
+            f"格式表：run {len(self.runs)} 行（不一致 {int(self.run_mismatch.sum())}），"
+            f"段落 {len(self.paras)} 行（不一致 {int(self.para_mismatch.sum())}），"
+            f"节点类别 {len(self.categories)} 种"
+        )
+
+
+def _character_style(cfg) -> CharacterStyle:
+    """与 FormatNode._handle_character_style 相同的构建方式。"""
+    return CharacterStyle.from_config(cfg)
+
+
+def _uses_default(node, rule: str) -> bool:
+    """节点的该默认规则是否仍由 FormatNode 的默认 handler 处理（未被子类覆写）。"""
+    from wordformat.rules.node import FormatNode
+
+    handler_name = getattr(type(node), "DEFAULT_RULES", {}).get(rule)
+    if handler_name is None:
+        return False
+    return getattr(type(node), handler_name) is getattr(FormatNode, handler_name)
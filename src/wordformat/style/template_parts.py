@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+# @Time    : 2026/10/19 16:40
+# @Author  : afish
+# @File    : template_parts.py
+"""模板派生的样式定义 / 编号定义 XML 片段（跨文档复用）。
+
+apply 模式每篇文档都要按配置修正样式定义（StyleDefinitionFixStage）、新建标题编号
+定义（numbering.create_numbering_definition），结果只取决于配置模板和文档原有的样式
+定义。同一学校模板的论文大多出自同一份 Word 模板，原样式定义逐字节相同，因此：
+
+    样式定义  以 (样式名, 原 w:style 的 XML) 为键缓存修正后的 w:style，
+              命中时直接整体替换文档中的元素，未命中才走 python-docx 逐项修正
+    编号定义  w:lvl 片段按模板只构建一次，每篇文档复制后填入各自的编号 ID
+
+缓存挂在 CompiledConfig 上（见 CompiledConfig.derived），随配置失效。
+缓存中的元素只作模板，接入文档前一律深拷贝。
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from docx.oxml.ns import qn
+from docx.styles.style import StyleFactory
+from lxml import etree
+
+_STYLE = qn("w:style")
+_NAME = qn("w:name")
+_VAL = qn("w:val")
+
+# 每份模板最多缓存的修正后样式定义条数（超出按最近最少使用淘汰）
+STYLE_CACHE_SIZE = 256
+
+
+def style_index(document) -> dict[str, object]:
+    """文档样式定义按内部名索引（一次遍历，代替逐个 styles[name] 的 XPath 查找）。
+
+    查找时用 BabelFish.ui2internal 把界面名（如 "Heading 1"）转为内部名。
+    """
+    index = {}
+    for elem in document.styles.element.iterchildren(_STYLE):
+        name = elem.find(_NAME)
+        if name is not None:
+            index.setdefault(name.get(_VAL), elem)
+    return index
+
+
+class TemplateParts:
+    """一份配置模板派生的样式 / 编号 XML 片段缓存。"""
+
+    def __init__(self, config_model):
+        self._config = config_model
+        self._style_configs: dict | None = None
+        self._styles: OrderedDict[tuple[str, bytes], object] = OrderedDict()
+        self._numbering_levels: dict | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_config(cls, config_model) -> TemplateParts:
+        """取配置上缓存的片段；普通配置（非 CompiledConfig）每次新建，不跨文档复用。"""
+        derived = getattr(type(config_model), "derived", None)
+        if derived is None:
+            return cls(config_model)
+        return config_model.derived("template_parts", lambda: cls(config_model))
+
+    def style_configs(self) -> dict:
+        """样式名 → 配置（collect_style_configs 的结果，按模板只收集一次）。"""
+        if self._style_configs is None:
+            self._style_configs = self._config.collect_style_configs()
+        return self._style_configs
+
+    def graft_style(self, elem, style_name: str, fix: Callable[[object], None]) -> None:
+        """把按模板修正好的样式定义接到文档上，替换原 w:style 元素 elem。
+
+        fix(style) 为逐项修正函数，仅在缓存未命中时调用，
+        其结果（修正后的 w:style）按原元素 XML 存入缓存。
+        """
+        key = (style_name, etree.tostring(elem))
+        with self._lock:
+            fixed = self._styles.get(key)
+            if fixed is not None:
+                self._styles.move_to_end(key)
+        if fixed is not None:
+            self.hits += 1
+            elem.getparent().replace(elem, copy.deepcopy(fixed))
+            return
+        self.misses += 1
+        fix(StyleFactory(elem))
+        fixed = copy.deepcopy(elem)
+        with self._lock:
+            self._styles.setdefault(key, fixed)
+            self._styles.move_to_end(key)
+            while len(self._styles) > STYLE_CACHE_SIZE:
+                self._styles.popitem(last=False)
+
+    def numbering_levels(self, build: Callable[[], dict]) -> dict:
+        """编号定义的 w:lvl 片段（按模板只构建一次）；调用方接入文档前需深拷贝。"""
+        if self._numbering_levels is None:
+            with self._lock:
+                if self._numbering_levels is None:
+                    self._numbering_levels = build()
+        return self._numbering_levels
+
+    def summary(self) -> str:
+        """命中统计文本。"""
+        return f"样式定义片段：命中 {self.hits} 次，新建 {self.misses} 次"
@@ -1,10 +1,11 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional
 
 
-# 用dataclass简化类定义（Python 3.7+支持）
-@dataclass
+# 用dataclass简化类定义（Python 3.7+支持）；不可变，便于 extract_unit_from_string 缓存复用
+@dataclass(frozen=True)
 class UnitResult:
     """单位提取结果类"""
 
@@ -70,67 +71,68 @@ class UnitResult:
                 raise ValueError(f"Invalid unit: {self.standard_unit}")
 
 
+# 单位映射规则（新增「行、字符」，标准化后仍为中文）
+_UNIT_MAPPING = {
+    # 国际标准单位
+    "磅": "pt",
+    "pt": "pt",
+    "PT": "pt",
+    "厘米": "cm",
+    "cm": "cm",
+    "CM": "cm",
+    "英寸": "inch",
+    "inch": "inch",
+    "inches": "inch",
+    "Inch": "inch",
+    "INCHES": "inch",
+    "毫米": "mm",
+    "mm": "mm",
+    "MM": "mm",
+    "emu": "emu",
+    "Emu": "emu",
+    "EMU": "emu",
+    # 非国际标准单位
+    "行": "hang",
+    "字符": "char",
+    "倍": "bei",
+}
+
+# 正则匹配（数值+可选空格+单位）→ 新增「行、字符」匹配
+_UNIT_PATTERNS = [
+    r"pt|磅",
+    r"厘米|cm",
+    r"英寸|inches|inch",
+    r"毫米|mm",
+    r"emu",
+    r"行",
+    r"字符",
+    r"倍",
+]
+_UNIT_RE = re.compile(r"(?i)(-?\d+\.?\d*)\s*(?:{})".format("|".join(_UNIT_PATTERNS)))
+_NUMBER_PREFIX_RE = re.compile(r"(?i)-?\d+\.?\d*\s*")
+
+
+@lru_cache(maxsize=1024)
 def extract_unit_from_string(text: str) -> UnitResult:
     """
     从字符串中提取指定单位（新增「行、字符」单位，返回UnitResult类实例）
     支持单位：pt/磅、厘米/CM、英寸/Inches、毫米/mm、Emu、行、字符
+    「小四」「1.5倍」之类取值在整篇文档反复出现，结果按输入字符串缓存（UnitResult 不可变）。
     Args:
         text str
     Returns:
         UnitResult
     """
-    # 1. 定义单位映射规则（新增「行、字符」，标准化后仍为中文）
-    unit_mapping = {
-        # 国际标准单位
-        "磅": "pt",
-        "pt": "pt",
-        "PT": "pt",
-        "厘米": "cm",
-        "cm": "cm",
-        "CM": "cm",
-        "英寸": "inch",
-        "inch": "inch",
-        "inches": "inch",
-        "Inch": "inch",
-        "INCHES": "inch",
-        "毫米": "mm",
-        "mm": "mm",
-        "MM": "mm",
-        "emu": "emu",
-        "Emu": "emu",
-        "EMU": "emu",
-        # 非国际标准单位
-        "行": "hang",
-        "字符": "char",
-        "倍": "bei",
-    }
-
-    # 2. 初始化结果类
-    result = UnitResult()
-
-    # 3. 正则匹配（数值+可选空格+单位）→ 新增「行、字符」匹配
-    unit_patterns = [
-        r"pt|磅",
-        r"厘米|cm",
-        r"英寸|inches|inch",
-        r"毫米|mm",
-        r"emu",
-        r"行",
-        r"字符",
-        r"倍",
-    ]
-    combined_pattern = r"(?i)(-?\d+\.?\d*)\s*(?:{})".format("|".join(unit_patterns))
-    match = re.search(combined_pattern, text)
-
-    if match:
-        # 提取数值
-        result.value = float(match.group(1))
-        # 提取原始单位
-        full_match = match.group(0)
-        result.original_unit = re.sub(r"(?i)-?\d+\.?\d*\s*", "", full_match).strip()
+    match = _UNIT_RE.search(text)
+    if not match:
+        return UnitResult()
+    # 提取原始单位
+    original_unit = _NUMBER_PREFIX_RE.sub("", match.group(0)).strip()
+    return UnitResult(
+        original_unit=original_unit,
         # 转换为标准化单位
-        result.standard_unit = unit_mapping.get(result.original_unit, None)
+        standard_unit=_UNIT_MAPPING.get(original_unit, None),
+        value=float(match.group(1)),
         # 标记为合法
-        result.is_valid = True
-
-    return result
+        is_valid=True,
+    )
@@ -6,6 +6,12 @@ from wordformat.utils._fs import (
     ensure_is_directory,
     get_file_name,
 )
+from wordformat.utils._runs import set_run_text, split_runs
+from wordformat.utils._snapshot import (
+    ParagraphSnapshot,
+    invalidate_snapshot,
+    paragraph_snapshot,
+)
 from wordformat.utils._text import (
     _count_numbering_levels,
     _format_number,
@@ -1,6 +1,7 @@
 """文件系统工具。"""
 
 import os
+import tempfile
 
 from loguru import logger
 
@@ -27,3 +28,23 @@ def ensure_directory_exists(path):
     else:
         os.makedirs(path, exist_ok=True)
         logger.info(f"已创建文件夹：'{path}'")
+
+
+def write_bytes_atomic(path, data: bytes) -> None:
+    """先写同目录下的唯一临时文件再替换 path，并发的线程、进程都不会读到半截内容。
+
+    写入失败时删除临时文件并抛出 OSError。
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(os.fspath(path)) or ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,183 @@
+"""预编译的文本模式族（标题编号、参考文献编号、题注、摘要标题等）。
+
+同一用途的一组正则按优先级合并为一个带命名组的交替模式，导入时编译一次：
+一次 match 即可得到命中的成员名和该成员捕获的各部分，
+不必在每个标题 / 题注 / 参考文献上重新拼模式串、逐个 re.match。
+
+成员内的命名组合并时自动加上成员名前缀，FamilyMatch.groups 中仍用原名。
+合并后的交替按成员顺序尝试，结果与逐个 re.match 相同。
+"""
+
+import re
+from typing import NamedTuple
+
+_GROUP_NAME = re.compile(r"\(\?P<(\w+)>")
+
+
+class FamilyMatch(NamedTuple):
+    """模式族的一次匹配结果。"""
+
+    member: str  # 命中的成员名
+    text: str  # 整体匹配到的文本
+    groups: dict[str, str | None]  # 该成员的命名组（原名）
+
+
+class PatternFamily:
+    """按优先级排列的一组正则，合并为单个带命名组的交替模式。"""
+
+    __slots__ = ("name", "members", "flags", "regex", "_groups")
+
+    def __init__(self, name: str, members: list[tuple[str, str]], flags: int = 0):
+        self.name = name
+        self.members = tuple(members)  # (成员名, 原模式) 按优先级
+        self.flags = flags
+        parts = []
+        for member, source in members:
+            source = _GROUP_NAME.sub(
+                lambda m, p=member: f"(?P<{p}__{m.group(1)}>", source
+            )
+            parts.append(f"(?P<{member}>{source})")
+        self.regex = re.compile("|".join(parts), flags)
+        # 成员名 → [(原组名, 组号)]
+        self._groups: dict[str, list[tuple[str, int]]] = {
+            member: [] for member, _ in members
+        }
+        for full, index in self.regex.groupindex.items():
+            member, sep, short = full.partition("__")
+            if sep:
+                self._groups[member].append((short, index))
+
+    def _result(self, m: re.Match | None) -> FamilyMatch | None:
+        if m is None:
+            return None
+        # 成员外层组最后闭合，lastgroup 即命中的成员名
+        member = m.lastgroup
+        groups = {short: m.group(index) for short, index in self._groups[member]}
+        return FamilyMatch(member, m.group(), groups)
+
+    def match(self, text: str) -> FamilyMatch | None:
+        """从 text 开头匹配，返回第一个命中的成员。"""
+        return self._result(self.regex.match(text))
+
+    def search(self, text: str) -> FamilyMatch | None:
+        """在 text 中搜索第一个命中位置。"""
+        return self._result(self.regex.search(text))
+
+
+# 模式族注册表：名称 → PatternFamily
+FAMILIES: dict[str, PatternFamily] = {}
+
+
+def register_family(
+    name: str, members: list[tuple[str, str]], flags: int = 0
+) -> PatternFamily:
+    """编译并注册一个模式族（同名覆盖）。"""
+    family = PatternFamily(name, members, flags)
+    FAMILIES[name] = family
+    return family
+
+
+def get_family(name: str) -> PatternFamily:
+    """按名称取模式族；未注册时抛 KeyError。"""
+    return FAMILIES[name]
+
+
+# ---------- 公共原子 ----------
+_CH = "[一二三四五六七八九十百千零壹贰叁肆伍陆柒捌玖拾佰仟]"
+_CHN = "(?:一|二|三|四|五|六|七|八|九|十|百|千|零|壹|贰|叁|肆|伍|陆|柒|捌|玖|拾|佰|仟)"
+_NUM = r"\d+"
+_ROMAN = "[IVXLCDM]+"
+# 中文数字/阿拉伯数字 混合组
+_CHDM = f"(?:{_CHN}|[0-9])+"
+
+# ---------- 标题手动编号（按级别，优先级从高到低） ----------
+HEADING_NUMBER = (
+    register_family(
+        "heading_number_1",
+        [
+            ("chapter", rf"第{_CHDM}章\s*"),  # 第一章、第1章
+            ("section", rf"第{_CHDM}节\s*"),  # 第一节
+            ("part", rf"第{_CHDM}部分\s*"),  # 第一部分
+            ("paren_full", rf"（{_CHDM}）\s*"),  # （一）、（1）
+            ("paren_half", rf"\({_CHDM}\)\s*"),  # (一)、(1)
+            ("right_paren", rf"{_CHDM}\)\s*"),  # 一)、1)
+            ("roman", rf"{_ROMAN}\.\s+"),  # I.  / V.
+            ("chinese", rf"{_CH}\s*[、，,\.]?\s*"),  # 一、 / 一 / 一.
+        ],
+    ),
+    register_family(
+        "heading_number_2",
+        [
+            ("dotted3", rf"{_NUM}\.{_NUM}\.{_NUM}\s*"),  # 1.1.1 (先匹配更长的)
+            ("dotted2", rf"{_NUM}\.{_NUM}\s*"),  # 1.1
+            ("chinese_dotted", rf"{_CH}\.{_NUM}\s*"),  # 一.1
+            ("chinese", rf"{_CH}\s*[、，,\.]?\s*"),  # 一、/ 一.
+        ],
+    ),
+    register_family(
+        "heading_number_3",
+        [
+            ("dotted3", rf"{_NUM}\.{_NUM}\.{_NUM}\s*"),  # 1.1.1
+            ("dotted2", rf"{_NUM}\.{_NUM}\s*"),  # 1.1
+            ("number", rf"{_NUM}\s*[、，,\.]?\s*"),  # 1. / 1、
+        ],
+    ),
+)
+
+
+def heading_number_family(ilvl: int) -> PatternFamily:
+    """标题级别（0 起）对应的手动编号模式族，三级及以上共用一族。"""
+    return HEADING_NUMBER[ilvl] if ilvl in (0, 1) else HEADING_NUMBER[2]
+
+
+# ---------- 参考文献条目手动编号 ----------
+REFERENCE_NUMBER = register_family(
+    "reference_number",
+    [
+        ("bracket", r"\[\d+\][\s　]*"),  # [1]
+        ("bracket_full", r"［\d+］[\s　]*"),  # ［1］（全角方括号）
+        ("paren", r"\(\d+\)[\s　]*"),  # (1)
+        ("paren_full", r"（\d+）[\s　]*"),  # （1）（全角括号）
+        ("dot", r"\d+\.[\s　]+"),  # 1.  (必须有空格，避免匹配年份如 2024.)
+        ("right_paren", r"\d+\)[\s　]*"),  # 1)
+        ("circled", r"[①②③④⑤⑥⑦⑧⑨⑩][\s　]*"),  # ①（带圈数字）
+    ],
+)
+
+# ---------- 题注：[标签][章节号][分隔符][题注编号] [题注名称] ----------
+_SEP = r"(?P<sep>[.\-:—–])"
+_LABEL = r"(?P<label>[图表])\s*"
+_CN = r"[一二三四五六七八九十百千零壹贰叁肆伍陆柒捌玖拾佰仟]+"
+_ROMAN_ANY = r"[IVXLCDMivxlcdm]+"
+_TAIL = r"[\s　]+(?P<name>.+)$"
+
+CAPTION = register_family(
+    "caption",
+    [
+        ("arabic", rf"{_LABEL}(?P<chapter>\d+){_SEP}(?P<num>\d+){_TAIL}"),
+        ("chinese", rf"{_LABEL}(?P<chapter>{_CN}){_SEP}(?P<num>\d+){_TAIL}"),
+        ("roman", rf"{_LABEL}(?P<chapter>{_ROMAN_ANY}){_SEP}(?P<num>\d+){_TAIL}"),
+        ("mixed", rf"{_LABEL}(?P<chapter>\d+){_SEP}(?P<num>{_CN}|{_ROMAN_ANY}){_TAIL}"),
+    ],
+)
+
+# ---------- 摘要标题（成员名即修正后的类别） ----------
+ABSTRACT_START = re.compile(r"摘要|Abstract")
+ABSTRACT_TITLE = register_family(
+    "abstract_title",
+    [
+        ("abstract_chinese_title", r"摘要\s*$"),
+        ("abstract_english_title", r"Abstract\s*$"),
+        ("abstract_chinese_title_content", r"摘要\s*[:：]"),
+        ("abstract_english_title_content", r"Abstract\s*[:：]?"),
+    ],
+)
+
+# ---------- 独立成行的章节标题（成员名即类别） ----------
+SECTION_TITLE = register_family(
+    "section_title",
+    [
+        ("references_title", r"参考文献\s*$"),
+        ("acknowledgements_title", r"致\s*谢\s*$"),
+    ],
+)
@@ -0,0 +1,177 @@
+"""按字符区间批量拆分段落 run。
+
+标点批注、引用上标、引用超链接、关键词标签拆分都需要「让某段文字独占 run」。
+split_runs 接收一组区间，一次从左到右遍历段落，把所有受影响的 run 在区间边界处
+切开，返回每个区间对应的 run。
+
+偏移与 paragraph.text 一致：w:tab / w:br 等按 python-docx 的文本等价计入，
+w:hyperlink 内的文字计入偏移但不拆分（落在超链接内的区间不返回 run）。
+切出的新 run 复制一次原 rPr，原 run 保留切点之前的内容。fresh=True 时区间总是切到新 run
+（区间起点恰为 run 起点时原 run 只留一个空 w:t），批注按锚点 run 分组时不会与整段的批注合并。
+
+set_run_text 是 Run.text 赋值的快速等价实现，供清除手动编号等改写 run 文本的场景使用。
+"""
+
+from bisect import bisect_left
+from copy import deepcopy
+
+from docx.oxml.ns import qn
+from docx.text.run import Run
+
+from wordformat.utils._snapshot import invalidate_snapshot
+
+_R = qn("w:r")
+_T = qn("w:t")
+_RPR = qn("w:rPr")
+_HYPERLINK = qn("w:hyperlink")
+_SPACE = qn("xml:space")
+
+# CT_R.text 计入文本的子元素（其余如 w:drawing 长度为 0）
+_TEXT_TAGS = frozenset(
+    qn(f"w:{t}") for t in ("t", "tab", "br", "cr", "noBreakHyphen", "ptab")
+)
+
+
+def _set_text(t_elem, text: str) -> None:
+    """写 w:t 文本；首尾有空白时标记 xml:space=preserve。"""
+    t_elem.text = text
+    if text and text != text.strip():
+        t_elem.set(_SPACE, "preserve")
+
+
+def set_run_text(r_elem, text: str) -> None:
+    """等价于 python-docx 的 CT_R.text = text。
+
+    run 内容（rPr 之外）只有一个普通 w:t、新文本不含制表/换行时原地改写这个 w:t，
+    结果与清空内容后逐字符重建相同；其余情况交给 python-docx。调用方负责使快照失效。
+    """
+    content = [child for child in r_elem if child.tag != _RPR]
+    if (
+        len(content) == 1
+        and content[0].tag == _T
+        and all(key == _SPACE for key in content[0].keys())
+        and "\t" not in text
+        and "\n" not in text
+        and "\r" not in text
+    ):
+        t_elem = content[0]
+        if not text:
+            r_elem.remove(t_elem)
+        elif len(text.strip()) < len(text):
+            t_elem.text = text
+            t_elem.set(_SPACE, "preserve")
+        else:
+            t_elem.text = text
+            t_elem.attrib.pop(_SPACE, None)
+        return
+    r_elem.text = text
+
+
+def _split_run(r_elem, cuts: list[int]) -> list[tuple[object, int]]:
+    """在 run 内偏移 cuts（升序，均在 run 文本内部）处切开，返回 [(w:r, 文本长度)]。"""
+    rPr = r_elem.find(_RPR)
+    pieces = [[r_elem, 0]]
+    cur = r_elem
+
+    def new_piece():
+        nonlocal cur
+        new_r = r_elem.makeelement(_R, {})
+        if rPr is not None:
+            new_r.append(deepcopy(rPr))
+        cur.addnext(new_r)
+        cur = new_r
+        pieces.append([new_r, 0])
+
+    pos = 0
+    ci = 0
+    for child in list(r_elem):
+        if child is rPr:
+            continue
+        # 子元素起点恰为切点：此后的内容进入新 run（run 起点落在 w:t 上时交给下面的文本切分）
+        if ci < len(cuts) and cuts[ci] == pos and (pos or child.tag != _T):
+            new_piece()
+            ci += 1
+        if cur is not r_elem:
+            cur.append(child)
+        text = str(child) if child.tag in _TEXT_TAGS else ""
+        if child.tag == _T and ci < len(cuts) and cuts[ci] < pos + len(text):
+            t_elem, last = child, 0
+            while ci < len(cuts) and cuts[ci] < pos + len(text):
+                k = cuts[ci] - pos
+                _set_text(t_elem, text[last:k])
+                pieces[-1][1] += k - last
+                new_piece()
+                t_elem = r_elem.makeelement(_T, {})
+                cur.append(t_elem)
+                last = k
+                ci += 1
+            _set_text(t_elem, text[last:])
+            pieces[-1][1] += len(text) - last
+        else:
+            pieces[-1][1] += len(text)
+        pos += len(text)
+    return [(r, n) for r, n in pieces]
+
+
+def _cut_pieces(
+    p, cuts: list[int], starts
+) -> tuple[list[tuple[int, int, object]], bool]:
+    """在 cuts 处切开段落的直接子 run，返回 [(起点, 终点, w:r)]（按文档顺序）和是否发生拆分。
+
+    落在 run 起点的切点只在属于 starts 时切开（此时原 run 留空）。
+    """
+    pieces = []
+    pos = 0
+    ci = 0
+    split = False
+    for child in list(p):
+        if child.tag == _HYPERLINK:
+            pos += len(child.text)
+        if child.tag != _R:
+            continue
+        length = len(child.text)
+        local = []
+        while ci < len(cuts) and cuts[ci] < pos + length:
+            if cuts[ci] > pos or cuts[ci] in starts:
+                local.append(cuts[ci] - pos)
+            ci += 1
+        if local:
+            split = True
+            start = pos
+            for r_elem, n in _split_run(child, local):
+                pieces.append((start, start + n, r_elem))
+                start += n
+        else:
+            pieces.append((pos, pos + length, child))
+        pos += length
+    return pieces, split
+
+
+def split_runs(paragraph, spans, fresh: bool = False) -> list[tuple[Run, ...]]:
+    """按区间 [(start, end)] 拆分段落 run，返回每个区间对应的 run 元组（按输入顺序）。
+
+    区间可跨 run（返回多个 run）；区间内有超链接文字或超出段落文本时返回空元组。
+    fresh 为 True 时区间起点总是切开，区间内容不留在原 run 中。
+    """
+    spans = list(spans)
+    cuts = sorted({x for span in spans for x in span})
+    starts = {start for start, _ in spans} if fresh else ()
+    pieces, split = _cut_pieces(paragraph._p, cuts, starts)
+    if split:
+        invalidate_snapshot(paragraph)
+
+    # 区间 → 完全落在其中的非空 run；长度凑不满（含超链接文字等）视为无法覆盖
+    pieces = [piece for piece in pieces if piece[1] > piece[0]]
+    piece_starts = [s for s, _, _ in pieces]
+    result = []
+    for start, end in spans:
+        runs = []
+        covered = 0
+        i = bisect_left(piece_starts, start)
+        while i < len(pieces) and pieces[i][1] <= end:
+            s, e, r = pieces[i]
+            runs.append(Run(r, paragraph))
+            covered += e - s
+            i += 1
+        result.append(tuple(runs) if runs and covered == end - start else ())
+    return result
@@ -0,0 +1,98 @@
+"""段落文本 / run 快照。
+
+规则里反复读 paragraph.text、paragraph.runs：每次都要从 XML 重新拼文本、
+重新创建 Run 代理对象。快照把一次读取的结果（段落文本、run 列表、各 run 文本及
+其在段落文本中的起始偏移）缓存在段落元素上，供同一段落的多条规则共用。
+
+失效规则：
+    本库拆分 run、改写 run 文本的函数修改后调用 invalidate_snapshot
+    段落子元素数量变化（新增 run、插入批注锚点等）时自动重建，作为兜底
+库外代码直接改写 run 文本后，需自行调用 invalidate_snapshot。
+"""
+
+from bisect import bisect_right
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+_ATTR = "_wf_snapshot"
+_R = qn("w:r")
+_HYPERLINK = qn("w:hyperlink")
+
+
+class ParagraphSnapshot:
+    """一个段落某一时刻的文本与 run 视图（只读）。
+
+    text       与 paragraph.text 相同（含超链接内文字）
+    runs       paragraph.runs 的元组（段落直属 w:r，不含超链接内的 run）
+    run_texts  各 run 的 run.text
+    offsets    各 run 在 text 中的起始偏移
+    """
+
+    __slots__ = ("text", "runs", "run_texts", "offsets", "_size")
+
+    def __init__(self, paragraph):
+        if not isinstance(paragraph, Paragraph):
+            self.runs = tuple(paragraph.runs)
+            self.run_texts = tuple(r.text for r in self.runs)
+            self.offsets = tuple(_cumulative(self.run_texts))
+            self.text = paragraph.text
+            self._size = -1
+            return
+        # 一次遍历段落子元素，同时得到 runs 与 text（超链接文字计入偏移）
+        p = paragraph._p
+        runs, texts, offsets, parts = [], [], [], []
+        pos = 0
+        for child in p.iterchildren(_R, _HYPERLINK):
+            t = child.text
+            if child.tag == _R:
+                runs.append(Run(child, paragraph))
+                texts.append(t)
+                offsets.append(pos)
+            parts.append(t)
+            pos += len(t)
+        self.runs = tuple(runs)
+        self.run_texts = tuple(texts)
+        self.offsets = tuple(offsets)
+        self.text = "".join(parts)
+        self._size = len(p)
+
+    def run_index_at(self, pos: int) -> int:
+        """text 中第 pos 个字符所在 run 的下标；落在超链接内或越界返回 -1。"""
+        i = bisect_right(self.offsets, pos) - 1
+        # 空 run 与后一个 run 起点相同，bisect_right 自然落到含该字符的 run
+        if i < 0 or pos >= self.offsets[i] + len(self.run_texts[i]):
+            return -1
+        return i
+
+
+def _cumulative(texts):
+    pos = 0
+    for t in texts:
+        yield pos
+        pos += len(t)
+
+
+def paragraph_snapshot(paragraph) -> ParagraphSnapshot:
+    """取段落快照：有新鲜缓存直接返回，否则重建并缓存。
+
+    缓存挂在段落元素（CT_P）上，同一段落的不同 Paragraph 代理共用；
+    非 python-docx 段落（如测试替身）不缓存，每次新建。
+    """
+    if not isinstance(paragraph, Paragraph):
+        return ParagraphSnapshot(paragraph)
+    p = paragraph._p
+    snap = getattr(p, _ATTR, None)
+    if snap is not None and snap._size == len(p):
+        return snap
+    snap = ParagraphSnapshot(paragraph)
+    setattr(p, _ATTR, snap)
+    return snap
+
+
+def invalidate_snapshot(paragraph) -> None:
+    """丢弃段落快照（paragraph 可为 Paragraph 或 w:p 元素）。"""
+    p = getattr(paragraph, "_p", paragraph)
+    if getattr(p, _ATTR, None) is not None:
+        setattr(p, _ATTR, None)
@@ -2,9 +2,12 @@
 
 import re
 
+import numpy as np
 from docx.oxml.ns import qn
 from docx.text.paragraph import Paragraph
 
+from wordformat.utils._patterns import CAPTION
+
 
 def get_paragraph_numbering_text(paragraph: Paragraph) -> str:
     """
@@ -360,41 +363,37 @@ def parse_caption_text(text: str) -> dict | None:
     if not text:
         return None
 
-    SEP = r"[.\-:—–]"
-    LABEL = r"([图表])\s*"
-    CN = r"[一二三四五六七八九十百千零壹贰叁肆伍陆柒捌玖拾佰仟]+"
-    ROMAN = r"[IVXLCDMivxlcdm]+"
-
-    # 按优先级依次尝试各模式: (pattern, ch_parser, num_parser)
-    patterns = [
-        (rf"^{LABEL}(\d+)({SEP})(\d+)[\s　]+(.+)$", int, int),
-        (rf"^{LABEL}({CN})({SEP})(\d+)[\s　]+(.+)$", _from_chinese_num, int),
-        (rf"^{LABEL}({ROMAN})({SEP})(\d+)[\s　]+(.+)$", _from_roman, int),
-        (
-            rf"^{LABEL}(\d+)({SEP})({CN}|{ROMAN})[\s　]+(.+)$",
-            int,
-            lambda n: _from_chinese_num(n)
-            if any(c in _digit_map for c in n)
-            else _from_roman(n),
-        ),
-    ]
-
-    for pattern, ch_parser, num_parser in patterns:
-        m = re.match(pattern, text)
-        if m:
-            label, ch_text, sep, num_text, name = m.groups()
-            return _make_caption_result(
-                label,
-                ch_text,
-                _try_parse_num(ch_text, ch_parser),
-                sep,
-                num_text,
-                _try_parse_num(num_text, num_parser),
-                name,
-                is_continued,
-            )
-
-    return None
+    m = CAPTION.match(text)
+    if m is None:
+        return None
+    ch_parser, num_parser = _CAPTION_PARSERS[m.member]
+    g = m.groups
+    return _make_caption_result(
+        g["label"],
+        g["chapter"],
+        _try_parse_num(g["chapter"], ch_parser),
+        g["sep"],
+        g["num"],
+        _try_parse_num(g["num"], num_parser),
+        g["name"],
+        is_continued,
+    )
+
+
+def _parse_cn_or_roman(text: str) -> int:
+    """题注编号为中文数字或罗马数字时的解析。"""
+    if any(c in _digit_map for c in text):
+        return _from_chinese_num(text)
+    return _from_roman(text)
+
+
+# 题注模式族成员 → (章节号解析, 题注编号解析)
+_CAPTION_PARSERS = {
+    "arabic": (int, int),
+    "chinese": (_from_chinese_num, int),
+    "roman": (_from_roman, int),
+    "mixed": (int, _parse_cn_or_roman),
+}
 
 
 # 供 parse_caption_text 内部使用的 digit_map
@@ -423,8 +422,24 @@ _digit_map = {
 
 # ---------------------------------------------------------------------------
 # CJK 字符检测工具
+#
+# 范围为 CJK 统一表意文字 U+4E00–U+9FFF。短文本用预编译的字符类正则，
+# 长文本（整段摘要、全文）转成 UTF-32 码点数组后用 NumPy 向量化判定。
 # ---------------------------------------------------------------------------
 
+_CJK_FIRST, _CJK_LAST = 0x4E00, 0x9FFF
+_CJK = re.compile("[\u4e00-\u9fff]")
+_NON_CJK = re.compile("[^\u4e00-\u9fff]+")
+# 不短于此长度的文本走 NumPy 路径（更短时数组转换的固定开销高于逐字符正则）
+_BULK_THRESHOLD = 128
+
+
+def _cjk_code_points(text: str):
+    """文本的码点数组及其中 CJK 字符的布尔掩码。"""
+    cp = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    # 无符号减法下溢为大数，一次比较即判定区间
+    return cp, (cp - _CJK_FIRST) <= (_CJK_LAST - _CJK_FIRST)
+
 
 def is_chinese_char(ch: str) -> bool:
     """判定单个字符是否为 CJK 统一表意文字。"""
@@ -433,14 +448,19 @@ def is_chinese_char(ch: str) -> bool:
 
 def count_chinese_chars(text: str) -> int:
     """统计文本中 CJK 字符数量。"""
-    return sum(1 for ch in text if is_chinese_char(ch))
+    if len(text) >= _BULK_THRESHOLD:
+        return int(np.count_nonzero(_cjk_code_points(text)[1]))
+    return len(_NON_CJK.sub("", text))
 
 
 def extract_chinese_chars(text: str) -> str:
     """提取文本中的纯 CJK 字符序列。"""
-    return "".join(ch for ch in text if is_chinese_char(ch))
+    if len(text) >= _BULK_THRESHOLD:
+        cp, mask = _cjk_code_points(text)
+        return cp[mask].tobytes().decode("utf-32-le")
+    return _NON_CJK.sub("", text)
 
 
 def has_chinese(text: str) -> bool:
     """文本中是否包含至少一个 CJK 字符。"""
-    return any(is_chinese_char(ch) for ch in text)
+    return _CJK.search(text) is not None
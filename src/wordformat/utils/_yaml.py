@@ -1,11 +1,64 @@
-"""YAML 配置加载。"""
+"""YAML 配置加载。
 
+有 LibYAML 时用 C 实现的 CFullLoader 解析（语义与 FullLoader 相同，含 <<: *anchor 合并）。
+解析结果另存一份二进制快照（marshal）在 YAML 旁边，以 mtime + 内容哈希为键，
+快照新鲜时直接读快照，跳过 YAML 解析。
+"""
+
+import marshal
+import os
 from typing import Any
 
 import yaml
+from loguru import logger
+
+from wordformat.utils._fs import write_bytes_atomic
+
+# 有 LibYAML 绑定时用 C 解析器，否则回落纯 Python 实现
+_Loader = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+# 快照格式版本：快照结构或解析语义变化时递增，旧快照自动失效
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".wfcache"
 
 
 def load_yaml_with_merge(file_path: str) -> dict[str, Any]:
     """加载 YAML 文件，正确处理 <<: *anchor 合并语法。"""
     with open(file_path, encoding="utf-8") as f:
-        return yaml.load(f, Loader=yaml.FullLoader)
+        return parse_yaml(f.read())
+
+
+def parse_yaml(text: str) -> dict[str, Any]:
+    """解析 YAML 文本，正确处理 <<: *anchor 合并语法。"""
+    return yaml.load(text, Loader=_Loader)
+
+
+def snapshot_path(file_path) -> str:
+    """快照文件路径：与 YAML 同目录的隐藏文件 .<文件名>.wfcache。"""
+    head, name = os.path.split(os.path.abspath(os.fspath(file_path)))
+    return os.path.join(head, f".{name}{SNAPSHOT_SUFFIX}")
+
+
+def read_snapshot(file_path, mtime_ns: int, digest: str) -> dict[str, Any] | None:
+    """读取 file_path 的快照；不存在、已过期或损坏时返回 None。"""
+    try:
+        with open(snapshot_path(file_path), "rb") as f:
+            version, snap_mtime, snap_digest, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != SNAPSHOT_VERSION or snap_mtime != mtime_ns or snap_digest != digest:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_snapshot(file_path, mtime_ns: int, digest: str, data: dict[str, Any]) -> None:
+    """把解析结果写成快照；目录不可写或含 marshal 不支持的类型（如日期）时静默跳过。"""
+    try:
+        payload = marshal.dumps((SNAPSHOT_VERSION, mtime_ns, digest, data))
+    except ValueError:
+        return
+    target = snapshot_path(file_path)
+    try:
+        write_bytes_atomic(target, payload)
+    except OSError as e:
+        logger.debug(f"配置快照写入失败，跳过: {target} ({e})")
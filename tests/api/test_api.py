@@ -6,6 +6,7 @@
 
 import argparse
 import io
+import json
 import os
 import shutil
 import tempfile
@@ -152,12 +153,61 @@ class TestCLIIntegration:
                 configpath=cfg_path,
                 savepath=out_dir,
                 check=True,
+                workers=None,
+                cache=None,
             )
         finally:
             for p in [docx_path, cfg_path, json_path]:
                 os.unlink(p)
             os.rmdir(out_dir)
 
+    @mock.patch("wordformat.cli.check_format_report")
+    @mock.patch("sys.argv")
+    def test_main_cf_report_only(self, mock_argv, mock_report, tmp_path):
+        docx_path = tmp_path / "论文.docx"
+        cfg_path = tmp_path / "c.yaml"
+        json_path = tmp_path / "s.json"
+        for p in (docx_path, cfg_path, json_path):
+            p.write_bytes(b"")
+        out_dir = tmp_path / "out"
+        report = {"summary": {"errors": 1, "notices": 0}, "issues": [{"property": "字号错误"}]}
+        mock_report.return_value = report
+        argv = ["wf", "cf", "-d", str(docx_path), "-c", str(cfg_path), "-f", str(json_path)]
+        argv += ["-o", str(out_dir), "--report-only"]
+        mock_argv.__getitem__.side_effect = lambda i: argv[i]
+        mock_argv.__len__.return_value = len(argv)
+        main()
+        mock_report.assert_called_once_with(
+            jsonpath=str(json_path),
+            docxpath=str(docx_path),
+            configpath=str(cfg_path),
+            workers=None,
+            cache=None,
+        )
+        written = json.loads((out_dir / "论文--检测报告.json").read_text(encoding="utf-8"))
+        assert written == report
+
+    @mock.patch("wordformat.pipeline.batch.run_batch")
+    @mock.patch("sys.argv")
+    def test_main_batch_mode(self, mock_argv, mock_run, tmp_path):
+        from wordformat.pipeline.batch import DocumentResult
+
+        src, out_dir = tmp_path / "in", tmp_path / "out"
+        src.mkdir()
+        mock_run.return_value = [
+            DocumentResult("a.docx", "done", errors=2),
+            DocumentResult("b.docx", "failed", error="boom"),
+        ]
+        argv = ["wf", "batch", "-i", str(src), "--mode", "cf", "-j", "3", "-o", str(out_dir)]
+        mock_argv.__getitem__.side_effect = lambda i: argv[i]
+        mock_argv.__len__.return_value = len(argv)
+        main()
+        mock_run.assert_called_once_with(
+            str(src), "cf", configpath=None, out_dir=str(out_dir), workers=3, resume=True
+        )
+        summary = (out_dir / "batch_summary.csv").read_text(encoding="utf-8-sig")
+        assert summary.splitlines()[2].startswith("b.docx,failed")
+
     @mock.patch("wordformat.cli.auto_format_thesis_document")
     @mock.patch("sys.argv")
     def test_main_af_mode(self, mock_argv, mock_auto):
@@ -301,6 +351,23 @@ class TestAPIEndpoints:
             client = TestClient(app)
             yield client, temp_dir, output_dir
 
+    def test_save_config_invalidates_compiled_cache(self, api_client, tmp_path):
+        """POST /configs/save 改写文件后，旧的编译配置被丢弃"""
+        from wordformat.config.compiled import compile_config
+
+        client, _, _ = api_client
+        configs_dir = tmp_path / "configs"
+        configs_dir.mkdir(exist_ok=True)
+        with mock.patch("wordformat.api.CONFIGS_DIR", configs_dir):
+            body = {"filename": "a.yaml", "content": "body_text:\n  font:\n    bold: true\n"}
+            assert client.post("/configs/save", json=body).status_code == 200
+            old = compile_config(configs_dir / "a.yaml")
+            body["content"] = "body_text:\n  font:\n    bold: false\n"
+            assert client.post("/configs/save", json=body).status_code == 200
+            new = compile_config(configs_dir / "a.yaml")
+        assert new is not old
+        assert new["body_text"]["font"]["bold"] is False
+
     def test_generate_json_success(self, api_client):
         """POST /generate-json 成功调用 set_tag_main"""
         client, temp_dir, output_dir = api_client
@@ -385,6 +452,28 @@ class TestAPIEndpoints:
         assert "标注版" in data["data"]["final_filename"]
         assert "download_url" in data["data"]
 
+    def test_check_format_report_only(self, api_client):
+        """POST /check-format?report_only=true 直接返回检测报告，不生成文件"""
+        client, temp_dir, output_dir = api_client
+
+        report = {"document": "tmp.docx", "summary": {"total": 1}, "issues": []}
+        with (
+            mock.patch("wordformat.api.check_format_report", return_value=report) as m,
+            mock.patch("wordformat.api.auto_format_thesis_document") as auto,
+        ):
+            response = client.post(
+                "/check-format?report_only=true",
+                files={"docx_file": ("test.docx", io.BytesIO(b"x"), "application/octet-stream")},
+                data={"json_data": "[]"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["document"] == "test.docx"
+        assert data["summary"] == {"total": 1}
+        m.assert_called_once()
+        auto.assert_not_called()
+
     def test_apply_format_success(self, api_client):
         """POST /apply-format 成功调用 auto_format_thesis_document(check=False)"""
         client, temp_dir, output_dir = api_client
@@ -461,6 +550,41 @@ class TestAPIEndpoints:
         assert response.status_code == 500
 
 
+class TestRunInWorker:
+    """run_in_worker：任务在线程池中执行，且不继承调用方的 contextvars 状态"""
+
+    def test_fresh_context_per_task(self, config_path):
+        import asyncio
+
+        from wordformat.api import run_in_worker
+        from wordformat.config.loader import get_config, load_config
+
+        load_config(config_path)
+
+        def read_config():
+            try:
+                return get_config()
+            except RuntimeError:
+                return None
+
+        assert asyncio.run(run_in_worker(read_config)) is None
+        assert get_config() is not None
+
+    def test_requests_overlap(self):
+        import asyncio
+        import threading
+
+        from wordformat.api import run_in_worker
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        async def both():
+            return await asyncio.gather(run_in_worker(barrier.wait), run_in_worker(barrier.wait))
+
+        # 两个任务须同时在不同线程中运行才能通过栅栏
+        assert sorted(asyncio.run(both())) == [0, 1]
+
+
 class TestCLIStartApiMode:
     """覆盖 cli.py startapi 模式（lines 151-169）"""
 
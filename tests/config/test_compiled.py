@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""编译配置缓存测试（config/compiled.py + 节点绑定）。"""
+
+import os
+import pickle
+import threading
+
+import pytest
+
+from wordformat import settings
+from wordformat.config import compiled as compiled_mod
+from wordformat.config.compiled import (
+    CompiledConfig,
+    cache_info,
+    compile_config,
+    config_from_dict,
+    invalidate_config,
+)
+from wordformat.config.loader import load_config
+from wordformat.rules import BodyText, HeadingLevel1Node
+from wordformat.utils._yaml import (
+    parse_yaml,
+    read_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+
+EXAMPLE = "example/undergrad_thesis.yaml"
+
+
+@pytest.fixture
+def yaml_path(tmp_path):
+    path = tmp_path / "cfg.yaml"
+    path.write_text(
+        "body:\n  text:\n    paragraph:\n      alignment: '两端对齐'\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestCache:
+    def test_same_content_shares_object(self, yaml_path, tmp_path):
+        copy = tmp_path / "copy.yaml"
+        copy.write_bytes(yaml_path.read_bytes())
+        assert compile_config(yaml_path) is compile_config(copy)
+        assert cache_info()["size"] == 1
+
+    def test_load_config_returns_compiled(self, yaml_path):
+        cfg = load_config(str(yaml_path))
+        assert isinstance(cfg, CompiledConfig)
+        assert cfg.body.text.paragraph.alignment == "两端对齐"
+        assert load_config(str(yaml_path)) is cfg
+
+    def test_invalidate_on_rewrite(self, yaml_path):
+        old = compile_config(yaml_path)
+        yaml_path.write_text("body:\n  text:\n    font:\n      font_size: '三号'\n", encoding="utf-8")
+        invalidate_config(yaml_path)
+        new = compile_config(yaml_path)
+        assert new is not old
+        assert new.config_for(BodyText).font.font_size == "三号"
+        assert cache_info()["size"] == 1
+
+    def test_pickle_roundtrip(self, yaml_path):
+        cfg = compile_config(yaml_path)
+        cfg.config_for(BodyText)
+        clone = pickle.loads(pickle.dumps(cfg))
+        assert dict(clone) == dict(cfg) and clone.digest == cfg.digest
+        assert clone.config_for(BodyText) == cfg.config_for(BodyText)
+
+    def test_config_from_dict_bypasses_cache(self, yaml_path):
+        raw = parse_yaml(yaml_path.read_text(encoding="utf-8"))
+        assert config_from_dict(raw).digest == config_from_dict(dict(raw)).digest
+        raw["body"]["text"]["paragraph"]["alignment"] = "居中对齐"
+        cfg = config_from_dict(raw)
+        assert cfg.config_for(BodyText).paragraph.alignment == "居中对齐"
+        assert cfg.digest != compile_config(yaml_path).digest
+        assert cache_info()["size"] == 1
+
+
+class TestPerClass:
+    def test_config_matches_plain_load(self):
+        compiled = compile_config(EXAMPLE)
+        for cls in (BodyText, HeadingLevel1Node):
+            plain = cls(value={}, level=1)
+            plain.load_config(dict(compiled))
+            assert compiled.config_for(cls) == plain.pydantic_config
+
+    def test_nodes_bind_by_reference(self):
+        compiled = compile_config(EXAMPLE)
+        a, b = BodyText(value={}, level=1), BodyText(value={}, level=1)
+        a.load_config(compiled)
+        b.load_config(compiled)
+        assert a.pydantic_config is b.pydantic_config
+        assert compiled.paragraph_style_for(BodyText) is compiled.paragraph_style_for(BodyText)
+        assert str(compiled.character_style_for(BodyText).font_size) == "小四"
+
+    def test_rules_for_matches_rule_plan(self):
+        compiled = compile_config(EXAMPLE)
+        plan = compiled.rules_for(BodyText)
+        assert plan == BodyText.rule_plan(compiled.config_for(BodyText))
+        assert [r[0] for r in plan][:2] == ["paragraph_style", "character_style"]
+
+
+class TestSnapshot:
+    def _fail_parse(self, monkeypatch):
+        def boom(text):
+            raise AssertionError("快照新鲜时不应解析 YAML")
+
+        monkeypatch.setattr(compiled_mod, "parse_yaml", boom)
+
+    def test_fresh_snapshot_skips_parsing(self, yaml_path, monkeypatch):
+        first = dict(compile_config(yaml_path))
+        assert os.path.exists(snapshot_path(yaml_path))
+        invalidate_config()
+        self._fail_parse(monkeypatch)
+        assert dict(compile_config(yaml_path)) == first
+
+    def test_content_change_reparses(self, yaml_path):
+        compile_config(yaml_path)
+        invalidate_config()
+        yaml_path.write_text("body:\n  text:\n    font:\n      bold: true\n", encoding="utf-8")
+        assert compile_config(yaml_path).body.text.font.bold is True
+
+    def test_mtime_change_reparses(self, yaml_path, monkeypatch):
+        compile_config(yaml_path)
+        invalidate_config()
+        st = os.stat(yaml_path)
+        os.utime(yaml_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        calls = []
+        monkeypatch.setattr(compiled_mod, "parse_yaml", lambda t: calls.append(t) or parse_yaml(t))
+        compile_config(yaml_path)
+        assert len(calls) == 1
+
+    def test_corrupt_snapshot_ignored(self, yaml_path):
+        compile_config(yaml_path)
+        invalidate_config()
+        with open(snapshot_path(yaml_path), "wb") as f:
+            f.write(b"not marshal")
+        assert compile_config(yaml_path).body.text.paragraph.alignment == "两端对齐"
+
+    def test_concurrent_writers_leave_no_temp_files(self, yaml_path):
+        data = parse_yaml(yaml_path.read_text(encoding="utf-8"))
+        threads = [
+            threading.Thread(target=write_snapshot, args=(yaml_path, i, "d", data))
+            for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(os.listdir(yaml_path.parent)) == sorted(
+            [yaml_path.name, os.path.basename(snapshot_path(yaml_path))]
+        )
+        assert any(read_snapshot(yaml_path, i, "d") == data for i in range(8))
+
+    def test_unmarshallable_content_not_snapshotted(self, tmp_path):
+        path = tmp_path / "dated.yaml"
+        path.write_text("date: 2026-01-01\n", encoding="utf-8")
+        compile_config(path)
+        assert not os.path.exists(snapshot_path(path))
+
+    def test_disabled(self, yaml_path, monkeypatch):
+        monkeypatch.setattr(settings, "YAML_SNAPSHOT", False)
+        compile_config(yaml_path)
+        assert not os.path.exists(snapshot_path(yaml_path))
+
+    def test_example_configs_match_pure_python_loader(self):
+        import yaml
+
+        for name in os.listdir("example"):
+            if name.endswith((".yaml", ".yml")):
+                with open(os.path.join("example", name), encoding="utf-8") as f:
+                    text = f.read()
+                assert parse_yaml(text) == yaml.load(text, Loader=yaml.FullLoader)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""只读配置视图测试（config/dotdict.py FrozenDotDict）：点号访问语义须与 DotDict 一致。"""
+
+import pickle
+
+import pytest
+
+from wordformat.config.dotdict import DotDict, FrozenDotDict
+
+RAW = {
+    "alignment": "居中",
+    "paragraph": {"alignment": "左对齐", "line_spacing": "1.5倍"},
+    "font": {"font_size": "小四", "line_spacing": "被 paragraph 覆盖"},
+    "rules": {"numbering": {"enabled": True}},
+    "items": "与 dict 方法同名",
+}
+
+
+@pytest.fixture
+def frozen():
+    return FrozenDotDict(RAW)
+
+
+class TestSameAsDotDict:
+    @pytest.mark.parametrize(
+        "key", ["alignment", "line_spacing", "font_size", "missing", "paragraph"]
+    )
+    def test_attribute_access(self, frozen, key):
+        assert getattr(frozen, key) == getattr(DotDict(RAW), key)
+
+    def test_fallback_priority(self, frozen):
+        # 本层 > paragraph > font
+        assert frozen.alignment == "居中"
+        assert frozen.line_spacing == "1.5倍"
+        assert frozen.font_size == "小四"
+
+    def test_nested_access(self, frozen):
+        assert frozen.rules.numbering.enabled is True
+        assert isinstance(frozen.rules, FrozenDotDict)
+        # 同一对象，不再每次包装
+        assert frozen.rules is frozen.rules
+
+    def test_missing_returns_none(self, frozen):
+        assert frozen.nope is None
+        assert frozen.rules.nope is None
+
+    def test_dict_method_name_only_by_key(self, frozen):
+        assert callable(frozen.items)
+        assert frozen["items"] == "与 dict 方法同名"
+
+    def test_dunder_raises(self, frozen):
+        with pytest.raises(AttributeError):
+            frozen.__missing_dunder__  # noqa: B018
+
+
+class TestReadOnly:
+    @pytest.mark.parametrize(
+        "op",
+        [
+            lambda d: d.__setitem__("alignment", "x"),
+            lambda d: d.__delitem__("alignment"),
+            lambda d: setattr(d, "alignment", "x"),
+            lambda d: delattr(d, "alignment"),
+            lambda d: d.update(alignment="x"),
+            lambda d: d.pop("alignment"),
+            lambda d: d.setdefault("new", 1),
+            lambda d: d.clear(),
+        ],
+    )
+    def test_writes_rejected(self, frozen, op):
+        with pytest.raises(TypeError):
+            op(frozen)
+        assert frozen.alignment == "居中"
+
+    def test_nested_writes_rejected(self, frozen):
+        with pytest.raises(TypeError):
+            frozen.rules.numbering["enabled"] = False
+
+    def test_source_not_mutated(self):
+        raw = {"paragraph": {"alignment": "居中"}}
+        FrozenDotDict(raw)
+        assert type(raw["paragraph"]) is dict
+
+
+class TestPickle:
+    def test_roundtrip(self, frozen):
+        copy = pickle.loads(pickle.dumps(frozen))
+        assert copy == frozen
+        assert copy.line_spacing == "1.5倍"
+        assert copy.rules.numbering.enabled is True
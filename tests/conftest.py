@@ -5,7 +5,9 @@
 """
 
 import os
+import re
 import json
+import zipfile
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -77,6 +79,68 @@ def temp_json(tmp_path):
     return str(path)
 
 
+# ==================== Synthetic Thesis Fixtures ====================
+
+# 合成论文的格式偏差：第 i 段按 deviate(i) 返回的名称施加（None 表示不加偏差）
+THESIS_DEVIATIONS = {
+    "bold": lambda p, r1, r2: setattr(r1, "bold", True),
+    "size": lambda p, r1, r2: setattr(r2.font, "size", Pt(15)),
+    "color": lambda p, r1, r2: setattr(r1.font.color, "rgb", RGBColor(255, 0, 0)),
+    "center": lambda p, r1, r2: setattr(
+        p.paragraph_format, "alignment", WD_ALIGN_PARAGRAPH.CENTER
+    ),
+    "spacing": lambda p, r1, r2: setattr(p.paragraph_format, "line_spacing", 1.5),
+}
+
+_DATE = re.compile(rb' w:date="[^"]*"')
+
+
+@pytest.fixture
+def make_thesis():
+    """合成论文工厂：make_thesis(path, rows, deviate=None) 保存文档并返回结构 JSON。
+
+    rows 为 (category, text, style) 序列，每段拆成 text[:4] / text[4:] 两个 run，
+    text 中的换行写成手动换行（结构 JSON 只记第一行）；
+    deviate(i) 返回第 i 段的偏差名（见 THESIS_DEVIATIONS）、自定义的 f(p, r1, r2) 或 None。
+    指纹依次为 fp0、fp1……
+    """
+
+    def make(path, rows, deviate=None):
+        doc = Document()
+        items = []
+        for category, text, style in rows:
+            head, *tail = text.split("\n")
+            p = doc.add_paragraph(style=style)
+            r1, r2 = p.add_run(head[:4]), p.add_run(head[4:])
+            for line in tail:
+                p.add_run().add_break()
+                p.add_run(line)
+            kind = deviate(len(items)) if deviate else None
+            apply = THESIS_DEVIATIONS.get(kind, kind)
+            if apply is not None:
+                apply(p, r1, r2)
+            items.append(
+                {"category": category, "paragraph": head, "fingerprint": f"fp{len(items)}"}
+            )
+        doc.save(str(path))
+        return items
+
+    return make
+
+
+@pytest.fixture
+def docx_parts():
+    """docx_parts(path) → (document.xml, comments.xml)，去掉批注时间以便逐字节比较。"""
+
+    def parts(path):
+        with zipfile.ZipFile(path) as z:
+            names = z.namelist()
+            comments = z.read("word/comments.xml") if "word/comments.xml" in names else b""
+            return _DATE.sub(b"", z.read("word/document.xml")), _DATE.sub(b"", comments)
+
+    return parts
+
+
 # ==================== Config Fixtures ====================
 
 _INLINE_YAML = """\
@@ -277,12 +341,15 @@ def mock_onnx_single():
 
 @pytest.fixture(autouse=True)
 def reset_config():
-    """每个测试前后自动清理配置状态"""
+    """每个测试前后自动清理配置状态（含编译配置缓存）"""
+    from wordformat.config.compiled import invalidate_config
     from wordformat.config.loader import clear_config
 
     clear_config()
+    invalidate_config()
     yield
     clear_config()
+    invalidate_config()
 
 
 @pytest.fixture(autouse=True)
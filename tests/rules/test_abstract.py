@@ -32,6 +32,7 @@ from wordformat.rules import (
     References,
 )
 from wordformat.rules.node import FormatNode as FormatNodeBase
+from wordformat.utils._snapshot import paragraph_snapshot
 
 # ---------------------------------------------------------------------------
 # 共享 fixtures / helpers
@@ -384,6 +385,19 @@ class TestAbstractTitleContentENBase:
         assert r2.text == ""
         assert "content" in r3.text
 
+    def test_snapshot_tracks_rewritten_title_runs(self, root_config):
+        """改写标题 run 文本后，段落快照应与实际 run 文本一致。"""
+        doc = Document()
+        p = doc.add_paragraph()
+        p.add_run("abs").font.size = Pt(10)
+        p.add_run("tract: content").font.size = Pt(10)
+        node = AbstractTitleContentEN(value=p, level=0, paragraph=p)
+        node.load_config(root_config)
+        paragraph_snapshot(p)
+        node.check_format(doc)
+        assert paragraph_snapshot(p).run_texts == tuple(r.text for r in p.runs)
+        assert paragraph_snapshot(p).text == p.text
+
 
 # ---------------------------------------------------------------------------
 # 13. AbstractContentEN._base 覆盖
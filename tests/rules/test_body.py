@@ -32,6 +32,7 @@ from wordformat.rules import (
     References,
 )
 from wordformat.rules.node import FormatNode as FormatNodeBase
+from wordformat.style.comment_writer import flush_comments
 
 # ---------------------------------------------------------------------------
 # 共享 fixtures / helpers
@@ -197,6 +198,41 @@ class TestBodyTextCitationSuperscript:
         assert "[1" in superscript_texts
         assert "2]" in superscript_texts
 
+    @pytest.mark.parametrize("chapter,marked", [(1, True), (2, False)])
+    def test_apply_format_only_marks_chapter_one(self, chapter, marked):
+        """apply_format 只做标记，不拆分 run（由 create_citation_hyperlinks 统一处理）。"""
+        doc = Document()
+        p = doc.add_paragraph("参见文献[1]的讨论。")
+        node = BodyText(
+            value={"category": "body_text", "chapter_number": chapter}, level=0, paragraph=p
+        )
+        with patch("wordformat.rules.node.FormatNode.apply_format"):
+            node.apply_format(doc)
+        assert node.superscript_citations is marked
+        assert len(p.runs) == 1
+
+
+
+class TestBodyTextPunctuation:
+    """半角标点批注锚在独占的新 run 上。"""
+
+    def test_mark_at_run_start_gets_own_comment(self, root_config):
+        """run 以标点开头时，标点批注不与该 run 的字体批注合并。"""
+        doc = Document()
+        p = doc.add_paragraph()
+        p.add_run("中文")
+        p.add_run(",中文").font.size = Pt(20)
+        node = BodyText(value={"category": "body_text"}, level=0, paragraph=p)
+        node.load_config(root_config)
+        node.check_format(doc)
+        flush_comments(doc)
+
+        texts = [c.text for c in doc.comments]
+        # 段落级、字号、标点各一条
+        assert len(texts) == 3
+        punct = [t for t in texts if "标点问题" in t]
+        assert len(punct) == 1 and "字号" not in punct[0]
+        assert p.text == "中文,中文"
 
 # ---------------------------------------------------------------------------
 # 8. AbstractTitleCN._base 完整 diff/apply 覆盖
@@ -371,9 +371,11 @@ numbering:
         mock_ps = MagicMock()
         mock_ps.diff_from_paragraph.return_value = {}
         mock_ps.apply_to_paragraph.return_value = {}
+        mock_ps.fix_paragraph.return_value = []
         mock_cs = MagicMock()
         mock_cs.diff_from_run.return_value = {}
         mock_cs.apply_to_run.return_value = {}
+        mock_cs.fix_run.return_value = []
         with (
             patch(
                 "wordformat.style.diff.ParagraphStyle.from_config",
@@ -382,8 +384,9 @@ numbering:
             patch(
                 "wordformat.style.diff.CharacterStyle",
                 return_value=mock_cs,
-            ),
+            ) as mock_cs_cls,
         ):
+            mock_cs_cls.from_config.return_value = mock_cs
             yield
 
     @pytest.mark.usefixtures("_suppress_format_comments")
@@ -511,6 +514,8 @@ numbering:
     @pytest.mark.usefixtures("_suppress_format_comments")
     def test_disabled_skips_numbering_check(self, caption_yaml):
         """rules.caption_numbering.enabled=False 时不检查编号（但仍注入 chapter/seq）。"""
+        from wordformat.config.compiled import config_from_dict
+        from wordformat.config.loader import use_config
         from wordformat.pipeline.stages import FormattingExecutionStage
 
         apply_format_check_to_all_nodes = (
@@ -521,8 +526,11 @@ numbering:
         p = self._make_paragraph("图2.1 测试")
         fig = self._make_caption_figure(p)
         heading = self._make_heading_node(children=[fig])
-        config = self._init_config(caption_yaml)
-        config["figures"]["caption"]["rules"]["caption_numbering"]["enabled"] = False
+        # 编译配置只读，改动配置项需由 dict 重新编译
+        raw = _load_yaml(caption_yaml)
+        raw["figures"]["caption"]["rules"]["caption_numbering"]["enabled"] = False
+        config = config_from_dict(raw)
+        use_config(config)
 
         with patch.object(fig, "add_comment") as mock_comment:
             apply_format_check_to_all_nodes(heading, doc, config, check=True)
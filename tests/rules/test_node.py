@@ -113,6 +113,54 @@ class TestFormatNodeBase:
         mock_base.assert_called_once_with(doc, p=False, r=False)
 
 
+class TestRulePlan:
+    """规则表：绑定编译配置时按类取一次，_run_rules 只按表调用 handler。"""
+
+    def test_bound_at_load_config(self, config_path):
+        from wordformat.config.compiled import compile_config
+
+        compiled = compile_config(config_path)
+        a, b = BodyText(value={}, level=1), BodyText(value={}, level=1)
+        a.load_config(compiled)
+        b.load_config(compiled)
+        assert a._rules is b._rules is compiled.rules_for(BodyText)
+        assert a._rules[0].handler is BodyText._handle_paragraph_style
+
+    def test_run_rules_uses_bound_plan(self, config_path, doc):
+        from unittest.mock import MagicMock
+
+        from wordformat.config.compiled import compile_config
+        from wordformat.rules.node import RuleStep
+
+        node = _make_node(BodyText)
+        node.load_config(compile_config(config_path))
+        handler = MagicMock()
+        node._rules = (RuleStep("x", handler, "cfg"),)
+        with patch.object(BodyText, "rule_plan") as plan:
+            node._run_rules(doc, p=True)
+        plan.assert_not_called()
+        handler.assert_called_once_with(node, doc, "cfg", True)
+
+    def test_disabled_rule_excluded(self):
+        from wordformat.config.dotdict import DotDict
+
+        cfg = DotDict({"rules": {"punctuation": {"enabled": False}}})
+        assert [step.name for step in BodyText.rule_plan(cfg)] == [
+            "paragraph_style",
+            "character_style",
+        ]
+        cfg = DotDict({"rules": {"punctuation": {"enabled": True}}})
+        assert BodyText.rule_plan(cfg)[-1].handler is BodyText._check_punctuation
+
+    def test_plain_config_plans_per_call(self, root_config, doc):
+        node = _make_node(BodyText)
+        node.load_config(root_config)
+        assert node._rules is None
+        with patch.object(BodyText, "rule_plan", return_value=()) as plan:
+            node._run_rules(doc, p=True)
+        plan.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # 2. 所有节点类型可实例化
 # ---------------------------------------------------------------------------
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""批注批量写入测试（style/comment_writer.py）。"""
+
+import re
+
+import pytest
+from docx import Document
+
+from wordformat.style.comment_writer import (
+    MERGED_ISSUE_TYPE,
+    CommentBudget,
+    CommentWriter,
+    flush_comments,
+)
+from wordformat.style.comments import add_styled_comment, split_comment_line
+
+ERROR = "正文段落-字号错误：小四，规范：五号"
+NOTICE = "正文段落-字体颜色错误：红色，规范：黑色"
+_DATE = re.compile(r' w:date="[^"]*"')
+
+
+@pytest.fixture
+def doc():
+    return Document()
+
+
+def _comments_xml(doc) -> str:
+    return _DATE.sub("", doc.part._comments_part.element.xml)
+
+
+def _writer(doc, **budget) -> CommentWriter:
+    writer = CommentWriter(doc.part, CommentBudget(**budget))
+    doc.part._wf_comment_writer = writer
+    return writer
+
+
+class TestWrite:
+    def test_same_xml_as_add_styled_comment(self):
+        lines = [ERROR, NOTICE, "无冒号的 \n 说明\t行"]
+        expected = Document()
+        p = expected.add_paragraph("hello")
+        add_styled_comment(expected, p.runs, [split_comment_line(t) for t in lines])
+
+        doc = Document()
+        p = doc.add_paragraph("hello")
+        _writer(doc).add(p.runs, lines)
+        assert flush_comments(doc) == 1
+        assert _comments_xml(doc) == _comments_xml(expected)
+        assert doc.element.body.xml == expected.element.body.xml
+
+    def test_deferred_until_flush(self, doc):
+        p = doc.add_paragraph("hello")
+        writer = _writer(doc)
+        writer.add(p.runs[0], [ERROR])
+        assert writer.pending == 1
+        assert list(doc.comments) == []
+        writer.flush()
+        assert writer.pending == 0
+        assert [c.text for c in doc.comments] == [ERROR]
+
+    def test_ids_continue_after_existing(self, doc):
+        p = doc.add_paragraph("hello")
+        doc.add_comment(p.runs, text="已有批注")
+        writer = _writer(doc)
+        for _ in range(3):
+            writer.add(p.runs, [ERROR])
+        writer.flush()
+        assert [c.comment_id for c in doc.comments] == [0, 1, 2, 3]
+
+    def test_record_severity(self, doc):
+        p = doc.add_paragraph("hello")
+        writer = _writer(doc)
+        assert writer.add(p.runs, [NOTICE]).severity == "提醒"
+        assert writer.add(p.runs, [NOTICE, ERROR]).severity == "错误"
+
+    def test_flush_without_writer(self, doc):
+        assert flush_comments(doc) == 0
+
+
+class TestBudget:
+    def test_paragraph_budget_merges_notices(self, doc):
+        p = doc.add_paragraph("hello")
+        p.add_run(" world")
+        writer = _writer(doc, paragraph=3)
+        writer.add(p.runs[0], [ERROR])
+        for _ in range(4):
+            writer.add(p.runs[1], [NOTICE])
+        assert writer.flush() == 3
+
+        texts = [c.text for c in doc.comments]
+        assert texts[:2] == [ERROR, NOTICE]
+        assert MERGED_ISSUE_TYPE in texts[2]
+        assert texts[2].count(NOTICE) == 3
+        # 汇总批注锚定整段
+        [start] = p._p.xpath('./w:commentRangeStart[@w:id="2"]')
+        assert start.getnext() is p.runs[0]._r
+
+    def test_errors_never_merged(self, doc):
+        p = doc.add_paragraph("hello")
+        writer = _writer(doc, paragraph=1)
+        for _ in range(3):
+            writer.add(p.runs, [ERROR])
+        assert writer.flush() == 3
+
+    def test_document_budget_counts_issue_types(self, doc):
+        writer = _writer(doc, document=2)
+        for i in range(5):
+            writer.add(doc.add_paragraph(f"第{i}段").runs, [NOTICE])
+        assert writer.flush() == 2
+        summary = list(doc.comments)[1].text
+        assert "另有 4 条提醒" in summary
+        assert "字体颜色错误：4 处" in summary
+
+    def test_single_overflow_not_merged(self, doc):
+        p = doc.add_paragraph("hello")
+        writer = _writer(doc, paragraph=3)
+        for _ in range(3):
+            writer.add(p.runs, [ERROR])
+        writer.add(p.runs, [NOTICE])
+        assert writer.flush() == 4
@@ -457,15 +457,39 @@ class TestUnitResult:
 # ===========================================================================
 
 
-class TestUnitLabelEnumRelValueSetter:
-    """Cover line 122: rel_value.setter"""
+class TestUnitLabelEnumInterned:
+    """取值对象不可变，且按 (类, 取值) 驻留"""
 
-    def test_rel_value_setter(self):
-        """Setting rel_value directly via setter"""
+    def test_rel_value_immutable(self):
         e = FontSize("小四")
         assert e.rel_value == 12
-        e.rel_value = 99
-        assert e.rel_value == 99
+        with pytest.raises(AttributeError):
+            e.rel_value = 99
+        with pytest.raises(AttributeError):
+            e.value = "五号"
+        assert e.rel_value == 12
+
+    def test_same_value_same_instance(self):
+        assert FontSize("小四") is FontSize("小四")
+        assert LineSpacing("1.5倍") is LineSpacing("1.5倍")
+        assert FontColor("BLACK") is FontColor("BLACK")
+
+    def test_interned_per_class_and_type(self):
+        assert FontSize("小四") is not FontName("小四")
+        assert FontSize(12) is not FontSize(12.0)
+        assert FontSize(12).value == 12 and FontSize(12.0).value == 12.0
+
+    def test_intern_table_bounded(self):
+        from wordformat.style.defs import INTERN_SIZE, _interned
+
+        for i in range(INTERN_SIZE + 10):
+            FontSize(f"{i}pt")
+        assert _interned.cache_info().currsize <= INTERN_SIZE
+        # 被淘汰后重新构造，取值不变
+        assert FontSize("0pt").rel_value == 0
+
+    def test_extract_unit_cached(self):
+        assert extract_unit_from_string("1.5倍") is extract_unit_from_string("1.5倍")
 
 
 class TestUnitLabelEnumBaseSetDefault:
@@ -537,8 +561,9 @@ class TestFontColorParseColorValueError:
         original = webcolors.hex_to_rgb
         webcolors.hex_to_rgb = MagicMock(side_effect=ValueError("mock error"))
         try:
+            # 实例按取值驻留、rel_value 已缓存，直接走解析函数
             with pytest.raises(ValueError, match="非法十六进制色值"):
-                FontColor("#FF0000").rel_value
+                FontColor._parse_color("#FF0000")
         finally:
             webcolors.hex_to_rgb = original
 
@@ -607,3 +607,74 @@ class TestParagraphStyleToStringAllEnabled:
         result = ParagraphStyle.to_string(diffs)
         assert "对齐错误" in result
         assert "段前间距错误" in result
+
+
+class TestSingleResolutionFix:
+    """fix_run / fix_paragraph 的残留差异须与「apply 后再 diff」完全一致。"""
+
+    @staticmethod
+    def _types(diffs):
+        return [(d.diff_type, str(d.expected_value), d.current_value) for d in diffs]
+
+    def _pair(self, build):
+        """同一构造在两份文档上各跑一次：旧路径 apply+diff，新路径 fix。"""
+        d1, d2 = Document(), Document()
+        return build(d1), build(d2)
+
+    @pytest.mark.parametrize(
+        "setup",
+        [
+            lambda r: None,
+            lambda r: setattr(r, "bold", True),
+            lambda r: setattr(r.font, "size", Pt(20)),
+            lambda r: setattr(r.font.color, "rgb", RGBColor(255, 0, 0)),
+            lambda r: setattr(r.font, "name", "Arial"),
+        ],
+    )
+    def test_run_remaining_matches_apply_then_diff(self, setup):
+        def build(d):
+            p = d.add_paragraph(style="Heading 1")
+            r = p.add_run("中文 text")
+            setup(r)
+            return r
+
+        old, new = self._pair(build)
+        cs = CharacterStyle(font_size="小四", bold=False)
+        cs.apply_to_run(old)
+        assert self._types(cs.fix_run(new)) == self._types(cs.diff_from_run(old))
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {"alignment": "居中对齐", "first_line_indent": "2字符"},
+            {"line_spacing": "1.5倍", "line_spacingrule": "单倍行距"},
+            {"builtin_style_name": "Heading 1", "space_before": "1行"},
+        ],
+    )
+    def test_paragraph_remaining_matches_apply_then_diff(self, kwargs):
+        def build(d):
+            p = d.add_paragraph("正文")
+            p.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            p.paragraph_format.line_spacing = 2.0
+            return p
+
+        old, new = self._pair(build)
+        ps = ParagraphStyle(**kwargs)
+        ps.apply_to_paragraph(old)
+        expected = self._types(ps.diff_from_paragraph(old))
+        assert self._types(ps.fix_paragraph(new)) == expected
+
+    def test_fix_run_resolves_chain_once(self, doc):
+        from wordformat.style.inheritance import StyleResolver
+
+        r = doc.add_paragraph().add_run("中文")
+        r.bold = True
+        cs = CharacterStyle()
+        with mock_patch.object(
+            StyleResolver, "run_inherited_sources", autospec=True,
+            side_effect=StyleResolver.run_inherited_sources,
+        ) as spy:
+            cs.fix_run(r)
+        assert spy.call_count == 1
+        assert r.bold is False
@@ -23,13 +23,17 @@ from wordformat.style.inheritance import (
     x_size_pt,
 )
 from wordformat.style.reader import (
+    EffectiveParaProps,
+    EffectiveRunProps,
     GetIndent,
     paragraph_get_alignment,
+    paragraph_get_effective_props,
     paragraph_get_first_line_indent,
     paragraph_get_line_spacing,
     paragraph_get_line_spacing_rule,
     paragraph_get_space_after,
     paragraph_get_space_before,
+    run_get_effective_props,
     run_get_font_bold,
     run_get_font_color,
     run_get_font_italic,
@@ -253,6 +257,14 @@ class TestDegradation:
         assert paragraph_get_line_spacing(m) is None
         assert GetIndent.left_indent(m) is None
 
+    def test_resolver_cached_per_document(self, doc):
+        """part.document 每次新建代理，resolver 须挂在 part 上才能复用。"""
+        r = doc.add_paragraph().add_run("x")
+        old = StyleResolver.for_run(r)
+        assert StyleResolver.for_paragraph(r._parent) is old
+        StyleResolver.invalidate(doc)
+        assert StyleResolver.for_run(r) is not old
+
     def test_resolver_no_document(self):
         """无文档构建的 resolver 只读直接格式，不抛异常。"""
         res = StyleResolver(None)
@@ -292,6 +304,74 @@ class TestExtractors:
         assert run_get_font_name_en(r) == "Calibri"
 
 
+# ── 批量解析：一次遍历与逐项 getter 结果一致 ─────────────────────
+class TestEffectiveProps:
+    def test_run_props_match_single_getters(self, doc):
+        st = _para_style(doc, "BulkRun", base=doc.styles["Heading 1"])
+        st.font.size = Pt(15)
+        r = doc.add_paragraph(style="BulkRun").add_run("中文")
+        r.font.italic = True
+        r.font.color.rgb = RGBColor(0x12, 0x34, 0x56)
+        props = run_get_effective_props(r)
+        assert props.bold is run_get_font_bold(r)
+        assert props.italic is True
+        assert props.underline is run_get_font_underline(r)
+        assert props.size_pt == run_get_font_size_pt(r) == 15.0
+        assert props.color == run_get_font_color(r) == (0x12, 0x34, 0x56)
+        assert props.font_name == run_get_font_name(r)
+        assert props.font_name_en == run_get_font_name_en(r)
+
+    def test_para_props_match_single_getters(self, doc):
+        st = _para_style(doc, "BulkPara")
+        pPr = st.element.get_or_add_pPr()
+        pPr.append(_spacing("beforeLines", "50"))
+        ind = OxmlElement("w:ind")
+        ind.set(qn("w:leftChars"), "-100")
+        ind.set(qn("w:firstLineChars"), "200")
+        pPr.append(ind)
+        p = doc.add_paragraph(style="BulkPara")
+        p.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p.paragraph_format.line_spacing = 1.5
+        props = paragraph_get_effective_props(p)
+        assert props.alignment == paragraph_get_alignment(p)
+        assert props.space_before == paragraph_get_space_before(p) == 0.5
+        assert props.space_after == paragraph_get_space_after(p)
+        assert props.line_spacing == paragraph_get_line_spacing(p) == 1.5
+        assert props.line_spacing_rule == paragraph_get_line_spacing_rule(p)
+        assert props.first_line_indent == paragraph_get_first_line_indent(p)
+        assert props.left_indent == GetIndent.left_indent(p) == 0.0
+        assert props.right_indent == GetIndent.right_indent(p)
+        assert props.builtin_style_name == "bulkpara"
+
+    def test_mock_returns_defaults(self):
+        assert run_get_effective_props(MagicMock()).size_pt == 12.0
+        assert paragraph_get_effective_props(MagicMock()).alignment is None
+
+    def test_records_are_slotted(self):
+        for obj in (EffectiveRunProps(), EffectiveParaProps()):
+            with pytest.raises(AttributeError):
+                obj.extra = 1
+
+    def test_resolve_many_walks_chain_once(self, doc):
+        """批量解析只构建一次源链生成器，且未命中的属性为 _MISS。"""
+        from wordformat.style.inheritance import _MISS, x_italic
+
+        r = doc.add_paragraph("标题", style="Heading 1").runs[0]
+        res = StyleResolver.for_run(r)
+        calls = []
+        orig = res.run_rpr_sources
+
+        def spy(run):
+            calls.append(run)
+            return orig(run)
+
+        res.run_rpr_sources = spy
+        v = res.resolve_run_many(r, {"bold": x_bold, "italic": x_italic})
+        assert len(calls) == 1
+        assert v["bold"] is True
+        assert v["italic"] is _MISS
+
+
 def _spacing(attr, val):
     sp = OxmlElement("w:spacing")
     sp.set(qn(f"w:{attr}"), val)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""结构化问题记录测试（style/issues.py）。"""
+
+import pytest
+from docx import Document
+
+from wordformat.style.comments import format_comment
+from wordformat.style.diff import ParagraphStyle
+from wordformat.style.issues import Issue, IssueCollector, join_issues, max_severity
+
+ERROR = Issue("正文段落", "字号错误", "小四", "五号")
+NOTICE = Issue("正文段落", "字体颜色错误", "红色", "黑色")
+
+
+class TestIssue:
+    def test_text_matches_format_comment(self):
+        assert ERROR.text == format_comment("正文段落", "字号错误", "小四", "五号")
+
+    def test_severity_from_property(self):
+        assert ERROR.severity == "错误"
+        assert NOTICE.severity == "提醒"
+
+    def test_explicit_severity_kept(self):
+        assert Issue("题注", "编号错误", "1", "2", severity="提醒").severity == "提醒"
+
+    @pytest.mark.parametrize("issue", [ERROR, NOTICE])
+    def test_parse_round_trip(self, issue):
+        assert Issue.parse(issue.text) == [issue]
+
+    def test_parse_multi_line_and_free_text(self):
+        issues = Issue.parse(f"{ERROR.text}\n\n无法归类的说明")
+        assert issues[0] == ERROR
+        assert issues[1].actual == "无法归类的说明"
+        assert issues[1].property == ""
+
+    def test_bind_and_to_dict(self):
+        bound = ERROR.bind("body_text", "fp1")
+        assert bound.node_type == "body_text"
+        assert bound.to_dict()["fingerprint"] == "fp1"
+        assert ERROR.node_type == ""
+
+    def test_join_and_max_severity(self):
+        assert join_issues([NOTICE, ERROR]) == f"{NOTICE.text}\n{ERROR.text}"
+        assert max_severity([NOTICE, ERROR]) == "错误"
+        assert max_severity([]) == "提醒"
+
+
+class TestCollector:
+    def test_per_document(self):
+        doc, other = Document(), Document()
+        collector = IssueCollector.for_document(doc)
+        assert IssueCollector.for_document(doc) is collector
+        assert IssueCollector.for_document(other) is not collector
+
+    def test_stats_count_comments(self):
+        collector = IssueCollector()
+        assert collector.record([NOTICE, ERROR]) == "错误"
+        assert collector.record([NOTICE]) == "提醒"
+        assert collector.stats == {"total": 2, "错误": 1, "提醒": 1}
+        assert len(collector.to_list()) == 3
+
+    def test_merge_equals_recording_in_order(self):
+        serial, first, second = IssueCollector(), IssueCollector(), IssueCollector()
+        for group in ([ERROR], [NOTICE, ERROR], [NOTICE]):
+            serial.record(group)
+        first.record([ERROR])
+        second.record([NOTICE, ERROR])
+        second.record([NOTICE])
+        first.merge(second)
+        assert first.issues == serial.issues
+        assert first.stats == serial.stats
+
+
+class TestDiffIssues:
+    def test_to_string_built_from_issues(self):
+        doc = Document()
+        para = doc.add_paragraph("hello")
+        diffs = ParagraphStyle(alignment="居中对齐").diff_from_paragraph(para)
+        issues = ParagraphStyle.to_issues(diffs, target="正文段落")
+        assert issues
+        assert all(i.location == "正文段落" for i in issues)
+        assert ParagraphStyle.to_string(diffs, target="正文段落") == join_issues(issues)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""diff 签名缓存测试（style/memo.py + diff 接入）。"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt
+
+from wordformat.style.diff import CharacterStyle, ParagraphStyle
+from wordformat.style.memo import DiffMemo
+
+
+@pytest.fixture
+def doc():
+    return Document()
+
+
+def _memo(doc) -> DiffMemo:
+    return DiffMemo.for_document(doc)
+
+
+class TestRunMemo:
+    def test_same_signature_hits(self, doc):
+        cs = CharacterStyle(bold=True)
+        r1 = doc.add_paragraph().add_run("a")
+        r2 = doc.add_paragraph().add_run("b")
+        first = cs.diff_from_run(r1)
+        second = CharacterStyle(bold=True).diff_from_run(r2)
+        memo = _memo(doc)
+        assert (memo.hits, memo.misses) == (1, 1)
+        assert [d.diff_type for d in first] == [d.diff_type for d in second]
+
+    def test_returns_independent_copies(self, doc):
+        cs = CharacterStyle(bold=True)
+        r = doc.add_paragraph().add_run("a")
+        cs.diff_from_run(r)[0].comment = "changed"
+        assert cs.diff_from_run(r)[0].comment != "changed"
+
+    def test_direct_format_change_misses(self, doc):
+        cs = CharacterStyle()
+        r = doc.add_paragraph().add_run("a")
+        cs.diff_from_run(r)
+        r.font.size = Pt(20)
+        assert "font_size" in [d.diff_type for d in cs.diff_from_run(r)]
+        assert _memo(doc).hits == 0
+
+    def test_expected_style_and_cjk_in_key(self, doc):
+        p = doc.add_paragraph()
+        r_en, r_cn = p.add_run("a"), p.add_run("中")
+        CharacterStyle(bold=True).diff_from_run(r_en)
+        CharacterStyle(bold=False).diff_from_run(r_en)
+        CharacterStyle(bold=True).diff_from_run(r_cn)
+        assert _memo(doc).hits == 0
+        assert len(_memo(doc).runs) == 3
+
+    def test_inherited_values_cached_per_style(self, doc):
+        cs = CharacterStyle()
+        p = doc.add_paragraph()
+        r1, r2 = p.add_run("a"), p.add_run("b")
+        r2.font.size = Pt(20)
+        cs.diff_from_run(r1)
+        cs.diff_from_run(r2)
+        memo = _memo(doc)
+        assert memo.misses == 2
+        assert len(memo.run_inherited) == 1
+
+    def test_mock_run_bypasses_memo(self):
+        run = MagicMock()
+        run.text = "测试文本"
+        assert isinstance(CharacterStyle().diff_from_run(run), list)
+
+
+class TestParagraphMemo:
+    def test_same_ppr_hits(self, doc):
+        ps = ParagraphStyle(alignment="居中对齐")
+        p1, p2 = doc.add_paragraph("x"), doc.add_paragraph("y")
+        assert [d.diff_type for d in ps.diff_from_paragraph(p1)] == [
+            d.diff_type for d in ps.diff_from_paragraph(p2)
+        ]
+        assert _memo(doc).hits == 1
+
+    def test_ppr_change_misses(self, doc):
+        ps = ParagraphStyle(alignment="居中对齐")
+        p = doc.add_paragraph("x")
+        assert "alignment" in [d.diff_type for d in ps.diff_from_paragraph(p)]
+        p.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        assert "alignment" not in [d.diff_type for d in ps.diff_from_paragraph(p)]
+        assert _memo(doc).hits == 0
+
+
+class TestSummary:
+    def test_hit_rate_and_summary(self, doc):
+        memo = _memo(doc)
+        assert memo.hit_rate == 0.0
+        cs = CharacterStyle()
+        for _ in range(4):
+            cs.diff_from_run(doc.add_paragraph().add_run("a"))
+        assert memo.hit_rate == 0.75
+        assert "75.0%" in memo.summary()
+
+    def test_invalidate_on_new_style(self, doc):
+        from wordformat.style.defs import ensure_style_exists
+
+        CharacterStyle().diff_from_run(doc.add_paragraph().add_run("a"))
+        old = _memo(doc)
+        ensure_style_exists(doc, "Brand New")
+        assert _memo(doc) is not old
+
+    def test_for_document_none(self):
+        assert DiffMemo.for_document(None) is None
+
+
+class TestStamp:
+    def _dirty_paragraph(self, doc, text="正文"):
+        p = doc.add_paragraph()
+        p.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        r = p.add_run(text)
+        r.font.size = Pt(20)
+        r.bold = True
+        return p, r
+
+    def test_stamp_matches_per_attribute_write(self, doc):
+        ps, cs = ParagraphStyle(), CharacterStyle()
+        (p1, r1), (p2, r2) = self._dirty_paragraph(doc), self._dirty_paragraph(doc)
+        assert ps.fix_paragraph(p1) == ps.fix_paragraph(p2)
+        assert cs.fix_run(r1) == cs.fix_run(r2)
+        assert _memo(doc).stamped == 2
+        assert p1._p.xml == p2._p.xml
+
+        reference = Document()
+        p3, r3 = self._dirty_paragraph(reference)
+        ps._write_paragraph(p3, ps.diff_from_paragraph(p3))
+        cs._write_run(r3, cs.diff_from_run(r3))
+        assert p3._p.xml == p2._p.xml
+
+    def test_stamp_keeps_unrelated_children(self, doc):
+        from wordformat.numbering import apply_auto_numbering
+
+        ps = ParagraphStyle()
+        ps.fix_paragraph(self._dirty_paragraph(doc)[0])
+        numbered = []
+        for _ in range(2):
+            p, _ = self._dirty_paragraph(doc)
+            apply_auto_numbering(p, "7")
+            ps.fix_paragraph(p)
+            numbered.append(p)
+        assert _memo(doc).stamped == 1
+        assert numbered[1]._p.pPr.numPr.numId.val == 7
+        assert numbered[0]._p.pPr.xml == numbered[1]._p.pPr.xml
+
+    def test_run_without_rpr_gets_rpr_first(self, doc):
+        cs = CharacterStyle(bold=True)
+        r1 = doc.add_paragraph().add_run("a")
+        cs.fix_run(r1)
+        r2 = doc.add_paragraph().add_run("b")
+        cs.fix_run(r2)
+        assert _memo(doc).stamped == 1
+        assert r2._r[0].tag == r1._r[0].tag == r1._r.rPr.tag
+        assert r2.bold is True
+        assert "印章写回 1 次" in _memo(doc).summary()
+
+    def test_stamp_copies_are_independent(self, doc):
+        cs = CharacterStyle(bold=True)
+        r1 = doc.add_paragraph().add_run("a")
+        r2 = doc.add_paragraph().add_run("b")
+        cs.fix_run(r1)
+        cs.fix_run(r2)
+        r2.italic = True
+        assert r1.italic is None
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""整篇格式表测试（style/table.py）：向量化比对结果须与逐项 diff 一致。"""
+
+import random
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt, RGBColor
+
+from wordformat.rules import BodyText, HeadingLevel1Node
+from wordformat.rules.node import FormatNode
+from wordformat.style.diff import CharacterStyle, ParagraphStyle
+from wordformat.style.table import FormatTable, _character_style
+from wordformat.utils import has_chinese
+
+
+def _tree(doc, specs):
+    """specs: [(节点类, 段落)]，挂到一个虚拟根节点下。"""
+    root = FormatNode(value={"category": "top"}, level=0)
+    for cls, p in specs:
+        node = cls(value=p.text, level=1, paragraph=p)
+        node.load_config({})
+        root.add_child_node(node)
+    return root
+
+
+@pytest.fixture
+def doc():
+    return Document()
+
+
+def _random_doc(doc, seed=7, n=40):
+    rnd = random.Random(seed)
+    specs = []
+    for i in range(n):
+        cls = HeadingLevel1Node if i % 5 == 0 else BodyText
+        p = doc.add_paragraph(style="Heading 1" if cls is HeadingLevel1Node else None)
+        for text in ("中文", "English", "混合 text"):
+            r = p.add_run(text)
+            k = rnd.random()
+            if k < 0.15:
+                r.bold = True
+            elif k < 0.3:
+                r.font.size = Pt(rnd.choice([10.5, 12, 14]))
+            elif k < 0.45:
+                r.font.color.rgb = RGBColor(255, 0, 0)
+            elif k < 0.6:
+                r.font.name = "Times New Roman"
+        k = rnd.random()
+        if k < 0.3:
+            p.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+        elif k < 0.5:
+            p.paragraph_format.line_spacing = 1.5
+        specs.append((cls, p))
+    return _tree(doc, specs)
+
+
+class TestEquivalence:
+    def test_run_and_para_mask_match_diff(self, doc):
+        root = _random_doc(doc)
+        table = FormatTable.build(root)
+        assert len(table.runs) and len(table.paras)
+        for node in root.children:
+            cfg = node.pydantic_config
+            cs = _character_style(cfg)
+            for run in node.paragraph.runs:
+                clean = table.run_clean(run, cs.signature(), has_chinese(run.text))
+                assert clean == (cs.diff_from_run(run) == [])
+            ps = ParagraphStyle.from_config(cfg)
+            clean = table.para_clean(node.paragraph, ps.signature())
+            assert clean == (ps.diff_from_paragraph(node.paragraph) == [])
+
+    def test_clean_rows_exist_after_apply(self, doc):
+        root = _random_doc(doc, n=10)
+        for node in root.children:
+            node.apply_style(doc)
+        table = FormatTable.build(root)
+        assert len(table.runs) == 30
+        assert not table.run_mismatch.any()
+
+
+class TestFallback:
+    def test_physical_unit_style_falls_back(self, doc):
+        p = doc.add_paragraph("正文")
+        root = _tree(doc, [(BodyText, p)])
+        root.children[0].pydantic_config.paragraph["space_before"] = "6pt"
+        table = FormatTable.build(root)
+        assert table.para_mismatch.all()
+
+    def test_signature_mismatch_not_clean(self, doc):
+        p = doc.add_paragraph()
+        p.add_run("正文")
+        table = FormatTable.build(_tree(doc, [(BodyText, p)]))
+        other = CharacterStyle(font_size="一号").signature()
+        assert table.run_clean(p.runs[0], other, True) is False
+
+    def test_unknown_run_not_clean(self, doc):
+        table = FormatTable.build(_tree(doc, []))
+        r = doc.add_paragraph().add_run("x")
+        assert table.run_clean(r, CharacterStyle().signature(), False) is False
+
+
+class TestAttach:
+    def test_attach_detach(self, doc):
+        table = FormatTable.build(_tree(doc, []))
+        p = doc.add_paragraph("x")
+        assert FormatTable.for_obj(p) is None
+        table.attach(doc)
+        assert FormatTable.for_obj(p) is table
+        FormatTable.detach(doc)
+        assert FormatTable.for_obj(p) is None
+
+    def test_summary(self, doc):
+        p = doc.add_paragraph()
+        p.add_run("正文")
+        summary = FormatTable.build(_tree(doc, [(BodyText, p)])).summary()
+        assert "run 1 行" in summary and "段落 1 行" in summary
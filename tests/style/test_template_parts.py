@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""模板片段缓存测试（style/template_parts.py）：接入结果须与逐项修正一致。"""
+
+import pytest
+from docx import Document
+from docx.oxml.ns import qn
+from lxml import etree
+
+from wordformat.config.loader import load_config
+from wordformat.config.models import NodeConfigRoot
+from wordformat.numbering import build_numbering_levels, create_numbering_definition
+from wordformat.pipeline.stages import StyleDefinitionFixStage
+from wordformat.style import template_parts
+from wordformat.style.template_parts import TemplateParts, style_index
+
+EXAMPLE = "example/undergrad_thesis.yaml"
+
+
+@pytest.fixture
+def config():
+    return load_config(EXAMPLE)
+
+
+def _fix_uncached(document, config):
+    """不经缓存的逐项修正结果（普通 dict 配置不跨文档复用片段）。"""
+    StyleDefinitionFixStage()._fix_all_style_definitions(document, NodeConfigRoot(**config))
+    return document.styles.element.xml
+
+
+class TestStyleGraft:
+    def test_hit_matches_direct_fix(self, config):
+        stage = StyleDefinitionFixStage()
+        expected = _fix_uncached(Document(), config)
+        first, second = Document(), Document()
+        stage._fix_all_style_definitions(first, config)
+        stage._fix_all_style_definitions(second, config)
+        parts = TemplateParts.for_config(config)
+        assert parts.hits == len(parts.style_configs())
+        assert first.styles.element.xml == second.styles.element.xml == expected
+
+    def test_grafted_elements_independent(self, config):
+        stage = StyleDefinitionFixStage()
+        a, b = Document(), Document()
+        stage._fix_all_style_definitions(a, config)
+        stage._fix_all_style_definitions(b, config)
+        elem_a = style_index(a)["Normal"]
+        elem_b = style_index(b)["Normal"]
+        assert elem_a is not elem_b
+        elem_b.append(elem_b.makeelement(qn("w:semiHidden"), {}))
+        assert elem_a.find(qn("w:semiHidden")) is None
+
+    def test_different_original_definition_not_shared(self, config):
+        stage = StyleDefinitionFixStage()
+        stage._fix_all_style_definitions(Document(), config)
+        doc = Document()
+        doc.styles["Normal"].font.italic = True
+        expected_doc = Document()
+        expected_doc.styles["Normal"].font.italic = True
+        stage._fix_all_style_definitions(doc, config)
+        assert doc.styles.element.xml == _fix_uncached(expected_doc, config)
+
+    def test_plain_config_not_cached(self, config):
+        plain = NodeConfigRoot(**config)
+        assert TemplateParts.for_config(plain) is not TemplateParts.for_config(plain)
+        assert TemplateParts.for_config(config) is TemplateParts.for_config(config)
+
+    def test_style_cache_bounded(self, config, monkeypatch):
+        monkeypatch.setattr(template_parts, "STYLE_CACHE_SIZE", 2)
+        parts = TemplateParts(config)
+        styles = Document().styles.element
+        elems = list(styles.iterchildren(qn("w:style")))[:3]
+        for elem in elems:
+            parts.graft_style(elem, "Normal", lambda style: None)
+        assert parts.misses == 3
+        assert len(parts._styles) == 2
+        # 最早的条目已淘汰，再次接入需重新修正
+        parts.graft_style(elems[0], "Normal", lambda style: None)
+        assert parts.misses == 4
+        parts.graft_style(elems[2], "Normal", lambda style: None)
+        assert parts.hits == 1
+
+
+class TestNumberingLevels:
+    def test_levels_built_once_and_copied(self, config):
+        parts = TemplateParts.for_config(config)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return build_numbering_levels(config.numbering, config.headings)
+
+        docs = [Document(), Document()]
+        for doc in docs:
+            levels = parts.numbering_levels(build)
+            create_numbering_definition(doc, config.numbering, config.headings, levels)
+        assert len(calls) == 1
+        # 倒数第二个 abstractNum 为标题编号（最后一个为参考文献）
+        lvls = [doc.part.numbering_part._element.findall(qn("w:abstractNum"))[-2][0] for doc in docs]
+        assert lvls[0] is not lvls[1]
+        assert etree.tostring(lvls[0]) == etree.tostring(lvls[1])
+
+    def test_matches_uncached_definition(self, config):
+        cached, plain = Document(), Document()
+        parts = TemplateParts.for_config(config)
+        levels = parts.numbering_levels(
+            lambda: build_numbering_levels(config.numbering, config.headings)
+        )
+        a = create_numbering_definition(cached, config.numbering, config.headings, levels)
+        b = create_numbering_definition(plain, config.numbering, config.headings)
+        assert a == b
+        assert (
+            cached.part.numbering_part._element.xml == plain.part.numbering_part._element.xml
+        )
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""批量处理（pipeline/batch.py）：进程池处理整个目录、跨文档合并推理、汇总与续跑。"""
+
+import csv
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from wordformat.pipeline.batch import find_documents, run_batch, write_summary
+from wordformat.pipeline.orchestrate import check_format_report
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+
+
+def _rows(chapter: int) -> list[tuple]:
+    rows = [("heading_level_1", f"第{chapter}章 标题", "Heading 1")]
+    return rows + [("body_text", f"第{chapter}章正文{i}，包含English words。", None) for i in range(3)]
+
+
+def _size_error(chapter: int):
+    """第 chapter % 4 段字号错误，各篇的问题落在不同段落。"""
+    return lambda i: "size" if i == chapter % 4 else None
+
+
+@pytest.fixture
+def cohort(tmp_path, make_thesis):
+    """cohort(n=3, with_json=True)：n 篇论文；
+    with_json 时在输出目录中预先放好结构 JSON（cf / af 不需要模型）。"""
+
+    def make(n=3, with_json=True):
+        src, out = tmp_path / "in", tmp_path / "out"
+        src.mkdir()
+        out.mkdir()
+        for i in range(1, n + 1):
+            items = make_thesis(src / f"论文{i}.docx", _rows(i), _size_error(i))
+            if with_json:
+                (out / f"论文{i}.json").write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+        return src, out
+
+    return make
+
+
+def _fake_infer(calls):
+    def infer(texts):
+        calls.append(len(texts))
+        return [{"label": "body_text", "score": 0.9} for _ in texts]
+
+    return infer
+
+
+class TestBatch:
+    def test_find_documents_skips_temp_and_outputs(self, tmp_path):
+        for name in ("b.docx", "a.docx", "~$a.docx", "a--标注版.docx", "notes.txt"):
+            (tmp_path / name).write_bytes(b"")
+        assert [p.name for p in find_documents(tmp_path)] == ["a.docx", "b.docx"]
+
+    def test_gj_batches_classification_across_documents(self, cohort):
+        src, out = cohort(with_json=False)
+        calls = []
+        with patch("wordformat.base.onnx_batch_infer", side_effect=_fake_infer(calls)):
+            results = run_batch(src, "gj", out_dir=out, workers=1)
+
+        # 3 篇各 4 段，合并为一次推理
+        assert calls == [12]
+        assert [r.status for r in results] == ["done"] * 3
+        for r in results:
+            data = json.loads(Path(r.output).read_text(encoding="utf-8"))
+            assert len(data) == r.paragraphs == 4
+
+    def test_gj_retries_each_document_when_merged_inference_fails(self, cohort):
+        src, out = cohort(with_json=False)
+
+        def classify(bases):
+            if len(bases) > 1 or "论文2" in bases[0].docx_file:
+                raise RuntimeError("推理失败")
+            return [[{"category": "body_text", "paragraph": "x"}]]
+
+        with patch("wordformat.base.classify_documents", side_effect=classify):
+            results = run_batch(src, "gj", out_dir=out, workers=1)
+
+        assert [r.status for r in results] == ["done", "failed", "done"]
+        assert "推理失败" in results[1].error
+
+    def test_cf_in_pool_matches_single_document_check(self, cohort):
+        src, out = cohort()
+        results = run_batch(src, "cf", str(EXAMPLE), out_dir=out, workers=2, chunk_size=1)
+
+        assert [r.status for r in results] == ["done"] * 3
+        for r in results:
+            assert Path(r.output).name.endswith("--标注版.docx") and Path(r.output).exists()
+            json_path = out / f"{Path(r.document).stem}.json"
+            report = check_format_report(str(json_path), r.document, str(EXAMPLE), cache=False)
+            assert (r.errors, r.notices) == (report["summary"]["errors"], report["summary"]["notices"])
+            assert r.total_ms >= r.format_ms > 0
+
+    def test_resume_skips_finished_documents(self, cohort):
+        src, out = cohort()
+        run_batch(src, "af", str(EXAMPLE), out_dir=out)
+        assert [r.status for r in run_batch(src, "af", str(EXAMPLE), out_dir=out)] == ["skipped"] * 3
+
+        (out / "论文2--修改版.docx").unlink()
+        results = run_batch(src, "af", str(EXAMPLE), out_dir=out)
+        assert [r.status for r in results] == ["skipped", "done", "skipped"]
+        forced = run_batch(src, "af", str(EXAMPLE), out_dir=out, resume=False)
+        assert [r.status for r in forced] == ["done"] * 3
+
+    def test_failure_is_isolated_and_summarized(self, cohort):
+        src, out = cohort()
+        (src / "论文2.docx").write_bytes(b"not a docx")
+        results = run_batch(src, "cf", str(EXAMPLE), out_dir=out, workers=1)
+
+        assert [r.status for r in results] == ["done", "failed", "done"]
+        assert results[1].error and not results[1].output
+
+        with open(write_summary(results, out / "summary.csv"), encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["status"] for row in rows] == ["done", "failed", "done"]
+        assert rows[0]["errors"] == str(results[0].errors)
+
+        data = json.loads(Path(write_summary(results, out / "summary.json")).read_text(encoding="utf-8"))
+        assert data["summary"]["failed"] == 1
+        assert data["summary"]["errors"] == results[0].errors + results[2].errors
+        assert data["documents"][1]["error"] == results[1].error
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""同一进程内多线程并发处理多篇文档：结果与串行逐篇处理一致，请求间状态不串扰。"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from wordformat.config.loader import get_config, load_config
+from wordformat.pipeline.orchestrate import auto_format_thesis_document, check_format_report
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+CATEGORIES = [
+    "heading_level_1",
+    "body_text",
+    "body_text",
+    "heading_level_2",
+    "body_text",
+    "caption_figure",
+    "body_text",
+]
+DEVIATIONS = ["bold", "size", "color", "center", "spacing", None]
+
+
+def _rows(n: int = 40) -> list[tuple]:
+    """n 段合成论文：按 CATEGORIES 循环排列标题、正文和图题注。"""
+    rows = []
+    for i in range(n):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        if category.startswith("heading"):
+            rows.append((category, f"{i} 标题{i}", f"Heading {category[-1]}"))
+        elif category == "caption_figure":
+            rows.append((category, f"图{i} 示意图", None))
+        else:
+            rows.append((category, f"正文内容第{i}段，包含English words。", None))
+    return rows
+
+
+def _pattern(seed: int):
+    """第 i 段的偏差：(i * 7 + seed) % 6 依次对应 DEVIATIONS。"""
+    return lambda i: DEVIATIONS[(i * 7 + seed) % 6]
+
+
+@pytest.fixture
+def jobs(tmp_path, make_thesis):
+    """8 篇文档 × 两份 style_checks_warning 不同的配置。"""
+    quiet = tmp_path / "quiet.yaml"
+    quiet.write_text(
+        EXAMPLE.read_text(encoding="utf-8").replace("  bold: true", "  bold: false", 1)
+        .replace("  font_size: true", "  font_size: false", 1),
+        encoding="utf-8",
+    )
+    result = []
+    for seed in range(8):
+        docx = tmp_path / f"doc{seed}.docx"
+        items = make_thesis(docx, _rows(), _pattern(seed))
+        config = str(EXAMPLE if seed % 2 else quiet)
+        result.append((items, str(docx), config))
+    return result
+
+
+def _parallel(fn, args):
+    with ThreadPoolExecutor(max_workers=len(args)) as pool:
+        return list(pool.map(lambda a: fn(*a), args))
+
+
+class TestConcurrentDocuments:
+    def test_reports_match_serial(self, jobs):
+        def run(items, docx, config):
+            return check_format_report(items, docx, config)
+
+        serial = [run(*job) for job in jobs]
+        assert serial[0]["summary"] != serial[1]["summary"]  # 两份配置确有差别
+        assert _parallel(run, jobs) == serial
+
+    @pytest.mark.parametrize("check", [True, False])
+    def test_saved_documents_match_serial(self, jobs, tmp_path, docx_parts, check):
+        def run(index, items, docx, config, tag):
+            out = tmp_path / f"{tag}{index}"
+            return auto_format_thesis_document(items, docx, config, str(out), check=check)
+
+        serial = [run(i, *job, "serial") for i, job in enumerate(jobs)]
+        parallel = _parallel(run, [(i, *job, "parallel") for i, job in enumerate(jobs)])
+        for a, b in zip(serial, parallel, strict=True):
+            assert docx_parts(a) == docx_parts(b)
+
+    def test_config_is_thread_local(self, jobs):
+        """一个线程加载的配置不影响其它线程。"""
+        load_config(jobs[0][2])
+        mine = get_config()
+        _parallel(lambda cfg: load_config(cfg), [(job[2],) for job in jobs[1:]])
+        assert get_config() is mine
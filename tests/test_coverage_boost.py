@@ -1304,7 +1304,6 @@ class TestCoverageBoostRound2:
         p = doc.add_paragraph("")
         root = FormatNode(value={"category": "top"}, level=0)
         root.children = []
-        FormatNode.reset_stats()
         stage = SummaryGenerationStage()
         from wordformat.pipeline.context import FormatContext
 
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""按段落指纹的增量 check（pipeline/incremental.py）：复用缓存的结果与完整检查逐字节一致。"""
+
+from pathlib import Path
+
+import pytest
+
+from wordformat.pipeline import incremental
+from wordformat.pipeline.incremental import CheckCache, cache_path
+from wordformat.pipeline.orchestrate import auto_format_thesis_document, check_format_report
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+DEVIATIONS = ["bold", "size", "color"]
+
+
+def _rows(edit: str | None = None) -> list[tuple]:
+    """两章合成论文；edit 不为 None 时替换第一章第一段正文（模拟修改后重新检查）。"""
+    rows = [("abstract_chinese_title_content", "摘要：本文研究论文格式。\n第二行。", None)]
+    for ch in (1, 2):
+        rows.append(("heading_level_1", f"第{ch}章 标题{ch}", "Heading 1"))
+        for i in range(3):
+            text = f"第{ch}章正文{i}，包含English words。"
+            rows.append(("body_text", edit if edit is not None and (ch, i) == (1, 0) else text, None))
+        rows.append(("caption_figure", f"图{ch}.1 示意图", None))
+    return rows
+
+
+def _deviate(i: int) -> str:
+    """第 i 段依次加粗、改字号、改颜色。"""
+    return DEVIATIONS[i % len(DEVIATIONS)]
+
+
+def _check(items, docx, out, cache):
+    return auto_format_thesis_document(
+        items, str(docx), str(EXAMPLE), savepath=str(out), check=True, cache=cache
+    )
+
+
+@pytest.fixture
+def thesis(tmp_path, make_thesis):
+    docx = tmp_path / "thesis.docx"
+    return make_thesis(docx, _rows(), _deviate), docx
+
+
+class TestIncrementalCheck:
+    def test_warm_check_matches_full_check(self, tmp_path, thesis, docx_parts):
+        items, docx = thesis
+        full = _check(items, docx, tmp_path / "full", cache=False)
+        assert not Path(cache_path(docx)).exists()
+
+        cold = _check(items, docx, tmp_path / "cold", cache=True)
+        assert Path(cache_path(docx)).exists()
+        warm = _check(items, docx, tmp_path / "warm", cache=True)
+        assert docx_parts(cold) == docx_parts(full)
+        assert docx_parts(warm) == docx_parts(full)
+
+    def test_only_edited_paragraph_is_rechecked(self, tmp_path, thesis, make_thesis):
+        items, docx = thesis
+        cache = CheckCache()
+        check_format_report(items, str(docx), str(EXAMPLE), cache=cache)
+        assert (cache.hits, cache.misses) == (0, len(items))
+
+        edited = make_thesis(docx, _rows(edit="第1章正文0，改写后的内容。"), _deviate)
+        cache.hits = cache.misses = 0
+        report = check_format_report(edited, str(docx), str(EXAMPLE), cache=cache)
+        assert (cache.hits, cache.misses) == (len(items) - 1, 1)
+        assert len(cache) == len(items)
+        expected = check_format_report(edited, str(docx), str(EXAMPLE), cache=False)
+        assert report["issues"] == expected["issues"]
+        assert report["summary"] == expected["summary"]
+
+    def test_cache_file_round_trip(self, thesis):
+        items, docx = thesis
+        check_format_report(items, str(docx), str(EXAMPLE), cache=True)
+        cache = CheckCache.for_source(docx)
+        assert len(cache) == len(items)
+
+        check_format_report(items, str(docx), str(EXAMPLE), cache=cache)
+        assert (cache.hits, cache.misses) == (len(items), 0)
+
+    def test_config_and_mode_are_part_of_fingerprint(self, tmp_path, thesis):
+        items, docx = thesis
+        cache = CheckCache()
+        check_format_report(items, str(docx), str(EXAMPLE), cache=cache)
+
+        # 写批注与仅报告的结果不同，不互相复用
+        _check(items, docx, tmp_path / "out", cache=cache)
+        assert cache.hits == 0
+
+        other = tmp_path / "other.yaml"
+        other.write_text(EXAMPLE.read_text(encoding="utf-8") + "\n# changed\n", encoding="utf-8")
+        report = check_format_report(items, str(docx), str(other), cache=cache)
+        assert cache.hits == 0
+        assert report["issues"]
+
+    def test_corrupt_or_stale_cache_is_ignored(self, thesis):
+        items, docx = thesis
+        Path(cache_path(docx)).write_bytes(b"not a cache")
+        assert len(CheckCache.for_source(docx)) == 0
+
+        check_format_report(items, str(docx), str(EXAMPLE), cache=True)
+        cache = CheckCache.for_source(docx)
+        assert len(cache) == len(items)
+        incremental.CACHE_VERSION += 1
+        try:
+            assert len(CheckCache.for_source(docx)) == 0
+        finally:
+            incremental.CACHE_VERSION -= 1
+
+    def test_opt_in(self, tmp_path, thesis, monkeypatch):
+        items, docx = thesis
+        monkeypatch.setattr(incremental, "CHECK_CACHE", False)
+        check_format_report(items, str(docx), str(EXAMPLE))
+        assert not Path(cache_path(docx)).exists()
+
+        check_format_report(items, str(docx), str(EXAMPLE), cache=True)
+        assert Path(cache_path(docx)).exists()
+
+        Path(cache_path(docx)).unlink()
+        monkeypatch.setattr(incremental, "CHECK_CACHE", True)
+        check_format_report(items, str(docx), str(EXAMPLE))
+        assert Path(cache_path(docx)).exists()
@@ -10,6 +10,7 @@ import os
 import shutil
 import tempfile
 import threading
+from types import SimpleNamespace
 from unittest import mock
 
 import pytest
@@ -45,8 +46,20 @@ from wordformat.structure.document_builder import DocumentBuilder
 from wordformat.structure.utils import promote_bodytext_in_subtrees_of_type
 from wordformat.rules.node import FormatNode
 from wordformat.rules.body import BodyText
+from wordformat.rules.abstract import AbstractContentCN, AbstractTitleCN
+from wordformat.rules.references import ReferenceEntry, References
 from wordformat.api import save_upload_file, TEMP_DIR
 
+
+def _flatten_tree_nodes(root_node):
+    """参考实现：DFS 前序展平树中所有节点（排除虚拟根节点）。"""
+    result = []
+    for child in root_node.children:
+        result.append(child)
+        result.extend(_flatten_tree_nodes(child))
+    return result
+
+
 apply_format_check_to_all_nodes = (
     FormattingExecutionStage().apply_format_check_to_all_nodes
 )
@@ -465,11 +478,8 @@ class TestSetStyleIntegration:
         apply_format_check_to_all_nodes(root, doc, {}, check=False)
         assert call_log == ["apply"]
 
-    def test_flatten_tree_nodes_matches_doc_order(self):
-        """DFS 展平的节点顺序与 document.paragraphs 一致。"""
-
-        _flatten_tree_nodes = ParagraphAlignmentStage()._flatten_tree_nodes
-
+    def test_alignment_follows_dfs_preorder(self):
+        """段落按 DFS 前序（排除虚拟根节点）依次对齐到节点，与 document.paragraphs 顺序一致。"""
         root = FormatNode(value={"category": "top"}, level=0)
         a = FormatNode(value={"category": "abstract_chinese_title"}, level=1)
         b = FormatNode(value={"category": "body_text"}, level=1)
@@ -480,8 +490,14 @@ class TestSetStyleIntegration:
         root.add_child_node(c)
         c.add_child_node(d)
 
+        doc = Document()
+        for i in range(4):
+            doc.add_paragraph(str(i))
+        ParagraphAlignmentStage().process(SimpleNamespace(document=doc, root_node=root))
+
         nodes = _flatten_tree_nodes(root)
         assert nodes == [a, b, c, d]
+        assert [n.paragraph._p for n in nodes] == [p._p for p in doc.paragraphs]
 
 
 # ==================== (i) set_style.py auto_format_thesis_document 覆盖测试 ====================
@@ -491,7 +507,7 @@ class TestAutoFormatThesisDocument:
     """覆盖 set_style.py lines 53-55, 120-176: auto_format_thesis_document 主流程"""
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_check_mode_returns_annotated_path(
@@ -515,7 +531,7 @@ class TestAutoFormatThesisDocument:
         assert "--标注版.docx" in result
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_apply_mode_returns_modified_path(
@@ -539,7 +555,38 @@ class TestAutoFormatThesisDocument:
         assert "--修改版.docx" in result
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
+    )
+    @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
+    def test_report_only_returns_issues_without_saving(
+        self, mock_builder, mock_apply, temp_docx, config_path, tmp_path
+    ):
+        """check_format_report：问题进入报告，不写批注、不保存文档"""
+        from wordformat.pipeline.orchestrate import check_format_report
+        from wordformat.style.issues import Issue, IssueCollector
+
+        root_node = mock.MagicMock()
+        root_node.children = []
+        mock_builder.build_from_json.return_value = root_node
+
+        def fake_apply(visitor, document, config, check):
+            collector = IssueCollector.for_document(document)
+            assert collector.write_comments is False
+            collector.record([Issue("正文段落", "字号错误", "小四", "五号")])
+
+        mock_apply.side_effect = fake_apply
+        with mock.patch("docx.document.Document.save") as save:
+            report = check_format_report(
+                jsonpath=temp_docx, docxpath=temp_docx, configpath=config_path
+            )
+        save.assert_not_called()
+        assert report["document"] == temp_docx
+        assert report["summary"]["total"] == 1
+        assert report["summary"]["errors"] == 1
+        assert report["issues"][0]["property"] == "字号错误"
+
+    @mock.patch(
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_filters_body_text_nodes(
@@ -569,16 +616,18 @@ class TestAutoFormatThesisDocument:
         assert len(root_node.children) == 2
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
-    @mock.patch("wordformat.pipeline.stages.promote_bodytext_in_subtrees_of_type")
     def test_promote_called_for_subtrees(
-        self, mock_promote, mock_builder, mock_apply, temp_docx, config_path, tmp_path
+        self, mock_builder, mock_apply, temp_docx, config_path, tmp_path
     ):
-        """promote_bodytext_in_subtrees_of_type 应被调用 (lines 153-161)"""
-        root_node = mock.MagicMock()
-        root_node.children = []
+        """结构遍历中提升参考文献子树的 BodyText (TreeNormalizationStage)"""
+        root_node = FormatNode(value={"category": "top"}, level=0)
+        refs = References(value={"category": "references_title"}, level=1)
+        entry = BodyText(value={"category": "body_text"}, level=2)
+        refs.add_child_node(entry)
+        root_node.add_child_node(refs)
         mock_builder.build_from_json.return_value = root_node
         mock_apply.return_value = None
 
@@ -591,12 +640,10 @@ class TestAutoFormatThesisDocument:
             savepath=str(tmp_path),
             check=True,
         )
-        assert (
-            mock_promote.call_count == 3
-        )  # AbstractTitleCN, AbstractTitleEN, References
+        assert type(entry) is ReferenceEntry
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_exception_in_traverse_raises(
@@ -620,7 +667,7 @@ class TestAutoFormatThesisDocument:
             )
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_config_load_failure_raises(
@@ -644,7 +691,7 @@ class TestAutoFormatThesisDocument:
             )
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_apply_mode_lists_styles(
@@ -1412,7 +1459,7 @@ class TestSetStyleAdditionalCoverage:
     """覆盖 set_style.py lines 53-55, 147, 150, 167-168"""
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_exception_in_traverse_logs_and_raises(
@@ -1436,7 +1483,7 @@ class TestSetStyleAdditionalCoverage:
             )
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
     def test_body_text_filtering(
@@ -1465,16 +1512,18 @@ class TestSetStyleAdditionalCoverage:
         assert len(root_node.children) == 2
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
-    @mock.patch("wordformat.pipeline.stages.promote_bodytext_in_subtrees_of_type")
     def test_promote_called(
-        self, mock_promote, mock_builder, mock_apply, temp_docx, config_path, tmp_path
+        self, mock_builder, mock_apply, temp_docx, config_path, tmp_path
     ):
-        """promote_bodytext_in_subtrees_of_type is called (line 150)"""
-        root_node = mock.MagicMock()
-        root_node.children = []
+        """Abstract subtree BodyText is promoted during the structure walk"""
+        root_node = FormatNode(value={"category": "top"}, level=0)
+        title = AbstractTitleCN(value={"category": "abstract_chinese_title"}, level=1)
+        body = BodyText(value={"category": "body_text"}, level=2)
+        title.add_child_node(body)
+        root_node.add_child_node(title)
         mock_builder.build_from_json.return_value = root_node
         mock_apply.return_value = None
 
@@ -1487,13 +1536,13 @@ class TestSetStyleAdditionalCoverage:
             savepath=str(tmp_path),
             check=True,
         )
-        assert mock_promote.call_count == 3
+        assert type(body) is AbstractContentCN
 
     @mock.patch(
-        "wordformat.pipeline.stages.FormattingExecutionStage.apply_format_check_to_all_nodes"
+        "wordformat.pipeline.stages.FormattingExecutionStage.register_nodes"
     )
     @mock.patch("wordformat.pipeline.stages.DocumentBuilder")
-    @mock.patch("wordformat.numbering.process_heading_numbering")
+    @mock.patch("wordformat.numbering.NumberingPlan.apply")
     def test_numbering_processing(
         self, mock_numbering, mock_builder, mock_apply, temp_docx, config_path, tmp_path
     ):
@@ -1166,6 +1166,113 @@ class TestProcessReferenceNumbering:
         assert numPr_elem is not None
 
 
+# ============================================================
+# numbering.py — NumberingPlan / 编号定义索引
+# ============================================================
+
+
+def _numbering_config(level_3=False):
+    from wordformat.config.models import NumberingConfig, NumberingLevelConfig
+
+    return NumberingConfig(
+        enabled=True,
+        level_1=NumberingLevelConfig(enabled=True, template="第%1章", suffix="space"),
+        level_2=NumberingLevelConfig(enabled=True, template="%1.%2", suffix="space"),
+        level_3=NumberingLevelConfig(enabled=level_3, template="%1.%2.%3", suffix="space"),
+        references=NumberingLevelConfig(enabled=True, template="[%1]", suffix="space"),
+    )
+
+
+class TestNumberingPlan:
+    def _tree(self, doc):
+        from wordformat.rules.references import ReferenceEntry
+
+        def node(cls, category, level, text):
+            return cls(value={"category": category}, level=level, paragraph=doc.add_paragraph(text))
+
+        root = FormatNode(value={"category": "top"}, level=0)
+        h1 = node(FormatNode, "heading_level_1", 1, "第一章 绪论")
+        h2 = node(FormatNode, "heading_level_2", 2, "1.1 背景")
+        h3 = node(FormatNode, "heading_level_3", 3, "1.1.1 细节")
+        ref = node(ReferenceEntry, "body_text", 2, "[1] 文献")
+        h2.add_child_node(h3)
+        h1.add_child_node(h2)
+        root.add_child_node(h1)
+        root.add_child_node(ref)
+        return root, h1, h2, h3, ref
+
+    def test_add_tree_plans_enabled_levels_in_document_order(self, doc):
+        from wordformat.numbering import NumberingPlan
+
+        root, h1, h2, h3, ref = self._tree(doc)
+        plan = NumberingPlan(_numbering_config())
+        plan.add_tree(root)
+        assert plan.headings == [(h1.paragraph, 0, "level_1"), (h2.paragraph, 1, "level_2")]
+        assert plan.references == [ref.paragraph]
+
+    def test_apply_strips_and_writes_num_pr(self, doc):
+        from wordformat.numbering import NumberingPlan
+
+        root, h1, h2, h3, ref = self._tree(doc)
+        plan = NumberingPlan(_numbering_config(level_3=True))
+        plan.add_tree(root)
+        definitions = plan.apply(doc)
+
+        assert [n.paragraph.text for n in (h1, h2, h3, ref)] == ["绪论", "背景", "细节", "文献"]
+        num_prs = [
+            n.paragraph._p.find(qn("w:pPr")).find(qn("w:numPr")) for n in (h1, h2, h3, ref)
+        ]
+        assert len({id(e) for e in num_prs}) == 4  # 每段各自一份 numPr
+        vals = [
+            (e.find(qn("w:ilvl")).get(qn("w:val")), e.find(qn("w:numId")).get(qn("w:val")))
+            for e in num_prs
+        ]
+        heading_id = definitions["headings"]["level_1"]
+        assert vals == [
+            ("0", heading_id),
+            ("1", heading_id),
+            ("2", heading_id),
+            ("0", definitions["references"]),
+        ]
+
+    def test_matches_per_paragraph_numbering(self):
+        """批量写入与逐段清除编号 + apply_auto_numbering 结果一致。"""
+        a, b = Document(), Document()
+        _, *nodes_a = self._tree(a)
+        root_b = self._tree(b)[0]
+
+        definitions = create_numbering_definition(a, _numbering_config())
+        heading_id = definitions["headings"]["level_1"]
+        for node, ilvl in zip(nodes_a[:2], (0, 1)):
+            _auto_strip_numbering(node.paragraph, ilvl)
+            apply_auto_numbering(node.paragraph, heading_id, str(ilvl))
+        _strip_reference_numbering(nodes_a[3].paragraph)
+        apply_auto_numbering(nodes_a[3].paragraph, definitions["references"])
+
+        process_heading_numbering(root_b, b, _numbering_config())
+        assert a.element.body.xml == b.element.body.xml
+
+
+class TestNumberingIndex:
+    def test_repeated_definitions_get_new_ids(self, doc):
+        config = _numbering_config()
+        first = create_numbering_definition(doc, config)
+        second = create_numbering_definition(doc, config)
+        assert int(second["headings"]["level_1"]) > int(first["references"])
+
+    def test_rescans_after_external_change(self, doc):
+        from docx.oxml import OxmlElement
+
+        config = _numbering_config()
+        create_numbering_definition(doc, config)
+        numbering_elm = doc.part.numbering_part._element
+        num = OxmlElement("w:num")
+        num.set(qn("w:numId"), "50")
+        numbering_elm.append(num)
+        result = create_numbering_definition(doc, config)
+        assert result["headings"]["level_1"] == "51"
+
+
 # ============================================================
 # hyperlinks.py — _parse_ref_numbers
 # ============================================================
@@ -1213,7 +1320,7 @@ class TestInsertBookmark:
         from wordformat.hyperlinks import _insert_bookmark, _next_bookmark_id
 
         p = doc.add_paragraph("A reference entry.")
-        bid = _next_bookmark_id()
+        bid = _next_bookmark_id(doc)
         _insert_bookmark(p, "_Ref1", bid)
 
         para_elem = p._element
@@ -1227,7 +1334,7 @@ class TestInsertBookmark:
         from wordformat.hyperlinks import _insert_bookmark, _next_bookmark_id
 
         p = doc.add_paragraph("Text")
-        bid = _next_bookmark_id()
+        bid = _next_bookmark_id(doc)
         _insert_bookmark(p, "_RefTest", bid)
 
         para_elem = p._element
@@ -1296,6 +1403,107 @@ class TestWrapCitationsInHyperlinks:
         rStyle = rPr.find(qn("w:rStyle"))
         assert rStyle.get(qn("w:val")) == "Hyperlink"
 
+    def test_citation_across_runs_left_unsplit(self, doc):
+        from wordformat.hyperlinks import _wrap_citations_in_hyperlinks
+
+        p = doc.add_paragraph("以及[3-")
+        p.add_run("5]：还有[1]")
+
+        _wrap_citations_in_hyperlinks(p, ["_Ref1"])
+
+        assert [r.text for r in p.runs] == ["以及[3-", "5]：还有"]
+        assert len(p._element.findall(qn("w:hyperlink"))) == 1
+
+
+class TestBookmarkIds:
+    def test_ids_are_per_document(self):
+        from wordformat.hyperlinks import _next_bookmark_id
+
+        doc_a, doc_b = Document(), Document()
+        first = _next_bookmark_id(doc_a)
+        assert _next_bookmark_id(doc_a) == first + 1
+        assert _next_bookmark_id(doc_b) == first
+
+    def test_starts_after_existing_bookmarks(self, doc):
+        from wordformat.hyperlinks import _insert_bookmark, _next_bookmark_id
+
+        _insert_bookmark(doc.add_paragraph("x"), "_Toc1", 5000)
+        assert _next_bookmark_id(doc) == 5001
+
+
+# ============================================================
+# hyperlinks.py — create_citation_hyperlinks（单遍：拆分 + 上标 + 超链接）
+# ============================================================
+
+
+class TestCreateCitationHyperlinks:
+    @staticmethod
+    def _tree(doc, body_text, chapter=1, refs=1):
+        from wordformat.rules.body import BodyText
+        from wordformat.rules.references import ReferenceEntry
+
+        root = FormatNode(value={"category": "top"}, expected_rule={}, level=0)
+        body = BodyText(
+            value={"category": "body_text", "chapter_number": chapter},
+            level=1,
+            paragraph=doc.add_paragraph(body_text),
+        )
+        root.add_child_node(body)
+        for i in range(refs):
+            root.add_child_node(
+                ReferenceEntry(
+                    value={"category": "references"},
+                    level=1,
+                    paragraph=doc.add_paragraph(f"参考文献 {i + 1}"),
+                )
+            )
+        return root, body
+
+    def test_superscript_and_link_in_one_pass(self, doc):
+        from wordformat.hyperlinks import create_citation_hyperlinks
+
+        root, body = self._tree(doc, "见文献[1]所述")
+        body.superscript_citations = True
+        create_citation_hyperlinks(root, doc)
+
+        p = body.paragraph._element
+        hyperlink = p.find(qn("w:hyperlink"))
+        assert hyperlink.get(qn("w:anchor")) == "_Ref1"
+        rPr = hyperlink.find(qn("w:r")).find(qn("w:rPr"))
+        assert rPr.find(qn("w:vertAlign")).get(qn("w:val")) == "superscript"
+        assert body.paragraph.text == "见文献[1]所述"
+
+    def test_not_superscript_unless_marked(self, doc):
+        from wordformat.hyperlinks import create_citation_hyperlinks
+
+        root, body = self._tree(doc, "见文献[1]所述", chapter=2)
+        create_citation_hyperlinks(root, doc)
+        assert body.paragraph._element.find(qn("w:hyperlink")) is not None
+        assert body.paragraph._element.find(".//" + qn("w:vertAlign")) is None
+
+    def test_superscript_without_references(self, doc):
+        from wordformat.hyperlinks import create_citation_hyperlinks
+
+        root, body = self._tree(doc, "见文献[1]所述", refs=0)
+        body.superscript_citations = True
+        create_citation_hyperlinks(root, doc)
+        assert body.paragraph._element.find(qn("w:hyperlink")) is None
+        assert [r.text for r in body.paragraph.runs if r.font.superscript] == ["[1]"]
+
+    def test_bookmark_ids_restart_per_document(self):
+        from wordformat.hyperlinks import create_citation_hyperlinks
+
+        ids = []
+        for _ in range(2):
+            doc = Document()
+            root, _ = self._tree(doc, "见[1][2]", refs=2)
+            create_citation_hyperlinks(root, doc)
+            ids.append(
+                [b.get(qn("w:id")) for b in doc.element.body.iter(qn("w:bookmarkStart"))]
+            )
+        assert ids[0] == ids[1]
+        assert len(set(ids[0])) == 2
+
 
 # ============================================================
 # utils.py — _format_number 额外覆盖测试
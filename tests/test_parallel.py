@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""按章节分片的多进程 check（pipeline/parallel.py）：结果与串行检查逐字节一致。"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from wordformat.pipeline import incremental, parallel
+from wordformat.pipeline.orchestrate import auto_format_thesis_document, check_format_report
+from wordformat.pipeline.stages import FormattingExecutionStage
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+DEVIATIONS = ["bold", "size", "color", "center", None]
+
+
+def _rows(chapters: int = 3) -> list[tuple]:
+    """每章：一级标题、若干正文、图题注（含一个续图）；另有一段摘要式的带换行段落。"""
+    # 摘要段落含手动换行：check 时被清理，父进程需写回子进程改动过的段落
+    rows = [("abstract_chinese_title_content", "摘要：本文研究论文格式。\n第二行。", None)]
+    for ch in range(1, chapters + 1):
+        rows.append(("heading_level_1", f"第{ch}章 标题{ch}", "Heading 1"))
+        rows += [("body_text", f"第{ch}章正文{i}，包含English words。", None) for i in range(4)]
+        rows.append(("caption_figure", f"图{ch}.1 示意图", None))
+        rows.append(("caption_figure", "图 示意图", None))
+        rows.append(("caption_figure", f"续图{ch}.1 示意图", None))
+    return rows
+
+
+@pytest.fixture
+def thesis(tmp_path, make_thesis):
+    docx = tmp_path / "thesis.docx"
+    return make_thesis(docx, _rows(), lambda i: DEVIATIONS[i % 5]), str(docx)
+
+
+def _check(tmp_path, thesis, workers):
+    items, docx = thesis
+    out = tmp_path / f"out{workers}"
+    return auto_format_thesis_document(
+        items, docx, str(EXAMPLE), savepath=str(out), check=True, workers=workers, cache=False
+    )
+
+
+class TestShardedCheck:
+    def test_annotated_document_matches_serial(self, tmp_path, thesis, docx_parts):
+        serial = _check(tmp_path, thesis, 1)
+        sharded = _check(tmp_path, thesis, 2)
+        assert docx_parts(sharded) == docx_parts(serial)
+        assert docx_parts(serial)[1]  # 确有批注
+
+    def test_report_matches_serial(self, thesis):
+        items, docx = thesis
+        serial = check_format_report(items, docx, str(EXAMPLE), workers=1, cache=False)
+        sharded = check_format_report(items, docx, str(EXAMPLE), workers=3, cache=False)
+        assert sharded["issues"] == serial["issues"]
+        assert sharded["summary"] == serial["summary"]
+
+    def test_failed_shard_falls_back_to_serial(self, tmp_path, thesis, docx_parts, monkeypatch):
+        serial = _check(tmp_path, thesis, 1)
+
+        def broken(jobs, write_comments):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(parallel, "_check_shard", broken)
+        assert docx_parts(_check(tmp_path, thesis, 2)) == docx_parts(serial)
+
+    def test_without_source_file_checks_in_walk(self):
+        ctx = SimpleNamespace(docx_path="", document=None, config_model={}, root_node=None)
+        stage = FormattingExecutionStage(workers=2)
+        assert incremental.run_deferred_check(stage, ctx, cache=None) is False
@@ -15,6 +15,7 @@ from docx.oxml.ns import qn
 from wordformat.tree import Tree, Stack, print_tree
 from wordformat.config.dotdict import DotDict
 from wordformat.rules.node import TreeNode, FormatNode
+from wordformat.style.comment_writer import flush_comments
 from wordformat.numbering import (
     _auto_strip_numbering,
     _strip_reference_numbering,
@@ -382,6 +383,8 @@ class TestFormatNode:
         node.add_comment(doc, p.runs[0], "标题-字号错误：小四，规范：五号")
         node.add_comment(doc, p.runs[0], "标题-加粗错误：加粗，规范：不加粗")
         node._flush_comments(doc)
+        assert list(doc.comments) == []  # 先登记，由写入器统一写入
+        assert flush_comments(doc) == 1
         comments = list(doc.comments)
         assert len(comments) == 1
         text = comments[0].text
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""单次遍历访问器测试（pipeline/visitor.py）及并入遍历的 stage。"""
+
+from types import SimpleNamespace
+
+import pytest
+from docx import Document
+
+from wordformat.pipeline.stages import (
+    ParagraphAlignmentStage,
+    TreeNormalizationStage,
+    TreeWalkStage,
+)
+from wordformat.pipeline.visitor import TreeVisitor
+from wordformat.rules.abstract import (
+    AbstractContentCN,
+    AbstractContentEN,
+    AbstractTitleCN,
+    AbstractTitleEN,
+)
+from wordformat.rules.body import BodyText
+from wordformat.rules.node import FormatNode
+from wordformat.rules.references import ReferenceEntry, References
+from wordformat.structure.utils import promote_bodytext_in_subtrees_of_type
+
+
+def _node(cls, name, *children):
+    node = cls(value={"name": name}, level=0)
+    for child in children:
+        node.add_child_node(child)
+    return node
+
+
+def _flatten_tree_nodes(root_node):
+    """参考实现：DFS 前序展平树中所有节点（排除虚拟根节点），即文档段落顺序。"""
+    result = []
+    for child in root_node.children:
+        result.append(child)
+        result.extend(_flatten_tree_nodes(child))
+    return result
+
+
+@pytest.fixture
+def tree():
+    return _node(
+        FormatNode,
+        "root",
+        _node(AbstractTitleCN, "t", _node(BodyText, "b1"), _node(BodyText, "b2")),
+        _node(References, "r", _node(BodyText, "e1")),
+        _node(BodyText, "b3"),
+    )
+
+
+class TestTreeVisitor:
+    def test_preorder_with_parent(self, tree):
+        seen = []
+        visitor = TreeVisitor()
+        visitor.on(object, lambda n, p: seen.append((n.value["name"], p and p.value["name"])))
+        visitor.walk(tree)
+        assert seen == [
+            ("root", None),
+            ("t", "root"),
+            ("b1", "t"),
+            ("b2", "t"),
+            ("r", "root"),
+            ("e1", "r"),
+            ("b3", "root"),
+        ]
+
+    def test_dispatch_by_type_in_registration_order(self, tree):
+        calls = []
+        visitor = TreeVisitor()
+        visitor.on(BodyText, lambda n, p: calls.append(("body", n.value["name"])))
+        visitor.on((References, AbstractTitleCN), lambda n, p: calls.append(("sec", n.value["name"])))
+        visitor.on(object, lambda n, p: calls.append(("all", n.value["name"])))
+        visitor.walk(tree)
+        assert calls[:4] == [("all", "root"), ("sec", "t"), ("all", "t"), ("body", "b1")]
+        assert [c for c in calls if c[0] == "body"] == [("body", n) for n in ("b1", "b2", "e1", "b3")]
+
+    def test_class_change_redispatches_remaining_hooks(self, tree):
+        calls = []
+
+        def promote(node, parent):
+            if isinstance(parent, References):
+                node.__class__ = ReferenceEntry
+
+        visitor = TreeVisitor()
+        visitor.on(BodyText, lambda n, p: calls.append(("body-before", n.value["name"])))
+        visitor.on(object, promote)
+        visitor.on(ReferenceEntry, lambda n, p: calls.append(("ref", n.value["name"])))
+        visitor.on(BodyText, lambda n, p: calls.append(("body-after", n.value["name"])))
+        visitor.on(object, lambda n, p: calls.append(("all", n.value["name"])))
+        visitor.walk(tree)
+        # 提升后其余钩子按新类型分派：BodyText 钩子不再调用，已调用过的钩子不重复
+        assert [c for c in calls if c[1] == "e1"] == [("body-before", "e1"), ("ref", "e1"), ("all", "e1")]
+        assert [c for c in calls if c[1] == "b3"] == [
+            ("body-before", "b3"),
+            ("body-after", "b3"),
+            ("all", "b3"),
+        ]
+
+    def test_finish_then_cleanup_even_on_error(self, tree):
+        order = []
+        visitor = TreeVisitor()
+        visitor.on_finish(lambda: order.append("finish"))
+        visitor.on_cleanup(lambda: order.append("cleanup"))
+        visitor.walk(tree)
+        assert order == ["finish", "cleanup"]
+
+        order.clear()
+        visitor.on(References, lambda n, p: (_ for _ in ()).throw(RuntimeError("boom")))
+        with pytest.raises(RuntimeError, match="boom"):
+            visitor.walk(tree)
+        assert order == ["cleanup"]
+
+
+class TestFusedStages:
+    def test_alignment_and_normalization_in_one_walk(self, tree):
+        doc = Document()
+        for _ in range(6):
+            doc.add_paragraph("x")
+        ctx = SimpleNamespace(document=doc, root_node=tree)
+        expected = _flatten_tree_nodes(tree)
+
+        TreeWalkStage(ParagraphAlignmentStage(), TreeNormalizationStage()).process(ctx)
+
+        assert [n.paragraph._p for n in expected] == [p._p for p in doc.paragraphs]
+        assert [type(n) for n in expected] == [
+            AbstractTitleCN,
+            AbstractContentCN,
+            AbstractContentCN,
+            References,
+            ReferenceEntry,
+            BodyText,
+        ]
+
+    def test_normalization_matches_per_type_promotion(self):
+        def build():
+            return _node(
+                FormatNode,
+                "root",
+                _node(
+                    AbstractTitleEN,
+                    "en",
+                    _node(BodyText, "a", _node(BodyText, "a1")),
+                    _node(References, "nested", _node(BodyText, "n1")),
+                ),
+                _node(References, "r", _node(BodyText, "e1", _node(BodyText, "e2"))),
+            )
+
+        legacy = build()
+        for parent_cls, target_cls in TreeNormalizationStage.MAPPINGS:
+            promote_bodytext_in_subtrees_of_type(legacy, parent_cls, target_cls)
+        fused = build()
+        TreeNormalizationStage().process(SimpleNamespace(root_node=fused))
+
+        def classes(root):
+            return [type(n) for n in _flatten_tree_nodes(root)]
+
+        assert classes(fused) == classes(legacy)
+        assert AbstractContentEN in classes(fused)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""监视模式（pipeline/watch.py）：轮询文件状态，改动后增量重新检查并给出问题变化。"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from docx.shared import Pt
+
+from wordformat.pipeline.watch import DocumentWatcher, diff_issues, file_stamp, format_delta
+from wordformat.style.issues import Issue
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "undergrad_thesis.yaml"
+# 一章论文：一级标题 + 4 段正文
+ROWS = [("heading_level_1", "第1章 绪论", "Heading 1")]
+ROWS += [("body_text", f"第1章正文{i}，包含English words。", None) for i in range(4)]
+
+
+def _first_body_size(size: int = 15):
+    """第一段正文后半部分的字号（改字号即可引入 / 修正一个问题）。"""
+
+    def set_size(p, r1, r2):
+        r2.font.size = Pt(size)
+
+    return lambda i: set_size if i == 1 else None
+
+
+def _issue(prop, actual="a"):
+    return Issue("正文段落", prop, actual, "b")
+
+
+class TestDiffIssues:
+    def test_added_and_resolved_keep_order(self):
+        a, b, c = _issue("字号错误"), _issue("字体错误"), _issue("加粗错误")
+        delta = diff_issues([a, b], [b, c])
+        assert delta.added == [c]
+        assert delta.resolved == [a]
+
+    def test_duplicates_counted(self):
+        a = _issue("字号错误")
+        assert diff_issues([a], [a, a]).added == [a]
+        assert diff_issues([a, a], [a]).resolved == [a]
+        assert diff_issues([a], [a]) == ([], [])
+
+
+class TestDocumentWatcher:
+    def test_poll_waits_until_file_settles(self, tmp_path, make_thesis):
+        docx = tmp_path / "thesis.docx"
+        json_path = tmp_path / "s.json"
+        items = make_thesis(docx, ROWS, _first_body_size())
+        json_path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+        watcher = DocumentWatcher(str(json_path), str(docx))
+        watcher._checked = watcher._seen = watcher._stamps()
+        assert not watcher.poll()
+
+        docx.write_bytes(docx.read_bytes() + b"\0")
+        assert not watcher.poll()  # 刚发生变化，等下一次轮询确认已稳定
+        assert watcher.poll()
+
+        os.remove(docx)
+        assert file_stamp(docx) is None
+        assert not watcher.poll()
+        assert not watcher.poll()
+
+    def test_recheck_reports_delta(self, tmp_path, make_thesis):
+        docx = tmp_path / "thesis.docx"
+        json_path = tmp_path / "s.json"
+        items = make_thesis(docx, ROWS, _first_body_size())
+        json_path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+        watcher = DocumentWatcher(str(json_path), str(docx), str(EXAMPLE), interval=0.01)
+        results = []
+
+        def on_result(result):
+            results.append(result)
+            if len(results) == 1:
+                make_thesis(docx, ROWS, _first_body_size(12))  # 修正第一段正文的字号
+
+        watcher.run(on_result, max_checks=2)
+
+        first, second = results
+        assert first.delta.added == first.issues and not first.delta.resolved
+        assert second.delta.resolved and not second.delta.added
+        assert all(issue.fingerprint == "fp1" for issue in second.delta.resolved)
+        assert len(second.issues) == len(first.issues) - len(second.delta.resolved)
+        # 只重新检查了改动的段落
+        assert watcher.cache.hits == len(items) - 1
+        lines = format_delta(second)
+        assert f"已解决 {len(second.delta.resolved)} 条" in lines[0]
+        assert all(line.startswith("  - ") for line in lines[1:])
+
+    def test_failed_check_waits_for_next_change(self, tmp_path, make_thesis):
+        docx = tmp_path / "thesis.docx"
+        docx.write_bytes(b"not a docx")
+        json_path = tmp_path / "s.json"
+        json_path.write_text("[]", encoding="utf-8")
+        watcher = DocumentWatcher(str(json_path), str(docx), str(EXAMPLE))
+        with pytest.raises(Exception):
+            watcher.check()
+        assert watcher.checks == 0
+        assert not watcher.poll()
+
+        make_thesis(docx, ROWS, _first_body_size())
+        assert not watcher.poll()
+        assert watcher.poll()
@@ -0,0 +1,73 @@
+"""utils/_patterns.py 测试 — 预编译模式族的优先级、成员与命名组。"""
+
+import re
+
+import pytest
+
+from wordformat.utils._patterns import (
+    CAPTION,
+    FAMILIES,
+    HEADING_NUMBER,
+    REFERENCE_NUMBER,
+    SECTION_TITLE,
+    get_family,
+    heading_number_family,
+    register_family,
+)
+
+
+def _sequential(family, text):
+    for member, source in family.members:
+        m = re.match(source, text, family.flags)
+        if m:
+            return member, m.group()
+    return None
+
+
+class TestPriority:
+    @pytest.mark.parametrize(
+        "text", ["1.2.3 方法", "1.2 现状", "一.1 小结", "一、需求", "3. 参数", "正文"]
+    )
+    def test_same_as_sequential(self, text):
+        for family in HEADING_NUMBER:
+            m = family.match(text)
+            assert ((m.member, m.text) if m else None) == _sequential(family, text)
+
+    def test_longer_member_first(self):
+        assert heading_number_family(2).match("1.1.1 数据").member == "dotted3"
+
+    def test_reference_dot_requires_space(self):
+        assert REFERENCE_NUMBER.match("2024.年报") is None
+        assert REFERENCE_NUMBER.match("1. Smith").member == "dot"
+
+
+class TestGroups:
+    def test_caption_groups_use_short_names(self):
+        m = CAPTION.match("表一-2 实验参数")
+        assert m.member == "chinese"
+        assert m.groups == {"label": "表", "chapter": "一", "sep": "-", "num": "2", "name": "实验参数"}
+
+    def test_member_without_groups(self):
+        assert SECTION_TITLE.match("致 谢").groups == {}
+
+    def test_search(self):
+        assert SECTION_TITLE.search("附：参考文献").member == "references_title"
+
+
+class TestRegistry:
+    @pytest.mark.parametrize("ilvl,index", [(-1, 2), (0, 0), (1, 1), (2, 2), (5, 2)])
+    def test_heading_family_by_level(self, ilvl, index):
+        assert heading_number_family(ilvl) is HEADING_NUMBER[index]
+
+    def test_lookup(self):
+        assert get_family("caption") is CAPTION
+        with pytest.raises(KeyError):
+            get_family("missing")
+
+    def test_register(self):
+        family = register_family("_test_family", [("a", r"(?P<x>a+)"), ("b", r"b")])
+        try:
+            assert get_family("_test_family") is family
+            assert family.match("aab").groups == {"x": "aa"}
+        finally:
+            FAMILIES.pop("_test_family")
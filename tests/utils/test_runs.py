@@ -0,0 +1,114 @@
+"""utils/_runs.py 测试 — 按区间批量拆分 run、改写 run 文本。"""
+
+import copy
+
+import pytest
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Pt
+
+from wordformat.utils import paragraph_snapshot, set_run_text, split_runs
+
+
+def _para(*texts):
+    doc = Document()
+    p = doc.add_paragraph()
+    for t in texts:
+        p.add_run(t).font.size = Pt(12)
+    return p
+
+
+def _texts(p):
+    return [r.text for r in p.runs]
+
+
+class TestSplitRuns:
+    def test_multiple_spans_in_one_run(self):
+        p = _para("中文,中文.结束")
+        result = split_runs(p, [(2, 3), (5, 6)])
+        assert _texts(p) == ["中文", ",", "中文", ".", "结束"]
+        assert [[r.text for r in runs] for runs in result] == [[","], ["."]]
+        assert p.text == "中文,中文.结束"
+
+    def test_span_on_run_boundary_not_split(self):
+        p = _para("前", "[1]", "后")
+        [(run,)] = split_runs(p, [(1, 4)])
+        assert _texts(p) == ["前", "[1]", "后"]
+        assert run._r is p.runs[1]._r
+
+    def test_fresh_moves_span_at_run_start_to_new_run(self):
+        p = _para("中文", ",中文")
+        original = p.runs[1]._r
+        [(run,)] = split_runs(p, [(2, 3)], fresh=True)
+        assert run.text == "," and run._r is not original
+        assert _texts(p) == ["中文", "", ",", "中文"]
+        assert original.find(qn("w:t")) is not None
+
+    def test_span_across_runs(self):
+        p = _para("前面[1", "2]后面")
+        [runs] = split_runs(p, [(2, 6)])
+        assert [r.text for r in runs] == ["[1", "2]"]
+        assert _texts(p) == ["前面", "[1", "2]", "后面"]
+
+    def test_rpr_cloned_per_piece(self):
+        p = _para("a,b")
+        split_runs(p, [(1, 2)])
+        rprs = [r._r.find(qn("w:rPr")) for r in p.runs]
+        assert len({id(x) for x in rprs}) == 3
+        assert all(r.font.size == Pt(12) for r in p.runs)
+
+    def test_tab_counted_like_paragraph_text(self):
+        p = _para("1.\t标题")
+        [(run,)] = split_runs(p, [(3, 5)])
+        assert run.text == "标题"
+        assert _texts(p) == ["1.\t", "标题"]
+
+    def test_edge_space_preserved(self):
+        p = _para("见 [1] 所述")
+        split_runs(p, [(2, 5)])
+        t = p.runs[2]._r.find(qn("w:t"))
+        assert t.text == " 所述"
+        assert t.get(qn("xml:space")) == "preserve"
+
+    def test_span_inside_hyperlink_returns_empty(self):
+        p = _para("见")
+        link = p._p.makeelement(qn("w:hyperlink"), {})
+        link.append(p.add_run("[1]")._r)
+        p._p.append(link)
+        p.add_run("后")
+        assert split_runs(p, [(1, 4), (4, 5)])[0] == ()
+        assert _texts(p) == ["见", "后"]
+
+    def test_snapshot_invalidated(self):
+        p = _para("a,b")
+        paragraph_snapshot(p)
+        split_runs(p, [(1, 2)])
+        assert paragraph_snapshot(p).run_texts == ("a", ",", "b")
+
+
+class TestSetRunText:
+    @pytest.mark.parametrize(
+        ("original", "text"),
+        [
+            ("1.1 研究背景", "研究背景"),
+            ("1.1 研究背景", ""),
+            ("标题", " 前导空格"),
+            (" 前导空格", "无空格"),
+            ("第一章", "含\t制表"),
+            ("a\tb", "ab"),
+        ],
+    )
+    def test_matches_python_docx_setter(self, original, text):
+        fast, slow = _para(original).runs[0]._r, _para(original).runs[0]._r
+        set_run_text(fast, text)
+        slow.text = text
+        assert fast.xml == slow.xml
+
+    def test_multiple_t_falls_back(self):
+        r, expected = _para("前").runs[0]._r, _para("前").runs[0]._r
+        for run in (r, expected):
+            run.append(copy.deepcopy(run.find(qn("w:t"))))
+        set_run_text(r, "后")
+        expected.text = "后"
+        assert r.xml == expected.xml
+        assert len(r.findall(qn("w:t"))) == 1
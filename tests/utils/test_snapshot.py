@@ -0,0 +1,90 @@
+"""utils/_snapshot.py 测试 — 段落快照的内容、缓存与失效。"""
+
+from unittest.mock import MagicMock
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from wordformat.numbering import _remove_chars
+from wordformat.utils import invalidate_snapshot, paragraph_snapshot, split_runs
+
+
+def _para(*texts):
+    doc = Document()
+    p = doc.add_paragraph()
+    for t in texts:
+        p.add_run(t)
+    return doc, p
+
+
+class TestContent:
+    def test_texts_and_offsets(self):
+        _, p = _para("第一", "", "段落abc")
+        snap = paragraph_snapshot(p)
+        assert snap.text == p.text == "第一段落abc"
+        assert snap.run_texts == ("第一", "", "段落abc")
+        assert snap.offsets == (0, 2, 2)
+        assert [r._element for r in snap.runs] == [r._element for r in p.runs]
+
+    def test_run_index_at(self):
+        _, p = _para("ab", "", "cd")
+        snap = paragraph_snapshot(p)
+        assert [snap.run_index_at(i) for i in range(4)] == [0, 0, 2, 2]
+        assert snap.run_index_at(4) == -1
+        assert snap.run_index_at(-1) == -1
+
+    def test_hyperlink_text_counted(self):
+        _, p = _para("ab")
+        link = p._p.makeelement(qn("w:hyperlink"), {})
+        link.append(p.add_run("[1]")._r)
+        p._p.append(link)
+        p.add_run("cd")
+        snap = paragraph_snapshot(p)
+        assert snap.text == p.text == "ab[1]cd"
+        assert snap.run_texts == ("ab", "cd")
+        assert snap.offsets == (0, 5)
+        assert snap.run_index_at(3) == -1
+
+
+class TestCache:
+    def test_shared_across_proxies(self):
+        doc, p = _para("abc")
+        assert paragraph_snapshot(p) is paragraph_snapshot(doc.paragraphs[0])
+
+    def test_invalidate(self):
+        _, p = _para("abc")
+        snap = paragraph_snapshot(p)
+        p.runs[0].text = "xyz"
+        assert paragraph_snapshot(p) is snap  # 库外改写须自行失效
+        invalidate_snapshot(p)
+        assert paragraph_snapshot(p).text == "xyz"
+
+    def test_rebuilt_when_children_change(self):
+        _, p = _para("abc")
+        snap = paragraph_snapshot(p)
+        p.add_run("d")
+        fresh = paragraph_snapshot(p)
+        assert fresh is not snap
+        assert fresh.text == "abcd"
+
+    def test_non_docx_paragraph_not_cached(self):
+        p = MagicMock()
+        p.runs = []
+        p.text = ""
+        assert paragraph_snapshot(p) is not paragraph_snapshot(p)
+
+
+class TestLibraryHelpers:
+    def test_split_runs(self):
+        _, p = _para("中文,中文")
+        paragraph_snapshot(p)
+        [(run,)] = split_runs(p, [(2, 3)])
+        snap = paragraph_snapshot(p)
+        assert snap.run_texts == ("中文", ",", "中文")
+        assert run._element is snap.runs[1]._element
+
+    def test_remove_chars(self):
+        _, p = _para("[1]", " 张三")
+        paragraph_snapshot(p)
+        _remove_chars(p, 3)
+        assert paragraph_snapshot(p).text == "张三"
@@ -1,7 +1,15 @@
 """utils/_text.py 测试 — 罗马数字、中文数字、题注解析。"""
 
 import pytest
-from wordformat.utils import _from_chinese_num, _from_roman, parse_caption_text
+from wordformat.utils import (
+    _from_chinese_num,
+    _from_roman,
+    count_chinese_chars,
+    extract_chinese_chars,
+    has_chinese,
+    is_chinese_char,
+    parse_caption_text,
+)
 
 
 class TestFromChineseNum:
@@ -188,3 +196,26 @@ class TestParseCaptionText:
 
 
 # ======================== _replace_paragraph_text ========================
+
+
+# ======================== CJK 统计 ========================
+
+_MIXED = "第1章 绪论：Deep learning（深度学习）\u4dff\u4e00\u9fff\ua000 \U00020000𝐀\t\n"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "abc", "中", "\u4dff\ua000", _MIXED, _MIXED * 3, _MIXED * 40, "中" * 500, "x" * 500],
+)
+class TestCjkStatistics:
+    """正则（短文本）与 NumPy（长文本）两条路径都须与逐字符判定一致。"""
+
+    def test_count(self, text):
+        assert count_chinese_chars(text) == sum(1 for ch in text if is_chinese_char(ch))
+
+    def test_extract(self, text):
+        assert extract_chinese_chars(text) == "".join(ch for ch in text if is_chinese_char(ch))
+
+    def test_has(self, text):
+        assert has_chinese(text) == any(is_chinese_char(ch) for ch in text)
+